@@ -9,6 +9,7 @@ from typing import TYPE_CHECKING, Any
 from django.contrib import admin
 
 from clients.models import (
+    ClientExportJob,
     DocumentProcessingJob,
     EmailCampaign,
     TestRun,
@@ -28,12 +29,13 @@ class DocumentProcessingJobAdmin(admin.ModelAdmin):
         "document",
         "job_type",
         "status",
+        "priority",
         "attempts",
         "requires_confirmation",
         "created_at",
         "updated_at",
     )
-    list_filter = ("job_type", "status", "requires_confirmation", "created_at")
+    list_filter = ("job_type", "status", "priority", "requires_confirmation", "created_at")
     search_fields = ("document__client__first_name", "document__client__last_name", "document__client__email")
     autocomplete_fields = ("document", "created_by")
     readonly_fields = (
@@ -41,6 +43,7 @@ class DocumentProcessingJobAdmin(admin.ModelAdmin):
         "created_by",
         "job_type",
         "status",
+        "priority",
         "source_file_name",
         "attempts",
         "max_attempts",
@@ -58,6 +61,28 @@ class DocumentProcessingJobAdmin(admin.ModelAdmin):
         return False
 
 
+@admin.register(ClientExportJob)
+class ClientExportJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "scope",
+        "company",
+        "status",
+        "processed_clients",
+        "total_clients",
+        "deduplicated_count",
+        "created_by",
+        "created_at",
+        "expires_at",
+    )
+    list_filter = ("scope", "status", "created_at")
+    search_fields = ("created_by__email", "company__name")
+    readonly_fields = tuple(field.name for field in ClientExportJob._meta.fields)
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+
 @admin.register(EmailCampaign)
 class EmailCampaignAdmin(admin.ModelAdmin):
     list_display = ("created_at", "subject", "status", "total_recipients", "sent_count", "failed_count", "created_by")
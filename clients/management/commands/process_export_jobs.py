@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from clients.services.export_jobs import process_pending_export_jobs
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Build queued client export archives and expire old download links."
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Maximum number of queued export jobs to process in one run.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        limit = options["limit"]
+        if limit is not None:
+            if limit <= 0:
+                raise CommandError("--limit must be positive.")
+            if limit > 20:
+                limit = 20
+        logger.info("Starting queued export job processing (limit=%s)", limit)
+        results = process_pending_export_jobs(limit=limit)
+
+        if not results:
+            self.stdout.write("No pending export jobs found.")
+            return
+
+        completed = sum(1 for result in results if result.status == "completed")
+        failed = sum(1 for result in results if result.status == "failed")
+        for result in results:
+            logger.info("Export job %s finished with status=%s", result.job_id, result.status)
+            self.stdout.write(f"Export job {result.job_id}: {result.status}")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Processed {len(results)} export job(s): completed={completed}, failed={failed}")
+        )
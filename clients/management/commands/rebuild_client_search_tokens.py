@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from clients.services.client_search import (
+    SEARCH_TOKEN_BATCH_SIZE,
+    SearchTokenBackfillResult,
+    backfill_client_search_tokens,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the encrypted-name search index (prefix and trigram tokens) of all clients. "
+        "Run once after upgrading the token scheme and after bulk imports that bypass Client.save()."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=SEARCH_TOKEN_BATCH_SIZE,
+            help="Number of clients rebuilt per transaction.",
+        )
+        parser.add_argument(
+            "--start-after",
+            type=int,
+            default=0,
+            help="Resume after this client id (printed as last_id by an interrupted run).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        batch_size = options["batch_size"]
+        if batch_size <= 0:
+            raise CommandError("--batch-size must be positive.")
+        if options["start_after"] < 0:
+            raise CommandError("--start-after must not be negative.")
+
+        verbosity = options["verbosity"]
+
+        def report(progress: SearchTokenBackfillResult) -> None:
+            if verbosity > 1:
+                self.stdout.write(f"checked={progress.checked} last_id={progress.last_id}")
+
+        logger.info("Starting client search token rebuild (start_after=%s)", options["start_after"])
+        result = backfill_client_search_tokens(
+            batch_size=batch_size, start_after=options["start_after"], on_batch=report
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Client search tokens rebuilt: checked={result.checked}, created={result.created}, "
+                f"deleted={result.deleted}, last_id={result.last_id}."
+            )
+        )
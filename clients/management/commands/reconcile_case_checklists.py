@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from clients.services.checklist_summary import RECONCILE_BATCH_SIZE, reconcile_case_checklist_summaries
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the persisted document-checklist summaries of active cases used by the "
+        "workday queue, the admin panel and the missing-document e-mails."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--stale-only",
+            action="store_true",
+            help="Only process cases without a summary or with one invalidated by a checklist edit.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=RECONCILE_BATCH_SIZE,
+            help="Number of cases recomputed per batch.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        batch_size = options["batch_size"]
+        if batch_size <= 0:
+            raise CommandError("--batch-size must be positive.")
+        logger.info("Starting case checklist reconciliation (stale_only=%s)", options["stale_only"])
+        result = reconcile_case_checklist_summaries(batch_size=batch_size, stale_only=options["stale_only"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Case checklist summaries reconciled: checked={result.checked}, "
+                f"created={result.created}, updated={result.repaired}."
+            )
+        )
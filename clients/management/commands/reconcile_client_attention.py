@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from clients.services.attention_state import RECONCILE_BATCH_SIZE, reconcile_client_attention_states
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the per-client attention state behind the client-list filters and "
+        "navbar badges, rewriting rows that drifted from their source records."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--missing-only",
+            action="store_true",
+            help="Only create rows for clients that do not have one yet.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=RECONCILE_BATCH_SIZE,
+            help="Number of clients recomputed per batch.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        batch_size = options["batch_size"]
+        if batch_size <= 0:
+            raise CommandError("--batch-size must be positive.")
+        logger.info("Starting client attention reconciliation (missing_only=%s)", options["missing_only"])
+        result = reconcile_client_attention_states(batch_size=batch_size, missing_only=options["missing_only"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Client attention state reconciled: checked={result.checked}, "
+                f"created={result.created}, repaired={result.repaired}."
+            )
+        )
@@ -2,17 +2,28 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
 import time
 from collections.abc import Callable
 from datetime import datetime
+from functools import partial
 from typing import Any
 
 from django.conf import settings
 from django.core.cache import cache
 from django.core.mail import mail_admins
-from django.core.management import BaseCommand, call_command
+from django.core.management import BaseCommand, CommandError, call_command
+from django.db import close_old_connections
 from django.utils import timezone
 
+from clients.services.automation_schedule import Schedule, parse_schedule
+from clients.services.job_wakeups import (
+    DOCUMENT_JOBS_CHANNEL,
+    EMAIL_CAMPAIGNS_CHANNEL,
+    JobWakeupListener,
+    wakeup_event,
+)
+
 logger = logging.getLogger(__name__)
 HEARTBEAT_CACHE_KEY = "background_automation_loop:heartbeat"
 # Long-lived marker (survives loop downtime) used to detect that the loop was
@@ -24,89 +35,293 @@ LAST_RUN_TIMEOUT = 7 * 24 * 60 * 60
 DB_BACKUP_DONE_KEY = "background_automation_loop:db_backup_done_date"
 DB_BACKUP_DONE_TIMEOUT = 3 * 24 * 60 * 60
 
+# Published next to the heartbeat with --loop: per-task last run, duration,
+# next run and overrun count, shown by the readiness endpoint.
+TASK_SCHEDULE_CACHE_KEY = f"{HEARTBEAT_CACHE_KEY}:tasks"
+# How often the scheduler thread refreshes the heartbeat and task schedule.
+HEARTBEAT_PUBLISH_SECONDS = 60
+
+# Tasks that drain a queue are also woken by ``clients.services.job_wakeups``
+# as soon as work is queued.
+LANE_CHANNELS = {
+    "document-jobs": DOCUMENT_JOBS_CHANNEL,
+    "email-campaigns": EMAIL_CAMPAIGNS_CHANNEL,
+}
+# Daily tasks guard themselves (the reminder command per 08:00/17:10 slot,
+# retention per day/week/month, releasing the guard when a step fails), so
+# they are polled: a slot skipped because the loop was down or the lock was
+# held, or a failed run, is retried on the next poll instead of a day later.
+DAILY_TASK_SCHEDULES = {
+    "weekly-document-reminders": "every 15m",
+    "retention-maintenance": "every 15m",
+}
+# A lane whose current run has taken this many schedule periods is reported
+# in the heartbeat's failed tasks, so a hung lane fails readiness.
+LANE_STALL_FACTOR = 3
+
 
 def _env_flag(name: str, default: bool = False) -> bool:
     return os.environ.get(name, "true" if default else "false").lower() in {"1", "true", "yes", "on"}
 
 
+class _TaskLane:
+    """Run one automation task in a daemon thread on its own schedule.
+
+    The first run starts immediately; after that the next run is due at
+    ``schedule.next_after(<start of the previous run>)``. A lane with a wakeup
+    channel also runs as soon as the channel fires. The event is cleared
+    before each run, so work queued during a run triggers another run right
+    after it. A run that ends after its next slot was due counts as an
+    overrun; the missed slots are skipped rather than queued.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        schedule: Schedule,
+        run: Callable[[], bool],
+        channel: str | None = None,
+    ) -> None:
+        self.name = name
+        self.schedule = schedule
+        self.last_succeeded: bool | None = None
+        self.last_started_at: datetime | None = None
+        self.last_duration_seconds: float | None = None
+        self.next_run_at: datetime | None = None
+        self.running = False
+        self.overruns = 0
+        self._run_task = run
+        self._wakeup = wakeup_event(channel) if channel else threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name=f"automation-lane-{name}", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+
+    def run_once(self) -> None:
+        self._wakeup.clear()
+        started_at = timezone.now()
+        started = time.monotonic()
+        self.running = True
+        self.last_started_at = started_at
+        try:
+            succeeded = self._run_task()
+        except Exception:
+            logger.exception("Background automation lane crashed: %s", self.name)
+            succeeded = False
+        self.last_duration_seconds = time.monotonic() - started
+        self.last_succeeded = succeeded
+        finished_at = timezone.now()
+        next_run_at = self.schedule.next_after(started_at)
+        if next_run_at <= finished_at:
+            self.overruns += 1
+            logger.warning(
+                "Background automation task %s overran its schedule (%s): took %.1fs.",
+                self.name,
+                self.schedule,
+                self.last_duration_seconds,
+            )
+            next_run_at = self.schedule.next_after(finished_at)
+        self.next_run_at = next_run_at
+        self.running = False
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "schedule": str(self.schedule),
+            "running": self.running,
+            "last_status": None if self.last_succeeded is None else ("ok" if self.last_succeeded else "error"),
+            "last_started_at": self.last_started_at.isoformat() if self.last_started_at else None,
+            "last_duration_seconds": (
+                round(self.last_duration_seconds, 3) if self.last_duration_seconds is not None else None
+            ),
+            "next_run_at": self.next_run_at.isoformat() if self.next_run_at else None,
+            "overruns": self.overruns,
+        }
+
+    def stalled(self, now: datetime, *, grace_seconds: float) -> bool:
+        """Whether the current run has exceeded ``LANE_STALL_FACTOR`` periods.
+
+        Never before *grace_seconds*, so a fast polling lane busy with one
+        large batch is not reported.
+        """
+        started_at = self.last_started_at
+        if not self.running or started_at is None:
+            return False
+        period = (self.schedule.next_after(started_at) - started_at).total_seconds()
+        return (now - started_at).total_seconds() > max(period * LANE_STALL_FACTOR, grace_seconds)
+
+    def _loop(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.run_once()
+            finally:
+                close_old_connections()
+            next_run_at = self.next_run_at
+            if next_run_at is None:
+                next_run_at = self.schedule.next_after(timezone.now())
+            self._wakeup.wait(max(0.0, (next_run_at - timezone.now()).total_seconds()))
+
+
 class Command(BaseCommand):
-    help = "Run background automation tasks for OCR jobs, email campaigns, reminders, retention and backups."
+    help = "Run background automation tasks for OCR jobs, email campaigns, export archives, reminders, retention and backups."
 
     def add_arguments(self, parser: Any) -> None:
         parser.add_argument(
             "--loop",
             action="store_true",
-            help="Keep running automation cycles until the process is stopped.",
+            help="Keep scheduling automation tasks until the process is stopped.",
         )
         parser.add_argument(
             "--interval-seconds",
             type=int,
             default=300,
-            help="How often the loop runs OCR and email campaign processing.",
+            help="With --loop, the cadence of periodic tasks without their own schedule.",
         )
         parser.add_argument(
             "--document-job-limit",
             type=int,
             default=50,
-            help="Maximum queued OCR jobs to process in one cycle.",
+            help="Maximum queued OCR jobs to process in one run.",
         )
         parser.add_argument(
             "--email-campaign-limit",
             type=int,
             default=50,
-            help="Maximum queued email campaigns to process in one cycle.",
+            help="Maximum queued email campaigns to process in one run.",
+        )
+        parser.add_argument(
+            "--job-poll-seconds",
+            type=int,
+            default=60,
+            help=(
+                "With --loop, how often the OCR and email campaign lanes check their queues"
+                " when no wakeup notification arrives."
+            ),
         )
 
     def handle(self, *args: Any, **options: Any) -> None:
-        loop = bool(options["loop"])
         interval_seconds = max(60, int(options["interval_seconds"]))
+        tasks = self._cycle_tasks(
+            document_job_limit=max(1, min(100, int(options["document_job_limit"]))),
+            email_campaign_limit=max(1, min(100, int(options["email_campaign_limit"]))),
+        )
+        if not options["loop"]:
+            self._run_cycle(interval_seconds=interval_seconds, tasks=tasks)
+            return
 
-        while True:
-            self._run_cycle(
-                interval_seconds=interval_seconds,
-                document_job_limit=max(1, min(100, int(options["document_job_limit"]))),
-                email_campaign_limit=max(1, min(100, int(options["email_campaign_limit"]))),
+        schedules = self._task_schedules(
+            interval_seconds=interval_seconds,
+            job_poll_seconds=max(5, int(options["job_poll_seconds"])),
+        )
+        lanes = [
+            _TaskLane(
+                name,
+                schedule=schedules[name],
+                channel=LANE_CHANNELS.get(name),
+                run=partial(self._run_locked, name, timeout=interval_seconds, task=task),
             )
-            if not loop:
-                return
-            time.sleep(interval_seconds)
+            for name, task in tasks.items()
+        ]
+        lanes.append(
+            _TaskLane(
+                "db-backup",
+                schedule=schedules["db-backup"],
+                run=partial(self._run_backup_lane, timeout=interval_seconds),
+            )
+        )
+        self._run_scheduler(lanes, interval_seconds=interval_seconds)
 
-    def _run_cycle(
-        self,
-        *,
-        interval_seconds: int,
-        document_job_limit: int,
-        email_campaign_limit: int,
-    ) -> None:
+    def _cycle_tasks(self, *, document_job_limit: int, email_campaign_limit: int) -> dict[str, Callable[[], Any]]:
+        return {
+            "document-jobs": lambda: call_command("process_document_jobs", "--limit", str(document_job_limit)),
+            "email-campaigns": lambda: call_command("process_email_campaigns", "--limit", str(email_campaign_limit)),
+            "export-jobs": lambda: call_command("process_export_jobs", "--limit", "5"),
+            "weekly-document-reminders": lambda: call_command("run_weekly_document_reminders"),
+            # Cheap anti-join: only clients created outside signals (imports,
+            # the first deploy) lack a row; the full repair runs nightly.
+            "client-attention": lambda: call_command("reconcile_client_attention", "--missing-only"),
+            # Rows invalidated by a checklist catalog edit or never built.
+            "case-checklists": lambda: call_command("reconcile_case_checklists", "--stale-only"),
+            "retention-maintenance": lambda: call_command("run_retention_maintenance"),
+        }
+
+    def _task_schedules(self, *, interval_seconds: int, job_poll_seconds: int) -> dict[str, Schedule]:
+        specs = {name: f"every {job_poll_seconds}s" for name in LANE_CHANNELS}
+        for name in ("export-jobs", "client-attention", "case-checklists", "db-backup"):
+            specs[name] = f"every {interval_seconds}s"
+        specs.update(DAILY_TASK_SCHEDULES)
+        overrides = dict(getattr(settings, "BACKGROUND_AUTOMATION_SCHEDULES", {}) or {})
+        unknown = sorted(set(overrides) - set(specs))
+        if unknown:
+            raise CommandError(f"BACKGROUND_AUTOMATION_SCHEDULES names unknown tasks: {', '.join(unknown)}")
+        specs.update(overrides)
+        try:
+            return {name: parse_schedule(spec) for name, spec in specs.items()}
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+    def _run_cycle(self, *, interval_seconds: int, tasks: dict[str, Callable[[], Any]]) -> None:
+        """Run every task once, in order (the command without --loop)."""
         heartbeat_timeout = max(180, interval_seconds * 3)
         self._check_resume_after_outage(interval_seconds=interval_seconds)
         results = {
-            "document-jobs": self._run_locked(
-                "document-jobs",
-                timeout=interval_seconds,
-                task=lambda: call_command("process_document_jobs", "--limit", str(document_job_limit)),
-            ),
-            "email-campaigns": self._run_locked(
-                "email-campaigns",
-                timeout=interval_seconds,
-                task=lambda: call_command("process_email_campaigns", "--limit", str(email_campaign_limit)),
-            ),
-            "weekly-document-reminders": self._run_locked(
-                "weekly-document-reminders",
-                timeout=interval_seconds,
-                task=lambda: call_command("run_weekly_document_reminders"),
-            ),
-            "retention-maintenance": self._run_locked(
-                "retention-maintenance",
-                timeout=interval_seconds,
-                task=lambda: call_command("run_retention_maintenance"),
-            ),
+            name: self._run_locked(name, timeout=interval_seconds, task=task) for name, task in tasks.items()
         }
         self._maybe_run_daily_backup(timeout=interval_seconds)
         failures = sorted(name for name, succeeded in results.items() if not succeeded)
         self._record_heartbeat(timeout=heartbeat_timeout, failures=failures)
         self._record_last_run()
 
+    def _run_scheduler(self, lanes: list[_TaskLane], *, interval_seconds: int) -> None:
+        """Run each task in its own lane and publish their state until stopped.
+
+        Lanes run concurrently, so a long OCR batch no longer delays reminders
+        and daily tasks no longer run every cycle. Cross-process exclusion is
+        still the per-task ``cache.add`` lock in ``_run_locked``.
+        """
+        heartbeat_timeout = max(180, interval_seconds * 3)
+        self._check_resume_after_outage(interval_seconds=interval_seconds)
+        listener = JobWakeupListener()
+        listener.start()
+        for lane in lanes:
+            lane.start()
+        logger.info(
+            "Background automation scheduler started: %s",
+            ", ".join(f"{lane.name} ({lane.schedule})" for lane in lanes),
+        )
+        try:
+            while True:
+                self._publish_lane_state(lanes, timeout=heartbeat_timeout)
+                time.sleep(min(HEARTBEAT_PUBLISH_SECONDS, interval_seconds))
+        finally:
+            for lane in lanes:
+                lane.stop()
+            listener.stop()
+
+    def _publish_lane_state(self, lanes: list[_TaskLane], *, timeout: int) -> None:
+        now = timezone.now()
+        stalled = [lane.name for lane in lanes if lane.stalled(now, grace_seconds=timeout)]
+        if stalled:
+            logger.error("Background automation lanes look hung: %s", ", ".join(stalled))
+        failures = sorted({lane.name for lane in lanes if lane.last_succeeded is False}.union(stalled))
+        self._record_heartbeat(timeout=timeout, failures=failures)
+        try:
+            cache.set(TASK_SCHEDULE_CACHE_KEY, {lane.name: lane.snapshot() for lane in lanes}, timeout=timeout)
+        except Exception:
+            logger.warning("Failed to publish background automation task schedule.", exc_info=True)
+        self._record_last_run()
+
+    def _run_backup_lane(self, *, timeout: int) -> bool:
+        # Backup failures alert the admins and retry on the next run; they are
+        # not reported as failed tasks so they never fail readiness.
+        self._maybe_run_daily_backup(timeout=timeout)
+        return True
+
     # --- heartbeat / outage watchdog -------------------------------------
 
     def _record_heartbeat(self, *, timeout: int, failures: list[str]) -> None:
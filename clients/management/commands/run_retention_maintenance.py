@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Callable
 from typing import Any
 
 from django.core.cache import cache
@@ -11,20 +12,25 @@ logger = logging.getLogger(__name__)
 
 EMAIL_LOG_CLEANUP_GUARD_TIMEOUT = 8 * 24 * 60 * 60
 ANONYMIZE_REPORT_GUARD_TIMEOUT = 32 * 24 * 60 * 60
+MEDIA_BLOB_GC_GUARD_TIMEOUT = 8 * 24 * 60 * 60
+CLIENT_ATTENTION_GUARD_TIMEOUT = 2 * 24 * 60 * 60
+CASE_CHECKLIST_GUARD_TIMEOUT = 2 * 24 * 60 * 60
 
 
 class Command(BaseCommand):
     help = (
-        "Run scheduled data-retention maintenance: weekly email payload cleanup "
-        "and a monthly GDPR anonymization report. Safe to invoke daily; internal "
-        "guards keep the actual cadence."
+        "Run scheduled data-retention maintenance: weekly email payload cleanup, "
+        "weekly garbage collection of unreferenced database media blobs, a "
+        "monthly GDPR anonymization report and the nightly client attention "
+        "state and case checklist summary reconciliation. Safe to invoke daily; "
+        "internal guards keep the actual cadence."
     )
 
     def add_arguments(self, parser: Any) -> None:
         parser.add_argument(
             "--force",
             action="store_true",
-            help="Run both maintenance steps immediately, ignoring the cadence guards.",
+            help="Run all maintenance steps immediately, ignoring the cadence guards.",
         )
 
     def handle(self, *args: Any, **options: Any) -> None:
@@ -32,26 +38,83 @@ class Command(BaseCommand):
         now = timezone.localtime()
 
         iso_year, iso_week, _ = now.isocalendar()
-        if self._acquire_guard(f"retention_maintenance:email_logs:{iso_year}-W{iso_week:02d}",
-                               EMAIL_LOG_CLEANUP_GUARD_TIMEOUT, force=force):
-            # Clearing expired email payloads is idempotent and non-destructive
-            # for business data (only bodies/recipients past the retention
-            # window), so it is the one retention step that runs unattended.
-            call_command("cleanup_email_logs", "--execute", "--confirm")
+        # Clearing expired email payloads is idempotent and non-destructive
+        # for business data (only bodies/recipients past the retention
+        # window), so it is the one retention step that runs unattended.
+        if self._run_guarded(
+            f"retention_maintenance:email_logs:{iso_year}-W{iso_week:02d}",
+            EMAIL_LOG_CLEANUP_GUARD_TIMEOUT,
+            force=force,
+            step=lambda: call_command("cleanup_email_logs", "--execute", "--confirm"),
+        ):
             self.stdout.write(self.style.SUCCESS("Weekly email payload cleanup executed."))
         else:
             self.stdout.write("Weekly email payload cleanup already ran for this week; skipped.")
 
-        if self._acquire_guard(f"retention_maintenance:anonymize_report:{now.year}-{now.month:02d}",
-                               ANONYMIZE_REPORT_GUARD_TIMEOUT, force=force):
-            # Anonymization itself stays a manual, human-confirmed action
-            # (--execute --confirm); automation only surfaces the monthly
-            # report of eligible/blocked records in the logs.
-            call_command("anonymize_old_clients")
+        # Deleted and replaced files leave their content-addressed blob
+        # behind until nothing references it; reclaim those bytes here.
+        if self._run_guarded(
+            f"retention_maintenance:media_blob_gc:{iso_year}-W{iso_week:02d}",
+            MEDIA_BLOB_GC_GUARD_TIMEOUT,
+            force=force,
+            step=lambda: call_command("collect_database_media_garbage"),
+        ):
+            self.stdout.write(self.style.SUCCESS("Weekly media blob garbage collection executed."))
+        else:
+            self.stdout.write("Weekly media blob garbage collection already ran for this week; skipped.")
+
+        # Repairs attention rows left stale by writes that bypass signals
+        # and rolls the date-relative expiry keys over to the new day.
+        if self._run_guarded(
+            f"retention_maintenance:client_attention:{now.date().isoformat()}",
+            CLIENT_ATTENTION_GUARD_TIMEOUT,
+            force=force,
+            step=lambda: call_command("reconcile_client_attention"),
+        ):
+            self.stdout.write(self.style.SUCCESS("Nightly client attention reconciliation executed."))
+        else:
+            self.stdout.write("Client attention reconciliation already ran today; skipped.")
+
+        # ZUS RCA months and document expiry move with the calendar, so
+        # every active case's checklist summary is rebuilt once a day.
+        if self._run_guarded(
+            f"retention_maintenance:case_checklists:{now.date().isoformat()}",
+            CASE_CHECKLIST_GUARD_TIMEOUT,
+            force=force,
+            step=lambda: call_command("reconcile_case_checklists"),
+        ):
+            self.stdout.write(self.style.SUCCESS("Nightly case checklist reconciliation executed."))
+        else:
+            self.stdout.write("Case checklist reconciliation already ran today; skipped.")
+
+        # Anonymization itself stays a manual, human-confirmed action
+        # (--execute --confirm); automation only surfaces the monthly
+        # report of eligible/blocked records in the logs.
+        if self._run_guarded(
+            f"retention_maintenance:anonymize_report:{now.year}-{now.month:02d}",
+            ANONYMIZE_REPORT_GUARD_TIMEOUT,
+            force=force,
+            step=lambda: call_command("anonymize_old_clients"),
+        ):
             self.stdout.write(self.style.SUCCESS("Monthly anonymization report executed."))
         else:
             self.stdout.write("Monthly anonymization report already ran for this month; skipped.")
 
+    def _run_guarded(self, cache_key: str, timeout: int, *, force: bool, step: Callable[[], Any]) -> bool:
+        """Run *step* unless its guard is taken; return False when skipped.
+
+        A failing step releases its guard so the next invocation retries it.
+        """
+        if not self._acquire_guard(cache_key, timeout, force=force):
+            return False
+        try:
+            step()
+        except Exception:
+            if not force:
+                cache.delete(cache_key)
+            raise
+        return True
+
     def _acquire_guard(self, cache_key: str, timeout: int, *, force: bool) -> bool:
         if force:
             return True
@@ -114,6 +114,12 @@ class Command(BaseCommand):
                 logger.warning("Daily document reminder cache guard failed; running anyway.", exc_info=True)
 
         logger.info("Starting daily document reminder check for scheduled_time=%02d:%02d.", cache_hour, cache_minute)
-        call_command("update_reminders", *self.UPDATE_REMINDER_ARGS)
+        try:
+            call_command("update_reminders", *self.UPDATE_REMINDER_ARGS)
+        except Exception:
+            # Release the slot so the next check retries it.
+            if not force:
+                cache.delete(cache_key)
+            raise
         self.stdout.write(self.style.SUCCESS("Daily document reminder check completed."))
         return True
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import time
 from collections import defaultdict
 from datetime import timedelta
 from typing import Any, cast
@@ -22,6 +23,7 @@ from clients.services.notifications import (
 from clients.services.tasks import create_auto_task
 from clients.services.workday import FINGERPRINTS_FOLLOWUP_DAYS
 from clients.services.zus import format_zus_months, missing_zus_months
+from legalize_site.metrics import REMINDER_RUN_DURATION, observe
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +59,7 @@ class Command(BaseCommand):
             raise CommandError("--test-data-only can only be used with --only missing-docs")
 
         self.stdout.write(self.style.SUCCESS("--- Starting reminder update ---"))
+        started_at = time.perf_counter()
         if dry_run:
             self.stdout.write(self.style.WARNING("DRY RUN: no reminders or emails will be created."))
 
@@ -108,7 +111,9 @@ class Command(BaseCommand):
                         self.create_fingerprints_followup_tasks()
 
             self.stdout.write(self.style.SUCCESS("--- Reminder update completed ---"))
+            observe(REMINDER_RUN_DURATION, time.perf_counter() - started_at, outcome="completed")
         except Exception as exc:
+            observe(REMINDER_RUN_DURATION, time.perf_counter() - started_at, outcome="failed")
             logger.exception("update_reminders failed")
             self.stdout.write(self.style.ERROR(f"update_reminders failed: {exc}"))
             raise CommandError("update_reminders failed") from exc
@@ -129,6 +134,14 @@ class Command(BaseCommand):
             fingerprints_date__lte=today,
             decision_date__isnull=True,
         ).exclude(client__email="")
+        # A summary refreshed today with nothing missing cannot produce an
+        # e-mail; stale or absent summaries still go through the full check.
+        cases = cases.filter(
+            Q(checklist_summary__isnull=True)
+            | Q(checklist_summary__is_stale=True)
+            | Q(checklist_summary__refreshed_on__lt=today)
+            | Q(checklist_summary__missing_count__gt=0)
+        )
 
         sent_count = 0
         skipped_count = 0
@@ -0,0 +1,49 @@
+# Generated by Django 6.0.7 on 2026-10-19 03:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0128_alter_clientactivity_event_type_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClientExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('client', 'Single client'), ('company', 'Company'), ('selection', 'Selected clients')], default='client', max_length=20, verbose_name='Scope')),
+                ('client_ids', models.JSONField(blank=True, default=list, verbose_name='Client IDs')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed'), ('expired', 'Expired')], default='pending', max_length=20, verbose_name='Status')),
+                ('total_clients', models.PositiveIntegerField(default=0, verbose_name='Total clients')),
+                ('processed_clients', models.PositiveIntegerField(default=0, verbose_name='Processed clients')),
+                ('file_count', models.PositiveIntegerField(default=0, verbose_name='Files in archive')),
+                ('deduplicated_count', models.PositiveIntegerField(default=0, verbose_name='Deduplicated files')),
+                ('archive_name', models.CharField(blank=True, default='', max_length=500, verbose_name='Archive storage name')),
+                ('archive_size', models.BigIntegerField(default=0, verbose_name='Archive size (bytes)')),
+                ('expires_at', models.DateTimeField(blank=True, null=True, verbose_name='Link expires at')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Attempts')),
+                ('max_attempts', models.PositiveIntegerField(default=3, verbose_name='Max attempts')),
+                ('error_message', models.TextField(blank=True, default='', verbose_name='Error message')),
+                ('next_attempt_at', models.DateTimeField(blank=True, null=True, verbose_name='Next attempt at')),
+                ('lease_expires_at', models.DateTimeField(blank=True, null=True, verbose_name='Lease expires at')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Started at')),
+                ('completed_at', models.DateTimeField(blank=True, null=True, verbose_name='Completed at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated at')),
+                ('company', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='export_jobs', to='clients.company', verbose_name='Company')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='client_export_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Created by')),
+            ],
+            options={
+                'verbose_name': 'Client export job',
+                'verbose_name_plural': 'Client export jobs',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='exportjob_ready_idx'), models.Index(fields=['status', 'lease_expires_at'], name='exportjob_lease_idx'), models.Index(fields=['status', 'expires_at'], name='exportjob_expiry_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.7 on 2026-10-19 03:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0129_clientexportjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='documentprocessingjob',
+            name='job_type',
+            field=models.CharField(choices=[('wezwanie_ocr', 'Wezwanie OCR'), ('company_doc_ocr', 'Company Doc OCR'), ('passport_ocr', 'Passport OCR'), ('rental_ocr', 'Rental Agreement OCR'), ('zus_ocr', 'ZUS Documents OCR'), ('insurance_ocr', 'Insurance Policy OCR'), ('image_compression', 'Image compression')], default='wezwanie_ocr', max_length=50, verbose_name='Job type'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 6.0.7 on 2026-10-19 04:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0130_alter_documentprocessingjob_job_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClientAttentionState',
+            fields=[
+                ('client', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='attention_state', serialize=False, to='clients.client', verbose_name='Клиент')),
+                ('legal_stay_deadline', models.DateField(blank=True, db_index=True, null=True)),
+                ('earliest_document_expiry', models.DateField(blank=True, db_index=True, null=True)),
+                ('next_document_expiry', models.DateField(blank=True, db_index=True, null=True)),
+                ('unverified_documents_valid_until', models.DateField(blank=True, db_index=True, null=True)),
+                ('latest_document_uploaded_at', models.DateTimeField(blank=True, null=True)),
+                ('earliest_open_payment_due', models.DateField(blank=True, db_index=True, null=True)),
+                ('earliest_open_task_due', models.DateField(blank=True, db_index=True, null=True)),
+                ('latest_failed_email_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('unnotified_fingerprints_date', models.DateField(blank=True, db_index=True, null=True)),
+                ('has_wezwanie_missing_case', models.BooleanField(db_index=True, default=False)),
+                ('has_new_card_missing_case', models.BooleanField(db_index=True, default=False)),
+                ('has_ocr_review', models.BooleanField(db_index=True, default=False)),
+                ('has_ocr_warning', models.BooleanField(db_index=True, default=False)),
+                ('has_ocr_pending', models.BooleanField(db_index=True, default=False)),
+                ('has_ocr_failed', models.BooleanField(db_index=True, default=False)),
+                ('refreshed_on', models.DateField()),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Состояние внимания клиента',
+                'verbose_name_plural': 'Состояния внимания клиентов',
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.0.7 on 2026-10-19 05:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0131_client_attention_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseChecklistSummary',
+            fields=[
+                ('case', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='checklist_summary', serialize=False, to='clients.case', verbose_name='Дело')),
+                ('purpose', models.CharField(blank=True, default='', max_length=20)),
+                ('missing_items', models.JSONField(blank=True, default=list)),
+                ('missing_count', models.PositiveIntegerField(db_index=True, default=0)),
+                ('required_count', models.PositiveIntegerField(default=0)),
+                ('complete_count', models.PositiveIntegerField(default=0)),
+                ('completion_ratio', models.FloatField(default=1.0)),
+                ('next_due_code', models.CharField(blank=True, default='', max_length=255)),
+                ('next_due_name', models.CharField(blank=True, default='', max_length=255)),
+                ('next_due_date', models.DateField(blank=True, db_index=True, null=True)),
+                ('is_stale', models.BooleanField(db_index=True, default=False)),
+                ('refreshed_on', models.DateField()),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='checklist_summaries', to='clients.client', verbose_name='Клиент')),
+            ],
+            options={
+                'verbose_name': 'Сводка чеклиста дела',
+                'verbose_name_plural': 'Сводки чеклистов дел',
+            },
+        ),
+    ]
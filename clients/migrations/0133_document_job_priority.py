@@ -0,0 +1,24 @@
+# Generated by Django 6.0.7 on 2026-10-19 07:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0132_case_checklist_summary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentprocessingjob',
+            name='priority',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'Staff (interactive)'), (1, 'Client portal'), (2, 'Background')], default=1, verbose_name='Priority'),
+        ),
+        migrations.AddIndex(
+            model_name='documentprocessingjob',
+            index=models.Index(fields=['status', 'priority', 'created_at'], name='docjob_sched_idx'),
+        ),
+    ]
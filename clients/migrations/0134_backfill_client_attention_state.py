@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from django.db import migrations
+
+
+def backfill_client_attention_states(apps, schema_editor):
+    Client = apps.get_model("clients", "Client")
+    if not Client._base_manager.exists():
+        return
+    # The rows are derived from half a dozen tables; reuse the maintenance
+    # routine rather than duplicating its aggregates against historical models.
+    from clients.services.attention_state import reconcile_client_attention_states
+
+    reconcile_client_attention_states(missing_only=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clients", "0133_document_job_priority"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_client_attention_states, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,9 @@
 from .activity import ClientActivity
 from .app_settings import AppSettings
+from .attention import ClientAttentionState
 from .campaign import EmailCampaign
 from .case import Case, CaseArchiveBatch, CaseParticipant, ClientArchiveBatch
+from .checklist import CaseChecklistSummary
 from .client import Client, ClientSearchToken
 from .company import Company
 from .consent import ConsentRecord
@@ -19,6 +21,7 @@ from .document_processing import DocumentProcessingJob
 from .document_version import DocumentVersion
 from .email import EmailLog
 from .employer import CaseEmployerAssignment, EmployerChangeCandidate
+from .export_job import ClientExportJob
 from .family import FamilyGroup
 from .family_mos import ClientFamilyMemberMOS
 from .onboarding import (
@@ -43,14 +46,17 @@ __all__ = [
     'ClientArchiveBatch',
     'CaseArchiveBatch',
     'CaseParticipant',
+    'CaseChecklistSummary',
     'AppSettings',
     'ConsentRecord',
     'ClientActivity',
+    'ClientAttentionState',
     'Company',
     'CaseEmployerAssignment',
     'EmployerChangeCandidate',
     'Document',
     'DocumentProcessingJob',
+    'ClientExportJob',
     'DocumentRequirement',
     'ClientDocumentRequirement',
     'DocumentVersion',
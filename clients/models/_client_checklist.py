@@ -42,16 +42,10 @@ def build_document_checklist(
     else:
         purpose = client.get_document_requirement_purpose()
 
-    if requirements_cache is not None:
-        cache_key = f"{purpose}:{current_language}"
-        if cache_key not in requirements_cache:
-            required_docs = DocumentRequirement.required_for(purpose, current_language)
-            reqs = list(DocumentRequirement.objects.filter(application_purpose=purpose))
-            requirements_cache[cache_key] = (required_docs, reqs)
-        required_docs, reqs = requirements_cache[cache_key]
-    else:
-        required_docs = DocumentRequirement.required_for(purpose, current_language)
-        reqs = list(DocumentRequirement.objects.filter(application_purpose=purpose))
+    # Served from the process-wide catalog cache; ``requirements_cache`` is
+    # accepted for existing callers but no longer needed.
+    required_docs = DocumentRequirement.required_for(purpose, current_language)
+    reqs = DocumentRequirement.records_for(purpose)
 
     prefetched_documents = getattr(client, "_prefetched_objects_cache", {}).get("documents")
 
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from datetime import timedelta
+from collections.abc import Iterable
+from datetime import date, timedelta
 from typing import TYPE_CHECKING, Any, cast
 
+from django.db.models import Count, Max, Prefetch, prefetch_related_objects
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
@@ -19,6 +21,16 @@ RODO_ERASURE_RESPONSE_DAYS = 30
 # Start warning one week before the deadline so there is time to act.
 RODO_ERASURE_WARNING_LEAD_DAYS = 7
 
+HEALTH_STATS_FIELDS = (
+    "health_awaiting_confirmation_count",
+    "health_expired_documents_count",
+    "health_expiring_documents_count",
+    "health_wezwanie_count",
+    "health_appointment_email_sent_count",
+    "health_overdue_payments_count",
+    "health_overdue_tasks_count",
+)
+
 
 def _erasure_deadline_state(client: "Client", today: Any) -> tuple[str, int] | None:
     """Return (severity, days_left) for a pending erasure request, or None.
@@ -55,22 +67,20 @@ def build_health_alerts(client: "Client", document_status_list: list[dict[str, A
         active_case.fingerprints_date if active_case is not None else None
     )
 
-    stats = (
-        cast(Any, client.__class__.objects).filter(pk=client.pk)
-        .with_health_stats(today=today)
-        .values(
-            "health_awaiting_confirmation_count",
-            "health_expired_documents_count",
-            "health_expiring_documents_count",
-            "health_wezwanie_count",
-            "health_appointment_email_sent_count",
-            "health_overdue_payments_count",
-            "health_overdue_tasks_count",
+    # Set by ``preload_health_alerts`` when evaluating a list of clients.
+    preloaded = getattr(client, "_preloaded_health", None)
+    if preloaded is not None:
+        stats = preloaded["stats"]
+    else:
+        stats = (
+            cast(Any, client.__class__.objects).filter(pk=client.pk)
+            .with_health_stats(today=today)
+            .values(*HEALTH_STATS_FIELDS)
+            .get()
         )
-        .get()
-    )
     for key, value in stats.items():
         setattr(client, key, value)
+    prefetched_documents = getattr(client, "_prefetched_objects_cache", {}).get("documents")
 
     # Check legal stay expiration only before submission: once the case is
     # submitted to the urząd the stamp legalises the stay (spec/business rule).
@@ -101,7 +111,12 @@ def build_health_alerts(client: "Client", document_status_list: list[dict[str, A
 
     if getattr(client, "health_awaiting_confirmation_count", 0):
         from django.utils.translation import gettext
-        awaiting_docs = list(client.documents.filter(awaiting_confirmation=True, archived_at__isnull=True))
+        if prefetched_documents is not None:
+            awaiting_docs = [
+                doc for doc in prefetched_documents if doc.awaiting_confirmation and doc.archived_at is None
+            ]
+        else:
+            awaiting_docs = list(client.documents.filter(awaiting_confirmation=True, archived_at__isnull=True))
         actions = []
         for doc in awaiting_docs:
             doc_name = client.get_document_name_by_code(doc.document_type)
@@ -131,7 +146,13 @@ def build_health_alerts(client: "Client", document_status_list: list[dict[str, A
         )
 
     if getattr(client, "health_expired_documents_count", 0):
-        expired_docs = list(client.documents.filter(expiry_date__lt=today, archived_at__isnull=True))
+        if prefetched_documents is not None:
+            expired_docs = [
+                doc for doc in prefetched_documents
+                if doc.expiry_date is not None and doc.expiry_date < today and doc.archived_at is None
+            ]
+        else:
+            expired_docs = list(client.documents.filter(expiry_date__lt=today, archived_at__isnull=True))
         if expired_docs:
             doc_name = client.get_document_name_by_code(expired_docs[0].document_type)
             action_label = _("Запросить документ: %s") % doc_name
@@ -148,7 +169,15 @@ def build_health_alerts(client: "Client", document_status_list: list[dict[str, A
         )
 
     if getattr(client, "health_expiring_documents_count", 0):
-        expiring_docs = list(client.documents.filter(expiry_date__gte=today, expiry_date__lte=today + timedelta(days=7), archived_at__isnull=True))
+        if prefetched_documents is not None:
+            expiring_docs = [
+                doc for doc in prefetched_documents
+                if doc.expiry_date is not None
+                and today <= doc.expiry_date <= today + timedelta(days=7)
+                and doc.archived_at is None
+            ]
+        else:
+            expiring_docs = list(client.documents.filter(expiry_date__gte=today, expiry_date__lte=today + timedelta(days=7), archived_at__isnull=True))
         if expiring_docs:
             doc_name = client.get_document_name_by_code(expiring_docs[0].document_type)
             action_label = _("Запросить документ: %s") % doc_name
@@ -166,7 +195,10 @@ def build_health_alerts(client: "Client", document_status_list: list[dict[str, A
         )
 
     # Rejected documents check
-    rejected_docs = list(client.documents.filter(rejection_reason__isnull=False, archived_at__isnull=True).exclude(rejection_reason=""))
+    if prefetched_documents is not None:
+        rejected_docs = [doc for doc in prefetched_documents if doc.rejection_reason and doc.archived_at is None]
+    else:
+        rejected_docs = list(client.documents.filter(rejection_reason__isnull=False, archived_at__isnull=True).exclude(rejection_reason=""))
     if rejected_docs:
         doc_name = client.get_document_name_by_code(rejected_docs[0].document_type)
         action_label = _("Запросить документ: %s") % doc_name
@@ -183,7 +215,12 @@ def build_health_alerts(client: "Client", document_status_list: list[dict[str, A
     if getattr(client, "health_wezwanie_count", 0) > 0:
         from django.utils.translation import gettext
         wezwanie_types = {DocumentType.WEZWANIE.value, DocumentType.WEZWANIE}
-        wezwanie_docs = list(client.documents.filter(document_type__in=wezwanie_types, archived_at__isnull=True).select_related("case").order_by("-uploaded_at"))
+        if prefetched_documents is not None:
+            wezwanie_docs = [
+                doc for doc in prefetched_documents if doc.document_type in wezwanie_types and doc.archived_at is None
+            ]
+        else:
+            wezwanie_docs = list(client.documents.filter(document_type__in=wezwanie_types, archived_at__isnull=True).select_related("case").order_by("-uploaded_at"))
 
         def _case_unnumbered(case_obj: Any) -> bool:
             # No case on the document → fall back to the client-level number.
@@ -309,7 +346,10 @@ def build_health_alerts(client: "Client", document_status_list: list[dict[str, A
             }
         )
 
-    failed_emails_count = client.email_logs.filter(delivery_status="failed").count()
+    if preloaded is not None:
+        failed_emails_count = preloaded["failed_emails_count"]
+    else:
+        failed_emails_count = client.email_logs.filter(delivery_status="failed").count()
     if failed_emails_count:
         alerts.append(
             {
@@ -388,7 +428,17 @@ def build_health_alerts(client: "Client", document_status_list: list[dict[str, A
             )
 
     if getattr(client, "health_overdue_tasks_count", 0):
-        first_overdue = client.staff_tasks.filter(status__in=["open", "in_progress"], due_date__lt=today).first()
+        prefetched_tasks = getattr(client, "_prefetched_objects_cache", {}).get("staff_tasks")
+        if prefetched_tasks is not None:
+            first_overdue = next(
+                (
+                    task for task in prefetched_tasks
+                    if task.status in {"open", "in_progress"} and task.due_date is not None and task.due_date < today
+                ),
+                None,
+            )
+        else:
+            first_overdue = client.staff_tasks.filter(status__in=["open", "in_progress"], due_date__lt=today).first()
         if first_overdue:
             action_label = _("Выполнить задачу: %s") % first_overdue.title
         else:
@@ -434,8 +484,12 @@ def build_health_alerts(client: "Client", document_status_list: list[dict[str, A
 
     # Check inactivity 30+ days
     if client.get_effective_workflow_stage() not in ["closed", "decision_received"]:
-        latest_act = client.activities.exclude(event_type="client_viewed").order_by("-created_at").first()
-        last_action_date = latest_act.created_at.date() if latest_act else client.created_at.date()
+        if preloaded is not None:
+            last_activity_at = preloaded["last_activity_at"]
+        else:
+            latest_act = client.activities.exclude(event_type="client_viewed").order_by("-created_at").first()
+            last_activity_at = latest_act.created_at if latest_act else None
+        last_action_date = last_activity_at.date() if last_activity_at else client.created_at.date()
         if last_action_date < today - timedelta(days=30):
             alerts.append(
                 {
@@ -452,6 +506,89 @@ def build_health_alerts(client: "Client", document_status_list: list[dict[str, A
 
     return alerts
 
+
+def preload_health_alerts(clients: Iterable["Client"], today: date | None = None) -> None:
+    """Load everything ``build_health_alerts`` reads for *clients* at once.
+
+    Related rows are prefetched onto the instances and the per-client
+    aggregates (health counters, failed e-mails, last activity) are read with
+    one grouped query each, so the number of queries does not depend on the
+    number of clients. ZUS RCA months and family income are still computed
+    per client, only for the clients they apply to.
+    """
+    from clients.models import ClientActivity, Document, EmailLog
+
+    clients = [client for client in clients if client.pk is not None]
+    if not clients:
+        return
+    today = today or timezone.localdate()
+    prefetch_related_objects(
+        clients,
+        Prefetch(
+            "documents",
+            queryset=Document.objects.select_related("case")
+            .annotate(preloaded_version_count=Count("versions"))
+            .order_by("-uploaded_at"),
+        ),
+        "cases",
+        "mos_applications",
+        "custom_document_requirements",
+        "staff_tasks",
+        "wniosek_submissions__confirmed_by",
+        "wniosek_submissions__attachments",
+        "wniosek_submissions__proof_documents",
+        "family_group",
+        "sponsor_client__family_group",
+    )
+    client_ids = [client.pk for client in clients]
+    model = clients[0].__class__
+    stats_by_client = {
+        row.pop("pk"): row
+        for row in cast(Any, model.objects).filter(pk__in=client_ids)
+        .with_health_stats(today=today)
+        .values("pk", *HEALTH_STATS_FIELDS)
+    }
+    failed_emails = dict(
+        EmailLog.objects.filter(client_id__in=client_ids, delivery_status="failed")
+        .values("client_id")
+        .annotate(failed=Count("pk"))
+        .values_list("client_id", "failed")
+    )
+    last_activity = dict(
+        ClientActivity.objects.filter(client_id__in=client_ids)
+        .exclude(event_type="client_viewed")
+        .values("client_id")
+        .annotate(last=Max("created_at"))
+        .values_list("client_id", "last")
+    )
+    for client in clients:
+        stats = stats_by_client.get(client.pk)
+        if stats is None:
+            # Not visible through the default manager (archived): leave it to
+            # the single-client path, which behaves as before.
+            continue
+        setattr(
+            client,
+            "_preloaded_health",
+            {
+                "stats": stats,
+                "failed_emails_count": failed_emails.get(client.pk, 0),
+                "last_activity_at": last_activity.get(client.pk),
+            },
+        )
+
+
+def build_health_alerts_bulk(clients: Iterable["Client"]) -> dict[int, list[dict[str, Any]]]:
+    """Health alerts for many clients, keyed by client pk.
+
+    Equivalent to calling ``build_health_alerts`` for each client, but the
+    related data is loaded up front by ``preload_health_alerts``.
+    """
+    clients = list(clients)
+    preload_health_alerts(clients)
+    return {client.pk: build_health_alerts(client) for client in clients}
+
+
 def build_automatic_checks(client: "Client", document_status_list: list[dict[str, Any]] | None = None) -> list[dict[str, Any]]:
     today = timezone.localdate()
     # Read the case number and fingerprints date from the single active case
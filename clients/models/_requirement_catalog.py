@@ -0,0 +1,91 @@
+"""Process-wide cache of the DocumentRequirement catalog.
+
+Every checklist build needs the requirement rows of one purpose and their
+labels in one language. The rows change only when staff edit a checklist, so
+each worker keeps them in memory and revalidates against a version token in
+the shared Django cache: one cache read per lookup instead of a catalog query.
+
+Edits bump the token from the ``DocumentRequirement`` signal receivers (once
+immediately, for reads inside the editing transaction, and again on commit,
+so other workers cannot cache the pre-commit rows under the new token).
+Entries also expire after ``CATALOG_LOCAL_TTL_SECONDS`` so label changes made
+through translation overrides propagate without a catalog edit.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Hashable
+from typing import Any, TypeVar
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION_CACHE_KEY = "document_requirements:catalog_version"
+CATALOG_LOCAL_TTL_SECONDS = 300
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+_version: str | None = None
+_entries: dict[Hashable, tuple[float, Any]] = {}
+
+
+def _current_version() -> str:
+    version = cache.get(CATALOG_VERSION_CACHE_KEY)
+    if version is None:
+        # First use or evicted/cleared cache: any fresh token invalidates
+        # whatever the workers hold.
+        version = uuid4().hex
+        if not cache.add(CATALOG_VERSION_CACHE_KEY, version, timeout=None):
+            version = cache.get(CATALOG_VERSION_CACHE_KEY) or version
+    return str(version)
+
+
+def cached_catalog(key: Hashable, build: Callable[[], T]) -> T:
+    """Return the cached value for *key*, building it with *build* when stale."""
+    global _version
+    try:
+        version = _current_version()
+    except Exception:
+        logger.warning("Document requirement catalog version unavailable; loading uncached")
+        return build()
+    now = time.monotonic()
+    with _lock:
+        if _version != version:
+            _entries.clear()
+            _version = version
+        entry = _entries.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+    value = build()
+    with _lock:
+        if _version == version:
+            _entries[key] = (now + CATALOG_LOCAL_TTL_SECONDS, value)
+    return value
+
+
+def _bump() -> None:
+    try:
+        cache.set(CATALOG_VERSION_CACHE_KEY, uuid4().hex, timeout=None)
+    except Exception:
+        logger.warning("Failed to bump document requirement catalog version")
+    reset_local_catalog()
+
+
+def invalidate_catalog() -> None:
+    """Invalidate the catalog in every worker after a requirement edit."""
+    _bump()
+    transaction.on_commit(_bump)
+
+
+def reset_local_catalog() -> None:
+    """Drop this worker's entries (tests use it after rolled-back edits)."""
+    global _version
+    with _lock:
+        _entries.clear()
+        _version = None
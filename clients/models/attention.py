@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class ClientAttentionState(models.Model):
+    """Denormalized per-client inputs of the client-list attention filters.
+
+    One row per client, written by ``clients.services.attention_state`` from
+    the signal receivers in ``clients.signals`` and repaired nightly by the
+    ``reconcile_client_attention`` command. The attention and OCR filters of
+    the client list and the navbar badges read this table instead of joining
+    documents/payments/tasks/e-mails/cases with ``DISTINCT``.
+
+    Date columns are stored independently of "today" wherever possible (the
+    earliest open payment due date rather than an "overdue" flag), so a row
+    stays correct as days pass. ``next_document_expiry`` is the one key that
+    is relative to ``refreshed_on`` and is rolled forward by the reconciler.
+    """
+
+    client = models.OneToOneField(
+        "clients.Client",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="attention_state",
+        verbose_name=_("Клиент"),
+    )
+    legal_stay_deadline = models.DateField(null=True, blank=True, db_index=True)
+    earliest_document_expiry = models.DateField(null=True, blank=True, db_index=True)
+    next_document_expiry = models.DateField(null=True, blank=True, db_index=True)
+    # Latest expiry among unverified, unrejected documents; undated ones count
+    # as never expiring (date.max).
+    unverified_documents_valid_until = models.DateField(null=True, blank=True, db_index=True)
+    latest_document_uploaded_at = models.DateTimeField(null=True, blank=True)
+    earliest_open_payment_due = models.DateField(null=True, blank=True, db_index=True)
+    earliest_open_task_due = models.DateField(null=True, blank=True, db_index=True)
+    latest_failed_email_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    unnotified_fingerprints_date = models.DateField(null=True, blank=True, db_index=True)
+    has_wezwanie_missing_case = models.BooleanField(default=False, db_index=True)
+    has_new_card_missing_case = models.BooleanField(default=False, db_index=True)
+    has_ocr_review = models.BooleanField(default=False, db_index=True)
+    has_ocr_warning = models.BooleanField(default=False, db_index=True)
+    has_ocr_pending = models.BooleanField(default=False, db_index=True)
+    has_ocr_failed = models.BooleanField(default=False, db_index=True)
+    refreshed_on = models.DateField()
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Состояние внимания клиента")
+        verbose_name_plural = _("Состояния внимания клиентов")
+
+    def __str__(self) -> str:
+        return f"ClientAttentionState(client_id={self.client_id})"
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class CaseChecklistSummary(models.Model):
+    """Persisted completion summary of one case's document checklist.
+
+    Written by ``clients.services.checklist_summary`` whenever a document,
+    custom requirement, Wniosek submission or the case itself changes, and
+    rebuilt nightly because ZUS RCA months and document expiry depend on the
+    date. The workday queue, the admin panel counters and the missing-document
+    e-mail run read this table instead of building every checklist on request.
+
+    ``missing_items`` keeps the incomplete rows in checklist order as
+    ``{"code": ..., "name": ...}``. ``name`` is only stored for custom
+    requirements; catalog labels are resolved in the reader's language.
+    """
+
+    case = models.OneToOneField(
+        "clients.Case",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="checklist_summary",
+        verbose_name=_("Дело"),
+    )
+    client = models.ForeignKey(
+        "clients.Client",
+        on_delete=models.CASCADE,
+        related_name="checklist_summaries",
+        verbose_name=_("Клиент"),
+    )
+    purpose = models.CharField(max_length=20, blank=True, default="")
+    missing_items = models.JSONField(default=list, blank=True)
+    missing_count = models.PositiveIntegerField(default=0, db_index=True)
+    required_count = models.PositiveIntegerField(default=0)
+    complete_count = models.PositiveIntegerField(default=0)
+    completion_ratio = models.FloatField(default=1.0)
+    next_due_code = models.CharField(max_length=255, blank=True, default="")
+    next_due_name = models.CharField(max_length=255, blank=True, default="")
+    next_due_date = models.DateField(null=True, blank=True, db_index=True)
+    # Set when the purpose's requirement catalog changed; the automation loop
+    # recomputes stale rows on its next cycle.
+    is_stale = models.BooleanField(default=False, db_index=True)
+    refreshed_on = models.DateField()
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Сводка чеклиста дела")
+        verbose_name_plural = _("Сводки чеклистов дел")
+
+    def __str__(self) -> str:
+        return f"CaseChecklistSummary(case_id={self.case_id}, missing={self.missing_count})"
+
+    @property
+    def missing_codes(self) -> list[str]:
+        return [str(item.get("code") or "") for item in self.missing_items]
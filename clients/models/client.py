@@ -3,7 +3,9 @@ from __future__ import annotations
 import hashlib
 import hmac
 import logging
+import math
 import re
+import unicodedata
 from datetime import date, timedelta
 from functools import cached_property
 from typing import TYPE_CHECKING, Any, Self, cast
@@ -11,7 +13,9 @@ from typing import TYPE_CHECKING, Any, Self, cast
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.db import models, transaction
-from django.db.models import Count, Q
+from django.db.models import Case as CaseExpr
+from django.db.models import Count, IntegerField, Max, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
 from django.urls import reverse
 from django.utils import timezone, translation
 from django.utils.translation import gettext_lazy as _
@@ -89,6 +93,55 @@ class ClientQuerySet(SoftDeleteQuerySet):
             ),
         )
 
+    def with_search_rank(self, query: str | None) -> Self:
+        """Annotate ``search_rank``: how well the name tokens match *query*.
+
+        A whole query word matching a name prefix counts
+        ``Client.NAME_PREFIX_RANK_WEIGHT``; every shared trigram counts one,
+        so exact words rank first and typo matches by overlap. Computed in
+        SQL from the ClientSearchToken index; no names are decrypted.
+        """
+        model = cast(Any, self.model)
+        words = model.name_query_words(query)
+        prefix_hashes: set[str] = set()
+        for word in words:
+            prefix_hashes |= model.name_query_word_hashes(word)
+        trigram_hashes = model.name_query_trigram_hashes(words)
+        if not prefix_hashes and not trigram_hashes:
+            return self.annotate(search_rank=Value(0, output_field=IntegerField()))
+        score = (
+            ClientSearchToken.objects.filter(client_id=OuterRef("pk"), token_hash__in=prefix_hashes | trigram_hashes)
+            .order_by()
+            .values("client_id")
+            .annotate(
+                score=Sum(
+                    CaseExpr(
+                        When(token_hash__in=prefix_hashes, then=Value(model.NAME_PREFIX_RANK_WEIGHT)),
+                        default=Value(1),
+                        output_field=IntegerField(),
+                    )
+                )
+            )
+            .values("score")[:1]
+        )
+        return self.annotate(
+            search_rank=Coalesce(Subquery(score, output_field=IntegerField()), Value(0), output_field=IntegerField())
+        )
+
+
+# Transliteration applied on top of NFKD accent stripping, so "ł"/"l",
+# "й"/"i" and Cyrillic/Latin spellings of the same name share search tokens.
+_NAME_FOLD_TABLE = str.maketrans(
+    {
+        "ł": "l", "ø": "o", "đ": "d", "ß": "ss", "æ": "ae", "œ": "oe",
+        "а": "a", "б": "b", "в": "v", "г": "g", "ґ": "g", "д": "d", "е": "e", "є": "e",
+        "ж": "zh", "з": "z", "и": "i", "і": "i", "ї": "i", "й": "i", "к": "k", "л": "l",
+        "м": "m", "н": "n", "о": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u",
+        "ф": "f", "х": "kh", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "shch", "ъ": "",
+        "ы": "y", "ь": "", "э": "e", "ю": "yu", "я": "ya",
+    }
+)
+
 
 # Process fields that used to live on Client now live on the Case (spec §4).
 # Creation calls that still pass them are routed to the client's primary case so
@@ -410,6 +463,13 @@ class Client(SoftDeleteModel):
             "application_submitted", "fingerprints",
             "waiting_decision", "decision_received", "closed",
         ]
+        prefetched = getattr(self, "_prefetched_objects_cache", {}).get("cases")
+        if prefetched is not None:
+            return any(
+                case.archived_at is None
+                and (case.submission_date is not None or case.workflow_stage in submitted_stages)
+                for case in prefetched
+            )
         return self.cases.filter(
             Q(submission_date__isnull=False) | Q(workflow_stage__in=submitted_stages),
             archived_at__isnull=True,
@@ -551,6 +611,10 @@ class Client(SoftDeleteModel):
 
     # --- searchable-encryption helpers (blind indexes + name prefix tokens) ---
     NAME_TOKEN_MIN_PREFIX = 3
+    NAME_TRIGRAM_SIZE = 3
+    # Share of the query's trigrams a name must contain to match fuzzily.
+    NAME_TRIGRAM_MIN_SIMILARITY = 0.6
+    NAME_PREFIX_RANK_WEIGHT = 10
 
     @staticmethod
     def normalize_email(value: str | None) -> str:
@@ -582,83 +646,182 @@ class Client(SoftDeleteModel):
     def hash_name_token(cls, token: str) -> str:
         return cls._blind_hash("name", token)
 
+    @classmethod
+    def hash_name_trigram(cls, trigram: str) -> str:
+        return cls._blind_hash("name_trigram", trigram)
+
+    @staticmethod
+    def fold_name_word(word: str) -> str:
+        """Lowercase ASCII spelling of a name word: no accents, Latin script."""
+        decomposed = unicodedata.normalize("NFKD", word.casefold().translate(_NAME_FOLD_TABLE))
+        return "".join(char for char in decomposed if not unicodedata.combining(char)).translate(_NAME_FOLD_TABLE)
+
+    @classmethod
+    def name_trigrams(cls, word: str) -> set[str]:
+        size = cls.NAME_TRIGRAM_SIZE
+        return {word[start:start + size] for start in range(len(word) - size + 1)}
+
     @classmethod
     def name_prefix_tokens(cls, *names: str | None) -> set[str]:
         """Prefix tokens (len >= NAME_TOKEN_MIN_PREFIX) for each name word.
 
         Indexing every prefix of every word lets a "starts-with" query of three
         or more characters match without decrypting; a whole short word (< 3
-        chars) is indexed verbatim so rare short names stay findable.
+        chars) is indexed verbatim so rare short names stay findable. Words
+        are indexed as written and in their folded spelling
+        (``fold_name_word``), so "Łukasz" is found by "lukasz".
         """
         tokens: set[str] = set()
         for name in names:
             for word in re.split(r"\s+", (name or "").strip().casefold()):
                 if not word:
                     continue
-                if len(word) < cls.NAME_TOKEN_MIN_PREFIX:
-                    tokens.add(word)
-                    continue
-                for end in range(cls.NAME_TOKEN_MIN_PREFIX, len(word) + 1):
-                    tokens.add(word[:end])
+                for variant in {word, cls.fold_name_word(word)}:
+                    if len(variant) < cls.NAME_TOKEN_MIN_PREFIX:
+                        tokens.add(variant)
+                        continue
+                    for end in range(cls.NAME_TOKEN_MIN_PREFIX, len(variant) + 1):
+                        tokens.add(variant[:end])
         return tokens
 
+    @classmethod
+    def name_search_token_hashes(cls, *names: str | None) -> set[str]:
+        """Every ClientSearchToken hash of a client with these names.
+
+        Prefix tokens serve "starts-with" queries; trigrams of the folded
+        words serve substring and typo-tolerant queries (``walcz`` finds
+        "Kowalczyk"). Both live in the same table under separate HMAC
+        namespaces.
+        """
+        hashes = {cls.hash_name_token(token) for token in cls.name_prefix_tokens(*names)}
+        for name in names:
+            for word in cls.name_query_words(name):
+                hashes |= {cls.hash_name_trigram(trigram) for trigram in cls.name_trigrams(cls.fold_name_word(word))}
+        return hashes
+
     @classmethod
     def name_query_words(cls, query: str | None) -> list[str]:
         return [word for word in re.split(r"\s+", (query or "").strip().casefold()) if word]
 
+    @classmethod
+    def name_query_word_hashes(cls, word: str) -> set[str]:
+        """Prefix-token hashes one query word may match (as typed or folded)."""
+        return {cls.hash_name_token(word), cls.hash_name_token(cls.fold_name_word(word))}
+
+    @classmethod
+    def name_query_trigram_hashes(cls, words: list[str]) -> set[str]:
+        trigrams: set[str] = set()
+        for word in words:
+            trigrams |= cls.name_trigrams(cls.fold_name_word(word))
+        return {cls.hash_name_trigram(trigram) for trigram in trigrams}
+
     @classmethod
     def build_search_filter(cls, query: str | None) -> Q:
-        """Q matching clients by encrypted name (word/prefix), email, phone or case number.
+        """Q matching clients by encrypted name (word/prefix/substring), email, phone or case number.
 
         Name words are AND-combined through the ClientSearchToken prefix index
-        (all words must match), then OR-ed with exact blind-index matches on
-        email/phone and the case-number hash — the searchable-encryption
-        replacement for the old plaintext ``icontains`` query.
+        (all words must match), OR-ed with the trigram index (at least
+        ``NAME_TRIGRAM_MIN_SIMILARITY`` of the query's trigrams present, which
+        covers substrings and typos), then OR-ed with exact blind-index matches
+        on email/phone and the case-number hash — the searchable-encryption
+        replacement for the old plaintext ``icontains`` query. Archived
+        clients are left to the outer queryset's manager. Order the result
+        with ``ClientQuerySet.with_search_rank``.
         """
         query = (query or "").strip()
         if not query:
             return Q(pk__in=[])
 
-        combined = Q()
-        matched_any = False
+        from .case import Case
 
+        # Every alternative is an indexed lookup returning client ids; their
+        # UNION feeds a single "pk IN", so the database never scans the
+        # client table (an OR of joins/columns would).
+        candidates: list[Any] = []
         words = cls.name_query_words(query)
         if words:
-            name_qs = cls.objects.all()
-            for word in words:
-                name_qs = name_qs.filter(search_tokens__token_hash=cls.hash_name_token(word))
-            combined |= Q(pk__in=name_qs.values("pk"))
-            matched_any = True
+            word_hashes = [cls.name_query_word_hashes(word) for word in words]
+            candidates.append(
+                ClientSearchToken.objects.filter(token_hash__in=set().union(*word_hashes))
+                .order_by()
+                .values("client_id")
+                .annotate(
+                    **{
+                        f"word_{index}": Max(
+                            CaseExpr(When(token_hash__in=hashes, then=Value(1)), default=Value(0))
+                        )
+                        for index, hashes in enumerate(word_hashes)
+                    }
+                )
+                .filter(**{f"word_{index}": 1 for index in range(len(word_hashes))})
+                .values("client_id")
+            )
+
+            trigram_hashes = cls.name_query_trigram_hashes(words)
+            if trigram_hashes:
+                min_overlap = math.ceil(len(trigram_hashes) * cls.NAME_TRIGRAM_MIN_SIMILARITY)
+                candidates.append(
+                    ClientSearchToken.objects.filter(token_hash__in=trigram_hashes)
+                    .order_by()
+                    .values("client_id")
+                    .annotate(overlap=Count("pk"))
+                    .filter(overlap__gte=min_overlap)
+                    .values("client_id")
+                )
 
         email_hash = cls.hash_email(query)
         if email_hash:
-            combined |= Q(email_hash=email_hash)
-            matched_any = True
+            candidates.append(cls._base_manager.filter(email_hash=email_hash).order_by().values("pk"))
 
         phone_hash = cls.hash_phone(query)
         if phone_hash:
-            combined |= Q(phone_hash=phone_hash)
-            matched_any = True
-
-        combined |= Q(cases__authority_case_number_hash=cls.hash_case_number(query))
+            candidates.append(cls._base_manager.filter(phone_hash=phone_hash).order_by().values("pk"))
 
-        return combined if matched_any or query else Q(pk__in=[])
+        # The default manager keeps archived and soft-deleted cases out.
+        candidates.append(
+            Case.objects.filter(authority_case_number_hash=cls.hash_case_number(query))
+            .order_by()
+            .values("client_id")
+        )
+        first, *rest = candidates
+        return Q(pk__in=first.union(*rest) if rest else first)
 
     def rebuild_search_tokens(self) -> None:
         """Sync this client's ClientSearchToken rows with its current name."""
-        if not self.pk:
-            return
-        desired = {self.hash_name_token(token) for token in self.name_prefix_tokens(self.first_name, self.last_name)}
-        existing = set(self.search_tokens.values_list("token_hash", flat=True))
-        stale = existing - desired
-        if stale:
-            self.search_tokens.filter(token_hash__in=stale).delete()
-        missing = desired - existing
+        if self.pk:
+            type(self).rebuild_search_tokens_bulk([self])
+
+    @classmethod
+    def rebuild_search_tokens_bulk(cls, clients: list["Client"]) -> tuple[int, int]:
+        """Sync the ClientSearchToken rows of *clients* in three queries.
+
+        Returns ``(created, deleted)`` token counts.
+        """
+        desired = {
+            client.pk: cls.name_search_token_hashes(client.first_name, client.last_name)
+            for client in clients
+            if client.pk
+        }
+        if not desired:
+            return 0, 0
+        stale_ids: list[int] = []
+        existing: dict[int, set[str]] = {client_id: set() for client_id in desired}
+        for token_id, client_id, token_hash in ClientSearchToken.objects.filter(client_id__in=desired).values_list(
+            "pk", "client_id", "token_hash"
+        ):
+            existing[client_id].add(token_hash)
+            if token_hash not in desired[client_id]:
+                stale_ids.append(token_id)
+        if stale_ids:
+            ClientSearchToken.objects.filter(pk__in=stale_ids).delete()
+        missing = [
+            ClientSearchToken(client_id=client_id, token_hash=token_hash)
+            for client_id, hashes in desired.items()
+            for token_hash in hashes - existing[client_id]
+        ]
         if missing:
-            ClientSearchToken.objects.bulk_create(
-                [ClientSearchToken(client=self, token_hash=token_hash) for token_hash in missing],
-                ignore_conflicts=True,
-            )
+            ClientSearchToken.objects.bulk_create(missing, batch_size=1000, ignore_conflicts=True)
+        return len(missing), len(stale_ids)
 
     def save(self, *args: Any, **kwargs: Any) -> None:
         update_fields = kwargs.get("update_fields")
@@ -795,7 +958,12 @@ class Client(SoftDeleteModel):
 
     def get_document_name_by_code(self, doc_code: str) -> str:
         from .document import DocumentRequirement, get_available_document_types, resolve_document_label
-        custom = self.custom_document_requirements.filter(document_type=doc_code).order_by("-is_active", "-id").first()
+        prefetched = getattr(self, "_prefetched_objects_cache", {}).get("custom_document_requirements")
+        if prefetched is not None:
+            matching = [requirement for requirement in prefetched if requirement.document_type == doc_code]
+            custom = max(matching, key=lambda requirement: (requirement.is_active, requirement.pk), default=None)
+        else:
+            custom = self.custom_document_requirements.filter(document_type=doc_code).order_by("-is_active", "-id").first()
         if custom:
             return custom.name
 
@@ -850,7 +1018,14 @@ class Client(SoftDeleteModel):
         case = self.active_case
         if case is None:
             return None
-        mos_application_data = self.mos_applications.filter(case=case).first()
+        prefetched = getattr(self, "_prefetched_objects_cache", {}).get("mos_applications")
+        if prefetched is not None:
+            # Same record as the unordered .first() below, which orders by pk.
+            mos_application_data = min(
+                (item for item in prefetched if item.case_id == case.pk), key=lambda item: item.pk, default=None
+            )
+        else:
+            mos_application_data = self.mos_applications.filter(case=case).first()
         if not mos_application_data:
             return None
         return mos_application_data.legal_stay_until
@@ -929,12 +1104,14 @@ class Client(SoftDeleteModel):
 
 
 class ClientSearchToken(models.Model):
-    """Keyed prefix-token index for searching encrypted client names.
+    """Keyed token index for searching encrypted client names.
 
     Each row is an HMAC of one lowercase name prefix (see
-    ``Client.name_prefix_tokens``). Searching hashes the query word and matches
-    ``token_hash`` exactly, so staff can find clients by a name word or its
-    beginning without the plaintext ever leaving the encrypted column.
+    ``Client.name_prefix_tokens``) or of one trigram of a folded name word
+    (``Client.name_search_token_hashes``). Searching hashes the query the same
+    way and matches ``token_hash`` exactly, so staff can find clients by a
+    name word, its beginning or a fragment without the plaintext ever leaving
+    the encrypted column.
     """
 
     client = models.ForeignKey(
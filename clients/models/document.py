@@ -13,6 +13,7 @@ from django.utils import translation
 from django.utils.translation import gettext_lazy as _
 
 from clients.constants import DOCUMENT_CHECKLIST, DocumentType
+from clients.models._requirement_catalog import cached_catalog
 from clients.models.consistency import assert_case_client_consistent
 from clients.validators import validate_uploaded_document
 from fernet_fields import EncryptedJSONField
@@ -140,10 +141,10 @@ def get_fallback_document_checklist(purpose: str, language: str | None = None) -
 
 def get_available_document_types(purpose: str | None = None) -> set[str]:
     types = set(DOCUMENT_TYPE_VALUES)
-    queryset = DocumentRequirement.objects.all()
     if purpose:
-        queryset = queryset.filter(application_purpose=purpose)
-    types.update(queryset.values_list("document_type", flat=True))
+        types.update(requirement.document_type for requirement in DocumentRequirement.records_for(purpose))
+    else:
+        types.update(DocumentRequirement.objects.values_list("document_type", flat=True))
     return types
 
 
@@ -300,6 +301,8 @@ class Document(SoftDeleteModel):
 
     def on_archive(self) -> None:
         from clients.models.client import Client
+        from clients.services.attention_state import refresh_client_attention_state
+        from clients.services.checklist_summary import refresh_case_checklist_summary
         from clients.services.onboarding_purposes import clear_onboarding_notifications_cache
         if self.client_id:
             try:
@@ -308,9 +311,16 @@ class Document(SoftDeleteModel):
                     clear_onboarding_notifications_cache(client)
             except Exception:
                 logger.warning("Failed to clear onboarding notifications cache on document archive")
+            # archive() writes archived_at with .update(), bypassing the
+            # post_save receivers that keep ClientAttentionState and
+            # CaseChecklistSummary current.
+            refresh_client_attention_state(self.client_id)
+            refresh_case_checklist_summary(self.case_id)
 
     def on_restore(self) -> None:
         from clients.models.client import Client
+        from clients.services.attention_state import refresh_client_attention_state
+        from clients.services.checklist_summary import refresh_case_checklist_summary
         from clients.services.onboarding_purposes import clear_onboarding_notifications_cache
         if self.client_id:
             try:
@@ -319,6 +329,8 @@ class Document(SoftDeleteModel):
                     clear_onboarding_notifications_cache(client)
             except Exception:
                 logger.warning("Failed to clear onboarding notifications cache on document restore")
+            refresh_client_attention_state(self.client_id)
+            refresh_case_checklist_summary(self.case_id)
 
     @property
     def display_name(self) -> str:
@@ -360,7 +372,7 @@ class Document(SoftDeleteModel):
         if requirement_map is None:
             requirement_map = {
                 requirement.document_type: requirement
-                for requirement in DocumentRequirement.objects.filter(application_purpose=purpose)
+                for requirement in DocumentRequirement.records_for(purpose)
             }
             cache[purpose] = requirement_map
         return requirement_map.get(self.document_type)
@@ -459,6 +471,14 @@ class DocumentRequirement(models.Model):
     def __str__(self) -> str:
         return f"{self.application_purpose}: {self.custom_name or self.document_type}"
 
+    @classmethod
+    def records_for(cls, purpose: str) -> list[DocumentRequirement]:
+        """Requirement rows of *purpose*, served from the process-wide catalog cache."""
+        return cached_catalog(
+            ("records", purpose),
+            lambda: list(cls.objects.filter(application_purpose=purpose).order_by("position", "id")),
+        )
+
     @classmethod
     def catalog_for(
         cls,
@@ -468,7 +488,16 @@ class DocumentRequirement(models.Model):
         include_optional: bool = True,
         include_fallback: bool = True,
     ) -> list[dict[str, Any]]:
-        records = list(cls.objects.filter(application_purpose=purpose).order_by("position", "id"))
+        items = cached_catalog(
+            ("catalog", purpose, language or translation.get_language(), include_fallback),
+            lambda: cls._build_catalog(purpose, language, include_fallback=include_fallback),
+        )
+        # Callers get their own dicts; the cached list is shared by the worker.
+        return [dict(item) for item in items if include_optional or item["is_required"]]
+
+    @classmethod
+    def _build_catalog(cls, purpose: str, language: str | None, *, include_fallback: bool) -> list[dict[str, Any]]:
+        records = cls.records_for(purpose)
         items: list[dict[str, Any]] = []
         seen: set[str] = set()
 
@@ -499,9 +528,6 @@ class DocumentRequirement(models.Model):
                     "label": resolve_document_label(code, language=language),
                     "is_required": True,
                 })
-
-        if not include_optional:
-            items = [item for item in items if item["is_required"]]
         return items
 
     @classmethod
@@ -15,6 +15,7 @@ class DocumentProcessingJob(models.Model):
     JOB_TYPE_RENTAL_OCR = "rental_ocr"
     JOB_TYPE_ZUS_OCR = "zus_ocr"
     JOB_TYPE_INSURANCE_OCR = "insurance_ocr"
+    JOB_TYPE_IMAGE_COMPRESSION = "image_compression"
 
     STATUS_PENDING = "pending"
     STATUS_PROCESSING = "processing"
@@ -28,6 +29,18 @@ class DocumentProcessingJob(models.Model):
         (JOB_TYPE_RENTAL_OCR, _("Rental Agreement OCR")),
         (JOB_TYPE_ZUS_OCR, _("ZUS Documents OCR")),
         (JOB_TYPE_INSURANCE_OCR, _("Insurance Policy OCR")),
+        (JOB_TYPE_IMAGE_COMPRESSION, _("Image compression")),
+    ]
+    # Scheduling classes, lowest first: staff waiting on the result, then
+    # client portal uploads, then background work nobody is waiting for.
+    PRIORITY_INTERACTIVE = 0
+    PRIORITY_PORTAL = 1
+    PRIORITY_BACKFILL = 2
+
+    PRIORITY_CHOICES = [
+        (PRIORITY_INTERACTIVE, _("Staff (interactive)")),
+        (PRIORITY_PORTAL, _("Client portal")),
+        (PRIORITY_BACKFILL, _("Background")),
     ]
     STATUS_CHOICES = [
         (STATUS_PENDING, _("Pending")),
@@ -70,6 +83,11 @@ class DocumentProcessingJob(models.Model):
         default=STATUS_PENDING,
         verbose_name=_("Status"),
     )
+    priority = models.PositiveSmallIntegerField(
+        choices=PRIORITY_CHOICES,
+        default=PRIORITY_PORTAL,
+        verbose_name=_("Priority"),
+    )
     source_file_name = models.CharField(
         max_length=500,
         blank=True,
@@ -95,6 +113,7 @@ class DocumentProcessingJob(models.Model):
             models.Index(fields=["job_type", "status", "next_attempt_at"], name="docjob_ready_idx"),
             models.Index(fields=["case", "status"], name="docjob_case_status_idx"),
             models.Index(fields=["status", "lease_expires_at"], name="docjob_lease_idx"),
+            models.Index(fields=["status", "priority", "created_at"], name="docjob_sched_idx"),
         ]
         verbose_name = _("Document processing job")
         verbose_name_plural = _("Document processing jobs")
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class ClientExportJob(models.Model):
+    """Background ZIP export of one or many clients.
+
+    Mirrors the lease/attempt bookkeeping of ``DocumentProcessingJob`` so a
+    worker that dies mid-archive is reclaimed and retried instead of leaving
+    the job stuck in ``processing``.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_PROCESSING = "processing"
+    STATUS_COMPLETED = "completed"
+    STATUS_FAILED = "failed"
+    STATUS_EXPIRED = "expired"
+
+    SCOPE_CLIENT = "client"
+    SCOPE_COMPANY = "company"
+    SCOPE_SELECTION = "selection"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, _("Pending")),
+        (STATUS_PROCESSING, _("Processing")),
+        (STATUS_COMPLETED, _("Completed")),
+        (STATUS_FAILED, _("Failed")),
+        (STATUS_EXPIRED, _("Expired")),
+    ]
+    SCOPE_CHOICES = [
+        (SCOPE_CLIENT, _("Single client")),
+        (SCOPE_COMPANY, _("Company")),
+        (SCOPE_SELECTION, _("Selected clients")),
+    ]
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="client_export_jobs",
+        verbose_name=_("Created by"),
+    )
+    scope = models.CharField(
+        max_length=20,
+        choices=SCOPE_CHOICES,
+        default=SCOPE_CLIENT,
+        verbose_name=_("Scope"),
+    )
+    company = models.ForeignKey(
+        "clients.Company",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="export_jobs",
+        verbose_name=_("Company"),
+    )
+    client_ids: models.JSONField[list[int]] = models.JSONField(default=list, blank=True, verbose_name=_("Client IDs"))
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+        verbose_name=_("Status"),
+    )
+    total_clients = models.PositiveIntegerField(default=0, verbose_name=_("Total clients"))
+    processed_clients = models.PositiveIntegerField(default=0, verbose_name=_("Processed clients"))
+    file_count = models.PositiveIntegerField(default=0, verbose_name=_("Files in archive"))
+    deduplicated_count = models.PositiveIntegerField(default=0, verbose_name=_("Deduplicated files"))
+    archive_name = models.CharField(max_length=500, blank=True, default="", verbose_name=_("Archive storage name"))
+    archive_size = models.BigIntegerField(default=0, verbose_name=_("Archive size (bytes)"))
+    expires_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Link expires at"))
+    attempts = models.PositiveIntegerField(default=0, verbose_name=_("Attempts"))
+    max_attempts = models.PositiveIntegerField(default=3, verbose_name=_("Max attempts"))
+    error_message = models.TextField(blank=True, default="", verbose_name=_("Error message"))
+    next_attempt_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Next attempt at"))
+    lease_expires_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Lease expires at"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Started at"))
+    completed_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Completed at"))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated at"))
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="exportjob_ready_idx"),
+            models.Index(fields=["status", "lease_expires_at"], name="exportjob_lease_idx"),
+            models.Index(fields=["status", "expires_at"], name="exportjob_expiry_idx"),
+        ]
+        verbose_name = _("Client export job")
+        verbose_name_plural = _("Client export jobs")
+
+    def __str__(self) -> str:
+        return f"export {self.pk} ({self.scope}, {self.status}, {self.processed_clients}/{self.total_clients})"
+
+    @property
+    def progress_percent(self) -> int:
+        if self.status == self.STATUS_COMPLETED:
+            return 100
+        if not self.total_clients:
+            return 0
+        return min(99, int(self.processed_clients * 100 / self.total_clients))
+
+    @property
+    def is_downloadable(self) -> bool:
+        return bool(
+            self.status == self.STATUS_COMPLETED
+            and self.archive_name
+            and (self.expires_at is None or self.expires_at > timezone.now())
+        )
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        if isinstance(self.client_ids, (list, tuple)):
+            self.client_ids = sorted({int(client_id) for client_id in self.client_ids})
+            if not self.total_clients:
+                self.total_clients = len(self.client_ids)
+        super().save(*args, **kwargs)
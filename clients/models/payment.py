@@ -152,12 +152,21 @@ class Payment(SoftDeleteModel):
         if reminder is not None:
             reminder.is_active = False
             reminder.save(update_fields=["is_active"])
+        self._refresh_client_attention_state()
 
     def on_restore(self) -> None:
         reminder = getattr(self, "reminder", None)
         if self.status == "partial" and self.due_date and reminder is not None:
             reminder.is_active = True
             reminder.save(update_fields=["is_active"])
+        self._refresh_client_attention_state()
+
+    def _refresh_client_attention_state(self) -> None:
+        # archive()/restore() write archived_at with .update(), bypassing the
+        # post_save receiver that keeps ClientAttentionState current.
+        from clients.services.attention_state import refresh_client_attention_state
+
+        refresh_client_attention_state(self.client_id)
 
     class Meta:
         ordering = ["-created_at"]
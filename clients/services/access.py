@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING, Any, cast
 
 from django.db.models import QuerySet
 
-from clients.models import Case, Client, Document, EmailCampaign, Payment, Reminder, StaffTask
+from clients.models import Case, Client, ClientExportJob, Document, EmailCampaign, Payment, Reminder, StaffTask
 from clients.services.roles import ADMIN_PANEL_ALLOWED_ROLES
 
 if TYPE_CHECKING:
@@ -15,17 +15,19 @@ PRIVILEGED_INTERNAL_ROLES = OFFICE_WIDE_ACCESS_ROLES
 
 
 def _user_group_names(user: AbstractBaseUser | AnonymousUser) -> frozenset[str]:
-    """Group names for ``user``, memoized on the user object for the request.
+    """Group names for ``user``, from its cross-request authorization snapshot.
 
     Role checks run many times per request (navigation, context processors,
-    per-view guards). Without this cache each call issues a fresh ``auth_group``
-    query, which on list pages showed up as dozens of identical lookups.
+    per-view guards). The names are memoized on the user object for the
+    request and cached across requests by ``clients.services.auth_snapshot``,
+    so steady-state staff pages do not query ``auth_group`` at all.
     """
     cached = getattr(user, "_cached_group_names", None)
     if cached is not None:
         return cached
-    groups = getattr(user, "groups", None)
-    names: frozenset[str] = frozenset(groups.values_list("name", flat=True)) if groups is not None else frozenset()
+    from clients.services.auth_snapshot import auth_snapshot
+
+    names = auth_snapshot(user).group_names
     try:
         user._cached_group_names = names  # type: ignore[union-attr]
     except (AttributeError, TypeError):  # pragma: no cover - exotic user objects
@@ -176,3 +178,20 @@ def accessible_campaigns_queryset(user: AbstractBaseUser | AnonymousUser | None,
 
     # Cast user to Any for ForeignKey lookup compatibility in filter
     return queryset.filter(created_by=cast(Any, user))
+
+
+def accessible_export_jobs_queryset(
+    user: AbstractBaseUser | AnonymousUser | None,
+    queryset: QuerySet[ClientExportJob] | None = None,
+) -> QuerySet[ClientExportJob]:
+    """Export archives hold full case files, so staff only see their own jobs."""
+    if queryset is None:
+        queryset = ClientExportJob.objects.select_related("created_by")
+
+    if not is_internal_staff_user(user):
+        return queryset.none()
+
+    if getattr(user, "is_superuser", False) or user_has_internal_role(user, "Admin"):
+        return queryset
+
+    return queryset.filter(created_by=cast(Any, user))
@@ -5,10 +5,12 @@ import uuid
 from datetime import timedelta
 from typing import TYPE_CHECKING, Any, cast
 
+from django.core.cache import cache
 from django.db import models
 from django.utils import timezone
 
 from clients.models import ClientActivity
+from clients.services.activity_buffer import write_client_activity
 
 if TYPE_CHECKING:
     from django.contrib.auth.models import AbstractBaseUser, AnonymousUser
@@ -19,6 +21,8 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+CLIENT_VIEW_DEDUPE_SECONDS = 15 * 60
+
 
 def describe_actor(user: AbstractBaseUser | AnonymousUser | None) -> str:
     """Human-readable snapshot of the actor for the audit trail.
@@ -86,6 +90,7 @@ ALLOWED_METADATA_SCHEMA = {
     "export_type": {
         "pdf_preview",
         "zip",
+        "zip_background",
         "document_version_download",
     },
     "status_tag": {
@@ -204,7 +209,7 @@ def log_client_activity(
                 resolved_case = source_case
                 break
 
-    return ClientActivity.objects.create(
+    return write_client_activity(ClientActivity(
         client=client,
         case=resolved_case,
         actor=cast(Any, real_actor),
@@ -216,20 +221,32 @@ def log_client_activity(
         document=document,
         payment=payment,
         task=task,
-    )
+    ))
+
+
+def _client_view_marker_key(client: Client, actor: AbstractBaseUser | AnonymousUser) -> str:
+    # created_at keeps the marker unique if a primary key is ever reused.
+    created = int(client.created_at.timestamp() * 1_000_000) if getattr(client, "created_at", None) else 0
+    return f"client_activity:viewed:{client.pk}:{created}:{actor.pk}"
+
 
 def log_client_view(*, client: Client, actor: AbstractBaseUser | AnonymousUser | None, request: HttpRequest | None = None) -> ClientActivity | None:
     if actor is None or not actor.is_authenticated:
         return None
 
-    recent_threshold = timezone.now() - timedelta(minutes=15)
-    if ClientActivity.objects.filter(
-        client=client,
-        actor=cast(Any, actor),
-        event_type="client_viewed",
-        created_at__gte=recent_threshold,
-    ).exists():
-        return None
+    try:
+        if not cache.add(_client_view_marker_key(client, actor), 1, timeout=CLIENT_VIEW_DEDUPE_SECONDS):
+            return None
+    except Exception:
+        logger.warning("Client view dedupe marker unavailable; falling back to a database check.")
+        recent_threshold = timezone.now() - timedelta(seconds=CLIENT_VIEW_DEDUPE_SECONDS)
+        if ClientActivity.objects.filter(
+            client=client,
+            actor=cast(Any, actor),
+            event_type="client_viewed",
+            created_at__gte=recent_threshold,
+        ).exists():
+            return None
 
     # Request path/method are intentionally not recorded: they are not on the
     # metadata whitelist and could leak object identifiers (spec section 9).
@@ -0,0 +1,171 @@
+"""Buffered writes for ``ClientActivity`` audit rows.
+
+``log_client_activity`` used to INSERT one row per event inside the caller's
+transaction. With ``CLIENT_ACTIVITY_BUFFERED_WRITES`` events logged inside a
+transaction are collected and written with one ``bulk_create`` when it
+commits. Events are buffered per savepoint: rolling back a savepoint drops
+its ``on_commit`` flush together with the events it would have written, so
+the audit trail still matches what was committed.
+
+``buffered_client_activity()`` batches an explicit block (a bulk action, a
+loop outside a transaction). Optionally, high-volume event types (by default
+only ``client_viewed``) logged outside a transaction go to an in-process queue
+drained by a daemon thread every ``CLIENT_ACTIVITY_BACKGROUND_FLUSH_SECONDS``.
+Those rows get the flush time as ``created_at`` and are lost if the worker is
+killed before the next flush, so only low-stakes events belong there.
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+import weakref
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+from clients.models import ClientActivity
+
+logger = logging.getLogger(__name__)
+
+BULK_BATCH_SIZE = 500
+BACKGROUND_QUEUE_LIMIT = 5000
+
+_local = threading.local()
+
+
+def _bulk_write(activities: list[ClientActivity]) -> None:
+    if activities:
+        ClientActivity.objects.bulk_create(activities, batch_size=BULK_BATCH_SIZE)
+
+
+class _TransactionBuffer:
+    def __init__(self) -> None:
+        self.activities: list[ClientActivity] = []
+        # True while this buffer's flush is queued with ``on_commit``.
+        self.registered = False
+
+    def register(self) -> None:
+        self.registered = True
+        transaction.on_commit(self.flush)
+
+    def flush(self) -> None:
+        self.registered = False
+        activities, self.activities = self.activities, []
+        _bulk_write(activities)
+
+
+def _transaction_buffer() -> _TransactionBuffer:
+    # Only the queued ``on_commit`` callback holds a buffer strongly. When its
+    # transaction or savepoint rolls back Django drops the callback, and the
+    # buffer disappears from this mapping together with its events.
+    buffers: weakref.WeakValueDictionary[tuple[str, ...], _TransactionBuffer] = connection.__dict__.setdefault(
+        "_client_activity_buffers", weakref.WeakValueDictionary()
+    )
+    key = tuple(connection.savepoint_ids)
+    buffer = buffers.get(key)
+    # A buffer that already flushed belongs to a committed transaction.
+    if buffer is None or not buffer.registered:
+        buffer = _TransactionBuffer()
+        buffers[key] = buffer
+        buffer.register()
+    return buffer
+
+
+class _BackgroundFlusher:
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._pending: list[ClientActivity] = []
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="client-activity-flusher", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def put(self, activity: ClientActivity) -> None:
+        with self._lock:
+            self._pending.append(activity)
+            overflow = len(self._pending) >= BACKGROUND_QUEUE_LIMIT
+        if overflow:
+            self._wakeup.set()
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+        try:
+            _bulk_write(pending)
+        except Exception:
+            logger.exception("Background client activity flush failed: dropped=%s", len(pending))
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.flush()
+            close_old_connections()
+
+
+_flusher_lock = threading.Lock()
+_flusher: _BackgroundFlusher | None = None
+
+
+def _background_flusher() -> _BackgroundFlusher | None:
+    global _flusher
+    interval = float(getattr(settings, "CLIENT_ACTIVITY_BACKGROUND_FLUSH_SECONDS", 0) or 0)
+    if interval <= 0:
+        return None
+    with _flusher_lock:
+        if _flusher is None:
+            _flusher = _BackgroundFlusher(interval)
+    return _flusher
+
+
+@contextmanager
+def buffered_client_activity() -> Iterator[list[ClientActivity]]:
+    """Collect every activity logged in the block and write them in one batch.
+
+    Nested blocks share the outermost batch. If the block raises, its events
+    are discarded.
+    """
+    outer = getattr(_local, "batch", None)
+    if outer is not None:
+        yield outer
+        return
+    batch: list[ClientActivity] = []
+    _local.batch = batch
+    try:
+        yield batch
+    finally:
+        _local.batch = None
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _bulk_write(batch))
+    else:
+        _bulk_write(batch)
+
+
+def write_client_activity(activity: ClientActivity) -> ClientActivity:
+    """Persist *activity* now or hand it to the active buffer.
+
+    Buffered activities are returned unsaved (``pk`` is ``None``).
+    """
+    batch: list[ClientActivity] | None = getattr(_local, "batch", None)
+    if batch is not None:
+        batch.append(activity)
+        return activity
+    in_transaction = connection.in_atomic_block
+    background_types: Any = getattr(settings, "CLIENT_ACTIVITY_BACKGROUND_EVENT_TYPES", ("client_viewed",))
+    if not in_transaction and activity.event_type in background_types:
+        flusher = _background_flusher()
+        if flusher is not None:
+            flusher.put(activity)
+            return activity
+    if in_transaction and getattr(settings, "CLIENT_ACTIVITY_BUFFERED_WRITES", False):
+        _transaction_buffer().activities.append(activity)
+        return activity
+    activity.save()
+    return activity
@@ -9,6 +9,7 @@ from django.utils import timezone
 
 from clients.models import Case, CaseArchiveBatch, Client, ClientArchiveBatch, StaffTask
 from clients.services.access import is_internal_staff_user
+from clients.services.activity_buffer import buffered_client_activity
 from clients.services.roles import user_has_any_role
 
 logger = logging.getLogger(__name__)
@@ -174,8 +175,9 @@ def archive_client_with_all_cases(
         status="archived",
     )
 
-    for case in active_cases:
-        archive_case(case, actor, client_batch=client_batch)
+    with buffered_client_activity():
+        for case in active_cases:
+            archive_case(case, actor, client_batch=client_batch)
 
     # Who archived the client lives on the batch, not on the client (spec §11).
     client.archived_at = timezone.now()
@@ -220,13 +222,14 @@ def restore_client_with_all_cases(
 
     case_batches = list(batch.case_batches.filter(status="archived"))
 
-    for case_batch in case_batches:
-        restore_case(
-            case=case_batch.case,
-            actor=actor,
-            batch=case_batch,
-            allow_when_client_archived=True
-        )
+    with buffered_client_activity():
+        for case_batch in case_batches:
+            restore_case(
+                case=case_batch.case,
+                actor=actor,
+                batch=case_batch,
+                allow_when_client_archived=True
+            )
 
     batch.status = "restored"
     batch.restored_by = actor
@@ -3,11 +3,9 @@ from __future__ import annotations
 from datetime import date, timedelta
 from typing import Any
 
-from django.db.models import Q, QuerySet
+from django.db.models import Count, Q, QuerySet
 from django.utils import timezone
 
-from clients.constants import DocumentType
-
 ATTENTION_FILTERS = (
     "legal_stay",
     "expired_documents",
@@ -22,99 +20,81 @@ ATTENTION_FILTERS = (
 )
 
 
-def _legal_stay_attention_q(today: date) -> Q:
-    cutoff = today + timedelta(days=30)
-    # Stage check reads the case (spec §4): in scope when the client has a case
-    # still in an early stage.
-    return Q(
-        cases__workflow_stage__in=["new_client", "document_collection"],
-        cases__submission_date__isnull=True,
-    ) & (
-        Q(legal_basis_end_date__isnull=False, legal_basis_end_date__lte=cutoff)
-        | Q(
-            legal_basis_end_date__isnull=True,
-            mos_applications__legal_stay_until__isnull=False,
-            mos_applications__legal_stay_until__lte=cutoff,
-        )
-    )
+DOCUMENT_FILTERS = {
+    "ocr_review": "has_ocr_review",
+    "ocr_warning": "has_ocr_warning",
+    "ocr_pending": "has_ocr_pending",
+    "ocr_failed": "has_ocr_failed",
+}
 
+# Client-list ordering for each attention filter, by the state row's sort keys.
+ATTENTION_ORDERING = {
+    "legal_stay": "attention_state__legal_stay_deadline",
+    "expired_documents": "-attention_state__latest_document_uploaded_at",
+    "expiring_documents": "-attention_state__latest_document_uploaded_at",
+    "unverified_documents": "-attention_state__latest_document_uploaded_at",
+    "overdue_payments": "attention_state__earliest_open_payment_due",
+    "failed_emails": "-attention_state__latest_failed_email_at",
+    "fingerprints_email": "attention_state__unnotified_fingerprints_date",
+    "overdue_tasks": "attention_state__earliest_open_task_due",
+    "wezwanie_missing_case": "-attention_state__latest_document_uploaded_at",
+}
 
-def _missing_case_number_q() -> Q:
-    # The authority case number lives on the case (spec §4); a client is flagged
-    # when they have a case without one.
-    return Q(cases__authority_case_number_hash__isnull=True) | Q(cases__authority_case_number_hash="")
 
+def client_attention_q(attention_filter: str, today: date | None = None, *, prefix: str = "") -> Q | None:
+    """Condition on ``ClientAttentionState`` for *attention_filter*, or None if unknown.
 
-def apply_client_attention_filter(queryset: QuerySet[Any], attention_filter: str, today: date | None = None) -> QuerySet[Any]:
+    Lookups are relative to the state row; pass ``prefix="attention_state__"``
+    to apply the condition to a ``Client`` queryset.
+    """
     today = today or timezone.localdate()
-    expiring_cutoff = today + timedelta(days=7)
-    wezwanie_types = {DocumentType.WEZWANIE, DocumentType.WEZWANIE.value}
-
-    if attention_filter == "legal_stay":
-        return queryset.filter(_legal_stay_attention_q(today)).distinct()
-    if attention_filter == "expired_documents":
-        return queryset.filter(
-            documents__expiry_date__isnull=False,
-            documents__expiry_date__lt=today,
-            documents__archived_at__isnull=True,
-        ).distinct()
-    if attention_filter == "expiring_documents":
-        return queryset.filter(
-            documents__expiry_date__isnull=False,
-            documents__expiry_date__gte=today,
-            documents__expiry_date__lte=expiring_cutoff,
-            documents__archived_at__isnull=True,
-        ).distinct()
-    if attention_filter == "unverified_documents":
-        return queryset.filter(
-            documents__verified=False,
-            documents__archived_at__isnull=True,
-        ).exclude(
-            Q(documents__rejection_reason__isnull=False) & ~Q(documents__rejection_reason="")
-        ).exclude(
-            documents__expiry_date__isnull=False,
-            documents__expiry_date__lt=today,
-        ).distinct()
-    if attention_filter == "overdue_payments":
-        return queryset.filter(
-            payments__status__in=["pending", "partial"],
-            payments__due_date__isnull=False,
-            payments__due_date__lte=today,
-            payments__archived_at__isnull=True,
-        ).distinct()
-    if attention_filter == "failed_emails":
-        return queryset.filter(email_logs__delivery_status="failed").distinct()
-    if attention_filter == "fingerprints_email":
-        # Fingerprints date lives on the case (spec §4).
-        return queryset.filter(cases__fingerprints_date__isnull=False).exclude(
-            email_logs__template_type="appointment_notification",
-        ).distinct()
-    if attention_filter == "overdue_tasks":
-        return queryset.filter(
-            staff_tasks__status__in=["open", "in_progress"],
-            staff_tasks__due_date__lt=today,
-        ).distinct()
-    if attention_filter == "wezwanie_missing_case":
-        # Correlate the wezwanie to its OWN case: flag only when the case that
-        # the wezwanie belongs to still has no authority number, so entering the
-        # number clears it (also for multi-case clients).
-        return queryset.filter(
-            Q(documents__case__authority_case_number_hash__isnull=True)
-            | Q(documents__case__authority_case_number_hash=""),
-            documents__document_type__in=wezwanie_types,
-            documents__archived_at__isnull=True,
-        ).distinct()
-    if attention_filter == "new_card_missing_case":
-        return queryset.filter(
-            _missing_case_number_q(),
-            mos_applications__new_residence_card_application_status="yes",
-        ).distinct()
-    return queryset
-
-
-def count_client_attention_filters(queryset: QuerySet[Any], today: date | None = None) -> dict[str, int]:
-    today = today or timezone.localdate()
-    return {
-        attention_filter: apply_client_attention_filter(queryset, attention_filter, today).count()
-        for attention_filter in ATTENTION_FILTERS
+
+    def q(**lookups: Any) -> Q:
+        return Q(**{f"{prefix}{lookup}": value for lookup, value in lookups.items()})
+
+    conditions = {
+        "legal_stay": q(legal_stay_deadline__lte=today + timedelta(days=30)),
+        "expired_documents": q(earliest_document_expiry__lt=today),
+        "expiring_documents": q(next_document_expiry__gte=today, next_document_expiry__lte=today + timedelta(days=7)),
+        "unverified_documents": q(unverified_documents_valid_until__gte=today),
+        "overdue_payments": q(earliest_open_payment_due__lte=today),
+        "failed_emails": q(latest_failed_email_at__isnull=False),
+        "fingerprints_email": q(unnotified_fingerprints_date__isnull=False),
+        "overdue_tasks": q(earliest_open_task_due__lt=today),
+        "wezwanie_missing_case": q(has_wezwanie_missing_case=True),
+        "new_card_missing_case": q(has_new_card_missing_case=True),
     }
+    if attention_filter in conditions:
+        return conditions[attention_filter]
+    if attention_filter in DOCUMENT_FILTERS:
+        return q(**{DOCUMENT_FILTERS[attention_filter]: True})
+    return None
+
+
+def apply_client_attention_filter(queryset: QuerySet[Any], attention_filter: str, today: date | None = None) -> QuerySet[Any]:
+    """Narrow a client queryset to *attention_filter* (an attention or OCR document filter).
+
+    Reads the denormalized ``ClientAttentionState`` row (one per client) so
+    the filter is a single indexed join without ``DISTINCT``.
+    """
+    condition = client_attention_q(attention_filter, today, prefix="attention_state__")
+    if condition is None:
+        return queryset
+    return queryset.filter(condition)
+
+
+def count_client_attention_filters(
+    queryset: QuerySet[Any],
+    today: date | None = None,
+    filters: tuple[str, ...] = ATTENTION_FILTERS,
+) -> dict[str, int]:
+    """Count the clients of *queryset* matching each of *filters* in one query."""
+    from clients.models import ClientAttentionState
+
+    today = today or timezone.localdate()
+    states = ClientAttentionState.objects.filter(client__in=queryset.order_by().values("pk"))
+    counts = states.aggregate(**{
+        attention_filter: Count("pk", filter=client_attention_q(attention_filter, today))
+        for attention_filter in filters
+    })
+    return {attention_filter: int(counts[attention_filter] or 0) for attention_filter in filters}
@@ -0,0 +1,210 @@
+"""Maintenance of the denormalized ``ClientAttentionState`` rows.
+
+Each row is recomputed from scratch for its client with one grouped aggregate
+per source table, so a refresh is idempotent and a handful of indexed queries
+regardless of how much history the client has. ``clients.signals`` refreshes
+a client's row whenever one of the sources is saved or deleted; writes that
+bypass signals (``QuerySet.update()``, raw SQL, restored backups) and the
+date-relative ``next_document_expiry`` are repaired by
+``reconcile_client_attention_states`` from the nightly maintenance run.
+"""
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+from django.db.models import Count, DateField, Max, Min, Q, QuerySet, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from clients.constants import DocumentType
+from clients.models import (
+    Case,
+    Client,
+    ClientAttentionState,
+    Document,
+    EmailLog,
+    MOSApplicationData,
+    Payment,
+    StaffTask,
+)
+
+logger = logging.getLogger(__name__)
+
+RECONCILE_BATCH_SIZE = 500
+EARLY_CASE_STAGES = ("new_client", "document_collection")
+OPEN_PAYMENT_STATUSES = ("pending", "partial")
+OPEN_TASK_STATUSES = ("open", "in_progress")
+
+STATE_FIELDS = tuple(
+    field.name
+    for field in ClientAttentionState._meta.concrete_fields
+    if field.name not in {"client", "refreshed_on", "refreshed_at"}
+)
+
+
+@dataclass(frozen=True)
+class ReconcileResult:
+    checked: int
+    created: int
+    repaired: int
+
+
+def _by_client(queryset: QuerySet[Any], **aggregates: Any) -> dict[int, dict[str, Any]]:
+    rows = queryset.order_by().values("client_id").annotate(**aggregates)
+    return {row.pop("client_id"): row for row in rows}
+
+
+def compute_client_attention_states(
+    client_ids: Iterable[int], *, today: date | None = None
+) -> list[ClientAttentionState]:
+    """Build (unsaved) attention rows for the existing clients among *client_ids*."""
+    today = today or timezone.localdate()
+    ids = list(client_ids)
+    clients = dict(Client._base_manager.filter(pk__in=ids).values_list("pk", "legal_basis_end_date"))
+    if not clients:
+        return []
+    ids = list(clients)
+
+    active = Q(archived_at__isnull=True)
+    unverified = active & Q(verified=False) & (Q(rejection_reason__isnull=True) | Q(rejection_reason=""))
+    missing_case_number = Q(case__authority_case_number_hash__isnull=True) | Q(case__authority_case_number_hash="")
+    documents = _by_client(
+        Document._base_manager.filter(client_id__in=ids),
+        earliest_document_expiry=Min("expiry_date", filter=active),
+        next_document_expiry=Min("expiry_date", filter=active & Q(expiry_date__gte=today)),
+        unverified_documents_valid_until=Max(
+            Coalesce("expiry_date", Value(date.max, output_field=DateField())), filter=unverified
+        ),
+        latest_document_uploaded_at=Max("uploaded_at", filter=active),
+        wezwanie_missing_case=Count(
+            "pk", filter=active & Q(document_type=DocumentType.WEZWANIE.value) & missing_case_number
+        ),
+        ocr_review=Count("pk", filter=active & Q(awaiting_confirmation=True)),
+        ocr_warning=Count("pk", filter=active & Q(ocr_name_mismatch=True)),
+        ocr_pending=Count("pk", filter=active & Q(ocr_status="pending")),
+        ocr_failed=Count("pk", filter=active & Q(ocr_status="failed")),
+    )
+    payments = _by_client(
+        Payment._base_manager.filter(
+            client_id__in=ids, archived_at__isnull=True, status__in=OPEN_PAYMENT_STATUSES, due_date__isnull=False
+        ),
+        earliest_due=Min("due_date"),
+    )
+    tasks = _by_client(
+        StaffTask._base_manager.filter(client_id__in=ids, status__in=OPEN_TASK_STATUSES, due_date__isnull=False),
+        earliest_due=Min("due_date"),
+    )
+    emails = _by_client(
+        EmailLog._base_manager.filter(client_id__in=ids),
+        latest_failed_at=Max("sent_at", filter=Q(delivery_status="failed")),
+        appointment_notifications=Count("pk", filter=Q(template_type="appointment_notification")),
+    )
+    cases = _by_client(
+        Case._base_manager.filter(client_id__in=ids),
+        early_cases=Count("pk", filter=Q(workflow_stage__in=EARLY_CASE_STAGES, submission_date__isnull=True)),
+        earliest_fingerprints=Min("fingerprints_date"),
+        missing_number=Count(
+            "pk", filter=Q(authority_case_number_hash__isnull=True) | Q(authority_case_number_hash="")
+        ),
+    )
+    applications = _by_client(
+        MOSApplicationData._base_manager.filter(client_id__in=ids),
+        earliest_legal_stay=Min("legal_stay_until"),
+        new_card=Count("pk", filter=Q(new_residence_card_application_status="yes")),
+    )
+
+    states = []
+    for client_id, legal_basis_end_date in clients.items():
+        doc = documents.get(client_id, {})
+        case = cases.get(client_id, {})
+        application = applications.get(client_id, {})
+        email = emails.get(client_id, {})
+        legal_stay_deadline = None
+        if case.get("early_cases"):
+            legal_stay_deadline = legal_basis_end_date or application.get("earliest_legal_stay")
+        states.append(
+            ClientAttentionState(
+                client_id=client_id,
+                legal_stay_deadline=legal_stay_deadline,
+                earliest_document_expiry=doc.get("earliest_document_expiry"),
+                next_document_expiry=doc.get("next_document_expiry"),
+                unverified_documents_valid_until=doc.get("unverified_documents_valid_until"),
+                latest_document_uploaded_at=doc.get("latest_document_uploaded_at"),
+                earliest_open_payment_due=payments.get(client_id, {}).get("earliest_due"),
+                earliest_open_task_due=tasks.get(client_id, {}).get("earliest_due"),
+                latest_failed_email_at=email.get("latest_failed_at"),
+                unnotified_fingerprints_date=(
+                    None if email.get("appointment_notifications") else case.get("earliest_fingerprints")
+                ),
+                has_wezwanie_missing_case=bool(doc.get("wezwanie_missing_case")),
+                has_new_card_missing_case=bool(case.get("missing_number") and application.get("new_card")),
+                has_ocr_review=bool(doc.get("ocr_review")),
+                has_ocr_warning=bool(doc.get("ocr_warning")),
+                has_ocr_pending=bool(doc.get("ocr_pending")),
+                has_ocr_failed=bool(doc.get("ocr_failed")),
+                refreshed_on=today,
+            )
+        )
+    return states
+
+
+def _write_states(states: list[ClientAttentionState]) -> None:
+    if states:
+        ClientAttentionState.objects.bulk_create(
+            states,
+            update_conflicts=True,
+            unique_fields=["client"],
+            update_fields=[*STATE_FIELDS, "refreshed_on", "refreshed_at"],
+        )
+
+
+def refresh_client_attention_state(*client_ids: int | None) -> None:
+    """Recompute and store the attention rows of *client_ids* (``None`` is ignored)."""
+    ids = {client_id for client_id in client_ids if client_id}
+    if ids:
+        _write_states(compute_client_attention_states(ids))
+
+
+def _state_values(state: ClientAttentionState) -> tuple[Any, ...]:
+    return tuple(getattr(state, name) for name in STATE_FIELDS)
+
+
+def reconcile_client_attention_states(
+    *, batch_size: int = RECONCILE_BATCH_SIZE, missing_only: bool = False, today: date | None = None
+) -> ReconcileResult:
+    """Recompute every client's row and rewrite the ones that drifted.
+
+    With ``missing_only`` only clients without a row are processed, which is
+    cheap enough to run on every automation cycle after a deploy or import.
+    """
+    today = today or timezone.localdate()
+    client_ids = Client._base_manager.order_by("pk").values_list("pk", flat=True)
+    if missing_only:
+        client_ids = client_ids.filter(attention_state__isnull=True)
+    checked = created = repaired = 0
+    last_id = 0
+    while True:
+        batch = list(client_ids.filter(pk__gt=last_id)[:batch_size])
+        if not batch:
+            break
+        last_id = batch[-1]
+        existing = {state.client_id: state for state in ClientAttentionState.objects.filter(client_id__in=batch)}
+        stale = []
+        for state in compute_client_attention_states(batch, today=today):
+            current = existing.get(state.client_id)
+            if current is None:
+                created += 1
+            elif _state_values(current) != _state_values(state):
+                repaired += 1
+            else:
+                continue
+            stale.append(state)
+        _write_states(stale)
+        checked += len(batch)
+    if repaired:
+        logger.warning("Client attention state drift repaired: clients=%s", repaired)
+    return ReconcileResult(checked=checked, created=created, repaired=repaired)
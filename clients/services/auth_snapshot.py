@@ -0,0 +1,153 @@
+"""Cross-request cache of what a staff user is allowed to do.
+
+Role and permission checks need the user's group names, their
+``EmployeePermission`` flags and whether they enrolled an MFA authenticator.
+Those used to be loaded on every request (the memo on the user object only
+lives for one request), so each staff page paid an ``auth_group`` query and an
+``employee_permission`` query before rendering anything.
+
+The snapshot is cached per user under a version number. Signals in
+``clients.signals`` bump the version whenever group membership, a group,
+the user's ``EmployeePermission`` row or their authenticators change, so the
+next request rebuilds it. The version is bumped again once the transaction
+commits: a request that read the old rows while it was open may have cached
+them under the first bump. Writes that bypass signals (``QuerySet.update()``,
+raw SQL) show up after ``AUTH_SNAPSHOT_TIMEOUT_SECONDS``.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from django.core.cache import cache
+from django.db import transaction
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import AbstractBaseUser, AnonymousUser
+
+logger = logging.getLogger(__name__)
+
+AUTH_SNAPSHOT_CACHE_PREFIX = "auth_snapshot:"
+AUTH_SNAPSHOT_TIMEOUT_SECONDS = 60 * 60
+_VERSION_TIMEOUT_SECONDS = 24 * 60 * 60
+
+
+@dataclass(frozen=True)
+class AuthSnapshot:
+    group_names: frozenset[str]
+    # Granted EmployeePermission flags; ``None`` when the user has no row.
+    employee_permissions: frozenset[str] | None
+    mfa_enabled: bool
+
+    def has_employee_permission(self, permission_name: str) -> bool:
+        return self.employee_permissions is not None and permission_name in self.employee_permissions
+
+
+def _version_key(user_id: int) -> str:
+    return f"{AUTH_SNAPSHOT_CACHE_PREFIX}{user_id}:version"
+
+
+def _snapshot_version(user_id: int) -> int:
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Start from the clock rather than 1: if the version key is evicted,
+        # the new one cannot match a snapshot cached under the old one.
+        cache.add(key, time.time_ns(), timeout=_VERSION_TIMEOUT_SECONDS)
+        version = cache.get(key)
+    return int(version or 0)
+
+
+def _bump(user_ids: set[int]) -> None:
+    for user_id in user_ids:
+        key = _version_key(user_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=_VERSION_TIMEOUT_SECONDS)
+        except Exception:
+            logger.warning("Failed to invalidate the auth snapshot of user %s.", user_id, exc_info=True)
+
+
+def bump_auth_snapshot_version(user_ids: Iterable[int | None]) -> None:
+    """Invalidate the cached snapshot of every user in *user_ids*, now and on commit."""
+    ids = {user_id for user_id in user_ids if user_id}
+    if not ids:
+        return
+    _bump(ids)
+    transaction.on_commit(lambda: _bump(ids))
+
+
+def _mfa_enabled(user_id: int) -> bool:
+    try:
+        from allauth.mfa.models import Authenticator
+    except ImportError:  # pragma: no cover - allauth.mfa not installed
+        return False
+    return Authenticator.objects.filter(user_id=user_id).exists()
+
+
+def _load_snapshot(user: Any) -> AuthSnapshot:
+    from clients.models import EmployeePermission
+    from clients.services.permissions import EMPLOYEE_PERMISSION_FIELDS
+
+    flags = (
+        EmployeePermission.objects.filter(user_id=user.pk).values(*sorted(EMPLOYEE_PERMISSION_FIELDS)).first()
+    )
+    return AuthSnapshot(
+        group_names=frozenset(user.groups.values_list("name", flat=True)),
+        employee_permissions=None if flags is None else frozenset(name for name, granted in flags.items() if granted),
+        mfa_enabled=_mfa_enabled(user.pk),
+    )
+
+
+def auth_snapshot(user: AbstractBaseUser | AnonymousUser | None) -> AuthSnapshot:
+    """The authorization snapshot of *user*, memoized on it for the request."""
+    cached = getattr(user, "_auth_snapshot", None)
+    if cached is not None:
+        return cached
+    user_id = getattr(user, "pk", None)
+    if user is None or not user_id or getattr(user, "groups", None) is None:
+        return AuthSnapshot(group_names=frozenset(), employee_permissions=None, mfa_enabled=False)
+
+    key: str | None = None
+    stored = None
+    try:
+        key = f"{AUTH_SNAPSHOT_CACHE_PREFIX}{user_id}:{_snapshot_version(user_id)}"
+        stored = cache.get(key)
+    except Exception:
+        logger.warning("Failed to read the auth snapshot of user %s.", user_id, exc_info=True)
+    if stored is not None:
+        snapshot = AuthSnapshot(
+            group_names=frozenset(stored["groups"]),
+            employee_permissions=None if stored["permissions"] is None else frozenset(stored["permissions"]),
+            mfa_enabled=stored["mfa"],
+        )
+    else:
+        snapshot = _load_snapshot(user)
+        stored = {
+            "groups": sorted(snapshot.group_names),
+            "permissions": None if snapshot.employee_permissions is None else sorted(snapshot.employee_permissions),
+            "mfa": snapshot.mfa_enabled,
+        }
+        if key is not None:
+            try:
+                cache.set(key, stored, timeout=AUTH_SNAPSHOT_TIMEOUT_SECONDS)
+            except Exception:
+                logger.warning("Failed to cache the auth snapshot of user %s.", user_id, exc_info=True)
+    try:
+        user._auth_snapshot = snapshot  # type: ignore[union-attr]
+    except (AttributeError, TypeError):  # pragma: no cover - exotic user objects
+        pass
+    return snapshot
+
+
+def forget_request_auth_snapshot(user: Any) -> None:
+    """Drop the per-request memo, e.g. after changing *user*'s groups in place."""
+    for attr in ("_auth_snapshot", "_cached_group_names"):
+        try:
+            delattr(user, attr)
+        except AttributeError:
+            pass
@@ -0,0 +1,79 @@
+"""Per-task schedules for ``run_background_automation_loop``.
+
+A schedule answers one question: when is the next run due after a given
+moment. Two kinds cover the automation tasks:
+
+* ``every 300s`` / ``every 5m`` / ``every 1h`` - a fixed interval measured
+  from the start of the previous run;
+* ``at 08:00,17:10`` - cron-like daily slots in ``TIME_ZONE``.
+
+Specs are strings so that ``BACKGROUND_AUTOMATION_SCHEDULES`` can override
+a task's cadence from settings.
+"""
+from __future__ import annotations
+
+import re
+from datetime import datetime, time, timedelta
+from typing import Protocol
+
+from django.utils import timezone
+
+_INTERVAL_RE = re.compile(r"^every\s+(\d+)\s*([smh]?)$")
+_DAILY_RE = re.compile(r"^at\s+(\d{1,2}:\d{2}(?:\s*,\s*\d{1,2}:\d{2})*)$")
+_UNIT_SECONDS = {"": 1, "s": 1, "m": 60, "h": 3600}
+
+
+class Schedule(Protocol):
+    def next_after(self, moment: datetime) -> datetime: ...
+
+
+class IntervalSchedule:
+    def __init__(self, seconds: int) -> None:
+        if seconds <= 0:
+            raise ValueError("Interval schedules need a positive number of seconds.")
+        self.seconds = seconds
+
+    def next_after(self, moment: datetime) -> datetime:
+        return moment + timedelta(seconds=self.seconds)
+
+    def __str__(self) -> str:
+        return f"every {self.seconds}s"
+
+
+class DailySchedule:
+    def __init__(self, slots: tuple[time, ...]) -> None:
+        if not slots:
+            raise ValueError("Daily schedules need at least one time slot.")
+        self.slots = tuple(sorted(set(slots)))
+
+    def next_after(self, moment: datetime) -> datetime:
+        local = timezone.localtime(moment)
+        for day_offset in (0, 1):
+            day = local.date() + timedelta(days=day_offset)
+            for slot in self.slots:
+                candidate = timezone.make_aware(datetime.combine(day, slot))
+                if candidate > moment:
+                    return candidate
+        raise AssertionError("unreachable: a daily slot always exists within two days")
+
+    def __str__(self) -> str:
+        return "at " + ",".join(slot.strftime("%H:%M") for slot in self.slots)
+
+
+def parse_schedule(spec: str) -> IntervalSchedule | DailySchedule:
+    """Parse ``"every <n>[s|m|h]"`` or ``"at HH:MM[,HH:MM...]"``."""
+    normalized = " ".join(str(spec).strip().lower().split())
+    interval = _INTERVAL_RE.match(normalized)
+    if interval:
+        return IntervalSchedule(int(interval.group(1)) * _UNIT_SECONDS[interval.group(2)])
+    daily = _DAILY_RE.match(normalized)
+    if daily:
+        slots = []
+        for raw_slot in daily.group(1).split(","):
+            hour, minute = (int(part) for part in raw_slot.strip().split(":"))
+            try:
+                slots.append(time(hour, minute))
+            except ValueError as exc:
+                raise ValueError(f"Invalid time slot in schedule {spec!r}.") from exc
+        return DailySchedule(tuple(slots))
+    raise ValueError(f"Unrecognised schedule {spec!r}; use 'every <n>[s|m|h]' or 'at HH:MM[,HH:MM]'.")
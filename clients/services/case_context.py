@@ -99,16 +99,10 @@ def build_case_document_checklist(
     current_language = translation.get_language() or client.language
     purpose = purpose_for_case(case)
 
-    if requirements_cache is not None:
-        cache_key = f"{purpose}:{current_language}"
-        if cache_key not in requirements_cache:
-            required_docs = DocumentRequirement.required_for(purpose, current_language)
-            requirements = list(DocumentRequirement.objects.filter(application_purpose=purpose))
-            requirements_cache[cache_key] = (required_docs, requirements)
-        required_docs, requirements = requirements_cache[cache_key]
-    else:
-        required_docs = DocumentRequirement.required_for(purpose, current_language)
-        requirements = list(DocumentRequirement.objects.filter(application_purpose=purpose))
+    # Served from the process-wide catalog cache; ``requirements_cache`` is
+    # accepted for existing callers but no longer needed.
+    required_docs = DocumentRequirement.required_for(purpose, current_language)
+    requirements = DocumentRequirement.records_for(purpose)
 
     prefetched_documents = getattr(case, "_prefetched_objects_cache", {}).get("documents")
     uploaded_docs: list[Document] | models.QuerySet[Document]
@@ -112,7 +112,11 @@ def resolve_single_active_case(client: Client) -> Case | None:
     client level. With several active cases it returns None so the caller can
     skip ambiguous aggregation rather than guess (spec section 4/5).
     """
-    active_cases = list(Case.objects.filter(client=client)[:2])
+    prefetched = getattr(client, "_prefetched_objects_cache", {}).get("cases")
+    if prefetched is not None:
+        active_cases = list(prefetched)[:2]
+    else:
+        active_cases = list(Case.objects.filter(client=client)[:2])
     if len(active_cases) == 1:
         return active_cases[0]
     return None
@@ -0,0 +1,204 @@
+"""Maintenance and reading of the persisted ``CaseChecklistSummary`` rows.
+
+A summary is derived from ``build_case_document_checklist`` so it can never
+disagree with the checklist staff see on the case page. ``clients.signals``
+refreshes the affected case once a document, custom requirement or Wniosek
+submission change commits; catalog edits only mark the purpose's rows stale, because
+one checklist save touches every requirement of the purpose and the rows are
+recomputed by the automation loop on its next cycle. ZUS RCA months and
+document expiry move with the calendar, so the nightly maintenance run
+rebuilds every active case's row.
+"""
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+from django.db.models import Count, Prefetch, Q
+from django.utils import timezone, translation
+
+from clients.constants import ACTIVE_WORKFLOW_STAGES
+from clients.models import (
+    Case,
+    CaseChecklistSummary,
+    ClientDocumentRequirement,
+    Document,
+    DocumentRequirement,
+    resolve_document_label,
+)
+from clients.services.case_context import build_case_document_checklist, purpose_for_case
+
+logger = logging.getLogger(__name__)
+
+RECONCILE_BATCH_SIZE = 200
+
+SUMMARY_FIELDS = tuple(
+    field.name
+    for field in CaseChecklistSummary._meta.concrete_fields
+    if field.name not in {"case", "refreshed_on", "refreshed_at"}
+)
+
+
+@dataclass(frozen=True)
+class ReconcileResult:
+    checked: int
+    created: int
+    repaired: int
+
+
+def summarize_checklist(rows: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """Reduce checklist rows to the stored summary values."""
+    # Confirmed free-text Wniosek attachments are always complete and are not
+    # part of the requirement set.
+    rows = [row for row in rows if not row.get("is_custom_submission")]
+    missing = [row for row in rows if not row.get("is_complete")]
+    required = [row for row in rows if row.get("is_required")]
+    complete = sum(1 for row in required if row.get("is_complete"))
+    dated = [row for row in missing if row.get("due_date")]
+    next_due = min(dated, key=lambda row: row["due_date"]) if dated else None
+    return {
+        "missing_items": [
+            {
+                "code": str(row.get("code") or ""),
+                "name": str(row.get("name") or "") if row.get("is_custom_requirement") else "",
+            }
+            for row in missing
+        ],
+        "missing_count": len(missing),
+        "required_count": len(required),
+        "complete_count": complete,
+        "completion_ratio": round(complete / len(required), 4) if required else 1.0,
+        "next_due_code": str(next_due.get("code") or "") if next_due else "",
+        "next_due_name": str(next_due.get("name") or "")[:255] if next_due else "",
+        "next_due_date": next_due["due_date"] if next_due else None,
+    }
+
+
+def compute_case_checklist_summaries(
+    case_ids: Iterable[int], *, today: date | None = None
+) -> list[CaseChecklistSummary]:
+    """Build (unsaved) summaries for the existing cases among *case_ids*."""
+    today = today or timezone.localdate()
+    cases = (
+        Case._base_manager.filter(pk__in=list(case_ids))
+        .select_related("client")
+        .prefetch_related(
+            Prefetch(
+                "documents",
+                queryset=Document.objects.annotate(preloaded_version_count=Count("versions")).order_by("-uploaded_at"),
+            ),
+            Prefetch(
+                "custom_document_requirements",
+                queryset=ClientDocumentRequirement.objects.filter(is_active=True).order_by("due_date", "created_at"),
+            ),
+            "client__wniosek_submissions__confirmed_by",
+            "client__wniosek_submissions__attachments",
+            "client__wniosek_submissions__proof_documents",
+        )
+    )
+    requirements_cache: dict[str, Any] = {}
+    summaries = []
+    for case in cases:
+        rows = build_case_document_checklist(case, requirements_cache=requirements_cache)
+        summaries.append(
+            CaseChecklistSummary(
+                case_id=case.pk,
+                client_id=case.client_id,
+                purpose=purpose_for_case(case),
+                is_stale=False,
+                refreshed_on=today,
+                **summarize_checklist(rows),
+            )
+        )
+    return summaries
+
+
+def _write_summaries(summaries: list[CaseChecklistSummary]) -> None:
+    if summaries:
+        CaseChecklistSummary.objects.bulk_create(
+            summaries,
+            update_conflicts=True,
+            unique_fields=["case"],
+            update_fields=[*SUMMARY_FIELDS, "refreshed_on", "refreshed_at"],
+        )
+
+
+def refresh_case_checklist_summary(*case_ids: int | None) -> None:
+    """Recompute and store the summaries of *case_ids* (``None`` is ignored)."""
+    ids = {case_id for case_id in case_ids if case_id}
+    if ids:
+        _write_summaries(compute_case_checklist_summaries(ids))
+
+
+def mark_checklist_summaries_stale(purpose: str) -> int:
+    """Flag the summaries built from *purpose*'s catalog for recomputation."""
+    return CaseChecklistSummary.objects.filter(purpose=purpose, is_stale=False).update(is_stale=True)
+
+
+def _summary_values(summary: CaseChecklistSummary) -> tuple[Any, ...]:
+    return tuple(getattr(summary, name) for name in SUMMARY_FIELDS)
+
+
+def reconcile_case_checklist_summaries(
+    *, batch_size: int = RECONCILE_BATCH_SIZE, stale_only: bool = False, today: date | None = None
+) -> ReconcileResult:
+    """Recompute the summaries of all active cases and rewrite drifted rows.
+
+    With ``stale_only`` only cases without a row or with a row flagged by a
+    catalog edit are processed, which is cheap enough for every automation
+    cycle.
+    """
+    today = today or timezone.localdate()
+    case_ids = Case.objects.filter(workflow_stage__in=ACTIVE_WORKFLOW_STAGES).order_by("pk").values_list("pk", flat=True)
+    if stale_only:
+        case_ids = case_ids.filter(Q(checklist_summary__isnull=True) | Q(checklist_summary__is_stale=True))
+    checked = created = repaired = 0
+    last_id = 0
+    while True:
+        batch = list(case_ids.filter(pk__gt=last_id)[:batch_size])
+        if not batch:
+            break
+        last_id = batch[-1]
+        existing = {summary.case_id: summary for summary in CaseChecklistSummary.objects.filter(case_id__in=batch)}
+        changed = []
+        for summary in compute_case_checklist_summaries(batch, today=today):
+            current = existing.get(summary.case_id)
+            if current is None:
+                created += 1
+            elif _summary_values(current) != _summary_values(summary):
+                repaired += 1
+            elif current.refreshed_on == today:
+                continue
+            changed.append(summary)
+        _write_summaries(changed)
+        checked += len(batch)
+    if repaired:
+        logger.info("Case checklist summaries updated: cases=%s", repaired)
+    return ReconcileResult(checked=checked, created=created, repaired=repaired)
+
+
+def missing_item_names(
+    summary: CaseChecklistSummary,
+    *,
+    language: str | None = None,
+    labels_cache: dict[str, dict[str, str]] | None = None,
+) -> list[str]:
+    """Display names of the summary's missing items in *language*.
+
+    Catalog labels are resolved like the checklist resolves them, once per
+    purpose and language when a shared *labels_cache* is passed.
+    """
+    language = language or translation.get_language()
+    cache_key = f"{summary.purpose}:{language}"
+    labels = labels_cache.get(cache_key) if labels_cache is not None else None
+    if labels is None:
+        labels = dict(DocumentRequirement.required_for(summary.purpose, language))
+        if labels_cache is not None:
+            labels_cache[cache_key] = labels
+    return [
+        item.get("name") or labels.get(item.get("code", "")) or str(resolve_document_label(item.get("code", ""), language=language))
+        for item in summary.missing_items
+    ]
@@ -0,0 +1,71 @@
+"""Per-process cache of client display names.
+
+Client names are stored encrypted, so every rendered name costs Fernet
+decryptions. Filter widgets only need the label of the selected client, and
+the same few clients are looked up again on every page load, so each worker
+keeps a short-lived ``id -> display name`` map. Saving or deleting a client
+drops its entry here (``clients.signals``); renames made in another worker or
+through ``QuerySet.update()`` become visible after
+``CLIENT_NAME_CACHE_TTL_SECONDS``.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterable
+
+from clients.models import Client
+
+CLIENT_NAME_CACHE_TTL_SECONDS = 60
+CLIENT_NAME_CACHE_MAX_ENTRIES = 5000
+
+_lock = threading.Lock()
+_entries: dict[int, tuple[float, str]] = {}
+
+
+def client_display_names(client_ids: Iterable[int]) -> dict[int, str]:
+    """Return ``{id: display name}`` for the existing clients among *client_ids*.
+
+    The caller is responsible for access checks; archived clients resolve too
+    so that old filter links keep their label.
+    """
+    ids = {int(client_id) for client_id in client_ids if client_id}
+    names: dict[int, str] = {}
+    now = time.monotonic()
+    with _lock:
+        for client_id in ids:
+            entry = _entries.get(client_id)
+            if entry is not None and entry[0] > now:
+                names[client_id] = entry[1]
+    missing = ids - names.keys()
+    if missing:
+        loaded = {
+            client.pk: client.get_full_name()
+            for client in Client._base_manager.filter(pk__in=missing).only("pk", "first_name", "last_name")
+        }
+        names.update(loaded)
+        with _lock:
+            if len(_entries) + len(loaded) > CLIENT_NAME_CACHE_MAX_ENTRIES:
+                _entries.clear()
+            expires_at = now + CLIENT_NAME_CACHE_TTL_SECONDS
+            for client_id, name in loaded.items():
+                _entries[client_id] = (expires_at, name)
+    return names
+
+
+def client_display_name(client_id: int | None) -> str:
+    """Display name of one client, or ``""`` when it does not exist."""
+    if not client_id:
+        return ""
+    return client_display_names([client_id]).get(int(client_id), "")
+
+
+def forget_client_display_name(client_id: int | None) -> None:
+    with _lock:
+        _entries.pop(int(client_id or 0), None)
+
+
+def reset_client_display_names() -> None:
+    """Drop every cached name (tests use it after rolled-back edits)."""
+    with _lock:
+        _entries.clear()
@@ -0,0 +1,60 @@
+"""Batched maintenance of the ClientSearchToken name index.
+
+``Client.save`` keeps a client's tokens current; this module rebuilds them for
+rows written without ``save`` (bulk imports, stress data) and for every
+client after the token scheme changes, in keyset-ordered batches so a large
+table is never loaded or locked at once.
+"""
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from django.db import transaction
+
+from clients.models import Client
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TOKEN_BATCH_SIZE = 500
+
+
+@dataclass(frozen=True)
+class SearchTokenBackfillResult:
+    checked: int
+    created: int
+    deleted: int
+    last_id: int
+
+
+def backfill_client_search_tokens(
+    *,
+    batch_size: int = SEARCH_TOKEN_BATCH_SIZE,
+    start_after: int = 0,
+    on_batch: Callable[[SearchTokenBackfillResult], None] | None = None,
+) -> SearchTokenBackfillResult:
+    """Rebuild the search tokens of every client with ``pk > start_after``.
+
+    Archived clients are included so they are findable again once restored.
+    Each batch commits on its own; ``on_batch`` receives the running totals,
+    whose ``last_id`` is the value to resume from after an interruption.
+    """
+    checked = created = deleted = 0
+    last_id = start_after
+    clients = Client._base_manager.order_by("pk").only("pk", "first_name", "last_name")
+    while True:
+        batch = list(clients.filter(pk__gt=last_id)[:batch_size])
+        if not batch:
+            break
+        with transaction.atomic():
+            batch_created, batch_deleted = Client.rebuild_search_tokens_bulk(batch)
+        checked += len(batch)
+        created += batch_created
+        deleted += batch_deleted
+        last_id = batch[-1].pk
+        if on_batch is not None:
+            on_batch(SearchTokenBackfillResult(checked=checked, created=created, deleted=deleted, last_id=last_id))
+    if created or deleted:
+        logger.info("Client search tokens rebuilt: clients=%s created=%s deleted=%s", checked, created, deleted)
+    return SearchTokenBackfillResult(checked=checked, created=created, deleted=deleted, last_id=last_id)
@@ -0,0 +1,84 @@
+"""Refreshes of denormalized rows, batched per transaction.
+
+Signal receivers keeping ``ClientAttentionState`` and ``CaseChecklistSummary``
+current call ``refresh_on_commit`` for every write they see. Inside a
+transaction the ids are collected and each refresh runs once, with all of
+them, after the commit, so a campaign logging fifty emails for one client
+recomputes that client once, and ten documents saved into one case rebuild
+its checklist once. Ids are
+collected per savepoint, the way ``clients.services.activity_buffer`` buffers
+events: rolling a savepoint back drops its ``on_commit`` callback and the ids
+recorded under it. Outside a transaction the refresh runs right away.
+"""
+from __future__ import annotations
+
+import logging
+import weakref
+from collections.abc import Callable, Iterable
+
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+Refresh = Callable[..., None]
+
+
+class _PendingIds:
+    def __init__(self, refresh: Refresh) -> None:
+        self.refresh = refresh
+        self.ids: set[int] = set()
+        # True while this set's flush is queued with ``on_commit``.
+        self.registered = False
+
+    def register(self) -> None:
+        self.registered = True
+        transaction.on_commit(self.flush)
+
+    def flush(self) -> None:
+        self.registered = False
+        # The first flush after the commit takes the ids of every savepoint
+        # that committed with it; the later ones find their sets empty.
+        ids: set[int] = set()
+        for pending in list(_pending_sets().values()):
+            if pending.refresh is self.refresh:
+                ids |= pending.ids
+                pending.ids = set()
+        ids |= self.ids
+        self.ids = set()
+        _run(self.refresh, ids)
+
+
+def _pending_sets() -> weakref.WeakValueDictionary[tuple[Refresh, tuple[str, ...]], _PendingIds]:
+    # Only the queued ``on_commit`` callback holds a set strongly, so a rolled
+    # back savepoint's set disappears from this mapping with its callback.
+    return connection.__dict__.setdefault("_deferred_refresh_ids", weakref.WeakValueDictionary())
+
+
+def _run(refresh: Refresh, ids: set[int]) -> None:
+    if not ids:
+        return
+    try:
+        # Savepoint, so a failed refresh cannot poison the caller's transaction.
+        with transaction.atomic():
+            refresh(*ids)
+    except Exception:
+        logger.exception("Failed to run %s: ids=%s", refresh.__qualname__, sorted(ids))
+
+
+def refresh_on_commit(refresh: Refresh, ids: Iterable[int | None]) -> None:
+    """Call ``refresh(*ids)`` once the current transaction commits, batched with other calls."""
+    wanted = {pk for pk in ids if pk}
+    if not wanted:
+        return
+    if not connection.in_atomic_block:
+        _run(refresh, wanted)
+        return
+    pending_sets = _pending_sets()
+    key = (refresh, tuple(connection.savepoint_ids))
+    pending = pending_sets.get(key)
+    # A set that already flushed belongs to a committed transaction.
+    if pending is None or not pending.registered:
+        pending = _PendingIds(refresh)
+        pending_sets[key] = pending
+        pending.register()
+    pending.ids.update(wanted)
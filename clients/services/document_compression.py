@@ -0,0 +1,198 @@
+"""Deferred upload-image compression as a document job stage.
+
+Compressing in the ``pre_save`` receiver (Pillow decode, LANCZOS resize, WEBP
+encode with ``optimize=True``) kept phone-photo uploads waiting for seconds.
+With ``DEFER_UPLOAD_IMAGE_COMPRESSION`` the original is stored as-is and an
+``image_compression`` job is queued next to the OCR jobs. The job waits until
+no OCR job for the document is pending or processing (OCR keys its
+file-identity check on the stored name, so the file must not move under it),
+then writes the compressed rendition and swaps ``Document.file`` in one
+row-locked transaction. The original is deleted only after commit.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+from pathlib import PurePosixPath
+from typing import Any
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from clients.models import Document, DocumentProcessingJob
+from clients.services.document_processing_common import (
+    DEFAULT_JOB_LEASE_SECONDS,
+    DEFAULT_JOB_MAX_ATTEMPTS,
+    DocumentProcessingRunResult,
+    _document_file_identity,
+)
+from clients.services.image_compression import compress_image, get_compression_settings, should_compress
+
+logger = logging.getLogger(__name__)
+
+OCR_WAIT_SECONDS = 30
+ACTIVE_JOB_STATUSES = (DocumentProcessingJob.STATUS_PENDING, DocumentProcessingJob.STATUS_PROCESSING)
+
+
+def deferred_compression_enabled() -> bool:
+    return bool(getattr(settings, "DEFER_UPLOAD_IMAGE_COMPRESSION", False))
+
+
+def enqueue_document_compression_job(*, document: Document) -> DocumentProcessingJob | None:
+    """Queue background compression for the document's current image file."""
+    if not document.pk or not document.file or not should_compress(str(document.file.name or "")):
+        return None
+    settle_seconds = int(getattr(settings, "DEFERRED_IMAGE_COMPRESSION_DELAY_SECONDS", OCR_WAIT_SECONDS))
+    job, _created = DocumentProcessingJob.objects.update_or_create(
+        document=document,
+        job_type=DocumentProcessingJob.JOB_TYPE_IMAGE_COMPRESSION,
+        defaults={
+            "status": DocumentProcessingJob.STATUS_PENDING,
+            "source_file_name": _document_file_identity(document),
+            "attempts": 0,
+            "max_attempts": DEFAULT_JOB_MAX_ATTEMPTS,
+            "error_message": "",
+            "next_attempt_at": timezone.now() + timedelta(seconds=max(0, settle_seconds)),
+            "lease_expires_at": None,
+            "started_at": None,
+            "completed_at": None,
+            "is_demo_data": bool(getattr(document, "is_demo_data", False)),
+            "priority": DocumentProcessingJob.PRIORITY_BACKFILL,
+        },
+    )
+    return job
+
+
+def _has_active_ocr_job(document_id: int) -> bool:
+    return (
+        DocumentProcessingJob.objects.filter(document_id=document_id, status__in=ACTIVE_JOB_STATUSES)
+        .exclude(job_type=DocumentProcessingJob.JOB_TYPE_IMAGE_COMPRESSION)
+        .exists()
+    )
+
+
+def _postpone(job: DocumentProcessingJob, *, processing: bool) -> DocumentProcessingRunResult:
+    """Hand the job back to the queue without spending an attempt."""
+    update_fields = ["next_attempt_at"]
+    job.next_attempt_at = timezone.now() + timedelta(seconds=OCR_WAIT_SECONDS)
+    if processing:
+        job.status = DocumentProcessingJob.STATUS_PENDING
+        job.attempts = max(0, job.attempts - 1)
+        job.lease_expires_at = None
+        update_fields += ["status", "attempts", "lease_expires_at"]
+    job.save(update_fields=update_fields)
+    return DocumentProcessingRunResult(
+        job=job,
+        status="skipped",
+        processed=False,
+        message=str(_("Waiting for OCR to finish reading the original file.")),
+    )
+
+
+def _delete_stored_file(storage: Any, name: str) -> None:
+    # django_cleanup may already have removed the replaced file.
+    if storage.exists(name):
+        storage.delete(name)
+
+
+def _finish(job_id: int, *, status: str, error_message: str = "", processed: bool = False) -> DocumentProcessingRunResult:
+    with transaction.atomic():
+        job = DocumentProcessingJob.objects.select_for_update().get(pk=job_id)
+        retry = status == DocumentProcessingJob.STATUS_FAILED and job.attempts < job.max_attempts
+        job.status = DocumentProcessingJob.STATUS_PENDING if retry else status
+        job.error_message = error_message
+        job.completed_at = None if retry else timezone.now()
+        job.next_attempt_at = timezone.now() + timedelta(seconds=OCR_WAIT_SECONDS * job.attempts) if retry else None
+        job.lease_expires_at = None
+        job.save(update_fields=["status", "error_message", "completed_at", "next_attempt_at", "lease_expires_at"])
+    return DocumentProcessingRunResult(
+        job=job,
+        status=job.status,
+        processed=processed,
+        message=error_message,
+    )
+
+
+def process_document_compression_job(*, job_id: int) -> DocumentProcessingRunResult:
+    """Compress the stored original and atomically swap it for the rendition."""
+
+    with transaction.atomic():
+        job = (
+            DocumentProcessingJob.objects.select_for_update()
+            .select_related("document")
+            .get(pk=job_id)
+        )
+        skipped = claim_compression_job(job)
+    if skipped is not None:
+        return skipped
+    return run_claimed_compression_job(job)
+
+
+def claim_compression_job(job: DocumentProcessingJob) -> DocumentProcessingRunResult | None:
+    """Mark a row-locked compression job as processing.
+
+    Must run inside the transaction that locked *job*. Returns the run result
+    when the job is not claimed (no longer pending, or postponed behind OCR).
+    """
+    if job.status != DocumentProcessingJob.STATUS_PENDING:
+        return DocumentProcessingRunResult(
+            job=job, status=job.status, processed=False, message=str(_("Job is not pending."))
+        )
+    if _has_active_ocr_job(job.document_id):
+        return _postpone(job, processing=False)
+    job.status = DocumentProcessingJob.STATUS_PROCESSING
+    job.attempts += 1
+    job.started_at = timezone.now()
+    job.lease_expires_at = job.started_at + timedelta(seconds=DEFAULT_JOB_LEASE_SECONDS)
+    job.save(update_fields=["status", "attempts", "started_at", "lease_expires_at"])
+    return None
+
+
+def run_claimed_compression_job(job: DocumentProcessingJob) -> DocumentProcessingRunResult:
+    document = job.document
+    original_name = str(document.file.name or "")
+    if not original_name or _document_file_identity(document) != job.source_file_name or not should_compress(original_name):
+        return _finish(job.pk, status=DocumentProcessingJob.STATUS_COMPLETED, error_message=str(_("File changed; nothing to compress.")))
+
+    storage = document.file.storage
+    compression = get_compression_settings()
+    output_format = "WEBP" if compression["convert_to_webp"] else "JPEG"
+    try:
+        with storage.open(original_name, "rb") as source:
+            buffer, new_ext = compress_image(source, output_format=output_format)
+        target_name = str(PurePosixPath(original_name).with_suffix(new_ext))
+        stored_name = storage.save(target_name, ContentFile(buffer.getvalue()))
+    except Exception as exc:
+        logger.warning(
+            "Deferred image compression failed: job_id=%s document_id=%s error_type=%s",
+            job.pk,
+            job.document_id,
+            type(exc).__name__,
+        )
+        return _finish(job.pk, status=DocumentProcessingJob.STATUS_FAILED, error_message=str(_("Image compression failed.")))
+
+    with transaction.atomic():
+        locked = Document.all_objects.select_for_update().get(pk=document.pk)
+        if str(locked.file.name or "") != original_name or _has_active_ocr_job(locked.pk):
+            # Re-uploaded or re-queued for OCR while we were encoding: keep the
+            # current file, drop the rendition and try again later if needed.
+            transaction.on_commit(lambda: storage.delete(stored_name))
+            swapped = False
+        else:
+            locked.file.name = stored_name
+            locked.save(update_fields=["file"])
+            transaction.on_commit(lambda: _delete_stored_file(storage, original_name))
+            swapped = True
+
+    if not swapped:
+        job.refresh_from_db()
+        if _has_active_ocr_job(document.pk):
+            return _postpone(job, processing=True)
+        return _finish(job.pk, status=DocumentProcessingJob.STATUS_COMPLETED, error_message=str(_("File changed; nothing to compress.")))
+
+    DocumentProcessingJob.objects.filter(pk=job.pk).update(source_file_name=_document_file_identity(locked))
+    logger.info("Deferred image compression swapped document %s to its compressed rendition", document.pk)
+    return _finish(job.pk, status=DocumentProcessingJob.STATUS_COMPLETED, processed=True)
@@ -53,7 +53,16 @@ def copy_document_to_case(document: Document, target_case: Case) -> Document:
         is_demo_data=document.is_demo_data,
         copied_from_document=document,
     )
-    if document.file:
+    copy_stored_file = getattr(document.file.storage, "copy", None) if document.file else None
+    if document.file and callable(copy_stored_file):
+        # Content-addressed storage: the new name shares the original bytes.
+        try:
+            filename = os.path.basename(document.file.name or "")
+            new_doc.file.name = copy_stored_file(document.file.name, new_doc.file.field.generate_filename(new_doc, filename))
+        except Exception:
+            logger.exception("Failed to copy document file reference, referencing original: document_id=%s", document.pk)
+            new_doc.file = document.file
+    elif document.file:
         try:
             document.file.seek(0)
             content = document.file.read()
@@ -0,0 +1,136 @@
+"""Lease heartbeat, time budget and cooperative cancellation for OCR jobs.
+
+A claimed job holds a lease until ``lease_expires_at``; once it lapses,
+``reclaim_stale_document_jobs`` hands the job to another worker. The worker
+that claimed it activates a ``DocumentJobLease`` for the rest of the run, and
+the OCR code calls ``ocr_checkpoint()`` between pages. Each checkpoint:
+
+* aborts with ``DocumentJobBudgetExceeded`` once the job has run longer than
+  ``DOCUMENT_JOB_TIME_BUDGET_SECONDS``;
+* extends the lease (at most every ``LEASE_RENEW_MIN_INTERVAL_SECONDS``) with
+  an UPDATE fenced on the attempt number the worker claimed. If the row no
+  longer matches, another worker owns the job, and the checkpoint aborts with
+  ``DocumentJobLeaseRevoked`` instead of finishing a duplicate OCR run.
+
+The finalizers call ``document_job_lease_lost`` under their row lock, so a
+worker that finished OCR after losing its lease does not write its result
+over the new owner's.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from clients.models import DocumentProcessingJob
+from clients.services.job_metrics import (
+    OCR_LEASE_RENEWED,
+    OCR_LEASE_REVOKED_ABORTED,
+    OCR_STALE_RESULT_DISCARDED,
+    OCR_TIME_BUDGET_EXCEEDED,
+    increment_job_metric,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_TIME_BUDGET_SECONDS = 900
+LEASE_RENEW_MIN_INTERVAL_SECONDS = 5.0
+
+
+class DocumentJobInterrupted(Exception):
+    """Raised by ``ocr_checkpoint`` to stop a job between pages."""
+
+
+class DocumentJobLeaseRevoked(DocumentJobInterrupted):
+    pass
+
+
+class DocumentJobBudgetExceeded(DocumentJobInterrupted):
+    pass
+
+
+class DocumentJobLease:
+    def __init__(self, *, job_id: int, attempt: int, lease_seconds: int, budget_seconds: float) -> None:
+        self.job_id = job_id
+        self.attempt = attempt
+        self.lease_seconds = lease_seconds
+        now = time.monotonic()
+        self.deadline = now + budget_seconds
+        self.renewed_at = now
+        self.revoked = False
+
+    def checkpoint(self) -> None:
+        now = time.monotonic()
+        if now >= self.deadline:
+            increment_job_metric(OCR_TIME_BUDGET_EXCEEDED)
+            logger.warning("Document job %s exceeded its time budget; aborting.", self.job_id)
+            raise DocumentJobBudgetExceeded(f"Document job {self.job_id} exceeded its time budget.")
+        if now - self.renewed_at >= LEASE_RENEW_MIN_INTERVAL_SECONDS:
+            self.renew()
+
+    def renew(self) -> None:
+        updated = DocumentProcessingJob.objects.filter(
+            pk=self.job_id,
+            status=DocumentProcessingJob.STATUS_PROCESSING,
+            attempts=self.attempt,
+        ).update(lease_expires_at=timezone.now() + timedelta(seconds=self.lease_seconds))
+        if not updated:
+            self.revoked = True
+            increment_job_metric(OCR_LEASE_REVOKED_ABORTED)
+            logger.warning(
+                "Document job %s lease was revoked (attempt %s); aborting the duplicate run.",
+                self.job_id,
+                self.attempt,
+            )
+            raise DocumentJobLeaseRevoked(f"Document job {self.job_id} is owned by another worker.")
+        self.renewed_at = time.monotonic()
+        increment_job_metric(OCR_LEASE_RENEWED)
+
+    def is_held_by(self, job: DocumentProcessingJob) -> bool:
+        return job.status == DocumentProcessingJob.STATUS_PROCESSING and job.attempts == self.attempt
+
+
+_active_lease: ContextVar[DocumentJobLease | None] = ContextVar("document_job_lease", default=None)
+
+
+@contextmanager
+def activate_document_job_lease(job: DocumentProcessingJob, *, lease_seconds: int) -> Iterator[DocumentJobLease]:
+    """Hold the lease on a just-claimed *job* for the duration of the block."""
+    budget = float(getattr(settings, "DOCUMENT_JOB_TIME_BUDGET_SECONDS", DEFAULT_JOB_TIME_BUDGET_SECONDS))
+    lease = DocumentJobLease(
+        job_id=job.pk,
+        attempt=job.attempts,
+        lease_seconds=lease_seconds,
+        budget_seconds=budget,
+    )
+    token = _active_lease.set(lease)
+    try:
+        yield lease
+    finally:
+        _active_lease.reset(token)
+
+
+def ocr_checkpoint() -> None:
+    """Renew the active job lease, or abort the job; a no-op outside a job."""
+    lease = _active_lease.get()
+    if lease is not None:
+        lease.checkpoint()
+
+
+def document_job_lease_lost(job: DocumentProcessingJob) -> bool:
+    """Whether the current worker's lease on the row-locked *job* is gone."""
+    lease = _active_lease.get()
+    if lease is None or lease.job_id != job.pk:
+        return False
+    if lease.is_held_by(job) and not lease.revoked:
+        return False
+    if not lease.revoked:
+        increment_job_metric(OCR_STALE_RESULT_DISCARDED)
+        logger.warning("Discarding the result of document job %s: its lease was taken over.", job.pk)
+    return True
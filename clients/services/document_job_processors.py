@@ -23,6 +23,7 @@ from clients.models import Case, Client, Document, DocumentProcessingJob
 from clients.security.encrypted import read_encrypted_json_dict
 from clients.services.activity import log_client_activity
 from clients.services.company_parser import parse_company_doc
+from clients.services.document_job_lease import document_job_lease_lost
 from clients.services.document_processing_common import (
     MANUAL_WEZWANIE_REVIEW_MESSAGE,
     DocumentProcessingRunResult,
@@ -50,6 +51,15 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+def _lease_lost_result(job: DocumentProcessingJob) -> DocumentProcessingRunResult:
+    return DocumentProcessingRunResult(
+        job=job,
+        status="skipped",
+        processed=False,
+        message=_("Job was taken over by another worker."),
+    )
+
+
 def _check_client_name_in_document(client: Client, detected_names: list[str], text: str) -> bool:
     """
     Checks if client's name matches one of the detected names,
@@ -699,6 +709,8 @@ def _finalize_failed_company_job(
 ) -> DocumentProcessingRunResult:
     with transaction.atomic():
         job = DocumentProcessingJob.objects.select_for_update().get(pk=job_id)
+        if document_job_lease_lost(job):
+            return _lease_lost_result(job)
         job.status = DocumentProcessingJob.STATUS_FAILED
         job.error_message = error_message
         job.completed_at = timezone.now()
@@ -727,6 +739,8 @@ def _finalize_successful_company_job(
 ) -> DocumentProcessingRunResult:
     with transaction.atomic():
         job = DocumentProcessingJob.objects.select_for_update().get(pk=job_id)
+        if document_job_lease_lost(job):
+            return _lease_lost_result(job)
         job.status = DocumentProcessingJob.STATUS_COMPLETED
         job.completed_at = timezone.now()
         job.error_message = ""
@@ -778,6 +792,8 @@ def _finalize_failed_ocr_job(
 ) -> DocumentProcessingRunResult:
     with transaction.atomic():
         job = DocumentProcessingJob.objects.select_for_update().get(pk=job_id)
+        if document_job_lease_lost(job):
+            return _lease_lost_result(job)
         job.status = DocumentProcessingJob.STATUS_FAILED
         job.error_message = error_message
         job.completed_at = timezone.now()
@@ -807,6 +823,8 @@ def _finalize_successful_ocr_job(
 ) -> DocumentProcessingRunResult:
     with transaction.atomic():
         job = DocumentProcessingJob.objects.select_for_update().get(pk=job_id)
+        if document_job_lease_lost(job):
+            return _lease_lost_result(job)
         job.status = DocumentProcessingJob.STATUS_COMPLETED
         job.completed_at = timezone.now()
         job.error_message = ""
@@ -867,6 +885,8 @@ def _finalize_failed_document_job(
             .select_related("document", "document__client")
             .get(pk=job_id)
         )
+        if document_job_lease_lost(job):
+            return _lease_lost_result(job)
         document = Document.objects.select_for_update().select_related("client").get(pk=job.document_id)
         if not _job_matches_processing_state(job, document, source_file_name):
             return DocumentProcessingRunResult(
@@ -930,6 +950,8 @@ def _finalize_successful_document_job(
             .select_related("document", "document__client")
             .get(pk=job_id)
         )
+        if document_job_lease_lost(job):
+            return _lease_lost_result(job)
         document = Document.objects.select_for_update().select_related("client").get(pk=job.document_id)
         if not _job_matches_processing_state(job, document, source_file_name):
             return DocumentProcessingRunResult(
@@ -0,0 +1,229 @@
+"""Which queued document job runs next.
+
+The queue used to run strictly by ``created_at``, so an urgent staff re-OCR
+waited behind a client's bulk upload. Ready jobs are now picked by:
+
+1. priority class: staff-interactive, then client portal, then background
+   work (``DocumentProcessingJob.PRIORITY_*``);
+2. round-robin across clients within a class: a client's n-th queued job
+   waits for every other client's (n-1)-th, so 60 ZUS months from one client
+   interleave with everybody else's uploads;
+3. age, as the tie-breaker.
+
+A job type at its concurrency cap (``DOCUMENT_JOB_TYPE_CONCURRENCY``, counted
+over jobs processing in every worker) is passed over, so heavy PDF OCR can
+never occupy all workers while passport jobs queue up. The pick only skips
+types that look full; ``claim_job_type_slot`` enforces the cap again inside
+the claim transaction, where concurrent workers are serialized.
+
+The dispatcher ranks the queue once per batch and, before every job, only
+reads the jobs queued since (a primary-key range), so a staff job queued
+mid-batch is picked up next. ``served`` carries the per-client counts of the
+current batch, which keeps the round-robin fair.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from django.conf import settings
+from django.db import models
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from clients.models import DocumentProcessingJob
+from clients.services.client_names import client_display_names
+
+# Jobs per client and priority class considered per pick; deeper entries
+# cannot be next anyway and would only make the scan proportional to backlog.
+FAIR_SHARE_DEPTH = 20
+DEFAULT_JOB_TYPE_CONCURRENCY = {
+    DocumentProcessingJob.JOB_TYPE_ZUS_OCR: 1,
+    DocumentProcessingJob.JOB_TYPE_INSURANCE_OCR: 1,
+    DocumentProcessingJob.JOB_TYPE_RENTAL_OCR: 1,
+    DocumentProcessingJob.JOB_TYPE_COMPANY_DOC_OCR: 1,
+    DocumentProcessingJob.JOB_TYPE_IMAGE_COMPRESSION: 1,
+}
+
+
+@dataclass(frozen=True)
+class QueuedDocumentJob:
+    id: int
+    job_type: str
+    priority: int
+    client_id: int
+    created_at: datetime
+    attempts: int
+    client_rank: int
+
+
+def job_type_concurrency_caps() -> dict[str, int]:
+    """Maximum jobs of each type processing at once; types not listed are uncapped."""
+    caps = dict(DEFAULT_JOB_TYPE_CONCURRENCY)
+    caps.update(getattr(settings, "DOCUMENT_JOB_TYPE_CONCURRENCY", {}) or {})
+    return {job_type: int(cap) for job_type, cap in caps.items() if cap is not None}
+
+
+def processing_job_counts() -> Counter[str]:
+    rows = (
+        DocumentProcessingJob.objects.filter(status=DocumentProcessingJob.STATUS_PROCESSING)
+        .values("job_type")
+        .annotate(count=models.Count("id"))
+        .order_by()
+    )
+    return Counter({row["job_type"]: row["count"] for row in rows})
+
+
+def claim_job_type_slot(job_type: str) -> bool:
+    """Whether a *job_type* job may start now; call inside the claim transaction.
+
+    Every claimer of a capped type first locks the same row, the type's oldest
+    unfinished job, so the processing count below cannot be read by two
+    workers before either has committed its claim.
+    """
+    cap = job_type_concurrency_caps().get(job_type)
+    if cap is None:
+        return True
+    unfinished = DocumentProcessingJob.objects.filter(
+        job_type=job_type,
+        status__in=(DocumentProcessingJob.STATUS_PENDING, DocumentProcessingJob.STATUS_PROCESSING),
+    )
+    list(unfinished.select_for_update().order_by("pk").values_list("pk", flat=True)[:1])
+    return unfinished.filter(status=DocumentProcessingJob.STATUS_PROCESSING).count() < cap
+
+
+def _ready_jobs_queryset(now: datetime) -> models.QuerySet[DocumentProcessingJob]:
+    return DocumentProcessingJob.objects.filter(
+        status=DocumentProcessingJob.STATUS_PENDING,
+        attempts__lt=models.F("max_attempts"),
+    ).filter(models.Q(next_attempt_at__isnull=True) | models.Q(next_attempt_at__lte=now))
+
+
+def ready_document_jobs(*, now: datetime | None = None) -> list[QueuedDocumentJob]:
+    """Each client's oldest ready jobs per priority class (``FAIR_SHARE_DEPTH`` at most)."""
+    now = now or timezone.now()
+    rows = (
+        _ready_jobs_queryset(now)
+        .annotate(
+            client_rank=models.Window(
+                RowNumber(),
+                partition_by=[models.F("priority"), models.F("document__client_id")],
+                order_by=[models.F("created_at").asc(), models.F("id").asc()],
+            )
+        )
+        .filter(client_rank__lte=FAIR_SHARE_DEPTH)
+        .values_list("id", "job_type", "priority", "document__client_id", "created_at", "attempts", "client_rank")
+    )
+    return [QueuedDocumentJob(*row) for row in rows]
+
+
+def latest_document_job_id() -> int:
+    """High-water mark for ``queued_document_jobs_since``."""
+    return DocumentProcessingJob.objects.aggregate(latest=models.Max("pk"))["latest"] or 0
+
+
+def queued_document_jobs_since(
+    after_id: int,
+    *,
+    known: list[QueuedDocumentJob],
+    now: datetime | None = None,
+) -> list[QueuedDocumentJob]:
+    """Ready jobs queued after *after_id*, ranked behind the *known* ones.
+
+    A new job's ``client_rank`` continues its client's count in *known* for
+    the same priority class, as the window in ``ready_document_jobs`` would.
+    """
+    now = now or timezone.now()
+    rows = (
+        _ready_jobs_queryset(now)
+        .filter(pk__gt=after_id)
+        .order_by("pk")
+        .values_list("id", "job_type", "priority", "document__client_id", "created_at", "attempts")
+    )
+    ranks = Counter((job.priority, job.client_id) for job in known)
+    known_ids = {job.id for job in known}
+    jobs = []
+    for row in rows:
+        if row[0] in known_ids:
+            continue
+        ranks[(row[2], row[3])] += 1
+        jobs.append(QueuedDocumentJob(*row, client_rank=ranks[(row[2], row[3])]))
+    return jobs
+
+
+def schedule_document_jobs(
+    jobs: list[QueuedDocumentJob],
+    *,
+    served: Counter[int] | None = None,
+) -> list[QueuedDocumentJob]:
+    """Order *jobs* by priority class, then round-robin across clients, then age."""
+    served = served or Counter()
+    return sorted(
+        jobs,
+        key=lambda job: (job.priority, job.client_rank + served[job.client_id], job.created_at, job.id),
+    )
+
+
+def next_document_job(
+    *,
+    served: Counter[int] | None = None,
+    skip_ids: set[int] | frozenset[int] = frozenset(),
+    ready: list[QueuedDocumentJob] | None = None,
+) -> QueuedDocumentJob | None:
+    """The job to run now, honouring per-type caps, or ``None``.
+
+    *ready* is the batch's ranked queue; without it the queue is read here.
+    """
+    caps = job_type_concurrency_caps()
+    running = processing_job_counts()
+    if ready is None:
+        ready = ready_document_jobs()
+    for job in schedule_document_jobs(ready, served=served):
+        if job.id in skip_ids:
+            continue
+        cap = caps.get(job.job_type)
+        if cap is not None and running[job.job_type] >= cap:
+            continue
+        return job
+    return None
+
+
+def planned_document_job_order(*, limit: int = 10) -> dict[str, Any]:
+    """The next *limit* ready jobs in dispatch order, for the admin dashboard.
+
+    Jobs carry client ids only, since the dashboard caches the plan in the
+    shared cache; ``with_client_names`` adds the decrypted names per request.
+    """
+    caps = job_type_concurrency_caps()
+    running = processing_job_counts()
+    upcoming = schedule_document_jobs(ready_document_jobs())[:limit]
+    priority_labels = dict(DocumentProcessingJob.PRIORITY_CHOICES)
+    job_type_labels = dict(DocumentProcessingJob.JOB_TYPE_CHOICES)
+    jobs = [
+        {
+            "position": position,
+            "id": job.id,
+            "priority": job.priority,
+            "priority_label": priority_labels.get(job.priority, job.priority),
+            "job_type_label": job_type_labels.get(job.job_type, job.job_type),
+            "client_id": job.client_id,
+            "created_at": job.created_at,
+            "attempts": job.attempts,
+            "at_capacity": job.job_type in caps and running[job.job_type] >= caps[job.job_type],
+        }
+        for position, job in enumerate(upcoming, start=1)
+    ]
+    lanes = [
+        {"job_type_label": job_type_labels.get(job_type, job_type), "running": running[job_type], "cap": cap}
+        for job_type, cap in sorted(caps.items())
+    ]
+    return {"jobs": jobs, "lanes": lanes}
+
+
+def with_client_names(plan: dict[str, Any]) -> dict[str, Any]:
+    """A copy of *plan* whose jobs also carry ``client_name``."""
+    names = client_display_names({job["client_id"] for job in plan["jobs"]})
+    jobs = [{**job, "client_name": names.get(job["client_id"], "")} for job in plan["jobs"]]
+    return {**plan, "jobs": jobs}
@@ -8,15 +8,29 @@ from __future__ import annotations
 import logging
 import os
 import tempfile
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from django.db import models, transaction
+from django.db import transaction
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from clients.models import Document, DocumentProcessingJob
 from clients.security.encrypted import EncryptedFieldUnavailableError, read_encrypted_json_dict
+from clients.services.document_compression import claim_compression_job, run_claimed_compression_job
+from clients.services.document_job_lease import (
+    DocumentJobBudgetExceeded,
+    DocumentJobLeaseRevoked,
+    activate_document_job_lease,
+)
+from clients.services.document_job_scheduling import (
+    claim_job_type_slot,
+    latest_document_job_id,
+    next_document_job,
+    queued_document_jobs_since,
+    ready_document_jobs,
+)
 from clients.services.document_processing_common import (
     DEFAULT_JOB_LEASE_SECONDS,
     DEFAULT_JOB_MAX_ATTEMPTS,
@@ -28,11 +42,14 @@ from clients.services.document_processing_common import (
 from clients.services.document_workflow_wezwanie import (
     _has_meaningful_parsed_data,
 )
+from clients.services.job_metrics import OCR_LEASE_RECLAIMED, increment_job_metric
+from clients.services.job_wakeups import DOCUMENT_JOBS_CHANNEL, notify_job_queued
 from clients.services.notifications import (
     send_appointment_notification_email,
     send_missing_documents_email,
 )
 from clients.services.wezwanie_parser import parse_wezwanie
+from legalize_site.metrics import DOCUMENT_JOB_ATTEMPTS, DOCUMENT_JOB_DURATION, DOCUMENT_JOB_WAIT, observe
 
 if TYPE_CHECKING:
     from django.contrib.auth.models import AbstractBaseUser, AnonymousUser
@@ -40,6 +57,7 @@ if TYPE_CHECKING:
 from clients.services.document_job_processors import (
     _finalize_failed_document_job,
     _finalize_successful_document_job,
+    _lease_lost_result,
     _process_company_doc_job_internal,
     _process_insurance_doc_job_internal,
     _process_passport_doc_job_internal,
@@ -56,8 +74,19 @@ def enqueue_document_processing_job(
     actor: AbstractBaseUser | AnonymousUser | None = None,
     requires_confirmation: bool = False,
     job_type: str = DocumentProcessingJob.JOB_TYPE_WEZWANIE_OCR,
+    priority: int | None = None,
 ) -> DocumentProcessingJob:
-    """Queue background OCR work for the current document file."""
+    """Queue background OCR work for the current document file.
+
+    Without an explicit *priority*, uploads by staff are interactive and
+    everything else (client portal, scripts) runs at portal priority.
+    """
+    if priority is None:
+        priority = (
+            DocumentProcessingJob.PRIORITY_INTERACTIVE
+            if actor is not None and actor.is_authenticated and getattr(actor, "is_staff", False)
+            else DocumentProcessingJob.PRIORITY_PORTAL
+        )
 
     job_defaults = {
         "created_by": actor if actor and actor.is_authenticated else None,
@@ -70,6 +99,7 @@ def enqueue_document_processing_job(
         "started_at": None,
         "completed_at": None,
         "requires_confirmation": requires_confirmation,
+        "priority": priority,
     }
 
     with transaction.atomic():
@@ -82,6 +112,7 @@ def enqueue_document_processing_job(
         document.ocr_status = "pending"
         document.ocr_name_mismatch = False
         document.save(update_fields=["awaiting_confirmation", "ocr_status", "ocr_name_mismatch"])
+        notify_job_queued(DOCUMENT_JOBS_CHANNEL)
 
     return job
 
@@ -93,31 +124,45 @@ def process_pending_document_jobs(
     send_missing_email: NotificationSender | None = None,
     send_appointment_email: NotificationSender | None = None,
 ) -> list[DocumentProcessingRunResult]:
-    """Process queued OCR jobs in FIFO order."""
-    reclaim_stale_document_jobs()
+    """Process queued OCR jobs by priority, fairly across clients.
 
-    now = timezone.now()
-
-    queryset = DocumentProcessingJob.objects.filter(
-        status=DocumentProcessingJob.STATUS_PENDING,
-        attempts__lt=models.F("max_attempts"),
-    ).filter(
-        models.Q(next_attempt_at__isnull=True) | models.Q(next_attempt_at__lte=now)
-    ).order_by("created_at")
-
-    if limit is not None:
-        queryset = queryset[:limit]
+    The queue is ranked once per batch and jobs queued since are added before
+    every pick (see ``clients.services.document_job_scheduling``), so staff
+    jobs queued while a batch runs jump ahead of the rest of it.
+    """
+    reclaim_stale_document_jobs()
 
-    job_ids = list(queryset.values_list("id", flat=True))
-    return [
-        process_document_processing_job(
-            job_id=job_id,
-            parser=parser,
-            send_missing_email=send_missing_email,
-            send_appointment_email=send_appointment_email,
+    results: list[DocumentProcessingRunResult] = []
+    served: Counter[int] = Counter()
+    attempted: set[int] = set()
+    high_water = latest_document_job_id()
+    ready = ready_document_jobs()
+    while limit is None or len(results) < limit:
+        if results:
+            arrived = queued_document_jobs_since(high_water, known=ready)
+            if arrived:
+                high_water = arrived[-1].id
+                ready.extend(arrived)
+        queued = next_document_job(served=served, skip_ids=attempted, ready=ready)
+        if queued is None and results:
+            # The batch may have used up the ``FAIR_SHARE_DEPTH`` jobs ranked
+            # per client; rank the queue again before giving up.
+            high_water = latest_document_job_id()
+            ready = ready_document_jobs()
+            queued = next_document_job(served=served, skip_ids=attempted, ready=ready)
+        if queued is None:
+            break
+        attempted.add(queued.id)
+        served[queued.client_id] += 1
+        results.append(
+            process_document_processing_job(
+                job_id=queued.id,
+                parser=parser,
+                send_missing_email=send_missing_email,
+                send_appointment_email=send_appointment_email,
+            )
         )
-        for job_id in job_ids
-    ]
+    return results
 
 
 def process_document_processing_job(
@@ -139,33 +184,84 @@ def process_document_processing_job(
             .select_related("document", "document__client")
             .get(pk=job_id)
         )
-        if job.status != DocumentProcessingJob.STATUS_PENDING:
+        if job.status == DocumentProcessingJob.STATUS_PENDING and not claim_job_type_slot(job.job_type):
+            return DocumentProcessingRunResult(
+                job=job,
+                status=job.status,
+                processed=False,
+                message=_("Job type is at its concurrency cap."),
+            )
+        if job.job_type == DocumentProcessingJob.JOB_TYPE_IMAGE_COMPRESSION:
+            # Same claim query as OCR; the compression stage runs after commit.
+            skipped = claim_compression_job(job)
+            if skipped is not None:
+                return skipped
+        elif job.status != DocumentProcessingJob.STATUS_PENDING:
             return DocumentProcessingRunResult(
                 job=job,
                 status=job.status,
                 processed=False,
                 message=_("Job is not pending."),
             )
+        else:
+            source_file_name = job.source_file_name or _document_file_identity(job.document)
+            job.status = DocumentProcessingJob.STATUS_PROCESSING
+            job.attempts += 1
+            job.started_at = timezone.now()
+            job.lease_expires_at = job.started_at + timedelta(seconds=DEFAULT_JOB_LEASE_SECONDS)
+            job.error_message = ""
+            job.completed_at = None
+            job.save(
+                update_fields=[
+                    "status",
+                    "attempts",
+                    "started_at",
+                    "lease_expires_at",
+                    "error_message",
+                    "completed_at",
+                ]
+            )
+            document_file = job.document.file
+
+    if job.job_type == DocumentProcessingJob.JOB_TYPE_IMAGE_COMPRESSION:
+        return run_claimed_compression_job(job)
 
-        source_file_name = job.source_file_name or _document_file_identity(job.document)
-        job.status = DocumentProcessingJob.STATUS_PROCESSING
-        job.attempts += 1
-        job.started_at = timezone.now()
-        job.lease_expires_at = job.started_at + timedelta(seconds=DEFAULT_JOB_LEASE_SECONDS)
-        job.error_message = ""
-        job.completed_at = None
-        job.save(
-            update_fields=[
-                "status",
-                "attempts",
-                "started_at",
-                "lease_expires_at",
-                "error_message",
-                "completed_at",
-            ]
+    with activate_document_job_lease(job, lease_seconds=DEFAULT_JOB_LEASE_SECONDS):
+        result = _run_claimed_document_job(
+            job,
+            source_file_name=source_file_name,
+            document_file=document_file,
+            parser=parser,
+            send_missing_email=send_missing_email,
+            send_appointment_email=send_appointment_email,
         )
-        document_file = job.document.file
+    _observe_document_job_run(job, result)
+    return result
 
+
+def _observe_document_job_run(job: DocumentProcessingJob, result: DocumentProcessingRunResult) -> None:
+    started_at = job.started_at or timezone.now()
+    observe(DOCUMENT_JOB_WAIT, (started_at - job.created_at).total_seconds(), job_type=job.job_type)
+    observe(
+        DOCUMENT_JOB_DURATION,
+        (timezone.now() - started_at).total_seconds(),
+        job_type=job.job_type,
+        outcome=result.status,
+    )
+    if result.status in {DocumentProcessingJob.STATUS_COMPLETED, DocumentProcessingJob.STATUS_FAILED}:
+        observe(DOCUMENT_JOB_ATTEMPTS, job.attempts, job_type=job.job_type)
+
+
+def _run_claimed_document_job(
+    job: DocumentProcessingJob,
+    *,
+    source_file_name: str,
+    document_file: Any,
+    parser: Parser,
+    send_missing_email: NotificationSender,
+    send_appointment_email: NotificationSender,
+) -> DocumentProcessingRunResult:
+    job_id = job.id
     _parsed_data, parsed_data_unavailable = read_encrypted_json_dict(
         job.document,
         "parsed_data",
@@ -204,6 +300,14 @@ def process_document_processing_job(
             parsed = parser(tmp_path)
         finally:
             os.remove(tmp_path)
+    except DocumentJobLeaseRevoked:
+        return _lease_lost_result(job)
+    except DocumentJobBudgetExceeded:
+        return _finalize_failed_document_job(
+            job_id=job_id,
+            source_file_name=source_file_name,
+            error_message=_("OCR exceeded its time budget."),
+        )
     except Exception as exc:
         logger.warning(
             "Automatic wezwanie parsing failed for queued job %s: error_type=%s",
@@ -264,4 +368,6 @@ def reclaim_stale_document_jobs(*, now: datetime | None = None) -> int:
         job.lease_expires_at = None
         job.save(update_fields=["status", "error_message", "completed_at", "next_attempt_at", "lease_expires_at"])
         updated += 1
+    if updated:
+        increment_job_metric(OCR_LEASE_RECLAIMED, updated)
     return updated
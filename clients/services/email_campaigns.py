@@ -12,6 +12,7 @@ from django.db.models import Q
 from django.utils import timezone
 
 from clients.models import Client, EmailCampaign, EmailLog
+from clients.services.job_wakeups import EMAIL_CAMPAIGNS_CHANNEL, notify_job_queued
 from clients.services.notifications import _log_email, _send_confirmation_email, build_email_idempotency_key
 
 if TYPE_CHECKING:
@@ -94,6 +95,7 @@ def queue_mass_email_campaign(
     )
     campaign.set_recipient_emails(normalized_recipients)
     campaign.save()
+    notify_job_queued(EMAIL_CAMPAIGNS_CHANNEL)
     return campaign
 
 
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import hashlib
 import io
 import logging
 import os
@@ -127,8 +128,8 @@ def generate_client_summary_text(client: Client) -> str:
     return "\n".join(lines)
 
 
-def _check_export_size_limit(client: Client, max_mb: int) -> None:
-    """Raise ExportSizeLimitExceeded if client files exceed *max_mb*."""
+def client_export_bytes(client: Client) -> int:
+    """Total stored size of the documents and versions an export of *client* includes."""
     from clients.models import DocumentVersion
 
     total_bytes = 0
@@ -151,17 +152,153 @@ def _check_export_size_limit(client: Client, max_mb: int) -> None:
                     version.pk,
                     exc,
                 )
+    return total_bytes
+
 
-    total_mb = total_bytes / (1024 * 1024)
+def _check_export_size_limit(client: Client, max_mb: int) -> None:
+    """Raise ExportSizeLimitExceeded if client files exceed *max_mb*."""
+    total_mb = client_export_bytes(client) / (1024 * 1024)
     if total_mb > max_mb:
         raise ExportSizeLimitExceeded(total_mb, max_mb)
 
 
+class ArchiveDigestIndex:
+    """Track file digests written to one archive so identical bytes are stored once.
+
+    The same passport scan is routinely attached to several family members and
+    carried from case to case; in a multi-client export each copy would
+    otherwise be written again. Duplicates are listed in ``DUPLICATES.txt``
+    with the path of the copy that was kept.
+    """
+
+    def __init__(self) -> None:
+        self.paths_by_digest: dict[str, str] = {}
+        self.duplicates: list[tuple[str, str]] = []
+        self.file_count = 0
+
+    @property
+    def deduplicated_count(self) -> int:
+        return len(self.duplicates)
+
+    def write(self, zf: zipfile.ZipFile, archive_name: str, data: bytes) -> bool:
+        """Write *data* unless identical bytes are already in the archive."""
+        digest = hashlib.sha256(data).hexdigest()
+        kept = self.paths_by_digest.get(digest)
+        if kept is not None:
+            self.duplicates.append((archive_name, kept))
+            return False
+        zf.writestr(archive_name, data)
+        self.paths_by_digest[digest] = archive_name
+        self.file_count += 1
+        return True
+
+    def write_manifest(self, zf: zipfile.ZipFile, archive_name: str) -> None:
+        if not self.duplicates:
+            return
+        lines = [
+            "DEDUPLICATED FILES",
+            "==================",
+            f"{len(self.duplicates)} file(s) had the same content (sha256) as a file already in this archive.",
+            "Each entry below was not stored again; open the kept copy instead.",
+            "",
+            *(f"{duplicate} -> {kept}" for duplicate, kept in self.duplicates),
+        ]
+        zf.writestr(archive_name, "\n".join(lines))
+
+
+def write_client_archive_entries(
+    zf: zipfile.ZipFile,
+    client: Client,
+    *,
+    prefix: str,
+    digest_index: ArchiveDigestIndex | None = None,
+) -> int:
+    """Add the summary, documents and versions of *client* under *prefix*.
+
+    Returns the number of files that were registered but missing from storage.
+    When *digest_index* is shared across clients, identical document bytes are
+    written only once for the whole archive.
+    """
+
+    digest_index = digest_index if digest_index is not None else ArchiveDigestIndex()
+    missing_files_info = []
+
+    # 1. Summary text file
+    summary = generate_client_summary_text(client)
+    zf.writestr(f"{prefix}/CASE_SUMMARY.txt", summary)
+
+    # 2. All document files
+    documents = client.documents.all().order_by("document_type", "-uploaded_at")
+    for doc in documents:
+        if not doc.file:
+            continue
+        if not document_file_exists(doc):
+            missing_files_info.append(f"Document: ID={doc.pk}, Type={doc.document_type}")
+            continue
+        try:
+            file_name = str(doc.file.name)
+            ext = os.path.splitext(file_name)[1] or ".bin"
+            archive_name = f"{prefix}/documents/document_{doc.pk}{ext}"
+
+            # Avoid duplicate names inside the archive
+            counter = 1
+            base_archive_name = archive_name
+            existing = {info.filename for info in zf.infolist()}
+            while archive_name in existing:
+                archive_name = f"{base_archive_name[:-len(ext)]}_{counter}{ext}"
+                counter += 1
+
+            with doc.file.open("rb") as handle:
+                digest_index.write(zf, archive_name, handle.read())
+        except Exception:
+            logger.exception("Failed to add document %s to ZIP", doc.pk)
+
+    # 3. Document versions (if any)
+    from clients.models import DocumentVersion
+
+    versions = DocumentVersion.objects.filter(
+        document__client=client
+    ).select_related("document").order_by("document__document_type", "-version_number")
+
+    for version in versions:
+        if not version.file:
+            continue
+        file_name = str(version.file.name)
+        if not version.file.storage.exists(file_name):
+            missing_files_info.append(f"Version: ID={version.pk}, DocID={version.document_id}, Version={version.version_number}")
+            continue
+        try:
+            ext = os.path.splitext(file_name)[1] or ".bin"
+            archive_name = f"{prefix}/document_versions/document_version_{version.pk}{ext}"
+            with version.file.open("rb") as handle:
+                digest_index.write(zf, archive_name, handle.read())
+        except Exception:
+            logger.exception("Failed to add version %s to ZIP", version.pk)
+
+    # 4. Missing files report
+    if missing_files_info:
+        missing_report = [
+            "MISSING FILES REPORT",
+            "====================",
+            f"The following {len(missing_files_info)} files were registered in the database but were missing from storage during export.",
+            "They might have been lost if they were stored on ephemeral storage (like a local container on Railway) and the app was redeployed.",
+            "",
+            *missing_files_info,
+            "",
+            f"Report generated: {timezone.now().strftime('%d.%m.%Y %H:%M')}"
+        ]
+        zf.writestr(f"{prefix}/MISSING_FILES.txt", "\n".join(missing_report))
+        logger.warning("ZIP export for client %s finished with %s missing files", client.pk, len(missing_files_info))
+
+    return len(missing_files_info)
+
+
 def generate_client_zip(client: Client) -> io.BytesIO:
     """Create a ZIP archive containing the client summary and all documents.
 
     Returns an in-memory BytesIO buffer ready for streaming to the response.
     Raises ExportSizeLimitExceeded if total file sizes exceed the configured limit.
+    Large or multi-client exports should go through ``export_jobs`` instead.
     """
 
     max_mb = int(getattr(settings, "MAX_TOTAL_CLIENT_EXPORT_MB", 200))
@@ -169,75 +306,11 @@ def generate_client_zip(client: Client) -> io.BytesIO:
 
     buffer = io.BytesIO()
     prefix = f"case_{client.pk}"
-
-    missing_files_info = []
+    digest_index = ArchiveDigestIndex()
 
     with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
-        # 1. Summary text file
-        summary = generate_client_summary_text(client)
-        zf.writestr(f"{prefix}/CASE_SUMMARY.txt", summary)
-
-        # 2. All document files
-        documents = client.documents.all().order_by("document_type", "-uploaded_at")
-        for doc in documents:
-            if not doc.file:
-                continue
-            if not document_file_exists(doc):
-                missing_files_info.append(f"Document: ID={doc.pk}, Type={doc.document_type}")
-                continue
-            try:
-                file_name = str(doc.file.name)
-                ext = os.path.splitext(file_name)[1] or ".bin"
-                archive_name = f"{prefix}/documents/document_{doc.pk}{ext}"
-
-                # Avoid duplicate names inside the archive
-                counter = 1
-                base_archive_name = archive_name
-                existing = {info.filename for info in zf.infolist()}
-                while archive_name in existing:
-                    archive_name = f"{base_archive_name[:-len(ext)]}_{counter}{ext}"
-                    counter += 1
-
-                zf.writestr(archive_name, doc.file.read())
-            except Exception:
-                logger.exception("Failed to add document %s to ZIP", doc.pk)
-
-        # 3. Document versions (if any)
-        from clients.models import DocumentVersion
-
-        versions = DocumentVersion.objects.filter(
-            document__client=client
-        ).select_related("document").order_by("document__document_type", "-version_number")
-
-        for version in versions:
-            if not version.file:
-                continue
-            file_name = str(version.file.name)
-            if not version.file.storage.exists(file_name):
-                missing_files_info.append(f"Version: ID={version.pk}, DocID={version.document_id}, Version={version.version_number}")
-                continue
-            try:
-                ext = os.path.splitext(file_name)[1] or ".bin"
-                archive_name = f"{prefix}/document_versions/document_version_{version.pk}{ext}"
-                zf.writestr(archive_name, version.file.read())
-            except Exception:
-                logger.exception("Failed to add version %s to ZIP", version.pk)
-
-        # 4. Missing files report
-        if missing_files_info:
-            missing_report = [
-                "MISSING FILES REPORT",
-                "====================",
-                f"The following {len(missing_files_info)} files were registered in the database but were missing from storage during export.",
-                "They might have been lost if they were stored on ephemeral storage (like a local container on Railway) and the app was redeployed.",
-                "",
-                *missing_files_info,
-                "",
-                f"Report generated: {timezone.now().strftime('%d.%m.%Y %H:%M')}"
-            ]
-            zf.writestr(f"{prefix}/MISSING_FILES.txt", "\n".join(missing_report))
-            logger.warning("ZIP export for client %s finished with %s missing files", client.pk, len(missing_files_info))
-
+        write_client_archive_entries(zf, client, prefix=prefix, digest_index=digest_index)
+        digest_index.write_manifest(zf, f"{prefix}/DUPLICATES.txt")
 
     buffer.seek(0)
     return buffer
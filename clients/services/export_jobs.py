@@ -0,0 +1,325 @@
+"""Background client export jobs: enqueue, build archive, sign download links.
+
+The synchronous ``client_export_zip`` view builds the archive inside the
+request, which times out for clients with many scans and cannot cover a whole
+company. Jobs here reuse the lease/attempt bookkeeping of the OCR queue
+(``document_jobs``): a worker claims a job under ``select_for_update``, renews
+its lease after every client, and a crashed worker's job is reclaimed and
+retried. Finished archives live in the default storage under ``exports/`` and
+are served through a signed, expiring link.
+"""
+from __future__ import annotations
+
+import logging
+import secrets
+import tempfile
+import zipfile
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, cast
+
+from django.conf import settings
+from django.core import signing
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import models, transaction
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from clients.models import Client, ClientExportJob, Company
+from clients.services.activity_buffer import buffered_client_activity
+from clients.services.export import (
+    ArchiveDigestIndex,
+    ExportSizeLimitExceeded,
+    client_export_bytes,
+    write_client_archive_entries,
+)
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import AbstractBaseUser, AnonymousUser
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXPORT_JOB_LEASE_SECONDS = 900
+DEFAULT_EXPORT_JOB_MAX_ATTEMPTS = 3
+EXPORT_JOB_RETRY_BACKOFF_SECONDS = 300
+EXPORT_ARCHIVE_PREFIX = "exports"
+EXPORT_DOWNLOAD_SIGNING_SALT = "clients.export_job_download"
+
+
+@dataclass(frozen=True)
+class ExportJobRunResult:
+    job_id: int
+    status: str
+    processed: bool
+    message: str = ""
+
+
+def export_link_ttl() -> timedelta:
+    return timedelta(hours=max(1, int(getattr(settings, "EXPORT_JOB_LINK_TTL_HOURS", 24))))
+
+
+def enqueue_client_export_job(
+    *,
+    clients: Iterable[Client],
+    actor: AbstractBaseUser | AnonymousUser | None = None,
+    scope: str = ClientExportJob.SCOPE_CLIENT,
+    company: Company | None = None,
+) -> ClientExportJob:
+    """Queue a background ZIP export covering *clients*."""
+
+    client_ids = sorted({int(client.pk) for client in clients})
+    if not client_ids:
+        raise ValueError("Client export job requires at least one client")
+    max_clients = int(getattr(settings, "EXPORT_JOB_MAX_CLIENTS", 500))
+    if len(client_ids) > max_clients:
+        raise ValueError(f"Client export job is limited to {max_clients} clients")
+
+    creator = actor if actor and actor.is_authenticated else None
+    return ClientExportJob.objects.create(
+        created_by=cast(Any, creator),
+        scope=scope,
+        company=company,
+        client_ids=client_ids,
+        total_clients=len(client_ids),
+        max_attempts=DEFAULT_EXPORT_JOB_MAX_ATTEMPTS,
+        next_attempt_at=timezone.now(),
+    )
+
+
+def process_pending_export_jobs(*, limit: int | None = None) -> list[ExportJobRunResult]:
+    """Build archives for queued export jobs in FIFO order."""
+    reclaim_stale_export_jobs()
+    expire_client_export_archives()
+
+    now = timezone.now()
+    queryset = ClientExportJob.objects.filter(
+        status=ClientExportJob.STATUS_PENDING,
+        attempts__lt=models.F("max_attempts"),
+    ).filter(
+        models.Q(next_attempt_at__isnull=True) | models.Q(next_attempt_at__lte=now)
+    ).order_by("created_at")
+
+    if limit is not None:
+        queryset = queryset[:limit]
+
+    job_ids = list(queryset.values_list("id", flat=True))
+    return [process_client_export_job(job_id=job_id) for job_id in job_ids]
+
+
+def _claim_export_job(job_id: int) -> ClientExportJob | None:
+    with transaction.atomic():
+        job = ClientExportJob.objects.select_for_update().get(pk=job_id)
+        if job.status != ClientExportJob.STATUS_PENDING:
+            return None
+        job.status = ClientExportJob.STATUS_PROCESSING
+        job.attempts += 1
+        job.started_at = timezone.now()
+        job.lease_expires_at = job.started_at + timedelta(seconds=DEFAULT_EXPORT_JOB_LEASE_SECONDS)
+        job.processed_clients = 0
+        job.error_message = ""
+        job.completed_at = None
+        job.save(
+            update_fields=[
+                "status",
+                "attempts",
+                "started_at",
+                "lease_expires_at",
+                "processed_clients",
+                "error_message",
+                "completed_at",
+            ]
+        )
+    return job
+
+
+def _record_progress(job: ClientExportJob, processed_clients: int) -> bool:
+    """Persist progress and renew the lease; ``False`` if the job was reclaimed."""
+    updated = ClientExportJob.objects.filter(
+        pk=job.pk,
+        status=ClientExportJob.STATUS_PROCESSING,
+        started_at=job.started_at,
+    ).update(
+        processed_clients=processed_clients,
+        lease_expires_at=timezone.now() + timedelta(seconds=DEFAULT_EXPORT_JOB_LEASE_SECONDS),
+        updated_at=timezone.now(),
+    )
+    return bool(updated)
+
+
+def process_client_export_job(*, job_id: int) -> ExportJobRunResult:
+    """Build, store and publish the archive for one queued export job."""
+
+    job = _claim_export_job(job_id)
+    if job is None:
+        status = ClientExportJob.objects.filter(pk=job_id).values_list("status", flat=True).first() or ""
+        return ExportJobRunResult(job_id=job_id, status=status, processed=False, message=_("Job is not pending."))
+
+    clients = list(Client.objects.filter(pk__in=job.client_ids).order_by("pk"))
+    max_bytes = int(getattr(settings, "MAX_TOTAL_EXPORT_JOB_MB", 2000)) * 1024 * 1024
+    digest_index = ArchiveDigestIndex()
+    total_bytes = 0
+
+    try:
+        with tempfile.TemporaryFile() as spool:
+            with zipfile.ZipFile(spool, "w", zipfile.ZIP_DEFLATED) as zf:
+                for index, client in enumerate(clients, start=1):
+                    total_bytes += client_export_bytes(client)
+                    if total_bytes > max_bytes:
+                        raise ExportSizeLimitExceeded(total_bytes / (1024 * 1024), max_bytes // (1024 * 1024))
+                    write_client_archive_entries(zf, client, prefix=f"case_{client.pk}", digest_index=digest_index)
+                    if not _record_progress(job, index):
+                        logger.warning("Export job %s lost its lease; abandoning this run", job.pk)
+                        return ExportJobRunResult(
+                            job_id=job.pk,
+                            status=ClientExportJob.STATUS_PENDING,
+                            processed=False,
+                            message=_("Job lease was reclaimed by another worker."),
+                        )
+                digest_index.write_manifest(zf, "DUPLICATES.txt")
+            archive_size = spool.tell()
+            spool.seek(0)
+            target_name = f"{EXPORT_ARCHIVE_PREFIX}/client-export-{job.pk}-{secrets.token_hex(8)}.zip"
+            archive_name = default_storage.save(target_name, File(spool, name=target_name))
+    except ExportSizeLimitExceeded as exc:
+        logger.warning("Export job %s exceeded the archive size limit", job.pk)
+        return _finalize_failed_export_job(job, error_message=str(exc), retry=False)
+    except Exception as exc:
+        logger.exception("Export job %s failed: error_type=%s", job.pk, type(exc).__name__)
+        return _finalize_failed_export_job(job, error_message=_("Archive generation failed."), retry=True)
+
+    now = timezone.now()
+    updated = ClientExportJob.objects.filter(pk=job.pk, status=ClientExportJob.STATUS_PROCESSING).update(
+        status=ClientExportJob.STATUS_COMPLETED,
+        processed_clients=len(clients),
+        total_clients=len(clients),
+        file_count=digest_index.file_count,
+        deduplicated_count=digest_index.deduplicated_count,
+        archive_name=archive_name,
+        archive_size=archive_size,
+        expires_at=now + export_link_ttl(),
+        completed_at=now,
+        lease_expires_at=None,
+        next_attempt_at=None,
+        updated_at=now,
+    )
+    if not updated:
+        default_storage.delete(archive_name)
+        return ExportJobRunResult(job_id=job.pk, status=ClientExportJob.STATUS_PENDING, processed=False)
+
+    from clients.use_cases.exports import record_client_export
+
+    with buffered_client_activity():
+        for client in clients:
+            record_client_export(
+                client=client,
+                actor=job.created_by,
+                export_type="zip_background",
+                summary=_("Экспорт кейса (ZIP, фоновая задача)"),
+            )
+    return ExportJobRunResult(job_id=job.pk, status=ClientExportJob.STATUS_COMPLETED, processed=True)
+
+
+def _finalize_failed_export_job(job: ClientExportJob, *, error_message: str, retry: bool) -> ExportJobRunResult:
+    now = timezone.now()
+    can_retry = retry and job.attempts < job.max_attempts
+    status = ClientExportJob.STATUS_PENDING if can_retry else ClientExportJob.STATUS_FAILED
+    ClientExportJob.objects.filter(pk=job.pk, status=ClientExportJob.STATUS_PROCESSING).update(
+        status=status,
+        error_message=str(error_message),
+        next_attempt_at=now + timedelta(seconds=EXPORT_JOB_RETRY_BACKOFF_SECONDS) if can_retry else None,
+        completed_at=None if can_retry else now,
+        lease_expires_at=None,
+        updated_at=now,
+    )
+    return ExportJobRunResult(job_id=job.pk, status=status, processed=True, message=str(error_message))
+
+
+def reclaim_stale_export_jobs(*, now: datetime | None = None) -> int:
+    now = now or timezone.now()
+    stale_jobs = ClientExportJob.objects.filter(
+        status=ClientExportJob.STATUS_PROCESSING,
+        lease_expires_at__isnull=False,
+        lease_expires_at__lt=now,
+    )
+    updated = 0
+    for job in stale_jobs.iterator():
+        job.status = (
+            ClientExportJob.STATUS_PENDING
+            if job.attempts < job.max_attempts
+            else ClientExportJob.STATUS_FAILED
+        )
+        job.error_message = _("Job lease expired before completion.")
+        job.completed_at = timezone.now() if job.status == ClientExportJob.STATUS_FAILED else None
+        job.next_attempt_at = now if job.status == ClientExportJob.STATUS_PENDING else None
+        job.lease_expires_at = None
+        job.save(update_fields=["status", "error_message", "completed_at", "next_attempt_at", "lease_expires_at"])
+        updated += 1
+    return updated
+
+
+def expire_client_export_archives(*, now: datetime | None = None) -> int:
+    """Delete archives whose download link has expired."""
+    now = now or timezone.now()
+    expired = ClientExportJob.objects.filter(
+        status=ClientExportJob.STATUS_COMPLETED,
+        expires_at__isnull=False,
+        expires_at__lte=now,
+    )
+    count = 0
+    for job in expired.iterator():
+        if job.archive_name:
+            try:
+                default_storage.delete(job.archive_name)
+            except Exception:
+                logger.warning("Failed to delete expired export archive for job %s", job.pk, exc_info=True)
+                continue
+        job.status = ClientExportJob.STATUS_EXPIRED
+        job.archive_name = ""
+        job.save(update_fields=["status", "archive_name", "updated_at"])
+        count += 1
+    return count
+
+
+def build_export_download_token(job: ClientExportJob) -> str:
+    """Signed token bound to the job *and* its current archive file."""
+    return signing.dumps({"job": job.pk, "archive": job.archive_name}, salt=EXPORT_DOWNLOAD_SIGNING_SALT)
+
+
+def resolve_export_download_token(token: str) -> ClientExportJob | None:
+    """Return the downloadable job for *token*, or ``None`` if invalid or expired."""
+    try:
+        payload = signing.loads(
+            token,
+            salt=EXPORT_DOWNLOAD_SIGNING_SALT,
+            max_age=export_link_ttl(),
+        )
+    except signing.BadSignature:
+        return None
+    if not isinstance(payload, dict) or not isinstance(payload.get("job"), int):
+        return None
+    job = ClientExportJob.objects.filter(pk=payload["job"]).first()
+    if job is None or not job.is_downloadable or job.archive_name != payload.get("archive"):
+        return None
+    return cast(ClientExportJob, job)
+
+
+def export_job_status_payload(job: ClientExportJob, *, download_url: str | None = None) -> dict[str, Any]:
+    return {
+        "id": job.pk,
+        "scope": job.scope,
+        "status": job.status,
+        "status_display": job.get_status_display(),
+        "total_clients": job.total_clients,
+        "processed_clients": job.processed_clients,
+        "progress_percent": job.progress_percent,
+        "file_count": job.file_count,
+        "deduplicated_count": job.deduplicated_count,
+        "archive_size": job.archive_size,
+        "error_message": job.error_message,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+        "expires_at": job.expires_at.isoformat() if job.expires_at else None,
+        "download_url": download_url,
+    }
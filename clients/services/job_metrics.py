@@ -0,0 +1,56 @@
+"""Cross-process counters for the background job queues.
+
+Counters live in the default cache (``cache.incr``), so every worker adds to
+the same totals; they reset when the cache is flushed and are meant for
+dashboards and alerting, not accounting.
+"""
+from __future__ import annotations
+
+import logging
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+JOB_METRICS_CACHE_PREFIX = "job_metrics:"
+JOB_METRICS_TIMEOUT = 30 * 24 * 60 * 60
+
+# OCR job leases (``clients.services.document_job_lease``).
+OCR_LEASE_RENEWED = "ocr_lease_renewed"
+OCR_LEASE_REVOKED_ABORTED = "ocr_lease_revoked_aborted"
+OCR_STALE_RESULT_DISCARDED = "ocr_stale_result_discarded"
+OCR_TIME_BUDGET_EXCEEDED = "ocr_time_budget_exceeded"
+OCR_LEASE_RECLAIMED = "ocr_lease_reclaimed"
+JOB_METRIC_NAMES = (
+    OCR_LEASE_RENEWED,
+    OCR_LEASE_REVOKED_ABORTED,
+    OCR_STALE_RESULT_DISCARDED,
+    OCR_TIME_BUDGET_EXCEEDED,
+    OCR_LEASE_RECLAIMED,
+)
+
+
+def increment_job_metric(name: str, amount: int = 1) -> None:
+    key = f"{JOB_METRICS_CACHE_PREFIX}{name}"
+    try:
+        cache.add(key, 0, timeout=JOB_METRICS_TIMEOUT)
+        cache.incr(key, amount)
+    except ValueError:
+        # The key expired between add() and incr().
+        cache.set(key, amount, timeout=JOB_METRICS_TIMEOUT)
+    except Exception:
+        logger.warning("Failed to update job metric %s.", name, exc_info=True)
+
+
+def job_metrics_snapshot() -> dict[str, int]:
+    """Current value of every job counter, plus derived totals."""
+    try:
+        stored = cache.get_many([f"{JOB_METRICS_CACHE_PREFIX}{name}" for name in JOB_METRIC_NAMES])
+    except Exception:
+        logger.warning("Failed to read job metrics.", exc_info=True)
+        stored = {}
+    metrics = {name: int(stored.get(f"{JOB_METRICS_CACHE_PREFIX}{name}") or 0) for name in JOB_METRIC_NAMES}
+    # Each one is an OCR run (or its write-back) that a second worker would
+    # otherwise have duplicated after taking over the job.
+    metrics["ocr_duplicate_work_avoided"] = metrics[OCR_LEASE_REVOKED_ABORTED] + metrics[OCR_STALE_RESULT_DISCARDED]
+    return metrics
@@ -0,0 +1,119 @@
+"""Immediate wakeups for the background job lanes.
+
+Queueing an OCR job or an email campaign calls ``notify_job_queued`` with the
+lane's channel. When the transaction commits, the channel's in-process event
+is set, and on PostgreSQL a ``NOTIFY`` is sent as well. The automation loop
+runs a ``JobWakeupListener`` thread that ``LISTEN``s on a dedicated
+connection and sets the same events, so a lane wakes as soon as work is queued
+from any web worker. Lanes keep waiting with a timeout: polling stays the
+fallback for lost notifications, SQLite, and jobs queued by other means.
+"""
+from __future__ import annotations
+
+import logging
+import select
+import threading
+
+from django.db import DatabaseError, close_old_connections, connection, transaction
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_JOBS_CHANNEL = "legalize_document_jobs"
+EMAIL_CAMPAIGNS_CHANNEL = "legalize_email_campaigns"
+JOB_CHANNELS = (DOCUMENT_JOBS_CHANNEL, EMAIL_CAMPAIGNS_CHANNEL)
+# How long the listener blocks in select() before re-checking for shutdown.
+LISTEN_POLL_SECONDS = 5.0
+LISTEN_RECONNECT_SECONDS = 30.0
+
+_events_lock = threading.Lock()
+_events: dict[str, threading.Event] = {}
+
+
+def wakeup_event(channel: str) -> threading.Event:
+    """Process-wide event set whenever work is queued on *channel*."""
+    with _events_lock:
+        event = _events.get(channel)
+        if event is None:
+            event = _events[channel] = threading.Event()
+        return event
+
+
+def notify_job_queued(channel: str) -> None:
+    """Wake the lane for *channel* once the current transaction commits."""
+    transaction.on_commit(lambda: _publish(channel))
+
+
+def _publish(channel: str) -> None:
+    wakeup_event(channel).set()
+    if connection.vendor != "postgresql":
+        return
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, '')", [channel])
+    except DatabaseError:
+        # The job row is already committed; the lane's polling picks it up.
+        logger.warning("Failed to send job wakeup notification: channel=%s", channel, exc_info=True)
+
+
+class JobWakeupListener:
+    """Daemon thread relaying PostgreSQL notifications to ``wakeup_event``.
+
+    Does nothing on other database backends. If the listening connection
+    drops, the thread reconnects after ``LISTEN_RECONNECT_SECONDS`` and sets
+    every event once, since notifications sent in between are lost.
+    """
+
+    def __init__(self, channels: tuple[str, ...] = JOB_CHANNELS) -> None:
+        self.channels = channels
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="job-wakeup-listener", daemon=True)
+
+    @property
+    def enabled(self) -> bool:
+        return connection.vendor == "postgresql"
+
+    def start(self) -> None:
+        if self.enabled:
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self._listen()
+            except Exception:
+                logger.warning("Job wakeup listener lost its connection; relying on polling.", exc_info=True)
+            finally:
+                # The thread owns its own connection (Django connections are per thread).
+                connection.close()
+            for channel in self.channels:
+                wakeup_event(channel).set()
+            self._stopped.wait(LISTEN_RECONNECT_SECONDS)
+        close_old_connections()
+
+    def _listen(self) -> None:
+        connection.ensure_connection()
+        connection.set_autocommit(True)
+        raw = connection.connection
+        with connection.cursor() as cursor:
+            for channel in self.channels:
+                cursor.execute(f'LISTEN "{channel}"')
+        logger.info("Listening for job wakeups on %s.", ", ".join(self.channels))
+        while not self._stopped.is_set():
+            readable, _writable, _failed = select.select([raw], [], [], LISTEN_POLL_SECONDS)
+            if not readable:
+                continue
+            raw.poll()
+            while raw.notifies:
+                notification = raw.notifies.pop(0)
+                if notification.channel in self.channels:
+                    wakeup_event(notification.channel).set()
+
+
+def reset_wakeup_events() -> None:
+    """Clear every pending wakeup (used by tests)."""
+    with _events_lock:
+        for event in _events.values():
+            event.clear()
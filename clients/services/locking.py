@@ -123,11 +123,17 @@ def _update_instance_with_locking(
             },
         )
 
-    # The bulk .update() above bypasses post_save signals, so the navbar
-    # attention cache is not invalidated automatically — refresh it here so the
-    # edited record's counts (wezwanie/legal-stay/…) update immediately.
+    # The bulk .update() above bypasses post_save signals, so neither the navbar
+    # attention cache nor the ClientAttentionState/CaseChecklistSummary rows are
+    # refreshed automatically — do it here so the edited record's counts
+    # (wezwanie/legal-stay/missing documents/…) update immediately.
     if client is not None:
+        from clients.services.attention_state import refresh_client_attention_state
+        from clients.services.checklist_summary import refresh_case_checklist_summary
         from clients.services.onboarding_purposes import clear_onboarding_notifications_cache
+
+        refresh_client_attention_state(client.pk)
+        refresh_case_checklist_summary(instance_id if model_class is Case else getattr(instance, "case_id", None))
         try:
             clear_onboarding_notifications_cache(client)
         except Exception:
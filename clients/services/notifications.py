@@ -23,6 +23,7 @@ from clients.services.case_context import checklist_for_case, purpose_for_case
 from clients.services.notifications_pdf import _render_email_pdf
 from clients.services.wniosek import get_submitted_document_codes
 from clients.services.zus import format_zus_months, missing_zus_months
+from legalize_site.metrics import EMAILS_SENT, increment
 
 if TYPE_CHECKING:
     from django.contrib.auth.models import AbstractBaseUser, AnonymousUser
@@ -297,6 +298,7 @@ def _log_email(
 ) -> None:
     from clients.models import EmailLog
 
+    increment(EMAILS_SENT, template=template_type or "other", status=delivery_status)
     real_sent_by = sent_by if sent_by and sent_by.is_authenticated else None
 
     try:
@@ -608,7 +610,7 @@ def _get_missing_documents_context(
     from clients.models import ClientDocumentRequirement, DocumentRequirement
 
     purpose = purpose_for_case(case) if case is not None else client.get_document_requirement_purpose()
-    has_db_records = DocumentRequirement.objects.filter(application_purpose=purpose).exists()
+    has_db_records = bool(DocumentRequirement.records_for(purpose))
     catalog = (
         checklist_for_case(case, language, include_optional=False, include_fallback=not has_db_records)
         if case is not None
@@ -1,27 +1,53 @@
 """PDF rendering for email copies, extracted from ``notifications``.
 
-Self-contained: turns plain email text into a paginated PDF via PIL. No
-dependency on the notification-sending machinery, so it lives here and
-``_render_email_pdf`` is imported back into ``notifications`` (callers and mock
-targets there are unaffected).
+Self-contained: turns plain email text into a paginated PDF. No dependency on
+the notification-sending machinery, so it lives here and ``_render_email_pdf``
+is imported back into ``notifications`` (callers and mock targets there are
+unaffected).
+
+Pages are drawn as vector text with reportlab, so the attachment stays a few
+KB, is searchable and copyable. The older PIL rasterizer is kept only as a
+fallback if reportlab fails at runtime.
 """
 from __future__ import annotations
 
 import logging
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
 from typing import Any
 
 from django.conf import settings
 from PIL import Image, ImageDraw, ImageFont
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
 
 logger = logging.getLogger(__name__)
 
 PDF_FONT_TEST_TEXT = "Привет"
+PDF_VECTOR_FONT_NAME = "LegalizeEmailSans"
+PDF_VECTOR_FALLBACK_FONT = "Helvetica"
+PDF_VECTOR_FONT_SIZE = 10.5
+PDF_VECTOR_LEADING = 14
+PDF_VECTOR_MARGIN = 56  # points, ~20 mm
+
+# One directory level only: a recursive ``**`` glob over /nix/store walks the
+# whole store (hundreds of thousands of entries) and took seconds per call.
+NIX_FONT_PATTERNS = (
+    "*/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "*/share/fonts/truetype/noto/NotoSans-Regular.ttf",
+)
 
 
 def _get_pdf_font_path() -> Path | None:
-    configured_path = str(getattr(settings, "PDF_FONT_PATH", ""))
+    return _resolve_pdf_font_path(str(getattr(settings, "PDF_FONT_PATH", "")))
+
+
+@lru_cache(maxsize=8)
+def _resolve_pdf_font_path(configured_path: str) -> Path | None:
+    """Find a TrueType font with Cyrillic glyphs; memoized per process."""
     if configured_path:
         path = Path(configured_path)
         if path.exists():
@@ -30,8 +56,8 @@ def _get_pdf_font_path() -> Path | None:
     nix_store = Path("/nix/store")
     nix_candidates: list[Path] = []
     if nix_store.exists():
-        nix_candidates.extend(nix_store.glob("**/share/fonts/truetype/dejavu/DejaVuSans.ttf"))
-        nix_candidates.extend(nix_store.glob("**/share/fonts/truetype/noto/NotoSans-Regular.ttf"))
+        for pattern in NIX_FONT_PATTERNS:
+            nix_candidates.extend(sorted(nix_store.glob(pattern)))
     candidate_paths = [
         Path(str(settings.BASE_DIR)) / "static" / "fonts" / "DejaVuSans.ttf",
         Path("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"),
@@ -53,10 +79,81 @@ def _get_pdf_font_path() -> Path | None:
             if not mask or mask.getbbox() is None:
                 continue
             return path
-    logger.warning("PDF font not found in default locations; falling back to PIL default font.")
+    logger.warning("PDF font not found in default locations; falling back to a built-in font.")
     return None
 
 
+@lru_cache(maxsize=8)
+def _register_vector_font(font_path: str) -> str:
+    """Register *font_path* with reportlab once and return the font name to use."""
+    try:
+        pdfmetrics.registerFont(TTFont(PDF_VECTOR_FONT_NAME, font_path))
+    except Exception as exc:
+        logger.warning("Could not register PDF font for vector rendering: error_type=%s", type(exc).__name__)
+        return PDF_VECTOR_FALLBACK_FONT
+    return PDF_VECTOR_FONT_NAME
+
+
+def _vector_font_name() -> str:
+    font_path = _get_pdf_font_path()
+    if font_path is None:
+        return PDF_VECTOR_FALLBACK_FONT
+    return _register_vector_font(str(font_path))
+
+
+def _wrap_vector_lines(text: str, font_name: str, font_size: float, max_width: float) -> list[str]:
+    """Greedy word wrap by real glyph widths; overlong tokens are hard-broken."""
+
+    def width(value: str) -> float:
+        return float(pdfmetrics.stringWidth(value, font_name, font_size))
+
+    lines: list[str] = []
+    for paragraph in text.splitlines():
+        if not paragraph.strip():
+            lines.append("")
+            continue
+        current = ""
+        for word in paragraph.split(" "):
+            candidate = word if not current else f"{current} {word}"
+            if width(candidate) <= max_width:
+                current = candidate
+                continue
+            if current:
+                lines.append(current)
+            current = ""
+            while word and width(word) > max_width:
+                cut = len(word)
+                while cut > 1 and width(word[:cut]) > max_width:
+                    cut -= 1
+                lines.append(word[:cut])
+                word = word[cut:]
+            current = word
+        if current:
+            lines.append(current)
+    return lines
+
+
+def _render_email_pdf_vector(text: str) -> bytes:
+    page_width, page_height = A4
+    font_name = _vector_font_name()
+    max_width = page_width - (PDF_VECTOR_MARGIN * 2)
+    lines = _wrap_vector_lines(text, font_name, PDF_VECTOR_FONT_SIZE, max_width)
+    lines_per_page = max(1, int((page_height - (PDF_VECTOR_MARGIN * 2)) // PDF_VECTOR_LEADING))
+
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4, pageCompression=1)
+    pdf.setTitle("Email copy")
+    for start in range(0, max(len(lines), 1), lines_per_page):
+        text_object = pdf.beginText(PDF_VECTOR_MARGIN, page_height - PDF_VECTOR_MARGIN - PDF_VECTOR_FONT_SIZE)
+        text_object.setFont(font_name, PDF_VECTOR_FONT_SIZE, leading=PDF_VECTOR_LEADING)
+        for line in lines[start : start + lines_per_page]:
+            text_object.textLine(line)
+        pdf.drawText(text_object)
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
 def _wrap_text_lines(text: str, draw: ImageDraw.ImageDraw, font: Any, max_width: int) -> list[str]:
     lines: list[str] = []
     for paragraph in text.splitlines():
@@ -78,7 +175,8 @@ def _wrap_text_lines(text: str, draw: ImageDraw.ImageDraw, font: Any, max_width:
     return lines
 
 
-def _render_email_pdf(text: str) -> bytes:
+def _render_email_pdf_raster(text: str) -> bytes:
+    """Legacy renderer: one 150-dpi RGB image per page, saved as an image PDF."""
     page_width, page_height = (1240, 1754)
     margin = 80
     font_path = _get_pdf_font_path()
@@ -117,3 +215,11 @@ def _render_email_pdf(text: str) -> bytes:
     if pages:
         pages[0].save(buffer, format="PDF", save_all=True, append_images=pages[1:])
     return buffer.getvalue()
+
+
+def _render_email_pdf(text: str) -> bytes:
+    try:
+        return _render_email_pdf_vector(text)
+    except Exception as exc:  # pragma: no cover - defensive; never block the confirmation email
+        logger.warning("Vector PDF rendering failed; using raster fallback: error_type=%s", type(exc).__name__)
+        return _render_email_pdf_raster(text)
@@ -0,0 +1,229 @@
+"""Keyset (cursor) pagination for large, append-mostly staff lists.
+
+Django's ``Paginator`` runs ``COUNT(*)`` and ``OFFSET N`` on every page, so
+deep pages of ``EmailLog`` or ``ClientActivity`` scan everything before them.
+``KeysetPaginator`` instead continues from the ordering values of the last
+(or first) row shown: ``WHERE (sent_at, id) < (:sent_at, :id) ORDER BY
+sent_at DESC, id DESC LIMIT 51`` walks the existing ``(-sent_at)`` index at a
+constant cost per page, whatever the depth.
+
+Cursors are opaque, signed tokens carrying those values and the direction, so
+they cannot be forged to probe other orderings. The primary key is appended as
+a tie-breaker, nullable columns sort last in both directions, and the total is
+an estimate from the PostgreSQL planner (exact below
+``EXACT_COUNT_THRESHOLD`` rows and on other backends).
+"""
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime
+from functools import cached_property
+from typing import Any, cast
+
+from django.core import signing
+from django.db import connections
+from django.db.models import F, Field, Model, Q, QuerySet
+from django.db.models.expressions import OrderBy
+
+TOKEN_SALT = "clients.keyset-pagination"
+EXACT_COUNT_THRESHOLD = 10_000
+
+
+class InvalidCursor(ValueError):
+    """The cursor token is malformed, tampered with or from another list."""
+
+
+@dataclass(frozen=True)
+class OrderKey:
+    field: Field
+    descending: bool
+    nulls_first: bool = False
+
+    @property
+    def name(self) -> str:
+        return self.field.attname
+
+    def reversed(self) -> OrderKey:
+        return OrderKey(self.field, not self.descending, not self.nulls_first)
+
+    def order_by(self) -> OrderBy | str:
+        if not self.field.null:
+            # Plain ordering so the planner can match the column's index.
+            return f"-{self.name}" if self.descending else self.name
+        nulls = {"nulls_first": True} if self.nulls_first else {"nulls_last": True}
+        expression = F(self.name)
+        return expression.desc(**nulls) if self.descending else expression.asc(**nulls)
+
+    def equal(self, value: Any) -> Q:
+        if value is None:
+            return Q(**{f"{self.name}__isnull": True})
+        return Q(**{self.name: value})
+
+    def after(self, value: Any) -> Q | None:
+        """Rows sorting strictly after *value* on this key, or None if there are none."""
+        if value is None:
+            return Q(**{f"{self.name}__isnull": False}) if self.nulls_first else None
+        condition = Q(**{f"{self.name}__{'lt' if self.descending else 'gt'}": value})
+        if self.field.null and not self.nulls_first:
+            condition |= Q(**{f"{self.name}__isnull": True})
+        return condition
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def approximate_count(queryset: QuerySet[Any], *, exact_below: int = EXACT_COUNT_THRESHOLD) -> tuple[int, bool]:
+    """Return ``(count, is_exact)`` for *queryset* without scanning large tables.
+
+    On PostgreSQL the planner's row estimate for the filtered query is used
+    (it comes from ``pg_class.reltuples`` and column statistics, so it is
+    cheap and usually within a few percent after ``ANALYZE``). Small results
+    and other backends fall back to an exact ``COUNT(*)``.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        sql, params = queryset.order_by().values("pk").query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = int(plan[0]["Plan"]["Plan Rows"])
+        if estimate >= exact_below:
+            return estimate, False
+    return queryset.count(), True
+
+
+class KeysetPage(Sequence[Any]):
+    def __init__(
+        self,
+        object_list: list[Any],
+        paginator: KeysetPaginator,
+        *,
+        next_token: str | None,
+        previous_token: str | None,
+    ) -> None:
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_token = next_token
+        self.previous_token = previous_token
+
+    def __repr__(self) -> str:
+        return f"<KeysetPage of {len(self.object_list)} objects>"
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def __getitem__(self, index: Any) -> Any:
+        return self.object_list[index]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.next_token is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_token is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """Paginate *queryset* by ``ordering`` (model field names, ``-`` for descending).
+
+    The queryset's own ordering is replaced; the primary key is appended as a
+    tie-breaker unless ``ordering`` already ends with it.
+    """
+
+    def __init__(self, queryset: QuerySet[Any], ordering: Sequence[str], per_page: int) -> None:
+        if not ordering:
+            raise ValueError("KeysetPaginator needs an explicit ordering.")
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        model: type[Model] = queryset.model
+        names = [name.lstrip("-") for name in ordering]
+        if names[-1] not in {"pk", model._meta.pk.name, model._meta.pk.attname}:
+            ordering = [*ordering, f"{'-' if ordering[-1].startswith('-') else ''}pk"]
+        self.keys = tuple(
+            OrderKey(
+                cast(Field, model._meta.pk if name.lstrip("-") == "pk" else model._meta.get_field(name.lstrip("-"))),
+                descending=name.startswith("-"),
+            )
+            for name in ordering
+        )
+        self._signature = f"{model._meta.label_lower}:{','.join(ordering)}"
+
+    @cached_property
+    def count(self) -> int:
+        return self.count_estimate[0]
+
+    @cached_property
+    def count_estimate(self) -> tuple[int, bool]:
+        return approximate_count(self.queryset)
+
+    def _token(self, obj: Any, *, backward: bool) -> str:
+        values = [_encode_value(getattr(obj, key.name)) for key in self.keys]
+        return signing.dumps({"o": self._signature, "v": values, "b": int(backward)}, salt=TOKEN_SALT, compress=True)
+
+    def _decode(self, token: str) -> tuple[list[Any], bool]:
+        try:
+            payload = signing.loads(token, salt=TOKEN_SALT)
+        except signing.BadSignature as exc:
+            raise InvalidCursor("Invalid pagination cursor.") from exc
+        if not isinstance(payload, dict) or payload.get("o") != self._signature:
+            raise InvalidCursor("Pagination cursor belongs to a different list.")
+        values = payload.get("v")
+        if not isinstance(values, list) or len(values) != len(self.keys):
+            raise InvalidCursor("Pagination cursor belongs to a different list.")
+        try:
+            decoded = [None if value is None else key.field.to_python(value) for key, value in zip(self.keys, values)]
+        except Exception as exc:
+            raise InvalidCursor("Invalid pagination cursor.") from exc
+        return decoded, bool(payload.get("b"))
+
+    @staticmethod
+    def _after(keys: Sequence[OrderKey], values: Sequence[Any]) -> Q:
+        """``(k1, k2, ...) > (v1, v2, ...)`` in the sort order described by *keys*."""
+        condition = Q(pk__in=[])
+        prefix = Q()
+        for key, value in zip(keys, values):
+            step = key.after(value)
+            if step is not None:
+                condition |= prefix & step
+            prefix &= key.equal(value)
+        first, first_value = keys[0], values[0]
+        if not first.field.null and first_value is not None:
+            # Redundant but sargable bound on the leading column, so the
+            # planner turns the OR chain into an index range scan.
+            condition &= Q(**{f"{first.name}__{'lte' if first.descending else 'gte'}": first_value})
+        return condition
+
+    def page(self, token: str | None = None) -> KeysetPage:
+        keys = self.keys
+        backward = False
+        queryset = self.queryset
+        if token:
+            values, backward = self._decode(token)
+            if backward:
+                keys = tuple(key.reversed() for key in keys)
+            queryset = queryset.filter(self._after(keys, values))
+        rows = list(queryset.order_by(*(key.order_by() for key in keys))[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if backward:
+            rows.reverse()
+        has_next = bool(rows) and (backward or has_more)
+        has_previous = bool(rows) and bool(token) and (has_more or not backward)
+        return KeysetPage(
+            rows,
+            self,
+            next_token=self._token(rows[-1], backward=False) if has_next else None,
+            previous_token=self._token(rows[0], backward=True) if has_previous else None,
+        )
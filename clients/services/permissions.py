@@ -8,6 +8,7 @@ from django.http import HttpRequest, HttpResponse, HttpResponseForbidden
 from django.utils.translation import gettext as _
 
 from clients.services.access import is_internal_staff_user
+from clients.services.auth_snapshot import auth_snapshot
 from clients.services.responses import ResponseHelper
 from clients.services.roles import user_has_any_role
 
@@ -54,10 +55,7 @@ def has_employee_permission(user: AbstractBaseUser | AnonymousUser | None, permi
     if user_has_any_role(user, "ReadOnly") and permission_name in READONLY_BLOCKED_PERMISSION_FIELDS:
         return False
 
-    permission_object = getattr(user, "employee_permission", None)
-    if permission_object is None:
-        return False
-    return bool(getattr(permission_object, permission_name, False))
+    return auth_snapshot(user).has_employee_permission(permission_name)
 
 
 def user_can_run_ocr_review(user: AbstractBaseUser | AnonymousUser | None) -> bool:
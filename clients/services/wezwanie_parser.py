@@ -10,6 +10,7 @@ from pathlib import Path
 from typing import Any
 
 from clients.constants import DocumentType
+from clients.services.document_job_lease import DocumentJobInterrupted, ocr_checkpoint
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +56,7 @@ DATE_PATTERNS = (
     re.compile(rf"({DATE_TOKEN_PATTERN})"),
 )
 IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".tif", ".tiff", ".bmp", ".webp"}
+OCR_MAX_PDF_PAGES = 10
 
 
 @dataclass
@@ -131,11 +133,13 @@ def _parse_date(raw: str | None) -> date | None:
 def _extract_pdf_text(path: Path) -> str:
     """Extract text from PDF, using native text extraction or OCR for scans."""
     text_content = ""
+    page_count = OCR_MAX_PDF_PAGES
 
     # 1. Try native text extraction first (fastest, best for digital PDFs)
     try:
         from pypdf import PdfReader
         reader = PdfReader(str(path))
+        page_count = min(OCR_MAX_PDF_PAGES, len(reader.pages))
         # ZUS RCA/DRA print the reporting period below the header block, which
         # can land on page 2+; read a few more pages of native text before
         # deciding OCR is needed.
@@ -154,36 +158,45 @@ def _extract_pdf_text(path: Path) -> str:
                 logger.warning("Tesseract binary is not available; skipping PDF OCR for %s", path)
                 return text_content
 
-            # Convert PDF to images (up to 10 pages for longer documents like
-            # Załącznik). 300 dpi noticeably improves tesseract accuracy on the
-            # small ZUS form print; OCR runs in the job queue, so the extra
-            # rasterization cost stays off the request path.
-            try:
-                convert_kwargs: dict[str, Any] = {"first_page": 1, "last_page": 10, "dpi": 300}
-                poppler_path = _get_poppler_path()
-                if poppler_path:
-                    convert_kwargs["poppler_path"] = poppler_path
-                images = convert_from_path(str(path), **convert_kwargs)
-            except Exception as e:
-                logger.warning("pdf2image failed: %s", e)
-                images = []
+            # Rasterize and OCR up to 10 pages (longer documents like
+            # Załącznik) one page at a time. 300 dpi noticeably improves
+            # tesseract accuracy on the small ZUS form print; OCR runs in the
+            # job queue, so the extra cost stays off the request path. The
+            # checkpoint before each page renews the job lease and lets a
+            # revoked or over-budget job stop early.
+            convert_kwargs: dict[str, Any] = {"dpi": 300}
+            poppler_path = _get_poppler_path()
+            if poppler_path:
+                convert_kwargs["poppler_path"] = poppler_path
 
             ocr_text = []
-            for i, image in enumerate(images):
+            for page_number in range(1, page_count + 1):
+                ocr_checkpoint()
+                try:
+                    images = convert_from_path(
+                        str(path), first_page=page_number, last_page=page_number, **convert_kwargs
+                    )
+                except Exception as e:
+                    logger.warning("pdf2image failed: %s", e)
+                    break
+                if not images:
+                    break
                 try:
                     # Polish language is crucial here
-                    page_text = pytesseract.image_to_string(image, lang="pol+eng")
+                    page_text = pytesseract.image_to_string(images[0], lang="pol+eng")
                     ocr_text.append(page_text)
                 except pytesseract.TesseractNotFoundError:
                     logger.warning("Tesseract binary is not available; skipping PDF OCR for %s", path)
                     break
                 except Exception as exc:
-                    logger.warning("OCR failed on page %s: error_type=%s", i, type(exc).__name__)
+                    logger.warning("OCR failed on page %s: error_type=%s", page_number - 1, type(exc).__name__)
 
             text_content = "\n".join(ocr_text)
             logger.debug("Extracted PDF OCR text length=%s", len(text_content))
         except ImportError:
             logger.warning("pdf2image or pytesseract not available")
+        except DocumentJobInterrupted:
+            raise
         except Exception as exc:
             logger.warning("PDF OCR extraction failed: error_type=%s", type(exc).__name__)
 
@@ -3,20 +3,20 @@ from __future__ import annotations
 from datetime import date, timedelta
 from typing import TYPE_CHECKING, Any, cast
 
-from django.db.models import Count, Prefetch, Q
+from django.db.models import Count, F, Q
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from clients.constants import ACTIVE_WORKFLOW_STAGES, FINISHED_WORKFLOW_STAGES, DocumentType
-from clients.models import Case, Client, ClientDocumentRequirement, Document, Payment, StaffTask
+from clients.models import Case, CaseChecklistSummary, Client, Document, Payment, StaffTask
 from clients.services.access import (
     accessible_cases_queryset,
-    accessible_clients_queryset,
     accessible_documents_queryset,
     accessible_payments_queryset,
     accessible_tasks_queryset,
 )
+from clients.services.checklist_summary import missing_item_names
 from clients.services.zus import format_zus_months, missing_zus_months
 
 if TYPE_CHECKING:
@@ -71,42 +71,36 @@ def _review_documents(user: AbstractBaseUser | AnonymousUser | None, limit: int)
 
 
 def _missing_document_clients(user: AbstractBaseUser | AnonymousUser | None, limit: int) -> list[dict[str, Any]]:
-    candidates = (
-        accessible_clients_queryset(
-            user,
-            Client.objects.filter(
-                cases__workflow_stage__in=ACTIVE_WORKFLOW_STAGES
-            ).distinct().order_by("created_at"),  # names are encrypted/unsortable
-        )
-        .prefetch_related(
-            Prefetch("documents", queryset=Document.objects.filter(case__archived_at__isnull=True).order_by("-uploaded_at")),
-            Prefetch(
-                "custom_document_requirements",
-                queryset=ClientDocumentRequirement.objects.filter(is_active=True).order_by("due_date", "created_at"),
+    # Reads the persisted per-case checklist summaries, so every active case
+    # with an open checklist is a candidate without building any checklist.
+    summaries = (
+        CaseChecklistSummary.objects.filter(
+            missing_count__gt=0,
+            client__archived_at__isnull=True,
+            case__in=accessible_cases_queryset(
+                user,
+                Case.objects.filter(workflow_stage__in=ACTIVE_WORKFLOW_STAGES),
             ),
-            "wniosek_submissions__confirmed_by",
-            "wniosek_submissions__attachments",
-            "wniosek_submissions__proof_documents",
-        )[:50]
+        )
+        .select_related("case", "client")
+        .order_by(F("next_due_date").asc(nulls_last=True), "client__created_at", "case_id")[:limit]
     )
     items: list[dict[str, Any]] = []
-    requirements_cache: dict[str, Any] = {}
-    for client in candidates:
-        missing = [item for item in client.get_document_checklist(requirements_cache=requirements_cache) if not item.get("is_complete")]
-        if not missing:
-            continue
+    labels_cache: dict[str, dict[str, str]] = {}
+    for summary in summaries:
+        names = missing_item_names(summary, labels_cache=labels_cache)
         items.append(
             {
-                "client": client,
+                "client": summary.client,
                 "title": _("Недостающие документы"),
-                "detail": ", ".join(str(item.get("name")) for item in missing[:3]),
-                "extra_count": max(len(missing) - 3, 0),
-                "url": _client_url(client.pk, "#documentAccordion"),
+                "detail": ", ".join(names[:3]),
+                "extra_count": max(len(names) - 3, 0),
+                "case_label": summary.case.display_number,
+                "case_url": _case_url(summary.case_id),
+                "url": _client_url(summary.client_id, "#documentAccordion"),
                 "action_label": _("Открыть чеклист"),
             }
         )
-        if len(items) >= limit:
-            break
     return items
 
 
@@ -4,14 +4,30 @@ import logging
 from typing import TYPE_CHECKING, Any
 
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save, pre_delete, pre_save
+from django.contrib.auth.models import Group
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from clients.services.activity import log_client_activity
 
-from .models import Case, Client, Document, EmailLog, EmployeePermission, Payment, Reminder, StaffTask
+from .models import (
+    Case,
+    Client,
+    ClientDocumentRequirement,
+    Document,
+    DocumentRequirement,
+    EmailLog,
+    EmployeePermission,
+    MOSApplicationData,
+    Payment,
+    Reminder,
+    StaffTask,
+    WniosekAttachment,
+    WniosekSubmission,
+)
 
 if TYPE_CHECKING:
     pass
@@ -138,6 +154,14 @@ def clear_cache_on_client_save(sender: Any, instance: Client, **kwargs: Any) ->
     _clear_attention_cache_for_client_id(instance.pk, reason="client_save")
 
 
+@receiver(post_save, sender=Client)
+@receiver(post_delete, sender=Client)
+def forget_client_name_on_change(sender: Any, instance: Client, **kwargs: Any) -> None:
+    from clients.services.client_names import forget_client_display_name
+
+    forget_client_display_name(instance.pk)
+
+
 @receiver(pre_save, sender=Client)
 def sync_payment_service_check(sender: Any, instance: Client, **kwargs: Any) -> None:
     if not instance.pk:
@@ -186,6 +210,14 @@ def compress_document_image_on_upload(sender: Any, instance: Document, **kwargs:
     if not should_compress(file_name):
         return
 
+    from clients.services.document_compression import deferred_compression_enabled
+
+    if deferred_compression_enabled():
+        # Store the original now; ``queue_deferred_document_compression``
+        # schedules the resize/WEBP encode once the row is committed.
+        setattr(instance, "_defer_image_compression", True)
+        return
+
     try:
         compressed_file = compress_uploaded_file(instance.file)
         if compressed_file:
@@ -198,6 +230,17 @@ def compress_document_image_on_upload(sender: Any, instance: Document, **kwargs:
         )
 
 
+@receiver(post_save, sender=Document)
+def queue_deferred_document_compression(sender: Any, instance: Document, **kwargs: Any) -> None:
+    if not getattr(instance, "_defer_image_compression", False):
+        return
+    setattr(instance, "_defer_image_compression", False)
+
+    from clients.services.document_compression import enqueue_document_compression_job
+
+    transaction.on_commit(lambda: enqueue_document_compression_job(document=instance))
+
+
 @receiver(post_save, sender=EmailLog)
 def create_activity_for_email_log(sender: Any, instance: EmailLog, created: bool, **kwargs: Any) -> None:
     if not instance.client_id:
@@ -272,3 +315,156 @@ def clear_attention_cache_on_case_save(sender: Any, instance: Case, **kwargs: An
     # (wezwanie/legal-stay/…), so refresh the cache instead of waiting for it to
     # expire.
     _clear_attention_cache_for_client_id(instance.client_id, reason="case_save")
+
+
+@receiver(post_save, sender=Client)
+@receiver(post_save, sender=Case)
+@receiver(post_save, sender=Document)
+@receiver(post_save, sender=EmailLog)
+@receiver(post_save, sender=MOSApplicationData)
+@receiver(post_save, sender=Payment)
+@receiver(post_save, sender=StaffTask)
+@receiver(post_delete, sender=Case)
+@receiver(post_delete, sender=Document)
+@receiver(post_delete, sender=EmailLog)
+@receiver(post_delete, sender=MOSApplicationData)
+@receiver(post_delete, sender=Payment)
+@receiver(post_delete, sender=StaffTask)
+def refresh_attention_state_on_change(sender: Any, instance: Any, **kwargs: Any) -> None:
+    # Keeps the denormalized ClientAttentionState row in step with its
+    # sources; writes that bypass signals are repaired by the nightly
+    # reconcile_client_attention run.
+    origin = kwargs.get("origin")
+    if isinstance(origin, Client) or getattr(origin, "model", None) is Client:
+        # Cascade of a client deletion: the state row goes with the client.
+        return
+    client_id = instance.pk if sender is Client else getattr(instance, "client_id", None)
+    if not client_id:
+        return
+
+    from clients.services.attention_state import refresh_client_attention_state
+    from clients.services.deferred_refresh import refresh_on_commit
+
+    # Recomputing the row costs several aggregate queries; bulk flows touch
+    # the same client many times, so refresh each client once after commit.
+    refresh_on_commit(refresh_client_attention_state, [client_id])
+
+
+@receiver(post_save, sender=Case)
+@receiver(post_save, sender=ClientDocumentRequirement)
+@receiver(post_save, sender=Document)
+@receiver(post_save, sender=WniosekAttachment)
+@receiver(post_save, sender=WniosekSubmission)
+@receiver(post_delete, sender=ClientDocumentRequirement)
+@receiver(post_delete, sender=Document)
+@receiver(post_delete, sender=WniosekAttachment)
+@receiver(post_delete, sender=WniosekSubmission)
+def refresh_checklist_summary_on_change(sender: Any, instance: Any, **kwargs: Any) -> None:
+    # Keeps the persisted CaseChecklistSummary of the touched case current;
+    # date-driven changes (ZUS months, expiry) are rebuilt nightly.
+    origin = kwargs.get("origin")
+    # ``origin`` is the deleted instance or queryset that started a cascade.
+    origin_model = getattr(origin, "model", None) or type(origin)
+    if origin_model in (Client, Case) or (sender is WniosekAttachment and origin_model is WniosekSubmission):
+        # The summary goes with the case, and a deleted submission refreshes
+        # its case itself.
+        return
+    if sender is Case:
+        case_id = instance.pk
+    elif sender is WniosekAttachment:
+        case_id = (
+            WniosekSubmission.objects.filter(pk=instance.submission_id).values_list("case_id", flat=True).first()
+        )
+    else:
+        case_id = getattr(instance, "case_id", None)
+    if not case_id:
+        return
+
+    from clients.services.checklist_summary import refresh_case_checklist_summary
+    from clients.services.deferred_refresh import refresh_on_commit
+
+    # Rebuilding the checklist is the expensive part of a document save;
+    # rebuild each touched case once, after the write has committed.
+    refresh_on_commit(refresh_case_checklist_summary, [case_id])
+
+
+@receiver(post_save, sender=DocumentRequirement)
+@receiver(post_delete, sender=DocumentRequirement)
+def invalidate_requirement_catalog_on_change(sender: Any, instance: DocumentRequirement, **kwargs: Any) -> None:
+    # Checklist manager and admin edits both land here: drop the process-wide
+    # catalog in every worker and flag the purpose's checklist summaries.
+    from clients.models._requirement_catalog import invalidate_catalog
+    from clients.services.checklist_summary import mark_checklist_summaries_stale
+
+    invalidate_catalog()
+    mark_checklist_summaries_stale(instance.application_purpose)
+
+
+def _forget_cached_user_auth(user: Any) -> None:
+    from clients.services.auth_snapshot import bump_auth_snapshot_version, forget_request_auth_snapshot
+
+    bump_auth_snapshot_version([user.pk])
+    forget_request_auth_snapshot(user)
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_auth_snapshot_of_new_user(sender: Any, instance: Any, created: bool, **kwargs: Any) -> None:
+    # A new account can reuse the id of a deleted (or rolled-back) one; make
+    # sure it never inherits that account's cached snapshot.
+    if created:
+        _forget_cached_user_auth(instance)
+
+
+@receiver(post_save, sender=EmployeePermission)
+@receiver(post_delete, sender=EmployeePermission)
+def invalidate_auth_snapshot_on_permission_change(sender: Any, instance: EmployeePermission, **kwargs: Any) -> None:
+    user = instance._state.fields_cache.get("user")
+    if user is not None:
+        _forget_cached_user_auth(user)
+    else:
+        from clients.services.auth_snapshot import bump_auth_snapshot_version
+
+        bump_auth_snapshot_version([instance.user_id])
+
+
+@receiver(post_save, sender="mfa.Authenticator")
+@receiver(post_delete, sender="mfa.Authenticator")
+def invalidate_auth_snapshot_on_authenticator_change(sender: Any, instance: Any, **kwargs: Any) -> None:
+    from clients.services.auth_snapshot import bump_auth_snapshot_version
+
+    bump_auth_snapshot_version([instance.user_id])
+
+
+@receiver(m2m_changed, sender=get_user_model().groups.through)
+def invalidate_auth_snapshot_on_membership_change(
+    sender: Any,
+    instance: Any,
+    action: str,
+    reverse: bool,
+    pk_set: set[int] | None,
+    **kwargs: Any,
+) -> None:
+    from clients.services.auth_snapshot import bump_auth_snapshot_version
+
+    if not reverse:
+        if action in {"post_add", "post_remove", "post_clear"}:
+            _forget_cached_user_auth(instance)
+        return
+    # group.user_set changes: pk_set holds user ids, except for clear().
+    if action == "pre_clear":
+        instance._auth_snapshot_member_ids = list(instance.user_set.values_list("pk", flat=True))
+    elif action == "post_clear":
+        bump_auth_snapshot_version(getattr(instance, "_auth_snapshot_member_ids", []))
+    elif action in {"post_add", "post_remove"}:
+        bump_auth_snapshot_version(pk_set or ())
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def invalidate_auth_snapshot_on_group_change(sender: Any, instance: Group, created: bool = False, **kwargs: Any) -> None:
+    # Renaming or deleting a group changes the role names of all its members.
+    if created:
+        return
+    from clients.services.auth_snapshot import bump_auth_snapshot_version
+
+    bump_auth_snapshot_version(instance.user_set.values_list("pk", flat=True))
@@ -5,9 +5,31 @@ import pytest
 from django.test import Client as DjangoClient
 
 from clients.models import Client
+from clients.models._requirement_catalog import reset_local_catalog
+from clients.services.client_names import reset_client_display_names
 from clients.tests.factories import create_admin_user, create_manager_user, create_staff_user
 
 
+@pytest.fixture(autouse=True)
+def _fresh_requirement_catalog():
+    """Forget the worker's DocumentRequirement catalog around every test.
+
+    Test transactions are rolled back without signals, so requirement rows
+    created by one test would otherwise survive in the process-wide cache.
+    """
+    reset_local_catalog()
+    yield
+    reset_local_catalog()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_client_names():
+    """Forget cached client display names; rolled-back ids get reused."""
+    reset_client_display_names()
+    yield
+    reset_client_display_names()
+
+
 @pytest.fixture
 def staff_user(db):
     """Return a staff user with the 'Staff' role."""
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from clients.models import Client, ClientActivity
+from clients.services.activity import log_client_activity, log_client_view
+from clients.services.activity_buffer import _BackgroundFlusher, buffered_client_activity
+from clients.tests.factories import create_staff_user
+
+
+class ClientActivityBufferTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.staff = create_staff_user()
+        self.client_obj = Client.objects.create(
+            first_name="Buffer",
+            last_name="Audit",
+            email="buffer-audit@example.com",
+            phone="+48111222333",
+            citizenship="UA",
+        )
+
+    def _log(self, summary: str) -> ClientActivity:
+        return log_client_activity(client=self.client_obj, actor=self.staff, event_type="client_updated", summary=summary)
+
+    @override_settings(CLIENT_ACTIVITY_BUFFERED_WRITES=True)
+    def test_events_in_a_transaction_are_written_in_one_insert_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            with transaction.atomic():
+                for index in range(25):
+                    self._log(f"event {index}")
+                self.assertFalse(ClientActivity.objects.exists())
+
+        with self.assertNumQueries(1):
+            for callback in callbacks:
+                callback()
+        self.assertEqual(ClientActivity.objects.count(), 25)
+        self.assertEqual(ClientActivity.objects.first().actor_label, self.staff.email)
+
+    @override_settings(CLIENT_ACTIVITY_BUFFERED_WRITES=True)
+    def test_events_from_a_rolled_back_savepoint_are_dropped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self._log("kept")
+                try:
+                    with transaction.atomic():
+                        self._log("rolled back")
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+                self._log("kept too")
+
+        self.assertEqual(
+            sorted(ClientActivity.objects.values_list("summary", flat=True)),
+            ["kept", "kept too"],
+        )
+
+    @override_settings(CLIENT_ACTIVITY_BUFFERED_WRITES=True)
+    def test_rolled_back_transaction_does_not_leak_its_buffer_into_the_next_one(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self._log("rolled back")
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            with transaction.atomic():
+                self._log("committed")
+
+        self.assertEqual(list(ClientActivity.objects.values_list("summary", flat=True)), ["committed"])
+
+    def test_explicit_batch_is_written_once_and_discarded_on_error(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with buffered_client_activity():
+                self._log("first")
+                self._log("second")
+                self.assertFalse(ClientActivity.objects.exists())
+        self.assertEqual(ClientActivity.objects.count(), 2)
+
+        with self.assertRaises(ValueError), buffered_client_activity():
+            self._log("lost")
+            raise ValueError
+        self.assertFalse(ClientActivity.objects.filter(summary="lost").exists())
+
+    def test_client_view_dedupe_uses_a_cache_marker_instead_of_a_query(self):
+        log_client_view(client=self.client_obj, actor=self.staff)
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(log_client_view(client=self.client_obj, actor=self.staff))
+        self.assertEqual(ClientActivity.objects.filter(event_type="client_viewed").count(), 1)
+
+    def test_background_flusher_bulk_writes_queued_events(self):
+        flusher = _BackgroundFlusher(interval=3600)
+        for index in range(3):
+            flusher.put(
+                ClientActivity(client=self.client_obj, event_type="client_viewed", summary=f"view {index}")
+            )
+
+        with self.assertNumQueries(1):
+            flusher.flush()
+        self.assertEqual(ClientActivity.objects.filter(event_type="client_viewed").count(), 3)
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from clients.constants import DocumentType
+from clients.models import Document, DocumentProcessingJob
+from clients.services.document_jobs import enqueue_document_processing_job
+from clients.testing.factories import create_test_client, create_test_document, create_test_user
+from clients.views.admin_dashboard import DASHBOARD_CACHE_KEY, dashboard_snapshot
+from database_media.usage import reset_storage_usage
+
+
+class AdminDashboardSnapshotTests(TestCase):
+    def setUp(self):
+        cache.delete(DASHBOARD_CACHE_KEY)
+        reset_storage_usage()
+        self.addCleanup(cache.delete, DASHBOARD_CACHE_KEY)
+        self.addCleanup(reset_storage_usage)
+
+    def test_aggregated_document_counts_match_the_per_filter_definitions(self):
+        today = timezone.localdate()
+        active_client = create_test_client()
+        create_test_document(active_client, awaiting_confirmation=True)
+        create_test_document(active_client, expiry_date=today - timedelta(days=1))
+        create_test_document(active_client)
+        rejected = create_test_document(active_client)
+        Document.objects.filter(pk=rejected.pk).update(rejection_reason="Blurred", ocr_name_mismatch=True)
+        archived_client = create_test_client()
+        create_test_document(archived_client, awaiting_confirmation=True)
+        create_test_document(archived_client)
+        archived_client.archived_at = timezone.now()
+        archived_client.save(update_fields=["archived_at"])
+
+        snapshot = dashboard_snapshot()
+
+        active_docs = Document.objects.filter(client__archived_at__isnull=True, case__archived_at__isnull=True)
+        expected = {
+            "docs_awaiting_confirmation": active_docs.filter(awaiting_confirmation=True).count(),
+            "docs_awaiting_verification": active_docs.filter(
+                file__gt="", verified=False, awaiting_confirmation=False, archived_at__isnull=True
+            )
+            .exclude(Q(rejection_reason__isnull=False) & ~Q(rejection_reason=""))
+            .exclude(expiry_date__isnull=False, expiry_date__lt=today)
+            .count(),
+            "docs_name_mismatch": active_docs.filter(ocr_name_mismatch=True).count(),
+            "expired_documents": active_docs.filter(expiry_date__isnull=False, expiry_date__lt=today).count(),
+        }
+        self.assertEqual({key: snapshot[key] for key in expected}, expected)
+        self.assertEqual(expected["docs_awaiting_confirmation"], 1)
+        self.assertEqual(expected["docs_awaiting_verification"], 1)
+        self.assertEqual(snapshot["storage"]["file_count"], 6)
+
+    def test_snapshot_runs_one_count_query_per_model(self):
+        # Document, DocumentProcessingJob, EmailCampaign, StaffTask, Reminder,
+        # recent campaigns, and the two reads behind the (empty) OCR plan.
+        dashboard_snapshot()
+        with self.assertNumQueries(8):
+            dashboard_snapshot()
+
+    @override_settings(ADMIN_DASHBOARD_CACHE_SECONDS=60)
+    def test_snapshot_is_cached_until_refreshed(self):
+        self.client.force_login(create_test_user())
+        url = reverse("clients:admin_dashboard")
+        self.assertEqual(self.client.get(url).context["pending_document_jobs"], 0)
+
+        client = create_test_client()
+        enqueue_document_processing_job(document=create_test_document(client, doc_type=DocumentType.WEZWANIE.value))
+        self.assertEqual(DocumentProcessingJob.objects.count(), 1)
+        self.assertEqual(self.client.get(url).context["pending_document_jobs"], 0)
+
+        response = self.client.post(url)
+
+        self.assertRedirects(response, url)
+        self.assertEqual(self.client.get(url).context["pending_document_jobs"], 1)
+
+    @override_settings(ADMIN_DASHBOARD_CACHE_SECONDS=60)
+    def test_cached_snapshot_holds_no_client_names(self):
+        client = create_test_client(first_name="Cached")
+        enqueue_document_processing_job(document=create_test_document(client, doc_type=DocumentType.WEZWANIE.value))
+        self.client.force_login(create_test_user())
+
+        response = self.client.get(reverse("clients:admin_dashboard"))
+
+        self.assertEqual(response.context["document_job_plan"]["jobs"][0]["client_name"], client.get_full_name())
+        cached_job = cache.get(DASHBOARD_CACHE_KEY)["document_job_plan"]["jobs"][0]
+        self.assertEqual(cached_job["client_id"], client.pk)
+        self.assertNotIn("client_name", cached_job)
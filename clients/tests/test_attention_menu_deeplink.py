@@ -22,13 +22,15 @@ class AttentionMenuDeepLinkTests(TestCase):
         self.client.login(email=self.staff.email, password=TEST_USER_CREDENTIAL)
 
     def _unverified_client(self, email: str) -> Client:
-        client = Client.objects.create(first_name="Unv", last_name="Doc", email=email)
-        Document.objects.create(
-            client=client,
-            document_type="passport",
-            file=SimpleUploadedFile(f"{email}.pdf", b"x", content_type="application/pdf"),
-            verified=False,
-        )
+        # The attention state is refreshed when the writes commit.
+        with self.captureOnCommitCallbacks(execute=True):
+            client = Client.objects.create(first_name="Unv", last_name="Doc", email=email)
+            Document.objects.create(
+                client=client,
+                document_type="passport",
+                file=SimpleUploadedFile(f"{email}.pdf", b"x", content_type="application/pdf"),
+                verified=False,
+            )
         return client
 
     def test_single_client_links_to_the_fix(self) -> None:
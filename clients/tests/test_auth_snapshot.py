@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from allauth.mfa.models import Authenticator
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from clients.services.access import user_has_internal_role
+from clients.services.auth_snapshot import AUTH_SNAPSHOT_CACHE_PREFIX, _snapshot_version, auth_snapshot
+from clients.services.permissions import has_employee_permission
+from clients.services.roles import ensure_predefined_roles
+
+AUTH_TABLES = ("auth_group", "clients_employeepermission", "mfa_authenticator")
+
+
+def _fresh(user):
+    """The user as the next request would load it."""
+    return get_user_model().objects.get(pk=user.pk)
+
+
+class AuthSnapshotTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        ensure_predefined_roles()
+        self.staff = get_user_model().objects.create_user(
+            email="snapshot-staff@example.com", password="pass", is_staff=True
+        )
+        self.staff.groups.add(Group.objects.get(name="Staff"))
+
+    def test_steady_state_staff_pages_skip_auth_queries(self) -> None:
+        self.client.force_login(self.staff)
+        self.client.get(reverse("clients:admin_dashboard"))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("clients:admin_dashboard"))
+
+        self.assertEqual(response.status_code, 200)
+        auth_queries = [q["sql"] for q in queries if any(table in q["sql"] for table in AUTH_TABLES)]
+        self.assertEqual(auth_queries, [])
+
+    def test_group_membership_changes_invalidate_the_snapshot(self) -> None:
+        self.assertFalse(user_has_internal_role(_fresh(self.staff), "Admin"))
+
+        Group.objects.get(name="Admin").user_set.add(self.staff)
+        self.assertTrue(user_has_internal_role(_fresh(self.staff), "Admin"))
+
+        self.staff.groups.clear()
+        self.assertEqual(auth_snapshot(_fresh(self.staff)).group_names, frozenset())
+
+    def test_permission_and_authenticator_changes_invalidate_the_snapshot(self) -> None:
+        self.assertFalse(has_employee_permission(_fresh(self.staff), "can_delete_clients"))
+        self.assertFalse(auth_snapshot(_fresh(self.staff)).mfa_enabled)
+
+        permissions = self.staff.employee_permission
+        permissions.can_delete_clients = True
+        permissions.save(update_fields=["can_delete_clients", "updated_at"])
+        Authenticator.objects.create(user=self.staff, type=Authenticator.Type.TOTP, data={})
+
+        self.assertTrue(has_employee_permission(self.staff, "can_delete_clients"))
+        self.assertTrue(auth_snapshot(_fresh(self.staff)).mfa_enabled)
+
+    def test_snapshot_cached_before_the_commit_is_invalidated_by_it(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            permissions = self.staff.employee_permission
+            permissions.can_delete_clients = True
+            permissions.save(update_fields=["can_delete_clients", "updated_at"])
+            # A concurrent request still seeing the old row caches it under
+            # the version bumped by the save.
+            cache.set(
+                f"{AUTH_SNAPSHOT_CACHE_PREFIX}{self.staff.pk}:{_snapshot_version(self.staff.pk)}",
+                {"groups": ["Staff"], "permissions": [], "mfa": False},
+            )
+
+        self.assertTrue(has_employee_permission(_fresh(self.staff), "can_delete_clients"))
+
+    def test_renaming_a_group_invalidates_its_members(self) -> None:
+        group = Group.objects.create(name="Interns")
+        group.user_set.add(self.staff)
+        self.assertIn("Interns", auth_snapshot(_fresh(self.staff)).group_names)
+
+        group.name = "Trainees"
+        group.save()
+
+        self.assertIn("Trainees", auth_snapshot(_fresh(self.staff)).group_names)
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import CommandError
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from clients.management.commands.run_background_automation_loop import (
+    HEARTBEAT_CACHE_KEY,
+    TASK_SCHEDULE_CACHE_KEY,
+    Command,
+    _TaskLane,
+)
+from clients.services.automation_schedule import DailySchedule, IntervalSchedule, parse_schedule
+
+
+class ScheduleParsingTests(SimpleTestCase):
+    def test_interval_and_daily_specs(self) -> None:
+        self.assertEqual(parse_schedule("every 5m").seconds, 300)
+        self.assertEqual(parse_schedule(" Every 90 ").seconds, 90)
+
+        daily = parse_schedule("at 17:10, 08:00")
+        assert isinstance(daily, DailySchedule)
+        morning = timezone.make_aware(datetime(2026, 6, 15, 9, 0))
+        evening = timezone.make_aware(datetime(2026, 6, 15, 18, 0))
+        self.assertEqual(daily.next_after(morning), timezone.make_aware(datetime(2026, 6, 15, 17, 10)))
+        self.assertEqual(daily.next_after(evening), timezone.make_aware(datetime(2026, 6, 16, 8, 0)))
+        self.assertEqual(str(daily), "at 08:00,17:10")
+
+        for spec in ("hourly", "every 0s", "at 25:00"):
+            with self.subTest(spec=spec), self.assertRaises(ValueError):
+                parse_schedule(spec)
+
+    def test_daily_tasks_get_slots_and_overrides_are_validated(self) -> None:
+        schedules = Command()._task_schedules(interval_seconds=300, job_poll_seconds=30)
+        # Daily tasks are polled; their own guards keep them to one run per slot.
+        self.assertEqual(str(schedules["retention-maintenance"]), "every 900s")
+        self.assertEqual(str(schedules["weekly-document-reminders"]), "every 900s")
+        self.assertEqual(str(schedules["document-jobs"]), "every 30s")
+        self.assertEqual(str(schedules["case-checklists"]), "every 300s")
+
+        with override_settings(BACKGROUND_AUTOMATION_SCHEDULES={"export-jobs": "every 2m"}):
+            schedules = Command()._task_schedules(interval_seconds=300, job_poll_seconds=30)
+        self.assertEqual(str(schedules["export-jobs"]), "every 120s")
+
+        for overrides in ({"nightly-magic": "every 1h"}, {"export-jobs": "sometimes"}):
+            with self.subTest(overrides=overrides), override_settings(BACKGROUND_AUTOMATION_SCHEDULES=overrides):
+                with self.assertRaises(CommandError):
+                    Command()._task_schedules(interval_seconds=300, job_poll_seconds=30)
+
+
+class TaskLaneTests(SimpleTestCase):
+    def test_run_records_duration_next_run_and_overruns(self) -> None:
+        started = timezone.make_aware(datetime(2026, 6, 15, 9, 0))
+        lane = _TaskLane("export-jobs", schedule=IntervalSchedule(60), run=lambda: True)
+
+        with patch(
+            "clients.management.commands.run_background_automation_loop.timezone.now",
+            side_effect=[started, started + timedelta(seconds=5)],
+        ):
+            lane.run_once()
+        self.assertEqual(lane.next_run_at, started + timedelta(seconds=60))
+        self.assertEqual(lane.overruns, 0)
+
+        finished = started + timedelta(seconds=200)
+        with patch(
+            "clients.management.commands.run_background_automation_loop.timezone.now",
+            side_effect=[started, finished],
+        ):
+            lane.run_once()
+        self.assertEqual(lane.overruns, 1)
+        self.assertEqual(lane.next_run_at, finished + timedelta(seconds=60))
+        snapshot = lane.snapshot()
+        self.assertEqual(snapshot["last_status"], "ok")
+        self.assertEqual(snapshot["schedule"], "every 60s")
+        self.assertFalse(snapshot["running"])
+
+    def test_run_longer_than_its_schedule_multiple_is_stalled(self) -> None:
+        started = timezone.make_aware(datetime(2026, 6, 15, 9, 0))
+        lane = _TaskLane("document-jobs", schedule=IntervalSchedule(60), run=lambda: True)
+        self.assertFalse(lane.stalled(started, grace_seconds=0))
+
+        lane.running = True
+        lane.last_started_at = started
+        self.assertFalse(lane.stalled(started + timedelta(seconds=170), grace_seconds=0))
+        self.assertTrue(lane.stalled(started + timedelta(seconds=190), grace_seconds=0))
+        self.assertFalse(lane.stalled(started + timedelta(seconds=190), grace_seconds=300))
+
+    def test_crashing_task_is_reported_as_failed(self) -> None:
+        def run() -> bool:
+            raise RuntimeError("boom")
+
+        lane = _TaskLane("export-jobs", schedule=IntervalSchedule(60), run=run)
+        lane.run_once()
+
+        self.assertFalse(lane.last_succeeded)
+        self.assertIsNotNone(lane.next_run_at)
+
+
+class PublishedScheduleTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    @override_settings(DEBUG=True)
+    def test_lane_state_is_published_next_to_the_heartbeat(self) -> None:
+        healthy = _TaskLane("export-jobs", schedule=IntervalSchedule(60), run=lambda: True)
+        failing = _TaskLane("email-campaigns", schedule=IntervalSchedule(60), run=lambda: False)
+        idle = _TaskLane("retention-maintenance", schedule=parse_schedule("at 03:30"), run=lambda: True)
+        healthy.run_once()
+        failing.run_once()
+
+        Command()._publish_lane_state([healthy, failing, idle], timeout=180)
+
+        self.assertEqual(cache.get(HEARTBEAT_CACHE_KEY)["failed_tasks"], ["email-campaigns"])
+        component = self.client.get(reverse("readiness")).json()["components"]["background_automation"]
+        self.assertEqual(component["failed_tasks"], ["email-campaigns"])
+        self.assertEqual(set(component["tasks"]), {"export-jobs", "email-campaigns", "retention-maintenance"})
+        self.assertIsNotNone(component["tasks"]["export-jobs"]["next_run_at"])
+        self.assertIsNone(component["tasks"]["retention-maintenance"]["last_status"])
+        self.assertEqual(cache.get(TASK_SCHEDULE_CACHE_KEY), component["tasks"])
+
+    def test_hung_lane_is_reported_as_failed(self) -> None:
+        hung = _TaskLane("export-jobs", schedule=IntervalSchedule(60), run=lambda: True)
+        hung.running = True
+        hung.last_started_at = timezone.now() - timedelta(hours=1)
+
+        Command()._publish_lane_state([hung], timeout=180)
+
+        heartbeat = cache.get(HEARTBEAT_CACHE_KEY)
+        self.assertEqual((heartbeat["status"], heartbeat["failed_tasks"]), ("error", ["export-jobs"]))
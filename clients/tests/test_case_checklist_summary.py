@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from clients.constants import DocumentType
+from clients.models import CaseChecklistSummary, ClientDocumentRequirement, DocumentRequirement
+from clients.services import checklist_summary
+from clients.services.checklist_summary import missing_item_names
+from clients.services.workday import _missing_document_clients
+from clients.testing.factories import create_test_client, create_test_document, create_test_user
+
+
+class CaseChecklistSummarySignalTests(TestCase):
+    def setUp(self) -> None:
+        # Summaries are refreshed once the triggering write commits.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client_obj = create_test_client(first_name="Checklist", last_name="Summary")
+        self.case = self.client_obj.cases.get()
+
+    def _summary(self) -> CaseChecklistSummary:
+        return CaseChecklistSummary.objects.get(case=self.case)
+
+    def test_summary_follows_document_uploads(self) -> None:
+        before = self._summary()
+        self.assertIn(DocumentType.PASSPORT.value, before.missing_codes)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            document = create_test_document(self.client_obj)
+        after = self._summary()
+        self.assertNotIn(DocumentType.PASSPORT.value, after.missing_codes)
+        self.assertEqual(after.missing_count, before.missing_count - 1)
+        self.assertGreater(after.completion_ratio, before.completion_ratio)
+
+        # Archiving writes archived_at with .update(); on_archive refreshes.
+        document.delete()
+        self.assertIn(DocumentType.PASSPORT.value, self._summary().missing_codes)
+
+    def test_documents_saved_together_rebuild_the_case_once(self) -> None:
+        with mock.patch(
+            "clients.services.checklist_summary.compute_case_checklist_summaries",
+            wraps=checklist_summary.compute_case_checklist_summaries,
+        ) as compute:
+            with self.captureOnCommitCallbacks(execute=True):
+                for doc_type in (DocumentType.PASSPORT, DocumentType.WEZWANIE, DocumentType.ZUS_RCA_OR_INSURANCE):
+                    create_test_document(self.client_obj, doc_type=doc_type.value)
+                self.assertEqual(compute.call_count, 0)
+
+        compute.assert_called_once_with({self.case.pk})
+
+    def test_custom_requirement_is_the_next_due_item(self) -> None:
+        due_date = timezone.localdate() + timedelta(days=5)
+        with self.captureOnCommitCallbacks(execute=True):
+            ClientDocumentRequirement.objects.create(
+                client=self.client_obj,
+                case=self.case,
+                document_type="bank_statement",
+                name="Bank statement",
+                due_date=due_date,
+            )
+
+        summary = self._summary()
+        self.assertEqual((summary.next_due_name, summary.next_due_date), ("Bank statement", due_date))
+        self.assertIn("Bank statement", missing_item_names(summary))
+
+    def test_catalog_edit_marks_rows_stale_until_reconciled(self) -> None:
+        DocumentRequirement.objects.create(
+            application_purpose="work", document_type="extra_certificate", custom_name="Extra certificate"
+        )
+        summary = self._summary()
+        self.assertTrue(summary.is_stale)
+        self.assertNotIn("extra_certificate", summary.missing_codes)
+
+        call_command("reconcile_case_checklists", "--stale-only", stdout=open("/dev/null", "w"))
+
+        summary = self._summary()
+        self.assertFalse(summary.is_stale)
+        self.assertIn("extra_certificate", summary.missing_codes)
+
+
+class WorkdayMissingDocumentsTests(TestCase):
+    def test_queue_reads_summaries_in_constant_queries(self) -> None:
+        staff = create_test_user()
+        with self.captureOnCommitCallbacks(execute=True):
+            create_test_client(first_name="First", last_name="Case")
+        _missing_document_clients(staff, limit=20)  # warm per-process lookups
+
+        with CaptureQueriesContext(connection) as single:
+            items = _missing_document_clients(staff, limit=20)
+        self.assertEqual(len(items), 1)
+        self.assertTrue(items[0]["case_label"])
+        self.assertTrue(items[0]["detail"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for index in range(3):
+                create_test_client(first_name=f"More{index}", last_name="Cases")
+        with CaptureQueriesContext(connection) as many:
+            items = _missing_document_clients(staff, limit=20)
+        self.assertEqual(len(items), 4)
+        self.assertEqual(len(many.captured_queries), len(single.captured_queries))
+
+    def test_reconcile_backfills_cases_without_summary(self) -> None:
+        client = create_test_client(first_name="No", last_name="Summary")
+        CaseChecklistSummary.objects.filter(client=client).delete()
+
+        call_command("reconcile_case_checklists", stdout=open("/dev/null", "w"))
+
+        self.assertTrue(CaseChecklistSummary.objects.filter(client=client, missing_count__gt=0).exists())
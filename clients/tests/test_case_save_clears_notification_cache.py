@@ -23,16 +23,19 @@ class CaseSaveClearsNotificationCacheTests(TestCase):
         self.client.login(email=self.staff.email, password=TEST_USER_CREDENTIAL)
 
     def test_entering_case_number_drops_the_wezwanie_count(self) -> None:
-        client = create_test_client(first_name="Nav", last_name="Refresh")
-        case = client.cases.get()
-        create_test_document(client, case=case, doc_type=DocumentType.WEZWANIE.value)
+        # The attention state is refreshed when the writes commit.
+        with self.captureOnCommitCallbacks(execute=True):
+            client = create_test_client(first_name="Nav", last_name="Refresh")
+            case = client.cases.get()
+            create_test_document(client, case=case, doc_type=DocumentType.WEZWANIE.value)
 
         first = self.client.get(reverse("clients:client_list"))
         self.assertEqual(first.context["attention_counts"]["wezwanie_missing_case"], 1)
 
         # Enter the authority number — the Case post_save signal clears the cache.
         case.authority_case_number = "WSC-II-P.6151.7.2026"
-        case.save(update_fields=["authority_case_number", "authority_case_number_hash"])
+        with self.captureOnCommitCallbacks(execute=True):
+            case.save(update_fields=["authority_case_number", "authority_case_number_hash"])
 
         second = self.client.get(reverse("clients:client_list"))
         self.assertEqual(second.context["attention_counts"]["wezwanie_missing_case"], 0)
@@ -43,9 +46,10 @@ class CaseSaveClearsNotificationCacheTests(TestCase):
         # hash — which backs the navbar filter — must still be refreshed.
         from clients.services.locking import update_case_with_version
 
-        client = create_test_client(first_name="Form", last_name="Path")
-        case = client.cases.get()
-        create_test_document(client, case=case, doc_type=DocumentType.WEZWANIE.value)
+        with self.captureOnCommitCallbacks(execute=True):
+            client = create_test_client(first_name="Form", last_name="Path")
+            case = client.cases.get()
+            create_test_document(client, case=case, doc_type=DocumentType.WEZWANIE.value)
 
         first = self.client.get(reverse("clients:client_list"))
         self.assertEqual(first.context["attention_counts"]["wezwanie_missing_case"], 1)
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from clients.models import Case, Client, ClientAttentionState, EmailLog, Payment
+from clients.services import attention_state
+from clients.services.attention import (
+    ATTENTION_FILTERS,
+    apply_client_attention_filter,
+    count_client_attention_filters,
+)
+from clients.services.attention_state import reconcile_client_attention_states
+from clients.testing.factories import create_pending_payment, create_test_client, create_test_document
+from clients.use_cases.documents import verify_all_client_documents
+
+
+def _flagged(attention_filter: str, **kwargs) -> set[int]:
+    return set(apply_client_attention_filter(Client.objects.all(), attention_filter, **kwargs).values_list("pk", flat=True))
+
+
+class ClientAttentionStateSignalTests(TestCase):
+    # The receivers refresh the row once the write commits; each
+    # ``self.committed()`` block stands for one committed request.
+    def committed(self):
+        return self.captureOnCommitCallbacks(execute=True)
+
+    def setUp(self) -> None:
+        with self.committed():
+            self.client_obj = create_test_client(first_name="Attention", last_name="State")
+
+    def test_state_row_is_created_with_the_client(self) -> None:
+        state = ClientAttentionState.objects.get(client=self.client_obj)
+
+        self.assertIsNone(state.earliest_open_payment_due)
+        self.assertFalse(state.has_ocr_review)
+
+    def test_payment_changes_are_reflected_immediately(self) -> None:
+        with self.committed():
+            payment = create_pending_payment(self.client_obj)
+        self.assertIn(self.client_obj.pk, _flagged("overdue_payments"))
+
+        payment.due_date = timezone.localdate() + timedelta(days=14)
+        with self.committed():
+            payment.save()
+        self.assertNotIn(self.client_obj.pk, _flagged("overdue_payments"))
+
+        payment.due_date = timezone.localdate()
+        with self.committed():
+            payment.save()
+        self.assertIn(self.client_obj.pk, _flagged("overdue_payments"))
+        # Archiving writes archived_at with .update(); on_archive refreshes.
+        payment.delete()
+        self.assertNotIn(self.client_obj.pk, _flagged("overdue_payments"))
+
+    def test_document_expiry_keys_follow_today(self) -> None:
+        today = timezone.localdate()
+        with self.committed():
+            create_test_document(self.client_obj, expiry_date=today + timedelta(days=3))
+
+        self.assertIn(self.client_obj.pk, _flagged("expiring_documents"))
+        self.assertNotIn(self.client_obj.pk, _flagged("expired_documents"))
+        # A week later the same row reports the document as expired.
+        self.assertIn(self.client_obj.pk, _flagged("expired_documents", today=today + timedelta(days=7)))
+
+    def test_unverified_document_is_judged_per_document(self) -> None:
+        today = timezone.localdate()
+        with self.committed():
+            pending = create_test_document(self.client_obj)
+            rejected = create_test_document(self.client_obj)
+            rejected.rejection_reason = "Blurry scan"
+            rejected.save()
+            create_test_document(self.client_obj, expiry_date=today - timedelta(days=1))
+
+        self.assertIn(self.client_obj.pk, _flagged("unverified_documents"))
+
+        pending.verified = True
+        with self.committed():
+            pending.save()
+        self.assertNotIn(self.client_obj.pk, _flagged("unverified_documents"))
+
+    def test_verify_all_refreshes_the_state_after_its_bulk_update(self) -> None:
+        with self.committed():
+            create_test_document(self.client_obj)
+        self.assertIn(self.client_obj.pk, _flagged("unverified_documents"))
+
+        verify_all_client_documents(client=self.client_obj, actor=None, send_missing_email=lambda client: 0)
+
+        self.assertNotIn(self.client_obj.pk, _flagged("unverified_documents"))
+
+    def test_hard_deleting_a_client_removes_its_state(self) -> None:
+        # Cascaded children must not re-create the row of the client being deleted.
+        with self.committed():
+            EmailLog.objects.create(client=self.client_obj, subject="Bounced", delivery_status="failed")
+            Case.all_objects.filter(client=self.client_obj).hard_delete()
+        self.assertIn(self.client_obj.pk, _flagged("failed_emails"))
+
+        with self.committed():
+            self.client_obj.delete(hard=True)
+
+        self.assertFalse(ClientAttentionState.objects.filter(client_id=self.client_obj.pk).exists())
+
+    def test_writes_in_one_transaction_refresh_the_client_once(self) -> None:
+        with mock.patch(
+            "clients.services.attention_state.compute_client_attention_states",
+            wraps=attention_state.compute_client_attention_states,
+        ) as compute:
+            with self.committed():
+                for index in range(3):
+                    EmailLog.objects.create(client=self.client_obj, subject=f"Bounced {index}", delivery_status="failed")
+                self.assertEqual(compute.call_count, 0)
+
+        compute.assert_called_once_with({self.client_obj.pk})
+        self.assertIn(self.client_obj.pk, _flagged("failed_emails"))
+
+    def test_rolled_back_writes_are_not_refreshed(self) -> None:
+        with mock.patch("clients.services.attention_state.compute_client_attention_states") as compute:
+            with self.committed():
+                try:
+                    with transaction.atomic():
+                        EmailLog.objects.create(client=self.client_obj, subject="Bounced", delivery_status="failed")
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+
+        compute.assert_not_called()
+
+    def test_badge_counts_are_a_single_query(self) -> None:
+        with self.committed():
+            create_pending_payment(self.client_obj)
+            create_test_document(self.client_obj, awaiting_confirmation=True)
+
+        with CaptureQueriesContext(connection) as queries:
+            counts = count_client_attention_filters(Client.objects.all(), filters=(*ATTENTION_FILTERS, "ocr_review"))
+
+        self.assertEqual(len(queries.captured_queries), 1)
+        self.assertEqual(counts["overdue_payments"], 1)
+        self.assertEqual(counts["ocr_review"], 1)
+        self.assertEqual(counts["failed_emails"], 0)
+
+
+class ReconcileClientAttentionTests(TestCase):
+    def test_reconcile_repairs_writes_that_bypassed_signals(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            client = create_test_client(first_name="Drift", last_name="Repair")
+            untouched = create_test_client(first_name="No", last_name="Drift")
+            payment = create_pending_payment(client)
+        Payment.objects.filter(pk=payment.pk).update(due_date=timezone.localdate() + timedelta(days=14))
+        self.assertIn(client.pk, _flagged("overdue_payments"))
+
+        result = reconcile_client_attention_states()
+
+        self.assertEqual((result.checked, result.created, result.repaired), (2, 0, 1))
+        self.assertNotIn(client.pk, _flagged("overdue_payments"))
+        self.assertTrue(ClientAttentionState.objects.filter(client=untouched).exists())
+
+    def test_missing_only_creates_absent_rows(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            client = create_test_client(first_name="Missing", last_name="Row")
+            create_test_document(client, ocr_status="pending")
+        ClientAttentionState.objects.filter(client=client).delete()
+        self.assertNotIn(client.pk, _flagged("ocr_pending"))
+
+        call_command("reconcile_client_attention", "--missing-only", stdout=open("/dev/null", "w"))
+
+        self.assertIn(client.pk, _flagged("ocr_pending"))
@@ -0,0 +1,123 @@
+"""Client detail shell + lazily loaded history fragments.
+
+The detail page must not grow with the client's history: activity, emails,
+open tasks and document versions are fetched as capped, cursor-paginated
+fragments whose query count is flat in the number of stored rows.
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from clients.models import ClientActivity, Document, DocumentVersion, EmailLog, StaffTask
+from clients.views.client_fragments import ACTIVITY_PAGE_SIZE, EMAIL_PAGE_SIZE, TASK_PAGE_SIZE, VERSION_PAGE_SIZE
+
+FRAGMENT_QUERY_BUDGET = 8
+
+
+def _add_history(client, count: int, *, start: int = 0) -> None:
+    now = timezone.now()
+    for index in range(start, start + count):
+        log = EmailLog.objects.create(
+            client=client, subject=f"Subject {index}", body=f"Body {index}", recipients="client@example.com"
+        )
+        EmailLog.objects.filter(pk=log.pk).update(sent_at=now - timedelta(minutes=index))
+        ClientActivity.objects.create(client=client, event_type="client_updated", summary=f"Activity {index}")
+        StaffTask.objects.create(client=client, title=f"Task {index}", due_date=now.date() + timedelta(days=index))
+        document = Document.objects.create(
+            client=client, document_type="custom_document", file=f"documents/history-{index}.pdf"
+        )
+        DocumentVersion.objects.create(document=document, file=f"document_versions/v-{index}.pdf", version_number=1)
+
+
+def _get(http_client, url_name: str, client, **params):
+    with CaptureQueriesContext(connection) as queries:
+        response = http_client.get(reverse(url_name, kwargs={"pk": client.pk}), params)
+    assert response.status_code == 200
+    return response, len(queries.captured_queries)
+
+
+@pytest.mark.django_db
+def test_detail_shell_does_not_load_history(logged_in_admin, sample_client):
+    url = reverse("clients:client_detail", kwargs={"pk": sample_client.pk}) + "?view=person"
+    logged_in_admin.get(url)  # warm the navigation counters cache
+    with CaptureQueriesContext(connection) as empty:
+        logged_in_admin.get(url)
+
+    _add_history(sample_client, 30)
+    logged_in_admin.get(url)
+    with CaptureQueriesContext(connection) as full:
+        response = logged_in_admin.get(url)
+
+    content = response.content.decode("utf-8")
+    assert "Subject 0" not in content
+    assert "Activity 0" not in content
+    for url_name in (
+        "client_activity_fragment",
+        "client_emails_fragment",
+        "client_tasks_fragment",
+        "client_versions_fragment",
+    ):
+        assert reverse(f"clients:{url_name}", kwargs={"pk": sample_client.pk}) in content
+    assert len(full.captured_queries) == len(empty.captured_queries)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("url_name", "page_size", "model"),
+    [
+        ("clients:client_activity_fragment", ACTIVITY_PAGE_SIZE, ClientActivity),
+        ("clients:client_emails_fragment", EMAIL_PAGE_SIZE, EmailLog),
+        ("clients:client_tasks_fragment", TASK_PAGE_SIZE, StaffTask),
+        ("clients:client_versions_fragment", VERSION_PAGE_SIZE, DocumentVersion),
+    ],
+)
+def test_fragment_is_capped_and_query_count_is_flat(logged_in_admin, sample_client, url_name, page_size, model):
+    _add_history(sample_client, 3)
+    _get(logged_in_admin, url_name, sample_client)  # warm the translation-override cache
+    _, small_queries = _get(logged_in_admin, url_name, sample_client)
+
+    _add_history(sample_client, page_size + 5, start=3)
+    response, large_queries = _get(logged_in_admin, url_name, sample_client)
+
+    page = response.context["page_obj"]
+    assert len(page) == page_size
+    assert page.has_next()
+    assert "data-fragment-more" in response.content.decode("utf-8")
+    assert large_queries == small_queries
+    assert large_queries <= FRAGMENT_QUERY_BUDGET
+
+    seen = [obj.pk for obj in page]
+    while page.has_next():
+        response, _ = _get(logged_in_admin, url_name, sample_client, cursor=page.next_token)
+        page = response.context["page_obj"]
+        seen.extend(obj.pk for obj in page)
+    assert len(seen) == len(set(seen)) == model.objects.count()
+
+
+@pytest.mark.django_db
+def test_email_fragment_lists_newest_first_and_rejects_bad_cursor(logged_in_admin, sample_client):
+    _add_history(sample_client, 2)
+
+    response, _ = _get(logged_in_admin, "clients:client_emails_fragment", sample_client)
+
+    content = response.content.decode("utf-8")
+    assert content.index("Subject 0") < content.index("Subject 1")
+    assert "data-fragment-more" not in content
+    bad = logged_in_admin.get(
+        reverse("clients:client_emails_fragment", kwargs={"pk": sample_client.pk}), {"cursor": "forged"}
+    )
+    assert bad.status_code == 404
+
+
+@pytest.mark.django_db
+def test_fragments_show_empty_state(logged_in_admin, sample_client):
+    response, _ = _get(logged_in_admin, "clients:client_tasks_fragment", sample_client)
+
+    assert not response.context["page_obj"].has_other_pages()
+    assert "list-group-item" not in response.content.decode("utf-8")
@@ -1,12 +1,15 @@
 """Client identity PII is encrypted at rest but stays searchable via blind indexes.
 
 Covers the searchable-encryption design: ciphertext at rest, transparent
-decryption, exact blind-index match for email/phone, prefix/word search for
-encrypted names, and intake de-duplication over the hashes.
+decryption, exact blind-index match for email/phone, prefix/word and trigram
+search for encrypted names, and intake de-duplication over the hashes.
 """
 from __future__ import annotations
 
+import io
+
 import pytest
+from django.core.management import call_command
 from django.db import connection
 
 from clients.models import Client, ClientSearchToken
@@ -76,6 +79,20 @@ def test_search_by_email_and_phone_and_case_insensitive():
     assert _search("48500600700") == {client.id}
 
 
+def test_case_number_search_skips_archived_cases():
+    from django.utils import timezone
+
+    client = _make()
+    case = client.cases.get()
+    case.authority_case_number = "WSC-II-S.6151.12345.2026"
+    case.save()
+    assert _search("WSC-II-S.6151.12345.2026") == {client.id}
+
+    case.archived_at = timezone.now()
+    case.save(update_fields=["archived_at"])
+    assert _search("WSC-II-S.6151.12345.2026") == set()
+
+
 def test_tokens_rebuilt_on_rename():
     client = _make(first_name="Иван", last_name="Петров")
     assert _search("ива") == {client.id}
@@ -93,6 +110,48 @@ def test_tokens_created_for_client():
     assert ClientSearchToken.objects.filter(client=client).count() >= 4
 
 
+def test_substring_transliteration_and_typo_search():
+    kowalczyk = _make(first_name="Łukasz", last_name="Kowalczyk", email="lukasz@example.com")
+    sergii = _make(first_name="Сергій", last_name="Бойко", email="serhii@example.com")
+
+    assert _search("walcz") == {kowalczyk.id}  # fragment inside the word
+    assert _search("lukasz") == {kowalczyk.id}  # ł/l
+    assert _search("kowalcyk") == {kowalczyk.id}  # one letter missing
+    assert _search("сергии") == {sergii.id}  # й/і folded to i
+    assert _search("serg") == {sergii.id}  # Latin spelling of a Cyrillic name
+    assert _search("nowak") == set()
+
+
+def test_search_rank_orders_exact_words_first():
+    fuzzy = _make(first_name="Anna", last_name="Kowalska", email="anna@example.com")
+    exact = _make(first_name="Jan", last_name="Kowalski", email="jan@example.com")
+
+    ranked = list(
+        Client.objects.filter(Client.build_search_filter("kowalski"))
+        .with_search_rank("kowalski")
+        .order_by("-search_rank")
+        .values_list("id", "search_rank")
+    )
+    assert [client_id for client_id, _rank in ranked] == [exact.id, fuzzy.id]
+    assert ranked[0][1] > ranked[1][1] > 0
+
+
+def test_backfill_command_rebuilds_tokens_in_batches():
+    clients = [_make(first_name=f"Client{index}", last_name="Kowalczyk") for index in range(3)]
+    ClientSearchToken.objects.all().delete()
+    assert _search("walcz") == set()
+
+    out = io.StringIO()
+    call_command("rebuild_client_search_tokens", "--batch-size", "2", stdout=out)
+
+    assert _search("walcz") == {client.id for client in clients}
+    assert "checked=3" in out.getvalue()
+
+    out = io.StringIO()
+    call_command("rebuild_client_search_tokens", stdout=out)
+    assert "created=0, deleted=0" in out.getvalue()
+
+
 def test_intake_dedup_uses_hashes():
     client = _make(email="Dup@Example.com", phone="+48 111 222 333")
     conflicts = _conflicts_for_personal_data({"email": "dup@example.com", "phone": "48111222333"})
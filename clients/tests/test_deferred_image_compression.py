@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from io import BytesIO
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.utils import timezone
+from PIL import Image
+
+from clients.models import Client, Document, DocumentProcessingJob
+from clients.services.document_compression import process_document_compression_job
+from clients.services.document_jobs import process_pending_document_jobs
+
+
+def _jpeg_upload(name: str = "scan.jpg") -> SimpleUploadedFile:
+    buffer = BytesIO()
+    Image.new("RGB", (2400, 1800), "white").save(buffer, format="JPEG", quality=95)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/jpeg")
+
+
+def _make_client() -> Client:
+    return Client.objects.create(
+        first_name="Oksana",
+        last_name="Deferred",
+        email="deferred-compression@example.com",
+        phone="+48555000111",
+        citizenship="UA",
+    )
+
+
+def _upload(django_capture_on_commit_callbacks) -> Document:
+    with django_capture_on_commit_callbacks(execute=True):
+        return Document.objects.create(client=_make_client(), document_type="passport", file=_jpeg_upload())
+
+
+@pytest.mark.django_db
+@override_settings(DEFER_UPLOAD_IMAGE_COMPRESSION=True, DEFERRED_IMAGE_COMPRESSION_DELAY_SECONDS=0)
+def test_upload_stores_original_and_queues_compression(django_capture_on_commit_callbacks):
+    document = _upload(django_capture_on_commit_callbacks)
+
+    document.refresh_from_db()
+    assert document.file.name.endswith(".jpg")
+    job = DocumentProcessingJob.objects.get(document=document)
+    assert job.job_type == DocumentProcessingJob.JOB_TYPE_IMAGE_COMPRESSION
+    original_name = document.file.name
+
+    with django_capture_on_commit_callbacks(execute=True):
+        results = process_pending_document_jobs()
+
+    assert [result.processed for result in results] == [True]
+    document.refresh_from_db()
+    assert document.file.name.endswith(".webp")
+    assert default_storage.exists(document.file.name)
+    assert not default_storage.exists(original_name)
+    job.refresh_from_db()
+    assert job.status == DocumentProcessingJob.STATUS_COMPLETED
+
+
+@pytest.mark.django_db
+@override_settings(DEFER_UPLOAD_IMAGE_COMPRESSION=True, DEFERRED_IMAGE_COMPRESSION_DELAY_SECONDS=0)
+def test_compression_waits_for_pending_ocr_on_the_original(django_capture_on_commit_callbacks):
+    document = _upload(django_capture_on_commit_callbacks)
+    job = DocumentProcessingJob.objects.get(document=document)
+    ocr_job = DocumentProcessingJob.objects.create(
+        document=document,
+        job_type=DocumentProcessingJob.JOB_TYPE_PASSPORT_OCR,
+        status=DocumentProcessingJob.STATUS_PENDING,
+        next_attempt_at=timezone.now() + timezone.timedelta(hours=1),
+    )
+
+    result = process_document_compression_job(job_id=job.pk)
+
+    assert result.status == "skipped"
+    job.refresh_from_db()
+    assert job.status == DocumentProcessingJob.STATUS_PENDING
+    assert job.attempts == 0
+    assert job.next_attempt_at > timezone.now()
+    document.refresh_from_db()
+    assert document.file.name.endswith(".jpg")
+
+    DocumentProcessingJob.objects.filter(pk=ocr_job.pk).update(status=DocumentProcessingJob.STATUS_COMPLETED)
+    DocumentProcessingJob.objects.filter(pk=job.pk).update(next_attempt_at=None)
+    with django_capture_on_commit_callbacks(execute=True):
+        result = process_document_compression_job(job_id=job.pk)
+
+    assert result.processed is True
+    document.refresh_from_db()
+    assert document.file.name.endswith(".webp")
+
+
+@pytest.mark.django_db
+@override_settings(DEFER_UPLOAD_IMAGE_COMPRESSION=True, DEFERRED_IMAGE_COMPRESSION_DELAY_SECONDS=0)
+def test_replaced_file_is_not_overwritten_by_stale_job(django_capture_on_commit_callbacks):
+    document = _upload(django_capture_on_commit_callbacks)
+    job = DocumentProcessingJob.objects.get(document=document)
+    document.file = SimpleUploadedFile("replacement.pdf", b"%PDF-replacement", content_type="application/pdf")
+    document.save()
+
+    result = process_document_compression_job(job_id=job.pk)
+
+    assert result.processed is False
+    document.refresh_from_db()
+    assert document.file.name.endswith(".pdf")
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from PIL import Image
+
+from clients.constants import DocumentType
+from clients.models import DocumentProcessingJob
+from clients.services import wezwanie_parser
+from clients.services.document_job_lease import (
+    DocumentJobBudgetExceeded,
+    DocumentJobLeaseRevoked,
+    activate_document_job_lease,
+    ocr_checkpoint,
+)
+from clients.services.document_jobs import (
+    enqueue_document_processing_job,
+    process_document_processing_job,
+    reclaim_stale_document_jobs,
+)
+from clients.services.job_metrics import job_metrics_snapshot
+from clients.services.wezwanie_parser import WezwanieData
+from clients.testing.factories import create_test_client, create_test_document
+
+
+def _take_over(job_id: int) -> None:
+    """Simulate the lease lapsing and a second worker claiming the job."""
+    job = DocumentProcessingJob.objects.get(pk=job_id)
+    job.lease_expires_at = job.started_at
+    job.save(update_fields=["lease_expires_at"])
+    reclaim_stale_document_jobs()
+    DocumentProcessingJob.objects.filter(pk=job_id).update(
+        status=DocumentProcessingJob.STATUS_PROCESSING,
+        attempts=job.attempts + 1,
+    )
+
+
+class DocumentJobLeaseTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.document = create_test_document(create_test_client(), doc_type=DocumentType.WEZWANIE.value)
+        self.job = enqueue_document_processing_job(document=self.document)
+
+    def _claim(self) -> DocumentProcessingJob:
+        DocumentProcessingJob.objects.filter(pk=self.job.pk).update(
+            status=DocumentProcessingJob.STATUS_PROCESSING, attempts=1
+        )
+        return DocumentProcessingJob.objects.get(pk=self.job.pk)
+
+    def test_checkpoint_extends_the_lease_while_the_job_runs(self) -> None:
+        job = self._claim()
+        with activate_document_job_lease(job, lease_seconds=600) as lease:
+            lease.renewed_at -= 10
+            ocr_checkpoint()
+
+        job.refresh_from_db()
+        self.assertIsNotNone(job.lease_expires_at)
+        self.assertEqual(job_metrics_snapshot()["ocr_lease_renewed"], 1)
+
+    def test_checkpoint_aborts_when_another_worker_owns_the_job(self) -> None:
+        job = self._claim()
+        with activate_document_job_lease(job, lease_seconds=600) as lease:
+            DocumentProcessingJob.objects.filter(pk=job.pk).update(attempts=2)
+            lease.renewed_at -= 10
+            with self.assertRaises(DocumentJobLeaseRevoked):
+                ocr_checkpoint()
+
+        self.assertEqual(job_metrics_snapshot()["ocr_duplicate_work_avoided"], 1)
+
+    @override_settings(DOCUMENT_JOB_TIME_BUDGET_SECONDS=0)
+    def test_checkpoint_enforces_the_time_budget(self) -> None:
+        with activate_document_job_lease(self._claim(), lease_seconds=600):
+            with self.assertRaises(DocumentJobBudgetExceeded):
+                ocr_checkpoint()
+
+        self.assertEqual(job_metrics_snapshot()["ocr_time_budget_exceeded"], 1)
+
+    def test_result_of_a_taken_over_job_is_discarded(self) -> None:
+        def slow_parser(_path: str) -> WezwanieData:
+            _take_over(self.job.pk)
+            return WezwanieData(text="parsed", case_number="WSC-II-S.1.2026", fingerprints_date=date(2030, 1, 5))
+
+        result = process_document_processing_job(job_id=self.job.pk, parser=slow_parser)
+
+        self.assertEqual(result.status, "skipped")
+        self.job.refresh_from_db()
+        self.assertEqual((self.job.status, self.job.attempts), (DocumentProcessingJob.STATUS_PROCESSING, 2))
+        self.document.refresh_from_db()
+        self.assertEqual(self.document.ocr_status, "pending")
+        metrics = job_metrics_snapshot()
+        self.assertEqual(metrics["ocr_stale_result_discarded"], 1)
+        self.assertEqual(metrics["ocr_lease_reclaimed"], 1)
+
+    def test_revoked_job_stops_at_the_next_page(self) -> None:
+        def paged_parser(_path: str) -> WezwanieData:
+            _take_over(self.job.pk)
+            with patch("clients.services.document_job_lease.LEASE_RENEW_MIN_INTERVAL_SECONDS", 0):
+                ocr_checkpoint()
+            raise AssertionError("the checkpoint should have aborted the run")
+
+        result = process_document_processing_job(job_id=self.job.pk, parser=paged_parser)
+
+        self.assertEqual(result.status, "skipped")
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.attempts, 2)
+        self.assertEqual(job_metrics_snapshot()["ocr_lease_revoked_aborted"], 1)
+
+
+class PdfOcrCheckpointTests(SimpleTestCase):
+    def test_pdf_ocr_checks_in_before_every_page(self) -> None:
+        page = Image.new("RGB", (20, 20), "white")
+        checkpoints = [None, None, DocumentJobLeaseRevoked("taken over")]
+
+        with patch.object(wezwanie_parser, "_tesseract_binary_available", return_value=True):
+            with patch.object(wezwanie_parser, "ocr_checkpoint", side_effect=checkpoints) as checkpoint:
+                with patch("pdf2image.convert_from_path", return_value=[page]) as convert:
+                    with patch("pytesseract.image_to_string", return_value="page text"):
+                        with self.assertRaises(DocumentJobLeaseRevoked):
+                            wezwanie_parser._extract_pdf_text(Path("missing-scan.pdf"))
+
+        self.assertEqual(checkpoint.call_count, 3)
+        self.assertEqual(
+            [(call.kwargs["first_page"], call.kwargs["last_page"]) for call in convert.call_args_list],
+            [(1, 1), (2, 2)],
+        )
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from datetime import date
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from clients.constants import DocumentType
+from clients.models import Client, DocumentProcessingJob
+from clients.services import document_jobs
+from clients.services.client_names import reset_client_display_names
+from clients.services.document_compression import enqueue_document_compression_job
+from clients.services.document_job_scheduling import next_document_job, planned_document_job_order
+from clients.services.document_jobs import (
+    enqueue_document_processing_job,
+    process_document_processing_job,
+    process_pending_document_jobs,
+)
+from clients.services.wezwanie_parser import WezwanieData
+from clients.testing.factories import create_client_user, create_test_client, create_test_document, create_test_user
+
+
+def _queue(client: Client, *, priority: int | None = None, job_type: str | None = None, actor=None):
+    document = create_test_document(client, doc_type=DocumentType.WEZWANIE.value)
+    return enqueue_document_processing_job(
+        document=document,
+        actor=actor,
+        priority=priority,
+        job_type=job_type or DocumentProcessingJob.JOB_TYPE_WEZWANIE_OCR,
+    )
+
+
+class DocumentJobSchedulingTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        reset_client_display_names()
+        self.bulk = create_test_client(first_name="Bulk")
+        self.other = create_test_client(first_name="Other")
+
+    def _run_order(self, *, on_first_job=None) -> list[int]:
+        order: list[int] = []
+
+        def parser(_path: str) -> WezwanieData:
+            order.append(DocumentProcessingJob.objects.get(status=DocumentProcessingJob.STATUS_PROCESSING).pk)
+            if on_first_job and len(order) == 1:
+                on_first_job()
+            return WezwanieData(text="parsed", case_number="WSC-II-S.1.2026", fingerprints_date=date(2030, 1, 5))
+
+        process_pending_document_jobs(parser=parser)
+        return order
+
+    def test_enqueue_derives_the_priority_class(self) -> None:
+        staff_job = _queue(self.bulk, actor=create_test_user())
+        portal_job = _queue(self.bulk, actor=create_client_user())
+        compression_job = enqueue_document_compression_job(
+            document=create_test_document(self.bulk, filename="scan.jpg")
+        )
+
+        self.assertEqual(staff_job.priority, DocumentProcessingJob.PRIORITY_INTERACTIVE)
+        self.assertEqual(portal_job.priority, DocumentProcessingJob.PRIORITY_PORTAL)
+        assert compression_job is not None
+        self.assertEqual(compression_job.priority, DocumentProcessingJob.PRIORITY_BACKFILL)
+
+    def test_clients_are_served_round_robin_within_a_priority_class(self) -> None:
+        bulk_jobs = [_queue(self.bulk).pk for _ in range(3)]
+        other_job = _queue(self.other).pk
+        backfill_job = _queue(self.other, priority=DocumentProcessingJob.PRIORITY_BACKFILL).pk
+
+        self.assertEqual(self._run_order(), [bulk_jobs[0], other_job, bulk_jobs[1], bulk_jobs[2], backfill_job])
+
+    def test_staff_job_queued_mid_batch_runs_next(self) -> None:
+        portal_jobs = [_queue(self.bulk).pk for _ in range(3)]
+        urgent: list[int] = []
+
+        order = self._run_order(
+            on_first_job=lambda: urgent.append(
+                _queue(self.other, priority=DocumentProcessingJob.PRIORITY_INTERACTIVE).pk
+            )
+        )
+
+        self.assertEqual(order, [portal_jobs[0], urgent[0], portal_jobs[1], portal_jobs[2]])
+
+    @override_settings(DOCUMENT_JOB_TYPE_CONCURRENCY={DocumentProcessingJob.JOB_TYPE_PASSPORT_OCR: 1})
+    def test_job_type_at_its_cap_is_passed_over(self) -> None:
+        running = _queue(self.bulk, job_type=DocumentProcessingJob.JOB_TYPE_ZUS_OCR)
+        DocumentProcessingJob.objects.filter(pk=running.pk).update(status=DocumentProcessingJob.STATUS_PROCESSING)
+        _queue(
+            self.bulk,
+            job_type=DocumentProcessingJob.JOB_TYPE_ZUS_OCR,
+            priority=DocumentProcessingJob.PRIORITY_INTERACTIVE,
+        )
+        passport = _queue(self.other, job_type=DocumentProcessingJob.JOB_TYPE_PASSPORT_OCR)
+
+        picked = next_document_job()
+
+        assert picked is not None
+        self.assertEqual(picked.id, passport.pk)
+        plan = planned_document_job_order()
+        self.assertEqual([job["at_capacity"] for job in plan["jobs"]], [True, False])
+        lanes = {lane["job_type_label"]: (lane["running"], lane["cap"]) for lane in plan["lanes"]}
+        self.assertEqual(lanes["ZUS Documents OCR"], (1, 1))
+        self.assertEqual(lanes["Passport OCR"], (0, 1))
+
+    @override_settings(DOCUMENT_JOB_TYPE_CONCURRENCY={DocumentProcessingJob.JOB_TYPE_WEZWANIE_OCR: 1})
+    def test_claim_is_refused_when_the_type_is_at_its_cap(self) -> None:
+        running = _queue(self.bulk)
+        DocumentProcessingJob.objects.filter(pk=running.pk).update(status=DocumentProcessingJob.STATUS_PROCESSING)
+        job = _queue(self.other)
+
+        result = process_document_processing_job(job_id=job.pk)
+
+        self.assertFalse(result.processed)
+        job.refresh_from_db()
+        self.assertEqual(job.status, DocumentProcessingJob.STATUS_PENDING)
+        self.assertEqual(job.attempts, 0)
+
+    def test_batch_ranks_the_queue_once(self) -> None:
+        for _ in range(3):
+            _queue(self.bulk)
+
+        with mock.patch.object(
+            document_jobs, "ready_document_jobs", wraps=document_jobs.ready_document_jobs
+        ) as ready_document_jobs:
+            self.assertEqual(len(self._run_order()), 3)
+
+        # Once for the batch and once more to confirm the queue is empty.
+        self.assertEqual(ready_document_jobs.call_count, 2)
+
+    def test_admin_dashboard_shows_the_scheduling_order(self) -> None:
+        _queue(self.bulk)
+        _queue(self.other, priority=DocumentProcessingJob.PRIORITY_INTERACTIVE)
+        self.client.force_login(create_test_user())
+
+        response = self.client.get(reverse("clients:admin_dashboard"))
+
+        self.assertContains(response, "OCR Scheduling Order")
+        jobs = response.context["document_job_plan"]["jobs"]
+        self.assertEqual([job["client_name"].split()[0] for job in jobs], ["Other", "Bulk"])
+        self.assertEqual(jobs[0]["priority_label"], "Staff (interactive)")
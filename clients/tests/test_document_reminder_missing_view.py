@@ -23,17 +23,19 @@ class DocumentReminderMissingViewTests(TestCase):
         self.client.force_login(self.staff)
 
     def test_missing_mode_lists_checklist_items_without_reminders(self) -> None:
-        client_record = Client.objects.create(
-            first_name="Missing",
-            last_name="Docs",
-            email="missing-docs@example.test",
-            application_purpose="work",
-        )
-        ClientDocumentRequirement.objects.create(
-            client=client_record,
-            name="Special missing permit confirmation",
-            is_required=True,
-        )
+        # The view reads checklist summaries, refreshed once the writes commit.
+        with self.captureOnCommitCallbacks(execute=True):
+            client_record = Client.objects.create(
+                first_name="Missing",
+                last_name="Docs",
+                email="missing-docs@example.test",
+                application_purpose="work",
+            )
+            ClientDocumentRequirement.objects.create(
+                client=client_record,
+                name="Special missing permit confirmation",
+                is_required=True,
+            )
 
         response = self.client.get(f"{reverse('clients:document_reminder_list')}?view=missing")
 
@@ -5,6 +5,7 @@ from django.urls import reverse
 from django.utils import timezone
 
 from clients.models import Client, EmailLog
+from clients.views.client_fragments import EMAIL_PAGE_SIZE
 
 
 @pytest.mark.django_db
@@ -15,35 +16,36 @@ def test_email_history_visibility(admin_client):
         email="test@example.com",
     )
 
-    # Create 5 email logs with different timestamps
     now = timezone.now()
-    for i in range(5):
-        EmailLog.objects.create(
+    for i in range(EMAIL_PAGE_SIZE + 2):
+        log = EmailLog.objects.create(
             client=client,
             subject=f"Subject {i}",
             body=f"Body {i}",
             recipients="test@example.com",
-            sent_at=now - timedelta(minutes=i)
         )
+        # sent_at is auto_now_add; backdate so "Subject 0" is the newest.
+        EmailLog.objects.filter(pk=log.pk).update(sent_at=now - timedelta(minutes=i))
+
+    detail = admin_client.get(reverse("clients:client_detail", kwargs={"pk": client.pk}) + "?view=person")
+    fragment_url = reverse("clients:client_emails_fragment", kwargs={"pk": client.pk})
+    assert fragment_url in detail.content.decode("utf-8")
 
-    url = reverse("clients:client_detail", kwargs={"pk": client.pk}) + "?view=person"
-    response = admin_client.get(url)
+    response = admin_client.get(fragment_url)
 
     assert response.status_code == 200
     content = response.content.decode("utf-8")
 
-    # Check that all 5 subjects are present
-    for i in range(5):
-        assert f"Subject {i}" in content
+    # The newest page is rendered; the two oldest wait behind "show more".
+    for i in range(EMAIL_PAGE_SIZE):
+        assert f"Subject {i}<" in content
+    assert f"Subject {EMAIL_PAGE_SIZE}<" not in content
+    assert 'data-fragment-more' in content
 
-    # Check classes for visible/hidden logs
-    # 3 newest should NOT have d-none
-    # 0, 1, 2 are newest because we created them with sent_at = now, now-1, now-2
-    assert 'class="email-log-row "' in content # Subject 0 (most recent)
+    next_page = admin_client.get(response.context["next_url"]).content.decode("utf-8")
+    assert f"Subject {EMAIL_PAGE_SIZE + 1}<" in next_page
+    assert 'data-fragment-more' not in next_page
 
-    # Check that the toggle button exists and shows count 2
-    assert 'email-history-toggle' in content
-    assert 'data-hidden-count="2"' in content
 
 @pytest.mark.django_db
 def test_email_history_no_toggle_for_3_logs(admin_client):
@@ -61,10 +63,9 @@ def test_email_history_no_toggle_for_3_logs(admin_client):
             recipients="test@example.com"
         )
 
-    url = reverse("clients:client_detail", kwargs={"pk": client.pk}) + "?view=person"
-    response = admin_client.get(url)
+    response = admin_client.get(reverse("clients:client_emails_fragment", kwargs={"pk": client.pk}))
 
     assert response.status_code == 200
     content = response.content.decode("utf-8")
 
-    assert 'email-history-toggle' not in content
+    assert 'data-fragment-more' not in content
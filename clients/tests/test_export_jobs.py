@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import io
+import zipfile
+from datetime import timedelta
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from clients.models import Client, ClientExportJob, Company, Document
+from clients.services.export_jobs import (
+    build_export_download_token,
+    enqueue_client_export_job,
+    process_client_export_job,
+    process_pending_export_jobs,
+    reclaim_stale_export_jobs,
+    resolve_export_download_token,
+)
+from clients.tests.factories import create_staff_user
+
+
+@pytest.fixture(autouse=True)
+def _media_root(settings, tmp_path):
+    """Keep uploaded scans and built archives out of the shared test media dir."""
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+
+def _make_client(index: int, company: Company | None = None) -> Client:
+    return Client.objects.create(
+        first_name=f"Export{index}",
+        last_name="Client",
+        email=f"export-{index}@example.com",
+        phone=f"+4850000000{index}",
+        citizenship="UA",
+        application_purpose="work",
+        company=company,
+    )
+
+
+def _attach(client: Client, name: str, content: bytes) -> Document:
+    document = Document.objects.create(client=client, document_type="passport")
+    document.file.save(name, ContentFile(content))
+    return document
+
+
+def _read_archive(job: ClientExportJob) -> zipfile.ZipFile:
+    with default_storage.open(job.archive_name, "rb") as handle:
+        return zipfile.ZipFile(io.BytesIO(handle.read()))
+
+
+@pytest.mark.django_db
+def test_multi_client_export_deduplicates_identical_documents(django_capture_on_commit_callbacks):
+    company = Company.objects.create(name="Export Sp. z o.o.")
+    first, second = _make_client(1, company), _make_client(2, company)
+    _attach(first, "passport-a.pdf", b"%PDF-shared-scan")
+    _attach(second, "passport-b.pdf", b"%PDF-shared-scan")
+    _attach(second, "visa.pdf", b"%PDF-unique")
+
+    job = enqueue_client_export_job(clients=[first, second], scope=ClientExportJob.SCOPE_COMPANY, company=company)
+    # The per-client audit rows are written in one batch when the job commits.
+    with django_capture_on_commit_callbacks(execute=True):
+        result = process_client_export_job(job_id=job.pk)
+
+    job.refresh_from_db()
+    assert result.status == ClientExportJob.STATUS_COMPLETED
+    assert (job.processed_clients, job.total_clients, job.progress_percent) == (2, 2, 100)
+    assert job.file_count == 2
+    assert job.deduplicated_count == 1
+    assert job.expires_at > timezone.now()
+
+    archive = _read_archive(job)
+    names = archive.namelist()
+    assert f"case_{first.pk}/CASE_SUMMARY.txt" in names
+    assert f"case_{second.pk}/CASE_SUMMARY.txt" in names
+    document_entries = [name for name in names if "/documents/" in name]
+    assert len(document_entries) == 2
+    assert "DUPLICATES.txt" in names
+    assert first.activities.filter(event_type="client_exported").exists()
+
+
+@pytest.mark.django_db
+def test_enqueue_rejects_empty_selection():
+    with pytest.raises(ValueError):
+        enqueue_client_export_job(clients=[])
+
+
+@pytest.mark.django_db
+def test_stale_export_job_is_reclaimed_for_retry():
+    job = enqueue_client_export_job(clients=[_make_client(3)])
+    ClientExportJob.objects.filter(pk=job.pk).update(
+        status=ClientExportJob.STATUS_PROCESSING,
+        attempts=1,
+        lease_expires_at=timezone.now() - timedelta(minutes=1),
+    )
+
+    assert reclaim_stale_export_jobs() == 1
+
+    job.refresh_from_db()
+    assert job.status == ClientExportJob.STATUS_PENDING
+    assert job.lease_expires_at is None
+
+
+@pytest.mark.django_db
+def test_expired_archive_is_deleted_and_link_stops_resolving():
+    job = enqueue_client_export_job(clients=[_make_client(4)])
+    process_pending_export_jobs()
+    job.refresh_from_db()
+    token = build_export_download_token(job)
+    assert resolve_export_download_token(token) == job
+
+    archive_name = job.archive_name
+    ClientExportJob.objects.filter(pk=job.pk).update(expires_at=timezone.now() - timedelta(seconds=1))
+    call_command("process_export_jobs")
+
+    job.refresh_from_db()
+    assert job.status == ClientExportJob.STATUS_EXPIRED
+    assert not default_storage.exists(archive_name)
+    assert resolve_export_download_token(token) is None
+
+
+@pytest.mark.django_db
+def test_export_job_views_queue_report_progress_and_download(client):
+    staff = create_staff_user()
+    client.force_login(staff)
+    client_obj = _make_client(5)
+    _attach(client_obj, "scan.pdf", b"%PDF-view")
+
+    response = client.post(
+        reverse("clients:client_export_zip_queue", kwargs={"pk": client_obj.pk}),
+        HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+    )
+    assert response.status_code == 200
+    job_id = response.json()["job_id"]
+
+    status = client.get(reverse("clients:export_job_status_api", kwargs={"job_id": job_id})).json()
+    assert status["status"] == ClientExportJob.STATUS_PENDING
+    assert status["download_url"] is None
+
+    process_pending_export_jobs()
+    status = client.get(reverse("clients:export_job_status_api", kwargs={"job_id": job_id})).json()
+    assert status["progress_percent"] == 100
+    download = client.get(status["download_url"])
+    assert download.status_code == 200
+    assert download["Content-Type"] == "application/zip"
+
+    other = create_staff_user()
+    client.force_login(other)
+    assert client.get(status["download_url"]).status_code == 404
+    assert client.get(reverse("clients:export_job_status_api", kwargs={"job_id": job_id})).status_code == 404
+
+
+@pytest.mark.django_db
+def test_export_job_list_shows_progress_and_download_link(client):
+    staff = create_staff_user()
+    client.force_login(staff)
+    client_obj = _make_client(6)
+
+    response = client.post(reverse("clients:client_export_zip_queue", kwargs={"pk": client_obj.pk}))
+    assert response.status_code == 302
+    assert response["Location"] == reverse("clients:export_job_list")
+
+    job = ClientExportJob.objects.get()
+    page = client.get(reverse("clients:export_job_list"))
+    assert reverse("clients:export_job_status_api", kwargs={"job_id": job.pk}) in page.content.decode()
+    assert page.context["jobs"][0].download_url is None
+
+    process_pending_export_jobs()
+    page = client.get(reverse("clients:export_job_list"))
+    assert page.context["jobs"][0].download_url.startswith("/")
+    assert page.context["jobs"][0].download_url in page.content.decode()
+
+    client.force_login(create_staff_user())
+    assert client.get(reverse("clients:export_job_list")).context["jobs"] == []
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from clients.models import Company
+from clients.services.client_names import client_display_name
+from clients.testing.factories import create_test_client, create_test_user
+
+
+class ReminderClientFilterTests(TestCase):
+    def setUp(self) -> None:
+        self.client.force_login(create_test_user(role="Staff"))
+        self.selected = create_test_client(first_name="Selected", last_name="Client")
+        self.other = create_test_client(first_name="Unlisted", last_name="Client")
+
+    def test_only_the_selected_client_is_rendered(self) -> None:
+        for url_name, param in (("payment_reminder_list", "client"), ("document_reminder_list", "doc_client")):
+            with self.subTest(url_name=url_name):
+                response = self.client.get(reverse(f"clients:{url_name}"), {param: self.selected.pk})
+
+                self.assertNotIn("all_clients", response.context)
+                self.assertEqual(response.context["client_filter_label"], "Selected Client")
+                self.assertContains(response, f'name="{param}" value="{self.selected.pk}"')
+                self.assertNotContains(response, "Unlisted Client")
+
+    def test_client_autocomplete_returns_a_label(self) -> None:
+        response = self.client.get(reverse("clients:client_autocomplete_api"), {"q": "Selected"})
+
+        self.assertEqual(
+            [(result["id"], result["label"]) for result in response.json()["results"]],
+            [(self.selected.pk, "Selected Client")],
+        )
+
+
+class ClientDisplayNameCacheTests(TestCase):
+    def test_names_are_cached_until_the_client_is_saved(self) -> None:
+        client = create_test_client(first_name="Cached", last_name="Name")
+        self.assertEqual(client_display_name(client.pk), "Cached Name")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(client_display_name(client.pk), "Cached Name")
+        self.assertEqual(len(queries.captured_queries), 0)
+
+        client.last_name = "Renamed"
+        client.save()
+        self.assertEqual(client_display_name(client.pk), "Cached Renamed")
+        self.assertEqual(client_display_name(0), "")
+
+
+class CompanyFilterTests(TestCase):
+    def setUp(self) -> None:
+        self.client.force_login(create_test_user(role="Staff"))
+        self.company = Company.objects.create(name="Żabka Polska", nip="5261040828")
+        Company.objects.create(name="Orlen Serwis")
+
+    def test_company_autocomplete_matches_name_and_nip(self) -> None:
+        url = reverse("clients:company_autocomplete_api")
+        for query in ("zabka", "Żab", "526104"):
+            with self.subTest(query=query):
+                results = self.client.get(url, {"q": query}).json()["results"]
+                self.assertEqual([result["id"] for result in results], [self.company.pk])
+                self.assertEqual(results[0]["label"], "Żabka Polska")
+        self.assertEqual(self.client.get(url, {"q": "z"}).json(), {"results": []})
+
+    def test_client_list_renders_only_the_selected_company(self) -> None:
+        response = self.client.get(reverse("clients:client_list"), {"company": self.company.pk})
+
+        self.assertEqual(response.context["selected_company_name"], "Żabka Polska")
+        self.assertNotContains(response, "Orlen Serwis")
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import random
+from datetime import timedelta
+from typing import Any
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone, translation
+
+from clients.constants import DocumentType
+from clients.models import Client, ClientActivity, Document, EmailLog, StaffTask
+from clients.models._client_health import build_health_alerts, build_health_alerts_bulk
+from clients.testing.factories import create_pending_payment, create_test_client, create_test_document
+
+DOCUMENT_TYPES = [
+    DocumentType.PASSPORT.value,
+    DocumentType.WEZWANIE.value,
+    "employer_letter",
+    "photos",
+]
+EXPIRY_OFFSETS = [None, None, -10, 0, 5, 60]
+
+
+def _rendered(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _rendered(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_rendered(item) for item in value]
+    if value is None or isinstance(value, (bool, int)):
+        return value
+    return str(value)
+
+
+def _random_client(rng: random.Random, index: int) -> Client:
+    today = timezone.localdate()
+    client = create_test_client(first_name=f"Bulk{index}", last_name="Health")
+    case = client.cases.get()
+    if rng.random() < 0.4:
+        case.authority_case_number = f"WSC-{index}"
+    if rng.random() < 0.4:
+        case.fingerprints_date = today - timedelta(days=rng.randint(1, 20))
+    case.save()
+    if rng.random() < 0.5:
+        Client.objects.filter(pk=client.pk).update(
+            legal_basis_end_date=today + timedelta(days=rng.choice([-3, 10, 90]))
+        )
+
+    for position in range(rng.randint(0, 4)):
+        offset = rng.choice(EXPIRY_OFFSETS)
+        document = create_test_document(
+            client,
+            doc_type=rng.choice(DOCUMENT_TYPES),
+            awaiting_confirmation=rng.random() < 0.3,
+            expiry_date=today + timedelta(days=offset) if offset is not None else None,
+        )
+        Document.objects.filter(pk=document.pk).update(
+            uploaded_at=timezone.now() - timedelta(hours=position + 1),
+            rejection_reason="Unreadable scan" if rng.random() < 0.2 else "",
+        )
+    for position in range(rng.randint(0, 2)):
+        StaffTask.objects.create(
+            client=client,
+            title=f"Task {index}-{position}",
+            status=rng.choice(["open", "in_progress", "done"]),
+            due_date=today + timedelta(days=rng.choice([-5, -1, 3])),
+        )
+    for _ in range(rng.randint(0, 2)):
+        EmailLog.objects.create(
+            client=client,
+            subject="Reminder",
+            body="Body",
+            recipients=client.email,
+            template_type="document_reminder",
+            delivery_status=rng.choice(["failed", "sent"]),
+        )
+    if rng.random() < 0.5:
+        create_pending_payment(client)
+    if rng.random() < 0.5:
+        stale = timezone.now() - timedelta(days=rng.randint(31, 90))
+        Client.objects.filter(pk=client.pk).update(created_at=stale)
+        ClientActivity.objects.filter(client=client).update(created_at=stale)
+    return client
+
+
+class HealthAlertsBulkTests(TestCase):
+    def test_bulk_matches_single_client_alerts(self) -> None:
+        rng = random.Random(20260318)
+        client_ids = [_random_client(rng, index).pk for index in range(12)]
+
+        with translation.override("en"):
+            bulk = build_health_alerts_bulk(Client.objects.filter(pk__in=client_ids))
+            for client_id in client_ids:
+                with self.subTest(client_id=client_id):
+                    single = build_health_alerts(Client.objects.get(pk=client_id))
+                    self.assertEqual(_rendered(bulk[client_id]), _rendered(single))
+
+        # The generated data must exercise the prefetched branches.
+        titles = {alert["title"] for alerts in bulk.values() for alert in _rendered(alerts)}
+        self.assertGreaterEqual(len(titles), 6)
+
+    def test_query_count_does_not_grow_with_clients(self) -> None:
+        def queries_for(count: int) -> int:
+            ids = []
+            for index in range(count):
+                client = create_test_client(first_name=f"Count{index}", last_name="Health")
+                create_test_document(client, expiry_date=timezone.localdate() - timedelta(days=1))
+                StaffTask.objects.create(
+                    client=client, title="Overdue", status="open", due_date=timezone.localdate() - timedelta(days=1)
+                )
+                ids.append(client.pk)
+            clients = list(Client.objects.filter(pk__in=ids))
+            with CaptureQueriesContext(connection) as queries:
+                build_health_alerts_bulk(clients)
+            return len(queries.captured_queries)
+
+        queries_for(1)  # warm per-process lookups such as the requirement catalog
+        self.assertEqual(queries_for(2), queries_for(6))
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import threading
+
+from django.test import SimpleTestCase, TestCase
+
+from clients.management.commands.run_background_automation_loop import _TaskLane
+from clients.services.automation_schedule import IntervalSchedule
+from clients.services.document_jobs import enqueue_document_processing_job
+from clients.services.email_campaigns import queue_mass_email_campaign
+from clients.services.job_wakeups import (
+    DOCUMENT_JOBS_CHANNEL,
+    EMAIL_CAMPAIGNS_CHANNEL,
+    JobWakeupListener,
+    reset_wakeup_events,
+    wakeup_event,
+)
+from clients.testing.factories import create_test_client, create_test_document
+
+
+class JobQueuedNotificationTests(TestCase):
+    def setUp(self) -> None:
+        reset_wakeup_events()
+
+    def test_enqueued_ocr_job_wakes_the_lane_on_commit(self) -> None:
+        document = create_test_document(create_test_client())
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            enqueue_document_processing_job(document=document)
+        self.assertFalse(wakeup_event(DOCUMENT_JOBS_CHANNEL).is_set())
+
+        for callback in callbacks:
+            callback()
+        self.assertTrue(wakeup_event(DOCUMENT_JOBS_CHANNEL).is_set())
+        self.assertFalse(wakeup_event(EMAIL_CAMPAIGNS_CHANNEL).is_set())
+
+    def test_queued_campaign_wakes_the_lane_on_commit(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            queue_mass_email_campaign(subject="Hi", message="Body", recipient_emails=["a@example.com"])
+
+        self.assertTrue(wakeup_event(EMAIL_CAMPAIGNS_CHANNEL).is_set())
+
+    def test_listener_stays_idle_without_postgresql(self) -> None:
+        listener = JobWakeupListener()
+        listener.start()
+
+        self.assertFalse(listener._thread.is_alive())
+
+
+class JobLaneTests(SimpleTestCase):
+    def setUp(self) -> None:
+        reset_wakeup_events()
+
+    def test_lane_runs_on_wakeup_without_waiting_for_its_schedule(self) -> None:
+        runs = threading.Semaphore(0)
+
+        def run() -> bool:
+            runs.release()
+            return False
+
+        lane = _TaskLane("document-jobs", schedule=IntervalSchedule(600), channel=DOCUMENT_JOBS_CHANNEL, run=run)
+        lane.start()
+        try:
+            self.assertTrue(runs.acquire(timeout=5))
+            wakeup_event(DOCUMENT_JOBS_CHANNEL).set()
+            self.assertTrue(runs.acquire(timeout=5))
+        finally:
+            lane.stop()
+        self.assertFalse(lane.last_succeeded)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from urllib.parse import urlencode
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from clients.models import EmailLog, StaffTask
+from clients.services.pagination import InvalidCursor, KeysetPaginator
+
+
+def _walk(paginator: KeysetPaginator) -> tuple[list[list[int]], list[list[int]]]:
+    """Return the pages seen walking forward to the end, then back to the start."""
+    forward = []
+    page = paginator.page()
+    forward.append([obj.pk for obj in page])
+    while page.has_next():
+        page = paginator.page(page.next_token)
+        forward.append([obj.pk for obj in page])
+    backward = [forward[-1]]
+    while page.has_previous():
+        page = paginator.page(page.previous_token)
+        backward.append([obj.pk for obj in page])
+    return forward, backward[::-1]
+
+
+def _make_email_logs(client, count: int, **extra) -> list[EmailLog]:
+    return [
+        EmailLog.objects.create(client=client, subject=f"Log {index}", body="Body", recipients="a@example.com", **extra)
+        for index in range(count)
+    ]
+
+
+@pytest.mark.django_db
+def test_walks_forward_and_back_through_rows_sharing_a_timestamp(sample_client):
+    logs = _make_email_logs(sample_client, 8)
+    tied = timezone.now() - timedelta(days=1)
+    EmailLog.objects.filter(pk__in=[log.pk for log in logs[2:6]]).update(sent_at=tied)
+
+    paginator = KeysetPaginator(EmailLog.objects.all(), ("-sent_at",), 3)
+    forward, backward = _walk(paginator)
+
+    expected = list(EmailLog.objects.order_by("-sent_at", "-pk").values_list("pk", flat=True))
+    assert [pk for page in forward for pk in page] == expected
+    assert [len(page) for page in forward] == [3, 3, 2]
+    assert backward == forward
+    assert paginator.count_estimate == (8, True)
+
+
+@pytest.mark.django_db
+def test_nullable_ordering_puts_undated_rows_last(sample_client):
+    today = date(2026, 3, 1)
+    for offset in (2, None, 0, None, 1, 0):
+        StaffTask.objects.create(
+            client=sample_client,
+            title=f"Task {offset}",
+            due_date=None if offset is None else today + timedelta(days=offset),
+        )
+
+    paginator = KeysetPaginator(StaffTask.objects.all(), ("due_date", "-created_at"), 2)
+    forward, backward = _walk(paginator)
+
+    seen = [StaffTask.objects.get(pk=pk).due_date for page in forward for pk in page]
+    assert seen == [today, today, today + timedelta(days=1), today + timedelta(days=2), None, None]
+    assert backward == forward
+
+
+@pytest.mark.django_db
+def test_cursor_is_bound_to_its_list(sample_client):
+    _make_email_logs(sample_client, 3)
+    token = KeysetPaginator(EmailLog.objects.all(), ("-sent_at",), 2).page().next_token
+
+    with pytest.raises(InvalidCursor):
+        KeysetPaginator(StaffTask.objects.all(), ("due_date",), 2).page(token)
+    with pytest.raises(InvalidCursor):
+        KeysetPaginator(EmailLog.objects.all(), ("-sent_at",), 2).page(f"{token}x")
+
+
+@pytest.mark.django_db
+def test_email_log_view_pages_by_cursor_and_keeps_filters(logged_in_admin, sample_client):
+    _make_email_logs(sample_client, 52, delivery_status=EmailLog.DELIVERY_STATUS_SENT)
+    _make_email_logs(sample_client, 3, delivery_status=EmailLog.DELIVERY_STATUS_FAILED)
+    url = reverse("clients:email_logs")
+
+    response = logged_in_admin.get(url, {"status": EmailLog.DELIVERY_STATUS_SENT})
+
+    assert response.status_code == 200
+    page = response.context["page_obj"]
+    assert len(page) == 50
+    assert not page.has_previous()
+    content = response.content.decode("utf-8")
+    assert urlencode({"cursor": page.next_token}) in content
+    assert "status=sent" in content
+
+    response = logged_in_admin.get(url, {"status": EmailLog.DELIVERY_STATUS_SENT, "cursor": page.next_token})
+
+    second = response.context["page_obj"]
+    assert len(second) == 2
+    assert {log.delivery_status for log in second} == {EmailLog.DELIVERY_STATUS_SENT}
+    assert second.has_previous() and not second.has_next()
+
+    assert logged_in_admin.get(url, {"cursor": "not-a-cursor"}).status_code == 404
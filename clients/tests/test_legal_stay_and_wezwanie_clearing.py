@@ -25,13 +25,15 @@ LEGAL_STAY_TITLES = {"Основание пребывания скоро ист
 
 class LegalStaySubmittedTests(TestCase):
     def setUp(self) -> None:
-        self.client_obj = create_test_client(first_name="Stay", last_name="Submit")
-        self.case = self.client_obj.cases.get()
-        self.case.workflow_stage = "document_collection"
-        self.case.save(update_fields=["workflow_stage"])
-        # Stay basis expiring within 30 days → the risk is relevant.
-        self.client_obj.legal_basis_end_date = date.today() + timedelta(days=10)
-        self.client_obj.save(update_fields=["legal_basis_end_date"])
+        # The attention state is refreshed when the writes commit.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client_obj = create_test_client(first_name="Stay", last_name="Submit")
+            self.case = self.client_obj.cases.get()
+            self.case.workflow_stage = "document_collection"
+            self.case.save(update_fields=["workflow_stage"])
+            # Stay basis expiring within 30 days → the risk is relevant.
+            self.client_obj.legal_basis_end_date = date.today() + timedelta(days=10)
+            self.client_obj.save(update_fields=["legal_basis_end_date"])
 
     def _alert_titles(self):
         with override("ru"):
@@ -45,7 +47,8 @@ class LegalStaySubmittedTests(TestCase):
 
     def test_legal_stay_risk_removed_after_submission(self) -> None:
         self.case.submission_date = date.today()
-        self.case.save(update_fields=["submission_date"])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.case.save(update_fields=["submission_date"])
 
         self.assertFalse(self._alert_titles() & LEGAL_STAY_TITLES)
         # The automatic check turns into a positive "submitted" status.
@@ -62,9 +65,10 @@ class LegalStaySubmittedTests(TestCase):
 class WezwanieNumberClearsTests(TestCase):
     def setUp(self) -> None:
         self.staff = create_test_user(role="Staff")
-        self.client_obj = create_test_client(first_name="Wez", last_name="Clear")
-        self.case = self.client_obj.cases.get()
-        create_test_document(self.client_obj, case=self.case, doc_type=DocumentType.WEZWANIE.value)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client_obj = create_test_client(first_name="Wez", last_name="Clear")
+            self.case = self.client_obj.cases.get()
+            create_test_document(self.client_obj, case=self.case, doc_type=DocumentType.WEZWANIE.value)
 
     def _has_wezwanie_alert(self) -> bool:
         with override("ru"):
@@ -79,7 +83,8 @@ class WezwanieNumberClearsTests(TestCase):
 
     def test_alert_cleared_once_number_entered(self) -> None:
         self.case.authority_case_number = "WSC-II-P.6151.5.2026"
-        self.case.save(update_fields=["authority_case_number"])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.case.save(update_fields=["authority_case_number"])
         self.assertFalse(self._has_wezwanie_alert())
         # And the navbar wezwanie filter no longer flags the client.
         flagged = apply_client_attention_filter(Client.objects.all(), "wezwanie_missing_case")
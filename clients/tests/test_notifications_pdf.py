@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+from pypdf import PdfReader
+
+from clients.services import notifications_pdf
+from clients.services.notifications_pdf import (
+    PDF_VECTOR_FALLBACK_FONT,
+    _get_pdf_font_path,
+    _render_email_pdf,
+    _resolve_pdf_font_path,
+    _wrap_vector_lines,
+)
+
+
+class EmailPdfRenderingTests(SimpleTestCase):
+    def setUp(self):
+        _resolve_pdf_font_path.cache_clear()
+        self.addCleanup(_resolve_pdf_font_path.cache_clear)
+
+    def test_rendered_pdf_is_text_searchable_and_paginated(self):
+        text = "\n".join(f"Строка {index}: Dzień dobry, dokumenty są gotowe." for index in range(120))
+
+        pdf_bytes = _render_email_pdf(text)
+
+        reader = PdfReader(BytesIO(pdf_bytes))
+        self.assertGreater(len(reader.pages), 1)
+        self.assertLess(len(pdf_bytes), 200_000)
+        extracted = reader.pages[0].extract_text()
+        self.assertIn("Dzień dobry", extracted)
+        if _get_pdf_font_path() is not None:
+            self.assertIn("Строка 0", extracted)
+
+    def test_font_discovery_runs_once_per_process(self):
+        with override_settings(PDF_FONT_PATH=""), patch.object(Path, "glob", autospec=True, return_value=[]) as glob:
+            _get_pdf_font_path()
+            first_calls = glob.call_count
+            _get_pdf_font_path()
+            _get_pdf_font_path()
+
+        self.assertEqual(glob.call_count, first_calls)
+        for call in glob.call_args_list:
+            self.assertNotIn("**", call.args[1])
+
+    def test_overlong_tokens_are_hard_wrapped(self):
+        lines = _wrap_vector_lines("x" * 500, PDF_VECTOR_FALLBACK_FONT, 10.5, 200)
+
+        self.assertGreater(len(lines), 1)
+        self.assertEqual("".join(lines), "x" * 500)
+
+    def test_raster_fallback_is_used_when_vector_rendering_fails(self):
+        with patch.object(notifications_pdf, "_render_email_pdf_vector", side_effect=RuntimeError("boom")):
+            pdf_bytes = _render_email_pdf("fallback")
+
+        self.assertTrue(pdf_bytes.startswith(b"%PDF"))
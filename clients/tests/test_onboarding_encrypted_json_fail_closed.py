@@ -143,6 +143,38 @@ class OnboardingEncryptedJSONFailClosedTests(TestCase):
             CORRUPTED_FERNET_TOKEN,
         )
 
+    def test_autosave_delta_only_decrypts_and_writes_the_posted_sections(self) -> None:
+        self.mos_data.address_data = {"city": "Kraków"}
+        self.mos_data.save(update_fields=["address_data", "updated_at"])
+        passport_ciphertext = _get_raw_json_field(self.mos_data, "passport_data")
+        self._corrupt_personal_data()
+
+        response = self.client.post(
+            reverse("clients:onboarding_auto_save", kwargs={"token": self.token}),
+            {"street": "Długa 1", "criminal_record": "no"},
+            HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(_get_raw_json_field(self.mos_data, "personal_data"), CORRUPTED_FERNET_TOKEN)
+        self.assertEqual(_get_raw_json_field(self.mos_data, "passport_data"), passport_ciphertext)
+        self.mos_data.refresh_from_db(fields=["address_data", "legal_declarations", "status"])
+        self.assertEqual(self.mos_data.address_data, {"city": "Kraków", "street": "Długa 1"})
+        self.assertEqual(self.mos_data.legal_declarations, {"criminal_record": False})
+        self.assertEqual(self.mos_data.status, "client_filling")
+
+    def test_autosave_delta_leaves_unposted_fields_of_a_section_alone(self) -> None:
+        url = reverse("clients:onboarding_auto_save", kwargs={"token": self.token})
+        self.client.post(url, {"employer_name": "Acme", "employer_nip": "1234567890"})
+
+        response = self.client.post(url, {"employer_name": " Acme Sp. z o.o. "})
+
+        self.assertEqual(response.status_code, 200)
+        self.mos_data.refresh_from_db()
+        self.assertEqual(self.mos_data.personal_data["employer_name"], "Acme Sp. z o.o.")
+        self.assertEqual(self.mos_data.personal_data["employer_nip"], "1234567890")
+        self.assertEqual(self.mos_data.personal_data["first_name"], "Original")
+
     def test_digital_access_rolls_back_when_passport_ocr_source_is_unavailable(self) -> None:
         self.mos_data.personal_data = {}
         self.mos_data.passport_data = {}
@@ -311,6 +311,28 @@ def test_weekly_document_reminder_loop_allows_1710_retry_slot():
     assert cache_add.call_args_list[1].args[0] == "daily_document_reminders:2026-06-15:1710"
 
 
+@pytest.mark.django_db
+def test_weekly_document_reminder_failure_releases_the_slot():
+    from django.core.cache import cache as django_cache
+
+    morning = timezone.make_aware(datetime(2026, 6, 15, 9, 30))
+    django_cache.clear()
+
+    with patch(
+        "clients.management.commands.run_weekly_document_reminders.timezone.localtime", return_value=morning
+    ):
+        with patch(
+            "clients.management.commands.run_weekly_document_reminders.call_command",
+            side_effect=[RuntimeError("smtp down"), None],
+        ) as call_mock:
+            with pytest.raises(RuntimeError):
+                call_command("run_weekly_document_reminders")
+            call_command("run_weekly_document_reminders")
+            call_command("run_weekly_document_reminders")
+
+    assert call_mock.call_count == 2
+
+
 @pytest.mark.django_db
 def test_background_automation_loop_runs_core_background_tasks():
     with patch("clients.management.commands.run_background_automation_loop.cache.add", return_value=True):
@@ -322,7 +344,10 @@ def test_background_automation_loop_runs_core_background_tasks():
     assert call_mock.call_args_list == [
         call("process_document_jobs", "--limit", "50"),
         call("process_email_campaigns", "--limit", "50"),
+        call("process_export_jobs", "--limit", "5"),
         call("run_weekly_document_reminders"),
+        call("reconcile_client_attention", "--missing-only"),
+        call("reconcile_case_checklists", "--stale-only"),
         call("run_retention_maintenance"),
     ]
     # One heartbeat (dict payload with failures) plus the long-lived last-run marker.
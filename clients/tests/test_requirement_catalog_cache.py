@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import translation
+
+from clients.models import DocumentRequirement
+from clients.models._requirement_catalog import CATALOG_VERSION_CACHE_KEY
+from clients.services.case_context import build_case_document_checklist
+from clients.testing.factories import create_test_client, create_test_user
+
+
+def _catalog_queries(queries: CaptureQueriesContext) -> list[str]:
+    return [query["sql"] for query in queries.captured_queries if "clients_documentrequirement" in query["sql"]]
+
+
+class DocumentRequirementCatalogCacheTests(TestCase):
+    def setUp(self) -> None:
+        self.requirement = DocumentRequirement.objects.create(
+            application_purpose="work", document_type="employer_letter", custom_name="Employer letter"
+        )
+
+    def _labels(self) -> dict[str, str]:
+        return dict(DocumentRequirement.required_for("work", "en"))
+
+    def test_checklist_builds_issue_no_catalog_queries_once_warm(self) -> None:
+        case = create_test_client().cases.get()
+        with translation.override("en"):
+            build_case_document_checklist(case)
+            with CaptureQueriesContext(connection) as queries:
+                rows = build_case_document_checklist(case)
+
+        self.assertEqual(_catalog_queries(queries), [])
+        self.assertIn("employer_letter", {row["code"] for row in rows})
+
+    def test_saving_a_requirement_invalidates_the_catalog(self) -> None:
+        self.assertEqual(self._labels()["employer_letter"], "Employer letter")
+
+        self.requirement.custom_name = "Letter from employer"
+        self.requirement.custom_name_en = ""
+        self.requirement.save()
+        self.assertEqual(self._labels()["employer_letter"], "Letter from employer")
+
+        self.requirement.delete()
+        self.assertNotIn("employer_letter", self._labels())
+
+    def test_version_bump_from_another_worker_reloads(self) -> None:
+        self._labels()
+        with CaptureQueriesContext(connection) as warm:
+            self._labels()
+        self.assertEqual(_catalog_queries(warm), [])
+
+        cache.set(CATALOG_VERSION_CACHE_KEY, "bumped-elsewhere", timeout=None)
+        with CaptureQueriesContext(connection) as reloaded:
+            self._labels()
+        self.assertEqual(len(_catalog_queries(reloaded)), 1)
+
+    def test_checklist_manager_edit_is_visible_immediately(self) -> None:
+        self._labels()
+        self.client.force_login(create_test_user(role="Admin"))
+
+        self.client.post(
+            reverse("clients:document_requirement_edit", kwargs={"pk": self.requirement.pk}),
+            {
+                f"req-{self.requirement.pk}-custom_name": "Updated letter",
+                f"req-{self.requirement.pk}-custom_name_en": "Updated letter",
+                f"req-{self.requirement.pk}-is_required": "on",
+                f"req-{self.requirement.pk}-position": "0",
+            },
+        )
+
+        self.assertEqual(self._labels()["employer_letter"], "Updated letter")
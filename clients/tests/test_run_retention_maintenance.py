@@ -17,7 +17,7 @@ class RunRetentionMaintenanceTests(TestCase):
         call_command("run_retention_maintenance", *args, stdout=out)
         return out.getvalue()
 
-    def test_first_run_executes_both_steps(self) -> None:
+    def test_first_run_executes_all_steps(self) -> None:
         with mock.patch(
             "clients.management.commands.run_retention_maintenance.call_command"
         ) as mocked:
@@ -26,8 +26,14 @@ class RunRetentionMaintenanceTests(TestCase):
         called = [call.args for call in mocked.call_args_list]
         self.assertIn(("cleanup_email_logs", "--execute", "--confirm"), called)
         self.assertIn(("anonymize_old_clients",), called)
+        self.assertIn(("collect_database_media_garbage",), called)
+        self.assertIn(("reconcile_client_attention",), called)
+        self.assertIn(("reconcile_case_checklists",), called)
         self.assertIn("Weekly email payload cleanup executed.", output)
+        self.assertIn("Weekly media blob garbage collection executed.", output)
         self.assertIn("Monthly anonymization report executed.", output)
+        self.assertIn("Nightly client attention reconciliation executed.", output)
+        self.assertIn("Nightly case checklist reconciliation executed.", output)
 
     def test_second_run_is_skipped_by_cadence_guards(self) -> None:
         with mock.patch(
@@ -36,7 +42,7 @@ class RunRetentionMaintenanceTests(TestCase):
             self._run()
             output = self._run()
 
-        self.assertEqual(mocked.call_count, 2)
+        self.assertEqual(mocked.call_count, 5)
         self.assertIn("skipped", output)
 
     def test_force_ignores_guards(self) -> None:
@@ -46,7 +52,7 @@ class RunRetentionMaintenanceTests(TestCase):
             self._run()
             self._run("--force")
 
-        self.assertEqual(mocked.call_count, 4)
+        self.assertEqual(mocked.call_count, 10)
 
     def test_guard_failure_fails_closed(self) -> None:
         with mock.patch(
@@ -60,6 +66,24 @@ class RunRetentionMaintenanceTests(TestCase):
         mocked.assert_not_called()
         self.assertIn("skipped", output)
 
+    def test_failed_step_releases_its_guard_for_the_next_run(self) -> None:
+        def run(name: str, *args: str) -> None:
+            if name == "reconcile_case_checklists" and not failed:
+                failed.append(name)
+                raise RuntimeError("database went away")
+
+        failed: list[str] = []
+        with mock.patch(
+            "clients.management.commands.run_retention_maintenance.call_command", side_effect=run
+        ) as mocked:
+            with self.assertRaises(RuntimeError):
+                self._run()
+            output = self._run()
+
+        retried = [call.args[0] for call in mocked.call_args_list[4:]]
+        self.assertEqual(retried, ["reconcile_case_checklists", "anonymize_old_clients"])
+        self.assertIn("Nightly case checklist reconciliation executed.", output)
+
     def test_anonymize_report_never_passes_execute(self) -> None:
         with mock.patch(
             "clients.management.commands.run_retention_maintenance.call_command"
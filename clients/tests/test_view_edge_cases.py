@@ -182,56 +182,58 @@ class ClientViewEdgeCaseTests(TestCase):
         self.assertEqual(filtered_submitted.context["onboarding_filter"], "submitted_in_mos")
 
     def test_client_attention_menu_and_document_filters_show_ocr_events(self):
-        review_client = Client.objects.create(
-            first_name="Review",
-            last_name="Client",
-            email="ocr-review@example.com",
-        )
-        pending_client = Client.objects.create(
-            first_name="Pending",
-            last_name="Client",
-            email="ocr-pending@example.com",
-        )
-        warning_client = Client.objects.create(
-            first_name="Warning",
-            last_name="Client",
-            email="ocr-warning@example.com",
-        )
-        failed_client = Client.objects.create(
-            first_name="Failed",
-            last_name="Client",
-            email="ocr-failed@example.com",
-        )
-        Document.objects.create(
-            client=review_client,
-            document_type="passport",
-            file=SimpleUploadedFile("review.pdf", b"file", content_type="application/pdf"),
-            awaiting_confirmation=True,
-            ocr_status="success",
-            verified=True,
-        )
-        Document.objects.create(
-            client=pending_client,
-            document_type="passport",
-            file=SimpleUploadedFile("pending.pdf", b"file", content_type="application/pdf"),
-            ocr_status="pending",
-            verified=True,
-        )
-        Document.objects.create(
-            client=warning_client,
-            document_type="passport",
-            file=SimpleUploadedFile("warning.pdf", b"file", content_type="application/pdf"),
-            ocr_status="success",
-            ocr_name_mismatch=True,
-            verified=True,
-        )
-        Document.objects.create(
-            client=failed_client,
-            document_type="passport",
-            file=SimpleUploadedFile("failed.pdf", b"file", content_type="application/pdf"),
-            ocr_status="failed",
-            verified=True,
-        )
+        # The attention state is refreshed when the writes commit.
+        with self.captureOnCommitCallbacks(execute=True):
+            review_client = Client.objects.create(
+                first_name="Review",
+                last_name="Client",
+                email="ocr-review@example.com",
+            )
+            pending_client = Client.objects.create(
+                first_name="Pending",
+                last_name="Client",
+                email="ocr-pending@example.com",
+            )
+            warning_client = Client.objects.create(
+                first_name="Warning",
+                last_name="Client",
+                email="ocr-warning@example.com",
+            )
+            failed_client = Client.objects.create(
+                first_name="Failed",
+                last_name="Client",
+                email="ocr-failed@example.com",
+            )
+            Document.objects.create(
+                client=review_client,
+                document_type="passport",
+                file=SimpleUploadedFile("review.pdf", b"file", content_type="application/pdf"),
+                awaiting_confirmation=True,
+                ocr_status="success",
+                verified=True,
+            )
+            Document.objects.create(
+                client=pending_client,
+                document_type="passport",
+                file=SimpleUploadedFile("pending.pdf", b"file", content_type="application/pdf"),
+                ocr_status="pending",
+                verified=True,
+            )
+            Document.objects.create(
+                client=warning_client,
+                document_type="passport",
+                file=SimpleUploadedFile("warning.pdf", b"file", content_type="application/pdf"),
+                ocr_status="success",
+                ocr_name_mismatch=True,
+                verified=True,
+            )
+            Document.objects.create(
+                client=failed_client,
+                document_type="passport",
+                file=SimpleUploadedFile("failed.pdf", b"file", content_type="application/pdf"),
+                ocr_status="failed",
+                verified=True,
+            )
 
         list_url = reverse("clients:client_list")
         response = self.client.get(list_url)
@@ -265,111 +267,113 @@ class ClientViewEdgeCaseTests(TestCase):
 
     def test_client_attention_menu_and_attention_filters_show_operational_events(self):
         today = date.today()
-        clients_by_filter = {
-            "legal_stay": Client.objects.create(
-                first_name="LegalStayAttention",
-                last_name="Client",
-                email="legal-stay-attention@example.com",
-                workflow_stage="new_client",
-                legal_basis_end_date=today + timedelta(days=5),
-            ),
-            "expired_documents": Client.objects.create(
-                first_name="ExpiredDocumentAttention",
-                last_name="Client",
-                email="expired-doc-attention@example.com",
-            ),
-            "expiring_documents": Client.objects.create(
-                first_name="ExpiringDocumentAttention",
-                last_name="Client",
-                email="expiring-doc-attention@example.com",
-            ),
-            "unverified_documents": Client.objects.create(
-                first_name="UnverifiedDocumentAttention",
-                last_name="Client",
-                email="unverified-doc-attention@example.com",
-            ),
-            "overdue_payments": Client.objects.create(
-                first_name="OverduePaymentAttention",
-                last_name="Client",
-                email="overdue-payment-attention@example.com",
-            ),
-            "failed_emails": Client.objects.create(
-                first_name="FailedEmailAttention",
-                last_name="Client",
-                email="failed-email-attention@example.com",
-            ),
-            "fingerprints_email": Client.objects.create(
-                first_name="FingerprintsEmailAttention",
-                last_name="Client",
-                email="fingerprints-email-attention@example.com",
-                fingerprints_date=today,
-            ),
-            "overdue_tasks": Client.objects.create(
-                first_name="OverdueTaskAttention",
-                last_name="Client",
-                email="overdue-task-attention@example.com",
-            ),
-            "wezwanie_missing_case": Client.objects.create(
-                first_name="WezwanieMissingCaseAttention",
-                last_name="Client",
-                email="wezwanie-missing-case-attention@example.com",
-            ),
-            "new_card_missing_case": Client.objects.create(
-                first_name="NewCardMissingCaseAttention",
-                last_name="Client",
-                email="new-card-missing-case-attention@example.com",
-            ),
-        }
-        new_card_mos_data = clients_by_filter["new_card_missing_case"].mos_applications.first()
-        new_card_mos_data.new_residence_card_application_status = MOSApplicationData.NEW_CARD_STATUS_YES
-        new_card_mos_data.save(update_fields=["new_residence_card_application_status"])
-        Document.objects.create(
-            client=clients_by_filter["expired_documents"],
-            document_type="passport",
-            file=SimpleUploadedFile("expired.pdf", b"file", content_type="application/pdf"),
-            expiry_date=today - timedelta(days=1),
-            verified=True,
-        )
-        Document.objects.create(
-            client=clients_by_filter["expiring_documents"],
-            document_type="passport",
-            file=SimpleUploadedFile("expiring.pdf", b"file", content_type="application/pdf"),
-            expiry_date=today + timedelta(days=2),
-            verified=True,
-        )
-        Document.objects.create(
-            client=clients_by_filter["unverified_documents"],
-            document_type="passport",
-            file=SimpleUploadedFile("unverified.pdf", b"file", content_type="application/pdf"),
-            verified=False,
-        )
-        Document.objects.create(
-            client=clients_by_filter["wezwanie_missing_case"],
-            document_type="wezwanie",
-            file=SimpleUploadedFile("wezwanie.pdf", b"file", content_type="application/pdf"),
-            verified=True,
-        )
-        Payment.objects.create(
-            client=clients_by_filter["overdue_payments"],
-            service_description="consultation",
-            total_amount="100.00",
-            amount_paid="0.00",
-            status="pending",
-            due_date=today,
-        )
-        EmailLog.objects.create(
-            client=clients_by_filter["failed_emails"],
-            subject="Failed email",
-            body="Body",
-            recipients="client@example.com",
-            delivery_status=EmailLog.DELIVERY_STATUS_FAILED,
-        )
-        StaffTask.objects.create(
-            client=clients_by_filter["overdue_tasks"],
-            title="Overdue task",
-            due_date=today - timedelta(days=1),
-            status="open",
-        )
+        # The attention state is refreshed when the writes commit.
+        with self.captureOnCommitCallbacks(execute=True):
+            clients_by_filter = {
+                "legal_stay": Client.objects.create(
+                    first_name="LegalStayAttention",
+                    last_name="Client",
+                    email="legal-stay-attention@example.com",
+                    workflow_stage="new_client",
+                    legal_basis_end_date=today + timedelta(days=5),
+                ),
+                "expired_documents": Client.objects.create(
+                    first_name="ExpiredDocumentAttention",
+                    last_name="Client",
+                    email="expired-doc-attention@example.com",
+                ),
+                "expiring_documents": Client.objects.create(
+                    first_name="ExpiringDocumentAttention",
+                    last_name="Client",
+                    email="expiring-doc-attention@example.com",
+                ),
+                "unverified_documents": Client.objects.create(
+                    first_name="UnverifiedDocumentAttention",
+                    last_name="Client",
+                    email="unverified-doc-attention@example.com",
+                ),
+                "overdue_payments": Client.objects.create(
+                    first_name="OverduePaymentAttention",
+                    last_name="Client",
+                    email="overdue-payment-attention@example.com",
+                ),
+                "failed_emails": Client.objects.create(
+                    first_name="FailedEmailAttention",
+                    last_name="Client",
+                    email="failed-email-attention@example.com",
+                ),
+                "fingerprints_email": Client.objects.create(
+                    first_name="FingerprintsEmailAttention",
+                    last_name="Client",
+                    email="fingerprints-email-attention@example.com",
+                    fingerprints_date=today,
+                ),
+                "overdue_tasks": Client.objects.create(
+                    first_name="OverdueTaskAttention",
+                    last_name="Client",
+                    email="overdue-task-attention@example.com",
+                ),
+                "wezwanie_missing_case": Client.objects.create(
+                    first_name="WezwanieMissingCaseAttention",
+                    last_name="Client",
+                    email="wezwanie-missing-case-attention@example.com",
+                ),
+                "new_card_missing_case": Client.objects.create(
+                    first_name="NewCardMissingCaseAttention",
+                    last_name="Client",
+                    email="new-card-missing-case-attention@example.com",
+                ),
+            }
+            new_card_mos_data = clients_by_filter["new_card_missing_case"].mos_applications.first()
+            new_card_mos_data.new_residence_card_application_status = MOSApplicationData.NEW_CARD_STATUS_YES
+            new_card_mos_data.save(update_fields=["new_residence_card_application_status"])
+            Document.objects.create(
+                client=clients_by_filter["expired_documents"],
+                document_type="passport",
+                file=SimpleUploadedFile("expired.pdf", b"file", content_type="application/pdf"),
+                expiry_date=today - timedelta(days=1),
+                verified=True,
+            )
+            Document.objects.create(
+                client=clients_by_filter["expiring_documents"],
+                document_type="passport",
+                file=SimpleUploadedFile("expiring.pdf", b"file", content_type="application/pdf"),
+                expiry_date=today + timedelta(days=2),
+                verified=True,
+            )
+            Document.objects.create(
+                client=clients_by_filter["unverified_documents"],
+                document_type="passport",
+                file=SimpleUploadedFile("unverified.pdf", b"file", content_type="application/pdf"),
+                verified=False,
+            )
+            Document.objects.create(
+                client=clients_by_filter["wezwanie_missing_case"],
+                document_type="wezwanie",
+                file=SimpleUploadedFile("wezwanie.pdf", b"file", content_type="application/pdf"),
+                verified=True,
+            )
+            Payment.objects.create(
+                client=clients_by_filter["overdue_payments"],
+                service_description="consultation",
+                total_amount="100.00",
+                amount_paid="0.00",
+                status="pending",
+                due_date=today,
+            )
+            EmailLog.objects.create(
+                client=clients_by_filter["failed_emails"],
+                subject="Failed email",
+                body="Body",
+                recipients="client@example.com",
+                delivery_status=EmailLog.DELIVERY_STATUS_FAILED,
+            )
+            StaffTask.objects.create(
+                client=clients_by_filter["overdue_tasks"],
+                title="Overdue task",
+                due_date=today - timedelta(days=1),
+                status="open",
+            )
 
         list_url = reverse("clients:client_list")
         response = self.client.get(list_url)
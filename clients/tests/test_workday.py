@@ -114,31 +114,33 @@ class WorkdayViewTests(TestCase):
     def test_workday_prioritizes_items_correctly(self):
         today = date(2026, 6, 20)
 
-        # Client whose stay is expiring soon (<= 30 days)
-        critical_client = Client.objects.create(
-            first_name="Critical",
-            last_name="Stay",
-            legal_basis_end_date=today + timedelta(days=15),
-        )
-        Document.objects.create(
-            client=critical_client,
-            document_type=DocumentType.PASSPORT.value,
-            file=self._file("passport.pdf"),
-            verified=False,
-        )
-
-        # Normal client with missing documents (should be important)
-        normal_client = Client.objects.create(
-            first_name="Normal",
-            last_name="Client",
-            legal_basis_end_date=today + timedelta(days=100),
-        )
-        Document.objects.create(
-            client=normal_client,
-            document_type=DocumentType.PASSPORT.value,
-            file=self._file("normal_passport.pdf"),
-            verified=False,
-        )
+        # Checklist summaries are refreshed once the writes commit.
+        with self.captureOnCommitCallbacks(execute=True):
+            # Client whose stay is expiring soon (<= 30 days)
+            critical_client = Client.objects.create(
+                first_name="Critical",
+                last_name="Stay",
+                legal_basis_end_date=today + timedelta(days=15),
+            )
+            Document.objects.create(
+                client=critical_client,
+                document_type=DocumentType.PASSPORT.value,
+                file=self._file("passport.pdf"),
+                verified=False,
+            )
+
+            # Normal client with missing documents (should be important)
+            normal_client = Client.objects.create(
+                first_name="Normal",
+                last_name="Client",
+                legal_basis_end_date=today + timedelta(days=100),
+            )
+            Document.objects.create(
+                client=normal_client,
+                document_type=DocumentType.PASSPORT.value,
+                file=self._file("normal_passport.pdf"),
+                verified=False,
+            )
 
         context = build_workday_context(self.admin, today=today, limit_per_section=10)
         review_items = {item["client"].last_name: item for item in context["workday_sections"][0]["items"]}
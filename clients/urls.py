@@ -36,6 +36,11 @@ urlpatterns = [
     # URL для экспорта
     path('client/<int:pk>/export/pdf/', views.client_export_pdf_view, name='client_export_pdf'),
     path('client/<int:pk>/export/zip/', views.client_export_zip, name='client_export_zip'),
+    path('client/<int:pk>/export/zip/queue/', views.client_export_zip_queue, name='client_export_zip_queue'),
+    path('exports/', views.export_job_list, name='export_job_list'),
+    path('exports/queue/', views.client_export_bulk_queue, name='client_export_bulk_queue'),
+    path('api/export-job/<int:job_id>/status/', views.export_job_status_api, name='export_job_status_api'),
+    path('exports/download/<str:token>/', views.export_job_download, name='export_job_download'),
 
     # URL для версий документов
     path('document/<int:doc_id>/versions/', views.document_versions_view, name='document_versions'),
@@ -91,6 +96,10 @@ urlpatterns = [
     path('client/<int:client_id>/documents/verify-all/', views.verify_all_documents, name='verify_all_documents'),
     path('<int:pk>/checklist-partial/', views.client_checklist_partial, name='client_checklist_partial'),
     path('<int:pk>/overview-partial/', views.client_overview_partial, name='client_overview_partial'),
+    path('<int:pk>/fragments/activity/', views.client_activity_fragment, name='client_activity_fragment'),
+    path('<int:pk>/fragments/emails/', views.client_emails_fragment, name='client_emails_fragment'),
+    path('<int:pk>/fragments/tasks/', views.client_tasks_fragment, name='client_tasks_fragment'),
+    path('<int:pk>/fragments/versions/', views.client_versions_fragment, name='client_versions_fragment'),
 
     # URL для работы с платежами
     path('client/<int:client_id>/payments/add/', views.add_payment, name='add_payment'),
@@ -160,4 +169,5 @@ urlpatterns = [
 
     path('<int:client_id>/mos-review/', views.admin_mos_review, name='admin_mos_review'),
     path('api/client-autocomplete/', views.client_autocomplete_api, name='client_autocomplete_api'),
+    path('api/company-autocomplete/', views.company_autocomplete_api, name='company_autocomplete_api'),
 ]
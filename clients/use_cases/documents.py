@@ -194,6 +194,10 @@ def verify_all_client_documents(
             .update(verified=True, awaiting_confirmation=False)
         )
         if updated_count:
+            # QuerySet.update() sends no signals, so refresh the row they maintain.
+            from clients.services.attention_state import refresh_client_attention_state
+            refresh_client_attention_state(client.pk)
+
             from clients.services.tasks import close_auto_task
             close_auto_task(client, "document_review")
 
@@ -7,6 +7,12 @@ from clients.views.base import StaffRequiredMixin, staff_required_view
 from clients.views.cases import *  # noqa: F403
 from clients.views.checklist_views import *  # noqa: F403
 from clients.views.client_crud import *  # noqa: F403
+from clients.views.client_fragments import (
+    client_activity_fragment,
+    client_emails_fragment,
+    client_tasks_fragment,
+    client_versions_fragment,
+)
 from clients.views.demo_center import democenter_view
 from clients.views.documents import *  # noqa: F403
 from clients.views.emails import *  # noqa: F403
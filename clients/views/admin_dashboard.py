@@ -1,22 +1,26 @@
 from __future__ import annotations
 
-import os
+from datetime import date
 from typing import Any
 
 from django.conf import settings
-from django.db.models import Q, Sum
+from django.core.cache import cache
+from django.db.models import Count, Q
 from django.http import HttpRequest, HttpResponse
-from django.shortcuts import render
+from django.shortcuts import redirect, render
 from django.template.defaultfilters import filesizeformat
 from django.utils import timezone
 from django.views import View
 
 from clients.models import Document, DocumentProcessingJob, EmailCampaign, Reminder, StaffTask
+from clients.services.document_job_scheduling import planned_document_job_order, with_client_names
 from clients.services.roles import REPORTS_VIEW_ROLES
 from clients.views.base import RoleRequiredMixin, StaffRequiredMixin
+from database_media.usage import storage_usage_bytes
 from legalize_site.runtime import runtime_dependency_summary
 
 OCR_DEPENDENCY_KEYS = {"pytesseract", "tesseract", "pdf2image", "pdftoppm", "cv2", "numpy"}
+DASHBOARD_CACHE_KEY = "admin_dashboard:snapshot"
 
 
 def _email_status() -> dict[str, str]:
@@ -36,25 +40,70 @@ def _ocr_status(missing_keys: list[str]) -> dict[str, str]:
     return {"css": "success", "label": "Ready"}
 
 
-def _storage_usage() -> dict[str, Any]:
-    """Cheap storage summary: DB-media aggregate when present, local walk otherwise."""
-    file_count = Document.objects.exclude(file="").count()
-    from database_media.models import DatabaseMediaFile
+def _storage_usage(file_count: int) -> dict[str, Any]:
+    """Storage summary from the running byte counter kept by the media backends."""
+    total = storage_usage_bytes()
+    return {
+        "total_display": filesizeformat(total) if total is not None else "—",
+        "file_count": file_count,
+    }
 
-    if DatabaseMediaFile.objects.exists():
-        total = DatabaseMediaFile.objects.aggregate(total=Sum("size"))["total"] or 0
-        return {"total_display": filesizeformat(total), "file_count": file_count}
-    media_root = str(getattr(settings, "MEDIA_ROOT", "") or "")
-    if media_root and os.path.isdir(media_root) and not getattr(settings, "USE_S3_MEDIA_STORAGE", False):
-        total = 0
-        for dirpath, _dirnames, filenames in os.walk(media_root):
-            for filename in filenames:
-                try:
-                    total += os.path.getsize(os.path.join(dirpath, filename))
-                except OSError:
-                    continue
-        return {"total_display": filesizeformat(total), "file_count": file_count}
-    return {"total_display": "—", "file_count": file_count}
+
+def _document_counts(today: date) -> dict[str, int]:
+    active = Q(client__archived_at__isnull=True, case__archived_at__isnull=True)
+    awaiting_verification = (
+        active
+        & Q(file__gt="", verified=False, awaiting_confirmation=False, archived_at__isnull=True)
+        & ~(Q(rejection_reason__isnull=False) & ~Q(rejection_reason=""))
+        & ~Q(expiry_date__isnull=False, expiry_date__lt=today)
+    )
+    return Document.objects.aggregate(
+        file_count=Count("pk", filter=~Q(file="")),
+        docs_awaiting_confirmation=Count("pk", filter=active & Q(awaiting_confirmation=True)),
+        docs_awaiting_verification=Count("pk", filter=awaiting_verification),
+        docs_name_mismatch=Count("pk", filter=active & Q(ocr_name_mismatch=True)),
+        expired_documents=Count("pk", filter=active & Q(expiry_date__isnull=False, expiry_date__lt=today)),
+    )
+
+
+def dashboard_snapshot() -> dict[str, Any]:
+    """Everything the dashboard shows, with one aggregate query per model."""
+    today = timezone.localdate()
+    runtime = runtime_dependency_summary()
+    job_counts = DocumentProcessingJob.objects.aggregate(
+        pending_document_jobs=Count("pk", filter=Q(status=DocumentProcessingJob.STATUS_PENDING)),
+        processing_document_jobs=Count("pk", filter=Q(status=DocumentProcessingJob.STATUS_PROCESSING)),
+        failed_document_jobs=Count("pk", filter=Q(status=DocumentProcessingJob.STATUS_FAILED)),
+    )
+    campaign_counts = EmailCampaign.objects.aggregate(
+        pending_campaigns=Count("pk", filter=Q(status=EmailCampaign.STATUS_PENDING)),
+        running_campaigns=Count("pk", filter=Q(status=EmailCampaign.STATUS_RUNNING)),
+        failed_campaigns=Count("pk", filter=Q(status=EmailCampaign.STATUS_FAILED)),
+    )
+    document_counts = _document_counts(today)
+    return {
+        "generated_at": timezone.now(),
+        "email_status": _email_status(),
+        "ocr_status": _ocr_status(runtime["missing_keys"]),
+        "storage": _storage_usage(document_counts.pop("file_count")),
+        "runtime_missing_count": runtime["missing_count"],
+        "runtime_dependencies": runtime["dependencies"],
+        **job_counts,
+        **campaign_counts,
+        **document_counts,
+        "overdue_tasks": StaffTask.objects.filter(
+            status__in=[StaffTask.STATUS_OPEN, StaffTask.STATUS_IN_PROGRESS],
+            due_date__isnull=False,
+            due_date__lt=today,
+            client__archived_at__isnull=True,
+        ).count(),
+        "active_reminders": Reminder.objects.filter(
+            is_active=True,
+            client__archived_at__isnull=True,
+        ).count(),
+        "recent_campaigns": list(EmailCampaign.objects.order_by("-created_at")[:5]),
+        "document_job_plan": planned_document_job_order(),
+    }
 
 
 class AdminDashboardView(RoleRequiredMixin, StaffRequiredMixin, View):
@@ -62,54 +111,15 @@ class AdminDashboardView(RoleRequiredMixin, StaffRequiredMixin, View):
     template_name = "clients/admin_dashboard.html"
 
     def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
-        today = timezone.localdate()
-        runtime = runtime_dependency_summary()
-
-        active_docs = Document.objects.filter(
-            client__archived_at__isnull=True,
-            case__archived_at__isnull=True,
-        )
-        context: dict[str, Any] = {
-            "generated_at": timezone.now(),
-            "email_status": _email_status(),
-            "ocr_status": _ocr_status(runtime["missing_keys"]),
-            "storage": _storage_usage(),
-            "runtime_missing_count": runtime["missing_count"],
-            "runtime_dependencies": runtime["dependencies"],
-            "pending_document_jobs": DocumentProcessingJob.objects.filter(
-                status=DocumentProcessingJob.STATUS_PENDING
-            ).count(),
-            "processing_document_jobs": DocumentProcessingJob.objects.filter(
-                status=DocumentProcessingJob.STATUS_PROCESSING
-            ).count(),
-            "failed_document_jobs": DocumentProcessingJob.objects.filter(
-                status=DocumentProcessingJob.STATUS_FAILED
-            ).count(),
-            "pending_campaigns": EmailCampaign.objects.filter(status=EmailCampaign.STATUS_PENDING).count(),
-            "running_campaigns": EmailCampaign.objects.filter(status=EmailCampaign.STATUS_RUNNING).count(),
-            "failed_campaigns": EmailCampaign.objects.filter(status=EmailCampaign.STATUS_FAILED).count(),
-            "docs_awaiting_confirmation": active_docs.filter(awaiting_confirmation=True).count(),
-            "docs_awaiting_verification": active_docs.filter(
-                file__gt="",
-                verified=False,
-                awaiting_confirmation=False,
-                archived_at__isnull=True,
-            )
-            .exclude(Q(rejection_reason__isnull=False) & ~Q(rejection_reason=""))
-            .exclude(expiry_date__isnull=False, expiry_date__lt=today)
-            .count(),
-            "overdue_tasks": StaffTask.objects.filter(
-                status__in=[StaffTask.STATUS_OPEN, StaffTask.STATUS_IN_PROGRESS],
-                due_date__isnull=False,
-                due_date__lt=today,
-                client__archived_at__isnull=True,
-            ).count(),
-            "docs_name_mismatch": active_docs.filter(ocr_name_mismatch=True).count(),
-            "expired_documents": active_docs.filter(expiry_date__isnull=False, expiry_date__lt=today).count(),
-            "active_reminders": Reminder.objects.filter(
-                is_active=True,
-                client__archived_at__isnull=True,
-            ).count(),
-            "recent_campaigns": EmailCampaign.objects.order_by("-created_at")[:5],
-        }
+        context = cache.get(DASHBOARD_CACHE_KEY)
+        if context is None:
+            context = dashboard_snapshot()
+            cache.set(DASHBOARD_CACHE_KEY, context, timeout=settings.ADMIN_DASHBOARD_CACHE_SECONDS)
+        # Client names are decrypted PII; they stay out of the shared cache.
+        context = {**context, "document_job_plan": with_client_names(context["document_job_plan"])}
         return render(request, self.template_name, context)
+
+    def post(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        """Refresh button: drop the cached snapshot and start again from fresh counts."""
+        cache.delete(DASHBOARD_CACHE_KEY)
+        return redirect("clients:admin_dashboard")
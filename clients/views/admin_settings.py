@@ -17,7 +17,17 @@ from clients.forms import (
     AppSettingsForm,
     ServicePriceForm,
 )
-from clients.models import AppSettings, Case, Client, Document, Payment, Reminder, ServicePrice, StaffTask
+from clients.models import (
+    AppSettings,
+    Case,
+    CaseChecklistSummary,
+    Client,
+    Document,
+    Payment,
+    Reminder,
+    ServicePrice,
+    StaffTask,
+)
 from clients.services.roles import (
     ADMIN_PANEL_ALLOWED_ROLES,
     CRITICAL_SETTINGS_ALLOWED_ROLES,
@@ -100,31 +110,15 @@ class AdminPanelView(RoleRequiredMixin, TemplateView):
         return context
 
 
-def _count_missing_document_items() -> int | str:
-    # Active = the client has at least one active (non-finished) case (spec §4).
-    active_qs = Client.objects.filter(
-        cases__workflow_stage__in=ACTIVE_WORKFLOW_STAGES
-    ).distinct()
-
-    # Для огромных баз данных мы не можем считать это в реальном времени,
-    # так как это требует создания чеклистов для каждого клиента.
-    if active_qs.count() > 500:
-        return "500+ (Расчет отключен для скорости)"
-
-    clients = active_qs.prefetch_related(
-        "documents",
-        "custom_document_requirements",
-        "wniosek_submissions__confirmed_by",
-        "wniosek_submissions__attachments",
-        "wniosek_submissions__proof_documents",
-    )
-    requirements_cache: dict[str, Any] = {}
-    return sum(
-        1
-        for client in clients
-        for item in client.get_document_checklist(requirements_cache=requirements_cache)
-        if not item.get("is_complete")
-    )
+def _count_missing_document_items() -> int:
+    # Active = the case is in a non-finished stage (spec §4); the per-case
+    # checklist summaries are kept current by signals and a nightly rebuild.
+    total = CaseChecklistSummary.objects.filter(
+        case__archived_at__isnull=True,
+        case__workflow_stage__in=ACTIVE_WORKFLOW_STAGES,
+        client__archived_at__isnull=True,
+    ).aggregate(total=Sum("missing_count"))["total"]
+    return total or 0
 
 
 class AppSettingsUpdateView(RoleRequiredMixin, UpdateView):
@@ -5,11 +5,12 @@ from typing import TYPE_CHECKING, Any, Callable
 
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.http import HttpRequest, HttpResponseForbidden
+from django.http import Http404, HttpRequest, HttpResponseForbidden
 from django.utils.http import url_has_allowed_host_and_scheme
 from django.utils.translation import gettext as _
 
 from clients.services.access import is_internal_staff_user, user_has_internal_role
+from clients.services.pagination import InvalidCursor, KeysetPaginator
 from clients.services.permissions import has_employee_permission
 from clients.services.responses import ResponseHelper
 
@@ -105,3 +106,24 @@ def role_or_feature_required_view(permission_name: str, *allowed_roles: str) ->
         return _wrapped
 
     return decorator
+
+
+class KeysetPaginationMixin:
+    """Cursor pagination for a ``ListView`` over a large, index-ordered table.
+
+    Pages are addressed by the opaque ``?cursor=`` token from
+    ``page_obj.next_token`` / ``page_obj.previous_token`` instead of a page
+    number; render them with ``clients/partials/keyset_pagination.html``.
+    """
+
+    request: HttpRequest
+    keyset_ordering: tuple[str, ...] = ()
+    cursor_kwarg = "cursor"
+
+    def paginate_queryset(self, queryset: Any, page_size: int) -> tuple[Any, Any, Any, bool]:
+        paginator = KeysetPaginator(queryset, self.keyset_ordering, page_size)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg) or None)
+        except InvalidCursor as exc:
+            raise Http404(_("Неверная страница.")) from exc
+        return paginator, page, page.object_list, page.has_other_pages()
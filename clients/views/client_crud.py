@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, cast
 
 from django.conf import settings
 from django.contrib import messages
 from django.db import transaction
-from django.db.models import Count, Max, Prefetch, Q
+from django.db.models import Count, Prefetch, Q
 from django.http import Http404, HttpRequest, HttpResponse
 from django.shortcuts import redirect, render
 from django.urls import reverse, reverse_lazy
@@ -20,11 +20,11 @@ from clients.forms import (
     PaymentForm,
     StaffTaskForm,
 )
-from clients.models import Case, Client, ClientActivity, Document, EmailLog, Payment, StaffTask, WniosekSubmission
+from clients.models import Case, Client, Payment
 from clients.security.encrypted import safe_encrypted_attr
-from clients.services.access import accessible_clients_queryset
+from clients.services.access import accessible_clients_queryset, user_has_internal_role
 from clients.services.activity import log_client_view
-from clients.services.attention import apply_client_attention_filter
+from clients.services.attention import ATTENTION_ORDERING, DOCUMENT_FILTERS, apply_client_attention_filter
 from clients.services.cases import resolve_single_active_case
 from clients.services.notifications import (
     send_expired_documents_email,
@@ -34,9 +34,11 @@ from clients.services.onboarding_purposes import (
     attach_onboarding_purpose_review_state,
     onboarding_purpose_mismatch_q,
 )
+from clients.services.permissions import has_employee_permission
 from clients.services.responses import apply_no_store
 from clients.services.roles import (
     CLIENT_DELETE_ROLES,
+    EXPORT_MUTATION_ROLES,
     user_has_any_role,
 )
 from clients.services.zus import missing_zus_month_upload_options
@@ -96,60 +98,19 @@ class ClientListView(StaffRequiredMixin, ListView):
                 queryset = queryset.filter(mos_applications__status=self.onboarding_filter)
                 list_ordering = ["-mos_applications__updated_at", "-created_at"]
 
+        # OCR document and attention filters read the per-client
+        # ClientAttentionState row: one indexed join instead of joining the
+        # documents/payments/tasks/e-mails with DISTINCT.
         self.document_filter = self.request.GET.get("document", "")
-        if self.document_filter == "ocr_review":
-            queryset = queryset.filter(
-                documents__awaiting_confirmation=True,
-                documents__archived_at__isnull=True,
-            )
-            queryset = queryset.annotate(latest_event_uploaded_at=Max("documents__uploaded_at"))
-            list_ordering = ["-latest_event_uploaded_at", "-created_at"]
-        elif self.document_filter == "ocr_warning":
-            queryset = queryset.filter(
-                documents__ocr_name_mismatch=True,
-                documents__archived_at__isnull=True,
-            )
-            queryset = queryset.annotate(latest_event_uploaded_at=Max("documents__uploaded_at"))
-            list_ordering = ["-latest_event_uploaded_at", "-created_at"]
-        elif self.document_filter == "ocr_pending":
-            queryset = queryset.filter(
-                documents__ocr_status="pending",
-                documents__archived_at__isnull=True,
-            )
-            queryset = queryset.annotate(latest_event_uploaded_at=Max("documents__uploaded_at"))
-            list_ordering = ["-latest_event_uploaded_at", "-created_at"]
-        elif self.document_filter == "ocr_failed":
-            queryset = queryset.filter(
-                documents__ocr_status="failed",
-                documents__archived_at__isnull=True,
-            )
-            queryset = queryset.annotate(latest_event_uploaded_at=Max("documents__uploaded_at"))
-            list_ordering = ["-latest_event_uploaded_at", "-created_at"]
+        if self.document_filter in DOCUMENT_FILTERS:
+            queryset = apply_client_attention_filter(queryset, self.document_filter)
+            list_ordering = ["-attention_state__latest_document_uploaded_at", "-created_at"]
 
         self.attention_filter = self.request.GET.get("attention", "")
         if self.attention_filter:
             queryset = apply_client_attention_filter(queryset, self.attention_filter)
-            if self.attention_filter in {
-                "expired_documents",
-                "expiring_documents",
-                "unverified_documents",
-                "wezwanie_missing_case",
-            }:
-                queryset = queryset.annotate(latest_event_uploaded_at=Max("documents__uploaded_at"))
-                list_ordering = ["-latest_event_uploaded_at", "-created_at"]
-            elif self.attention_filter == "overdue_payments":
-                queryset = queryset.annotate(latest_attention_due_date=Max("payments__due_date"))
-                list_ordering = ["latest_attention_due_date", "-created_at"]
-            elif self.attention_filter == "overdue_tasks":
-                queryset = queryset.annotate(latest_attention_due_date=Max("staff_tasks__due_date"))
-                list_ordering = ["latest_attention_due_date", "-created_at"]
-            elif self.attention_filter == "failed_emails":
-                queryset = queryset.annotate(latest_attention_sent_at=Max("email_logs__sent_at"))
-                list_ordering = ["-latest_attention_sent_at", "-created_at"]
-            elif self.attention_filter == "fingerprints_email":
-                list_ordering = ["cases__fingerprints_date", "-created_at"]
-            elif self.attention_filter == "legal_stay":
-                list_ordering = ["legal_basis_end_date", "-created_at"]
+            if self.attention_filter in ATTENTION_ORDERING:
+                list_ordering = [ATTENTION_ORDERING[self.attention_filter], "-created_at"]
 
         company_id = self.request.GET.get("company")
         if company_id:
@@ -157,7 +118,9 @@ class ClientListView(StaffRequiredMixin, ListView):
 
         query = self.request.GET.get("q", "")
         if query:
-            queryset = queryset.filter(Client.build_search_filter(query))
+            # Best name-token overlap first (exact words, then fragments/typos).
+            queryset = cast(Any, queryset.filter(Client.build_search_filter(query))).with_search_rank(query)
+            list_ordering = ["-search_rank", *list_ordering]
         return queryset.distinct().order_by(*list_ordering)
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
@@ -178,7 +141,14 @@ class ClientListView(StaffRequiredMixin, ListView):
             client.safe_case_number = authority or legacy or "—"
             client.case_number_is_legacy = bool(not authority and legacy)
             attach_onboarding_purpose_review_state(client)
-        context["companies"] = Company.objects.all()
+        # The company filter is an autocomplete (company_autocomplete_api);
+        # only the selected company is loaded to label the input.
+        selected_company = context["selected_company"]
+        context["selected_company_name"] = (
+            Company.objects.filter(pk=selected_company).values_list("name", flat=True).first() or ""
+            if selected_company.isdigit()
+            else ""
+        )
         return context
 
 
@@ -196,42 +166,6 @@ class ClientDetailView(StaffRequiredMixin, DetailView):
                 "mos_applications",
                 Prefetch("cases", queryset=Case.objects.select_related("company").order_by("-opened_at", "-id")),
                 Prefetch("payments", queryset=Payment.objects.filter(case__archived_at__isnull=True).order_by("-created_at")),
-                Prefetch(
-                    "documents",
-                    queryset=Document.objects.filter(case__archived_at__isnull=True).annotate(
-                        preloaded_version_count=Count("versions")
-                    ).order_by("-uploaded_at"),
-                ),
-                Prefetch(
-                    "staff_tasks",
-                    queryset=StaffTask.objects.filter(case__archived_at__isnull=True).select_related("assignee", "created_by").order_by(
-                        "status",
-                        "due_date",
-                        "-created_at",
-                    ),
-                ),
-                Prefetch(
-                    "activities",
-                    queryset=ClientActivity.objects.select_related("actor", "document", "payment", "task").order_by(
-                        "-created_at"
-                    ),
-                ),
-                Prefetch("email_logs", queryset=EmailLog.objects.select_related("sent_by").order_by("-sent_at")),
-                Prefetch(
-                    "wniosek_submissions",
-                    queryset=WniosekSubmission.objects.select_related("confirmed_by")
-                    .prefetch_related(
-                        "attachments",
-                        Prefetch(
-                            "proof_documents",
-                            queryset=Document.objects.filter(archived_at__isnull=True).only(
-                                "id", "confirms_submission", "uploaded_at", "archived_at"
-                            ),
-                        ),
-                    )
-                    .order_by("-confirmed_at"),
-                ),
-                "reminders",
                 "sponsored_family_members",
             ),
         )
@@ -280,22 +214,13 @@ class ClientDetailView(StaffRequiredMixin, DetailView):
         context["safe_case_number"] = active_case_number or _("Не указан")
         active_case_for_zus = resolve_single_active_case(client)
         context["missing_zus_months_for_upload"] = (missing_zus_month_upload_options(active_case_for_zus) if active_case_for_zus else [])
-        prefetched = getattr(client, "_prefetched_objects_cache", {})
-        email_logs = prefetched.get("email_logs")
-        if email_logs is None:
-            email_logs = client.email_logs.select_related("sent_by").order_by("-sent_at")
-        context["email_logs"] = email_logs[:50]
         context["service_choices"] = Payment.SERVICE_CHOICES
         context["task_form"] = StaffTaskForm(initial={"assignee": self.request.user.pk})
-        staff_tasks = prefetched.get("staff_tasks")
-        if staff_tasks is None:
-            open_tasks = client.staff_tasks.filter(
-                status__in=["open", "in_progress"],
-            ).select_related("assignee", "created_by")
-        else:
-            open_tasks = [task for task in staff_tasks if task.status in {"open", "in_progress"}]
-        context["open_tasks"] = open_tasks[:10]
-        context["recent_activities"] = client.activities.all()[:25]
+        # Activity, emails, open tasks and document versions are unbounded per
+        # client; they load as cursor-paginated fragments (views/client_fragments.py).
+        context["can_view_document_versions"] = user_has_internal_role(
+            self.request.user, *EXPORT_MUTATION_ROLES
+        ) or has_employee_permission(self.request.user, "can_export_clients")
         context["workflow_summary"] = client.get_workflow_summary(document_status_list=document_status_list)
         context["workflow_alerts"] = context["workflow_summary"]["alerts"]
         attach_onboarding_purpose_review_state(client)
@@ -545,9 +470,10 @@ def client_autocomplete_api(request: HttpRequest) -> HttpResponse:
     )
 
     results = []
-    for client in queryset.distinct()[:8]:
+    for client in cast(Any, queryset).with_search_rank(query).distinct().order_by("-search_rank", "-created_at")[:8]:
         results.append({
             "id": client.id,
+            "label": client.get_full_name(),
             "first_name": client.first_name,
             "last_name": client.last_name,
             "email": client.email or "",
@@ -558,3 +484,29 @@ def client_autocomplete_api(request: HttpRequest) -> HttpResponse:
         })
 
     return JsonResponse({"results": results})
+
+
+@role_required_view("Admin", "Manager", "Staff")
+def company_autocomplete_api(request: HttpRequest) -> HttpResponse:
+    from django.http import JsonResponse
+
+    from clients.models import Company
+    from clients.models.company import normalize_company_name
+
+    query = request.GET.get("q", "").strip()
+    if not query or len(query) < 2:
+        return JsonResponse({"results": []})
+
+    condition = Q(name__icontains=query)
+    normalized = normalize_company_name(query)
+    if normalized:
+        condition |= Q(normalized_name__contains=normalized)
+    digits = "".join(char for char in query if char.isdigit())
+    if len(digits) >= 3:
+        condition |= Q(nip__startswith=digits) | Q(regon__startswith=digits) | Q(krs__startswith=digits)
+
+    results = [
+        {"id": company.id, "label": company.name, "nip": company.nip}
+        for company in Company.objects.filter(condition).only("id", "name", "nip")[:8]
+    ]
+    return JsonResponse({"results": results})
@@ -0,0 +1,148 @@
+"""Lazily loaded, cursor-paginated sections of the client detail page.
+
+The detail page used to prefetch a client's whole history (every activity,
+email, task and document version) to render its first screen. It now renders
+a shell and each of these sections is fetched by ``client/fragments.js`` when
+it scrolls into view, one capped page at a time; "show more" follows the
+page's ``next_token``. Every fragment costs a fixed number of queries
+regardless of how much history the client has.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlencode
+
+from django.db.models import QuerySet
+from django.http import Http404, HttpRequest, HttpResponse
+from django.middleware.csrf import get_token
+from django.shortcuts import get_object_or_404
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.translation import gettext as _
+
+from clients.models import Client, ClientActivity, DocumentVersion, EmailLog, StaffTask
+from clients.services.access import accessible_clients_queryset
+from clients.services.pagination import InvalidCursor, KeysetPaginator
+from clients.services.responses import apply_no_store
+from clients.services.roles import EXPORT_MUTATION_ROLES
+from clients.views.base import role_or_feature_required_view, staff_required_view
+
+if TYPE_CHECKING:
+    from django.http.response import HttpResponseBase
+
+ACTIVITY_PAGE_SIZE = 25
+EMAIL_PAGE_SIZE = 10
+TASK_PAGE_SIZE = 10
+VERSION_PAGE_SIZE = 20
+
+
+def _client_for_fragment(request: HttpRequest, pk: int) -> Client:
+    return get_object_or_404(accessible_clients_queryset(request.user, Client.objects.all()), pk=pk)
+
+
+def _render_fragment(
+    request: HttpRequest,
+    template_name: str,
+    *,
+    queryset: QuerySet[Any],
+    ordering: tuple[str, ...],
+    page_size: int,
+    url_name: str,
+    client: Client,
+    prepare: Callable[[list[Any]], None] | None = None,
+) -> HttpResponse:
+    paginator = KeysetPaginator(queryset, ordering, page_size)
+    try:
+        page = paginator.page(request.GET.get("cursor") or None)
+    except InvalidCursor as exc:
+        raise Http404(_("Неверная страница.")) from exc
+    if prepare is not None:
+        prepare(page.object_list)
+    next_url = ""
+    if page.has_next():
+        next_url = f"{reverse(url_name, kwargs={'pk': client.pk})}?{urlencode({'cursor': page.next_token})}"
+    context = {
+        "client": client,
+        "page_obj": page,
+        "items": page.object_list,
+        "next_url": next_url,
+        "is_first_page": not request.GET.get("cursor"),
+        "csrf_token": get_token(request),
+    }
+    # Rendered without the request so the page-chrome context processors
+    # (navigation counters, onboarding badges) do not run for every fragment.
+    return apply_no_store(HttpResponse(render_to_string(template_name, context)))
+
+
+@staff_required_view
+def client_activity_fragment(request: HttpRequest, pk: int) -> HttpResponseBase:
+    client = _client_for_fragment(request, pk)
+    return _render_fragment(
+        request,
+        "clients/partials/client_activity_fragment.html",
+        queryset=ClientActivity.objects.filter(client=client).select_related("actor"),
+        ordering=("-created_at",),
+        page_size=ACTIVITY_PAGE_SIZE,
+        url_name="clients:client_activity_fragment",
+        client=client,
+    )
+
+
+@staff_required_view
+def client_emails_fragment(request: HttpRequest, pk: int) -> HttpResponseBase:
+    # Bodies and recipients are encrypted at rest; only the rows of the
+    # requested page are fetched and decrypted.
+    client = _client_for_fragment(request, pk)
+    return _render_fragment(
+        request,
+        "clients/partials/client_emails_fragment.html",
+        queryset=EmailLog.objects.filter(client=client),
+        ordering=("-sent_at",),
+        page_size=EMAIL_PAGE_SIZE,
+        url_name="clients:client_emails_fragment",
+        client=client,
+    )
+
+
+@staff_required_view
+def client_tasks_fragment(request: HttpRequest, pk: int) -> HttpResponseBase:
+    client = _client_for_fragment(request, pk)
+    return _render_fragment(
+        request,
+        "clients/partials/client_tasks_fragment.html",
+        queryset=StaffTask.objects.filter(
+            client=client,
+            status__in=["open", "in_progress"],
+            case__archived_at__isnull=True,
+        ).select_related("assignee"),
+        ordering=("due_date", "-created_at"),
+        page_size=TASK_PAGE_SIZE,
+        url_name="clients:client_tasks_fragment",
+        client=client,
+    )
+
+
+@role_or_feature_required_view("can_export_clients", *EXPORT_MUTATION_ROLES)
+def client_versions_fragment(request: HttpRequest, pk: int) -> HttpResponseBase:
+    client = _client_for_fragment(request, pk)
+
+    def share_client(versions: list[DocumentVersion]) -> None:
+        # display_name caches the requirement map on the client instance;
+        # sharing one instance resolves every label with a single query.
+        for version in versions:
+            version.document.client = client
+
+    return _render_fragment(
+        request,
+        "clients/partials/client_versions_fragment.html",
+        queryset=DocumentVersion.objects.filter(
+            document__client=client,
+            document__archived_at__isnull=True,
+        ).select_related("document", "uploaded_by"),
+        ordering=("-created_at",),
+        page_size=VERSION_PAGE_SIZE,
+        url_name="clients:client_versions_fragment",
+        client=client,
+        prepare=share_client,
+    )
@@ -6,17 +6,29 @@ import logging
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from django.http import HttpRequest, HttpResponse
+from django.core.files.storage import default_storage
+from django.http import Http404, HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext as _
 from django.views.generic import DetailView
 
-from clients.models import Client, Document, DocumentVersion
+from clients.models import Client, ClientExportJob, Company, Document, DocumentVersion
 from clients.security.encrypted import safe_encrypted_attr
-from clients.services.access import accessible_clients_queryset, accessible_documents_queryset
+from clients.services.access import (
+    accessible_clients_queryset,
+    accessible_documents_queryset,
+    accessible_export_jobs_queryset,
+)
 from clients.services.export import ExportSizeLimitExceeded, generate_client_zip
-from clients.services.responses import apply_no_store
+from clients.services.export_jobs import (
+    build_export_download_token,
+    enqueue_client_export_job,
+    export_job_status_payload,
+    resolve_export_download_token,
+)
+from clients.services.responses import ResponseHelper, apply_no_store, json_no_store
 from clients.services.roles import EXPORT_MUTATION_ROLES
 from clients.use_cases.exports import (
     record_client_export,
@@ -30,6 +42,8 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+EXPORT_JOB_LIST_LIMIT = 50
+
 
 class ClientExportPDFView(RoleOrFeatureRequiredMixin, DetailView):
     allowed_roles = list(EXPORT_MUTATION_ROLES)
@@ -109,6 +123,114 @@ def client_export_zip(request: HttpRequest, pk: int) -> HttpResponse:
     return apply_no_store(response)
 
 
+def _export_job_queued_response(request: HttpRequest, job: ClientExportJob) -> HttpResponse:
+    from django.contrib import messages as django_messages
+
+    status_url = reverse("clients:export_job_status_api", kwargs={"job_id": job.pk})
+    helper = ResponseHelper(request)
+    if helper.expects_json:
+        return helper.success(_("Экспорт поставлен в очередь."), job_id=job.pk, status_url=status_url)
+    django_messages.success(
+        request,
+        _("Экспорт поставлен в очередь (задача #%(job)s). Ссылка на архив появится после обработки.")
+        % {"job": job.pk},
+    )
+    return redirect("clients:export_job_list")
+
+
+@role_or_feature_required_view("can_export_clients", *EXPORT_MUTATION_ROLES)
+def client_export_zip_queue(request: HttpRequest, pk: int) -> HttpResponse:
+    """Queue a background ZIP export for one client (no request-time archive build)."""
+
+    if request.method != "POST":
+        return HttpResponse(status=405)
+    client = get_object_or_404(accessible_clients_queryset(request.user, Client.objects.all()), pk=pk)
+    job = enqueue_client_export_job(clients=[client], actor=request.user, scope=ClientExportJob.SCOPE_CLIENT)
+    return _export_job_queued_response(request, job)
+
+
+@role_or_feature_required_view("can_export_clients", *EXPORT_MUTATION_ROLES)
+def client_export_bulk_queue(request: HttpRequest) -> HttpResponse:
+    """Queue one archive covering a company's clients or an explicit selection."""
+
+    from django.contrib import messages as django_messages
+
+    if request.method != "POST":
+        return HttpResponse(status=405)
+
+    clients_qs = accessible_clients_queryset(request.user, Client.objects.all())
+    company = None
+    company_id = (request.POST.get("company") or "").strip()
+    if company_id.isdigit():
+        company = get_object_or_404(Company, pk=int(company_id))
+        clients = list(clients_qs.filter(company=company).only("pk"))
+        scope = ClientExportJob.SCOPE_COMPANY
+    else:
+        client_ids = [int(value) for value in request.POST.getlist("client_ids") if str(value).isdigit()]
+        clients = list(clients_qs.filter(pk__in=client_ids).only("pk"))
+        scope = ClientExportJob.SCOPE_SELECTION
+
+    try:
+        job = enqueue_client_export_job(clients=clients, actor=request.user, scope=scope, company=company)
+    except ValueError as exc:
+        helper = ResponseHelper(request)
+        if helper.expects_json:
+            return helper.error(str(exc))
+        django_messages.error(request, _("Экспорт невозможен: %(error)s") % {"error": exc})
+        return redirect("clients:client_list")
+    return _export_job_queued_response(request, job)
+
+
+@role_or_feature_required_view("can_export_clients", *EXPORT_MUTATION_ROLES)
+def export_job_list(request: HttpRequest) -> HttpResponse:
+    """Recent export jobs with their progress; unfinished rows poll the status API."""
+
+    jobs = list(accessible_export_jobs_queryset(request.user).order_by("-created_at")[:EXPORT_JOB_LIST_LIMIT])
+    for job in jobs:
+        job.download_url = (  # type: ignore[attr-defined]
+            reverse("clients:export_job_download", kwargs={"token": build_export_download_token(job)})
+            if job.is_downloadable
+            else None
+        )
+    response = render(
+        request,
+        "clients/export_jobs.html",
+        {
+            "jobs": jobs,
+            "active_statuses": [ClientExportJob.STATUS_PENDING, ClientExportJob.STATUS_PROCESSING],
+        },
+    )
+    return apply_no_store(response)
+
+
+@role_or_feature_required_view("can_export_clients", *EXPORT_MUTATION_ROLES)
+def export_job_status_api(request: HttpRequest, job_id: int) -> HttpResponse:
+    job = get_object_or_404(accessible_export_jobs_queryset(request.user), pk=job_id)
+    download_url = None
+    if job.is_downloadable:
+        download_url = reverse("clients:export_job_download", kwargs={"token": build_export_download_token(job)})
+    return json_no_store(export_job_status_payload(job, download_url=download_url))
+
+
+@role_or_feature_required_view("can_export_clients", *EXPORT_MUTATION_ROLES)
+def export_job_download(request: HttpRequest, token: str) -> HttpResponseBase:
+    """Serve a finished archive through its signed, expiring link."""
+
+    job = resolve_export_download_token(token)
+    if job is None or not accessible_export_jobs_queryset(request.user).filter(pk=job.pk).exists():
+        raise Http404("Export not found")
+    try:
+        archive = default_storage.open(job.archive_name, "rb")
+    except FileNotFoundError as exc:
+        raise Http404("Export not found") from exc
+    return build_protected_file_response(
+        archive,
+        filename=f"client-export-{job.pk}.zip",
+        as_attachment=True,
+        content_type="application/zip",
+    )
+
+
 @role_or_feature_required_view("can_export_clients", *EXPORT_MUTATION_ROLES)
 def document_versions_view(request: HttpRequest, doc_id: int) -> HttpResponse:
     """List all versions of a specific document."""
@@ -8,10 +8,10 @@ from django.views.generic import ListView
 from clients.forms import EmailLogFilterForm, StaffActivityFilterForm
 from clients.models.activity import ClientActivity
 from clients.models.email import EmailLog
-from clients.views.base import RoleRequiredMixin
+from clients.views.base import KeysetPaginationMixin, RoleRequiredMixin
 
 
-class BaseLogView(RoleRequiredMixin, ListView):
+class BaseLogView(KeysetPaginationMixin, RoleRequiredMixin, ListView):
     paginate_by = 50
     allowed_roles = ["Admin", "Manager"]
 
@@ -20,6 +20,7 @@ class EmailLogsView(BaseLogView):
     model = EmailLog
     template_name = "clients/logs/email_logs.html"
     context_object_name = "logs"
+    keyset_ordering = ("-sent_at",)
 
     def get_queryset(self) -> Any:
         qs = super().get_queryset().select_related("client", "sent_by")
@@ -65,6 +66,7 @@ class StaffActivityLogsView(BaseLogView):
     model = ClientActivity
     template_name = "clients/logs/staff_activity_logs.html"
     context_object_name = "activities"
+    keyset_ordering = ("-created_at",)
 
     def get_queryset(self) -> Any:
         qs = super().get_queryset().select_related("actor", "client", "document", "payment")
@@ -1,5 +1,5 @@
 import logging
-from typing import cast
+from typing import Any, cast
 
 from django.contrib import messages
 from django.db import IntegrityError, transaction
@@ -10,6 +10,7 @@ from django.http import (
     HttpResponseForbidden,
     HttpResponseNotAllowed,
     JsonResponse,
+    QueryDict,
 )
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
@@ -427,7 +428,149 @@ def onboarding_personal_data(request: HttpRequest, token: str) -> HttpResponse:
     return redirect("clients:onboarding_passport", token=token)
 
 
+# Autosave fields grouped by the encrypted MOS column that stores them. The
+# wizard posts only the fields changed since its last save, so an autosave
+# decrypts, re-encrypts and writes just the columns its fields belong to.
+_AUTOSAVE_SECTION_FIELDS: dict[str, frozenset[str]] = {
+    "personal_data": frozenset(
+        {
+            "first_name",
+            "last_name",
+            "phone",
+            "email",
+            "birth_date",
+            "citizenship",
+            "gender",
+            "maiden_name",
+            "previous_surnames",
+            "previous_first_names",
+            "birth_place",
+            "birth_country",
+            "origin_country",
+            "father_name",
+            "mother_name",
+            "mother_maiden_name",
+            "height",
+            "eye_color",
+            "education",
+            "marital_status",
+            "profession",
+            "special_marks",
+            "employer_email",
+            "employer_name",
+            "employer_nip",
+            "university_email",
+        }
+    ),
+    "passport_data": frozenset({"document_number", "expiry_date", "issue_date", "issuing_authority"}),
+    "address_data": frozenset(
+        {
+            "street",
+            "city",
+            "postal_code",
+            "home_country",
+            "home_city",
+            "home_street",
+            "voivodeship",
+            "powiat",
+            "gmina",
+            "house_number",
+            "apartment_number",
+            "meldunek",
+        }
+    ),
+    "stay_data": frozenset(
+        {
+            "is_in_poland",
+            "last_entry_date",
+            "stay_basis",
+            "was_in_poland_before",
+            "has_insurance",
+            "has_stable_income",
+        }
+    ),
+    "legal_declarations": frozenset({"criminal_record", "tax_arrears"}),
+    "previous_stays": frozenset({"previous_stays"}),
+    "travel_history": frozenset({"travel_history"}),
+}
+_AUTOSAVE_LIST_SECTIONS = frozenset({"previous_stays", "travel_history"})
+_MOS_ENCRYPTED_FIELDS = (
+    "personal_data",
+    "passport_data",
+    "address_data",
+    "stay_data",
+    "previous_stays",
+    "travel_history",
+    "insurance_data",
+    "financial_data",
+    "legal_declarations",
+    "new_residence_card_case_number",
+)
+# Personal fields mirrored onto the Client row when non-empty.
+_AUTOSAVE_CLIENT_FIELDS = ("first_name", "last_name", "phone", "email")
+# Stripped personal fields; the extra-data step stores values as typed.
+_AUTOSAVE_STRIPPED_PERSONAL_FIELDS = frozenset(
+    {
+        "first_name",
+        "last_name",
+        "phone",
+        "email",
+        "birth_date",
+        "citizenship",
+        "gender",
+        "maiden_name",
+        "previous_surnames",
+        "previous_first_names",
+        "birth_place",
+        "birth_country",
+        "origin_country",
+        "employer_email",
+        "employer_name",
+        "employer_nip",
+        "university_email",
+    }
+)
+_AUTOSAVE_YES_NO_FIELDS = frozenset(
+    {
+        "meldunek",
+        "is_in_poland",
+        "was_in_poland_before",
+        "has_insurance",
+        "has_stable_income",
+        "criminal_record",
+        "tax_arrears",
+    }
+)
+_MOS_STATUSES_PAST_CLIENT_FILLING = frozenset(
+    {
+        "client_completed",
+        "staff_review",
+        "approved_by_staff",
+        "mos_package_ready",
+        "submitted_in_mos",
+        "fingerprints",
+        "waiting_decision",
+        "decision_received",
+        "closed",
+    }
+)
+
+
+def _autosave_value(post: QueryDict, field: str, section: str) -> Any:
+    if field in _AUTOSAVE_YES_NO_FIELDS:
+        return post.get(field) == "yes"
+    value = post.get(field, "")
+    if section == "passport_data" or field in _AUTOSAVE_STRIPPED_PERSONAL_FIELDS:
+        return value.strip()
+    return value
+
+
 def onboarding_auto_save(request: HttpRequest, token: str) -> HttpResponse:
+    """Apply a batch of changed wizard fields to the client's MOS draft.
+
+    Fields absent from the POST are left alone, and only the encrypted
+    columns holding the posted fields are decrypted and written back.
+    """
     if request.method != "POST":
         return JsonResponse({"status": "error", "message": _("Method not allowed")}, status=405)
 
@@ -443,260 +586,81 @@ def onboarding_auto_save(request: HttpRequest, token: str) -> HttpResponse:
 
     client = session.client
     case = _session_case(session)
-    mos_data = MOSApplicationData.objects.filter(client=client, case=case).first()
-    if mos_data is None:
-        mos_data = MOSApplicationData(client=client, case=case)
+    posted = request.POST
+    touched = [section for section, fields in _AUTOSAVE_SECTION_FIELDS.items() if not fields.isdisjoint(posted)]
+    mos_data = (
+        MOSApplicationData.objects.filter(client=client, case=case)
+        .defer(*(field for field in _MOS_ENCRYPTED_FIELDS if field not in touched))
+        .first()
+    )
     if not _mos_data_is_editable(mos_data):
         return JsonResponse({"status": "locked", "message": _("This onboarding form is locked.")}, status=423)
 
     selected_purpose: str | None = None
-    if "mos_purpose" in request.POST:
+    if "mos_purpose" in posted:
         try:
-            selected_purpose = normalize_onboarding_purpose(request.POST.get("mos_purpose"))
+            selected_purpose = normalize_onboarding_purpose(posted.get("mos_purpose"))
         except ValueError:
             return JsonResponse({"status": "error", "message": _("Invalid application purpose")}, status=400)
 
-    # Complete the encrypted preflight before saving digital access, Client, or
-    # MOS fields. Otherwise a bad key could leave an autosave half-applied.
-    try:
-        personal_data = require_encrypted_json_dict(mos_data, "personal_data")
-        passport_data = require_encrypted_json_dict(mos_data, "passport_data")
-        address_data = require_encrypted_json_dict(mos_data, "address_data")
-        stay_data = require_encrypted_json_dict(mos_data, "stay_data")
-        require_encrypted_json_dict(mos_data, "insurance_data")
-        require_encrypted_json_dict(mos_data, "financial_data")
-        declarations = require_encrypted_json_dict(mos_data, "legal_declarations")
-        require_encrypted_json_list(mos_data, "previous_stays")
-        require_encrypted_json_list(mos_data, "travel_history")
-    except EncryptedJSONUnavailableError:
-        return _encrypted_json_unavailable_json_response()
-
-    if mos_data.pk is None:
-        # Validation and the first encrypted preflight are complete. Use the
-        # canonical get_or_create now so overlapping first autosaves converge
-        # on one case-scoped row instead of racing two plain INSERTs.
+    if mos_data is None:
+        # Use the canonical get_or_create so overlapping first autosaves
+        # converge on one case-scoped row instead of racing two plain INSERTs.
         mos_data, _created_mos = _ensure_mos(client, case)
         if not _mos_data_is_editable(mos_data):
             return JsonResponse(
                 {"status": "locked", "message": _("This onboarding form is locked.")},
                 status=423,
             )
-        try:
-            personal_data = require_encrypted_json_dict(mos_data, "personal_data")
-            passport_data = require_encrypted_json_dict(mos_data, "passport_data")
-            address_data = require_encrypted_json_dict(mos_data, "address_data")
-            stay_data = require_encrypted_json_dict(mos_data, "stay_data")
-            require_encrypted_json_dict(mos_data, "insurance_data")
-            require_encrypted_json_dict(mos_data, "financial_data")
-            declarations = require_encrypted_json_dict(mos_data, "legal_declarations")
-            require_encrypted_json_list(mos_data, "previous_stays")
-            require_encrypted_json_list(mos_data, "travel_history")
-        except EncryptedJSONUnavailableError:
-            return _encrypted_json_unavailable_json_response()
+
+    # Complete the encrypted preflight before saving digital access, Client, or
+    # MOS fields. Otherwise a bad key could leave an autosave half-applied.
+    sections: dict[str, Any] = {}
+    try:
+        for section in touched:
+            if section in _AUTOSAVE_LIST_SECTIONS:
+                sections[section] = require_encrypted_json_list(mos_data, section)
+            else:
+                sections[section] = require_encrypted_json_dict(mos_data, section)
+    except EncryptedJSONUnavailableError:
+        return _encrypted_json_unavailable_json_response()
 
     # Collect digital-access changes without constructing an unsaved one-to-one
     # row. update_or_create below handles a concurrent first autosave safely.
-    digital_access_updates: dict[str, bool] = {}
-    if "has_pesel" in request.POST:
-        digital_access_updates["has_pesel"] = request.POST.get("has_pesel") == "yes"
-    if "has_trusted_profile" in request.POST:
-        digital_access_updates["has_trusted_profile"] = request.POST.get("has_trusted_profile") == "yes"
-    if "has_mos_account" in request.POST:
-        digital_access_updates["has_mos_account"] = request.POST.get("has_mos_account") == "yes"
-
-    # Process passport/personal fields (Step 1)
-    personal_dirty = False
-    passport_dirty = False
-    client_dirty = False
-
-    if "first_name" in request.POST:
-        val = request.POST.get("first_name", "").strip()
-        personal_data["first_name"] = val
-        personal_dirty = True
-        if val and client.first_name != val:
-            client.first_name = val
-            client_dirty = True
-
-    if "last_name" in request.POST:
-        val = request.POST.get("last_name", "").strip()
-        personal_data["last_name"] = val
-        personal_dirty = True
-        if val and client.last_name != val:
-            client.last_name = val
-            client_dirty = True
-
-    if "phone" in request.POST:
-        val = request.POST.get("phone", "").strip()
-        personal_data["phone"] = val
-        personal_dirty = True
-        if val and client.phone != val:
-            client.phone = val
-            client_dirty = True
+    digital_access_updates = {
+        field: posted.get(field) == "yes"
+        for field in ("has_pesel", "has_trusted_profile", "has_mos_account")
+        if field in posted
+    }
+
+    for section in touched:
+        if section in _AUTOSAVE_LIST_SECTIONS:
+            value = posted.get(section, "")
+            sections[section] = [value.strip() if section == "previous_stays" else value]
+        else:
+            for field in _AUTOSAVE_SECTION_FIELDS[section].intersection(posted):
+                sections[section][field] = _autosave_value(posted, field, section)
+        setattr(mos_data, section, sections[section])
 
-    if "email" in request.POST:
-        val = request.POST.get("email", "").strip()
-        personal_data["email"] = val
-        personal_dirty = True
-        if val and client.email != val:
-            client.email = val
+    client_dirty = False
+    for field in _AUTOSAVE_CLIENT_FIELDS:
+        value = posted.get(field, "").strip()
+        if field in posted and value and getattr(client, field) != value:
+            setattr(client, field, value)
             client_dirty = True
 
-    if "birth_date" in request.POST:
-        val = request.POST.get("birth_date", "").strip()
-        personal_data["birth_date"] = val
-        personal_dirty = True
-
-    if "citizenship" in request.POST:
-        val = request.POST.get("citizenship", "").strip()
-        personal_data["citizenship"] = val
-        personal_dirty = True
-
-    if "document_number" in request.POST:
-        val = request.POST.get("document_number", "").strip()
-        passport_data["document_number"] = val
-        passport_dirty = True
-
-    if "expiry_date" in request.POST:
-        val = request.POST.get("expiry_date", "").strip()
-        passport_data["expiry_date"] = val
-        passport_dirty = True
-
-    for field in [
-        "gender",
-        "maiden_name",
-        "previous_surnames",
-        "previous_first_names",
-        "birth_place",
-        "birth_country",
-        "origin_country",
-    ]:
-        if field in request.POST:
-            personal_data[field] = request.POST.get(field, "").strip()
-            personal_dirty = True
-
-    for field in ["issue_date", "issuing_authority"]:
-        if field in request.POST:
-            passport_data[field] = request.POST.get(field, "").strip()
-            passport_dirty = True
-
-    # Process personal_extra fields (Step 2 of extra data)
-    for field in [
-        "father_name",
-        "mother_name",
-        "mother_maiden_name",
-        "height",
-        "eye_color",
-        "education",
-        "marital_status",
-        "profession",
-        "special_marks",
-    ]:
-        if field in request.POST:
-            personal_data[field] = request.POST.get(field, "")
-            personal_dirty = True
-
-    if personal_dirty:
-        mos_data.personal_data = personal_data
-    if passport_dirty:
-        mos_data.passport_data = passport_data
-
-    # Process address fields
-    address_dirty = False
-    for field in [
-        "street",
-        "city",
-        "postal_code",
-        "home_country",
-        "home_city",
-        "home_street",
-        "voivodeship",
-        "powiat",
-        "gmina",
-        "house_number",
-        "apartment_number",
-    ]:
-        if field in request.POST:
-            address_data[field] = request.POST.get(field, "")
-            address_dirty = True
-    if "meldunek" in request.POST:
-        address_data["meldunek"] = request.POST.get("meldunek") == "yes"
-        address_dirty = True
-    if address_dirty:
-        mos_data.address_data = address_data
-
-    # Process travel fields
+    mos_fields = [*touched, "status", "updated_at"]
     purpose_updated = False
-    if selected_purpose is not None:
-        if mos_data.mos_purpose != selected_purpose:
-            mos_data.mos_purpose = selected_purpose
-            purpose_updated = True
-    if "legal_stay_until" in request.POST:
-        val = request.POST.get("legal_stay_until", "").strip()
-        if val:
-            mos_data.legal_stay_until = val
-
-    stay_dirty = False
-    if "is_in_poland" in request.POST:
-        stay_data["is_in_poland"] = request.POST.get("is_in_poland") == "yes"
-        stay_dirty = True
-    if "last_entry_date" in request.POST:
-        stay_data["last_entry_date"] = request.POST.get("last_entry_date", "")
-        stay_dirty = True
-    if "stay_basis" in request.POST:
-        stay_data["stay_basis"] = request.POST.get("stay_basis", "")
-        stay_dirty = True
-    if "was_in_poland_before" in request.POST:
-        stay_data["was_in_poland_before"] = request.POST.get("was_in_poland_before") == "yes"
-        stay_dirty = True
-    if "has_insurance" in request.POST:
-        stay_data["has_insurance"] = request.POST.get("has_insurance") == "yes"
-        stay_dirty = True
-    if "has_stable_income" in request.POST:
-        stay_data["has_stable_income"] = request.POST.get("has_stable_income") == "yes"
-        stay_dirty = True
-
-    if stay_dirty:
-        mos_data.stay_data = stay_data
-
-    if "employer_email" in request.POST:
-        personal_data["employer_email"] = request.POST.get("employer_email", "").strip()
-        mos_data.personal_data = personal_data
-    if "employer_name" in request.POST or "employer_nip" in request.POST:
-        personal_data["employer_name"] = request.POST.get("employer_name", "").strip()
-        personal_data["employer_nip"] = request.POST.get("employer_nip", "").strip()
-        mos_data.personal_data = personal_data
-    if "university_email" in request.POST:
-        personal_data["university_email"] = request.POST.get("university_email", "").strip()
-        mos_data.personal_data = personal_data
-    if "previous_stays" in request.POST:
-        mos_data.previous_stays = [request.POST.get("previous_stays", "").strip()]
-
-    if "travel_history" in request.POST:
-        mos_data.travel_history = [request.POST.get("travel_history", "")]
-
-    # Process declarations fields
-    declarations_dirty = False
-    if "criminal_record" in request.POST:
-        declarations["criminal_record"] = request.POST.get("criminal_record") == "yes"
-        declarations_dirty = True
-    if "tax_arrears" in request.POST:
-        declarations["tax_arrears"] = request.POST.get("tax_arrears") == "yes"
-        declarations_dirty = True
-    if declarations_dirty:
-        mos_data.legal_declarations = declarations
-
-    # Set status to client_filling if not already filled or completed
-    if mos_data.status not in [
-        "client_completed",
-        "staff_review",
-        "approved_by_staff",
-        "mos_package_ready",
-        "submitted_in_mos",
-        "fingerprints",
-        "waiting_decision",
-        "decision_received",
-        "closed",
-    ]:
+    if selected_purpose is not None and mos_data.mos_purpose != selected_purpose:
+        mos_data.mos_purpose = selected_purpose
+        mos_fields.append("mos_purpose")
+        purpose_updated = True
+    legal_stay_until = posted.get("legal_stay_until", "").strip()
+    if legal_stay_until:
+        mos_data.legal_stay_until = legal_stay_until
+        mos_fields.append("legal_stay_until")
+
+    if mos_data.status not in _MOS_STATUSES_PAST_CLIENT_FILLING:
         mos_data.status = "client_filling"
 
     with transaction.atomic():
@@ -705,7 +669,7 @@ def onboarding_auto_save(request: HttpRequest, token: str) -> HttpResponse:
                 client=client,
                 defaults=digital_access_updates,
             )
-        mos_data.save()
+        mos_data.save(update_fields=mos_fields)
         if client_dirty:
             client.save()
 
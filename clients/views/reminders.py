@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterable
 from datetime import timedelta
 from typing import TYPE_CHECKING, Any
 
 from django.contrib import messages
 from django.core.management import call_command
-from django.db.models import Count, Prefetch
+from django.db.models import Max
 from django.http import HttpRequest
 from django.shortcuts import get_object_or_404, redirect
 from django.utils import timezone
@@ -17,8 +18,10 @@ from django.utils.translation import gettext_lazy as _lazy
 from django.views.generic import ListView
 
 from clients.constants import ACTIVE_WORKFLOW_STAGES
-from clients.models import Client, ClientDocumentRequirement, Document, Reminder
+from clients.models import CaseChecklistSummary, Client, Document, Reminder
 from clients.services.access import accessible_clients_queryset, accessible_reminders_queryset
+from clients.services.checklist_summary import missing_item_names
+from clients.services.client_names import client_display_name
 from clients.services.notifications import send_expiring_documents_email
 from clients.services.roles import REPORT_MUTATION_ROLES
 from clients.use_cases.reminders import (
@@ -27,7 +30,7 @@ from clients.use_cases.reminders import (
     send_document_reminder_for_client,
     send_document_reminder_for_reminder,
 )
-from clients.views.base import StaffRequiredMixin, role_required_view
+from clients.views.base import KeysetPaginationMixin, StaffRequiredMixin, role_required_view
 
 if TYPE_CHECKING:
     from django.http.response import HttpResponseBase
@@ -70,6 +73,14 @@ class ReminderListView(StaffRequiredMixin, ListView):
 
         return queryset
 
+    def _client_filter_label(self) -> str:
+        client_id = getattr(self, "client_filter_id", None)
+        if client_id is None:
+            return ""
+        if not accessible_clients_queryset(self.request.user, Client.objects.filter(pk=client_id)).exists():
+            return ""
+        return client_display_name(client_id)
+
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
         reminders = context["reminders"]
@@ -83,10 +94,10 @@ class ReminderListView(StaffRequiredMixin, ListView):
         context.update(
             {
                 "title": self.title,
-                "all_clients": accessible_clients_queryset(
-                    self.request.user,
-                    Client.objects.filter(user__is_staff=False).order_by("created_at"),  # names encrypted
-                ),
+                # The client filter is an autocomplete; only the selected
+                # client's name is rendered (decrypting every client's name
+                # for a dropdown cost two Fernet tokens per client per load).
+                "client_filter_label": self._client_filter_label(),
                 # Plain dict with every key the template reads: a QueryDict
                 # lookup for an absent parameter is an invalid template
                 # variable, not an empty string.
@@ -126,7 +137,8 @@ class DocumentReminderListView(ReminderListView):
     def _missing_document_clients_queryset(self) -> Any:
         # Active = the client has at least one active (non-finished) case (§4).
         queryset = Client.objects.filter(
-            cases__workflow_stage__in=ACTIVE_WORKFLOW_STAGES
+            cases__workflow_stage__in=ACTIVE_WORKFLOW_STAGES,
+            cases__checklist_summary__missing_count__gt=0,
         ).distinct().order_by(
             "last_name",
             "first_name",
@@ -135,49 +147,37 @@ class DocumentReminderListView(ReminderListView):
         client_filter_id = getattr(self, "client_filter_id", None)
         if client_filter_id:
             queryset = queryset.filter(pk=client_filter_id)
-        return queryset.prefetch_related(
-            Prefetch(
-                "documents",
-                queryset=Document.objects.annotate(preloaded_version_count=Count("versions")).order_by("-uploaded_at"),
-            ),
-            Prefetch(
-                "custom_document_requirements",
-                queryset=ClientDocumentRequirement.objects.filter(is_active=True).order_by("due_date", "created_at"),
-            ),
-            "wniosek_submissions__confirmed_by",
-            "wniosek_submissions__attachments",
-        )
+        return queryset
 
     @staticmethod
-    def _missing_documents_for_client(client: Client, requirements_cache: dict[str, Any]) -> list[dict[str, Any]]:
-        checklist = client.get_document_checklist(requirements_cache=requirements_cache) or []
-        return [
-            {
-                "name": item.get("name"),
-                "expiry_date": getattr((item.get("documents") or [None])[0], "expiry_date", None),
-            }
-            for item in checklist
-            if not item.get("is_complete")
-        ]
+    def _missing_documents_by_client(client_ids: Iterable[int]) -> dict[int, list[dict[str, Any]]]:
+        # Reads the persisted checklist summaries of the clients' active cases
+        # instead of building every client's checklist on each page load.
+        summaries = CaseChecklistSummary.objects.filter(
+            client_id__in=list(client_ids),
+            missing_count__gt=0,
+            case__workflow_stage__in=ACTIVE_WORKFLOW_STAGES,
+        ).order_by("client_id", "case_id")
+        labels_cache: dict[str, dict[str, str]] = {}
+        missing: dict[int, dict[tuple[str, str], dict[str, Any]]] = defaultdict(dict)
+        for summary in summaries:
+            names = missing_item_names(summary, labels_cache=labels_cache)
+            for code, name in zip(summary.missing_codes, names, strict=True):
+                missing[summary.client_id].setdefault((code, name), {"name": name, "expiry_date": None})
+        codes = {code for items in missing.values() for code, _name in items}
+        latest_expiry = (
+            Document.objects.filter(client_id__in=list(missing), document_type__in=codes, expiry_date__isnull=False)
+            .values("client_id", "document_type")
+            .annotate(latest=Max("expiry_date"))
+        )
+        for row in latest_expiry:
+            for (code, _name), item in missing[row["client_id"]].items():
+                if code == row["document_type"]:
+                    item["expiry_date"] = row["latest"]
+        return {client_id: list(items.values()) for client_id, items in missing.items()}
 
     def get_queryset(self) -> Any:
-        return (
-            super()
-            .get_queryset()
-            .select_related("document")
-            .prefetch_related(
-                Prefetch(
-                    "client__documents",
-                    queryset=Document.objects.annotate(preloaded_version_count=Count("versions")).order_by("-uploaded_at"),
-                ),
-                Prefetch(
-                    "client__custom_document_requirements",
-                    queryset=ClientDocumentRequirement.objects.filter(is_active=True).order_by("due_date", "created_at"),
-                ),
-                "client__wniosek_submissions__confirmed_by",
-                "client__wniosek_submissions__attachments",
-            )
-        )
+        return super().get_queryset().select_related("document")
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
@@ -200,16 +200,12 @@ class DocumentReminderListView(ReminderListView):
                 else:
                     group["ok_count"] += 1
 
-        requirements_cache: dict[str, Any] = {}
-        for group in grouped.values():
-            group["missing_documents"] = self._missing_documents_for_client(group["client"], requirements_cache)
-
         if missing_only:
             for client in self._missing_document_clients_queryset():
-                group = grouped.setdefault(client.id, self._empty_group(client))
-                if group["missing_documents"]:
-                    continue
-                group["missing_documents"] = self._missing_documents_for_client(client, requirements_cache)
+                grouped.setdefault(client.id, self._empty_group(client))
+        missing_by_client = self._missing_documents_by_client(grouped)
+        for client_id, group in grouped.items():
+            group["missing_documents"] = missing_by_client.get(client_id, [])
 
         for group in grouped.values():
             if group["expired_count"]:
@@ -241,7 +237,7 @@ class DocumentReminderListView(ReminderListView):
         return context
 
 
-class PaymentReminderListView(ReminderListView):
+class PaymentReminderListView(KeysetPaginationMixin, ReminderListView):
     reminder_type = "payment"
     template_name = "clients/payment_reminder_list.html"
     title = _lazy("Напоминания по оплатам")
@@ -249,6 +245,7 @@ class PaymentReminderListView(ReminderListView):
     # large active caseload previously loaded every reminder into a single
     # page. Paginate to bound the query volume and page weight.
     paginate_by = 50
+    keyset_ordering = ("due_date",)
 
     def get_queryset(self) -> Any:
         # display_title / display_notes for a payment reminder read the related
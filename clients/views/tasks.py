@@ -15,19 +15,26 @@ from clients.models import Client, StaffTask
 from clients.services.access import accessible_clients_queryset, accessible_tasks_queryset
 from clients.services.roles import TASK_MUTATION_ROLES
 from clients.use_cases.tasks import complete_task_for_client, create_task_for_client
-from clients.views.base import RoleOrFeatureRequiredMixin, role_or_feature_required_view, safe_redirect_target
+from clients.views.base import (
+    KeysetPaginationMixin,
+    RoleOrFeatureRequiredMixin,
+    role_or_feature_required_view,
+    safe_redirect_target,
+)
 
 if TYPE_CHECKING:
     from django.http.response import HttpResponseBase
 
 
-class TaskListView(RoleOrFeatureRequiredMixin, ListView):
+class TaskListView(KeysetPaginationMixin, RoleOrFeatureRequiredMixin, ListView):
     model = StaffTask
     allowed_roles = list(TASK_MUTATION_ROLES)
     required_permission_name = "can_manage_staff_tasks"
     template_name = "clients/tasks_list.html"
     context_object_name = "tasks"
     paginate_by = 50
+    # Tasks without a due date sort after dated ones.
+    keyset_ordering = ("due_date", "-created_at")
 
     def get_queryset(self) -> Any:
         queryset = (
@@ -0,0 +1,233 @@
+"""At-rest compression codecs for database media blobs.
+
+Blobs are compressed once, when first stored, with the codec named by
+``DATABASE_MEDIA_COMPRESSION`` ("zlib", "zstd" or "none"). zstd needs the
+optional ``zstandard`` package and falls back to zlib without it. Content that
+is already compressed (JPEG/PNG/WEBP/GIF/ZIP-based office files, ...) is
+stored as-is, and anything else keeps its compressed form only when it saves
+at least ``DATABASE_MEDIA_COMPRESSION_MIN_SAVING`` of the bytes — scanner PDFs
+with embedded JPEGs usually do not, text-layer PDFs and plain text do.
+
+Reads decode incrementally through ``DecodingReader`` so streaming a large
+blob never holds the whole decompressed file next to the stored bytes.
+"""
+from __future__ import annotations
+
+import io
+import logging
+import zlib
+from functools import lru_cache
+from typing import Any
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CODEC_NONE = ""
+CODEC_ZLIB = "zlib"
+CODEC_ZSTD = "zstd"
+KNOWN_CODECS = (CODEC_NONE, CODEC_ZLIB, CODEC_ZSTD)
+
+MIN_COMPRESSIBLE_SIZE = 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 10
+
+ALREADY_COMPRESSED_SIGNATURES = (
+    b"\xff\xd8\xff",  # JPEG
+    b"\x89PNG\r\n\x1a\n",
+    b"GIF87a",
+    b"GIF89a",
+    b"PK\x03\x04",  # ZIP, DOCX/XLSX/ODT
+    b"\x1f\x8b",  # gzip
+    b"\x28\xb5\x2f\xfd",  # zstd frame
+    b"7z\xbc\xaf\x27\x1c",
+    b"Rar!\x1a\x07",
+)
+ALREADY_COMPRESSED_CONTENT_TYPES = frozenset(
+    {
+        "image/jpeg",
+        "image/png",
+        "image/webp",
+        "image/gif",
+        "image/heic",
+        "image/heif",
+        "application/zip",
+        "application/gzip",
+        "application/x-7z-compressed",
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    }
+)
+
+
+@lru_cache(maxsize=1)
+def _zstd_module() -> Any | None:
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def configured_codec() -> str:
+    codec = str(getattr(settings, "DATABASE_MEDIA_COMPRESSION", CODEC_ZLIB) or "").strip().lower()
+    if codec in {"", "none", "off"}:
+        return CODEC_NONE
+    if codec == CODEC_ZSTD and _zstd_module() is None:
+        logger.warning("DATABASE_MEDIA_COMPRESSION=zstd but zstandard is not installed; using zlib.")
+        return CODEC_ZLIB
+    if codec not in KNOWN_CODECS:
+        logger.warning("Unknown DATABASE_MEDIA_COMPRESSION codec %r; storing media uncompressed.", codec)
+        return CODEC_NONE
+    return codec
+
+
+def is_already_compressed(data: bytes, content_type: str = "") -> bool:
+    if content_type.split(";", 1)[0].strip().lower() in ALREADY_COMPRESSED_CONTENT_TYPES:
+        return True
+    head = bytes(data[:16])
+    if head.startswith(b"RIFF") and head[8:12] == b"WEBP":
+        return True
+    if head[4:8] == b"ftyp":  # HEIC/HEIF/MP4 containers
+        return True
+    return head.startswith(ALREADY_COMPRESSED_SIGNATURES)
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == CODEC_ZLIB:
+        return zlib.compress(data, ZLIB_LEVEL)
+    if codec == CODEC_ZSTD:
+        zstandard = _zstd_module()
+        if zstandard is None:
+            raise RuntimeError("zstandard is not installed")
+        return bytes(zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data))
+    return data
+
+
+def encode(data: bytes, *, content_type: str = "", codec: str | None = None) -> tuple[bytes, str]:
+    """Return ``(stored_bytes, codec)`` for *data*, compressing only when it pays off."""
+    codec = configured_codec() if codec is None else codec
+    if codec == CODEC_NONE or len(data) < MIN_COMPRESSIBLE_SIZE or is_already_compressed(data, content_type):
+        return data, CODEC_NONE
+    compressed = compress(data, codec)
+    min_saving = float(getattr(settings, "DATABASE_MEDIA_COMPRESSION_MIN_SAVING", 0.1))
+    if len(compressed) > len(data) * (1 - min_saving):
+        return data, CODEC_NONE
+    return compressed, codec
+
+
+class _ZlibDecoder:
+    def __init__(self) -> None:
+        self._decompressor = zlib.decompressobj()
+
+    @property
+    def needs_input(self) -> bool:
+        return not self._decompressor.unconsumed_tail
+
+    def feed(self, chunk: bytes) -> bytes:
+        data = self._decompressor.unconsumed_tail + chunk
+        return self._decompressor.decompress(data, STREAM_CHUNK_SIZE)
+
+    def flush(self) -> bytes:
+        return self._decompressor.flush()
+
+
+class _ZstdDecoder:
+    needs_input = True
+
+    def __init__(self) -> None:
+        zstandard = _zstd_module()
+        if zstandard is None:
+            raise RuntimeError("zstandard is not installed; cannot read zstd-compressed media")
+        self._decompressor = zstandard.ZstdDecompressor().decompressobj()
+
+    def feed(self, chunk: bytes) -> bytes:
+        return bytes(self._decompressor.decompress(chunk))
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class DecodingReader(io.RawIOBase):
+    """Seekable, incrementally decompressing reader over stored blob bytes.
+
+    Seeking backwards restarts decoding from the start; forward seeks decode
+    and discard. Callers mostly read sequentially or ``seek(0)`` and re-read.
+    """
+
+    def __init__(self, stored: bytes, codec: str, size: int) -> None:
+        super().__init__()
+        self._stored = memoryview(stored)
+        self._codec = codec
+        self._size = size
+        self._reset()
+
+    def _reset(self) -> None:
+        self._decoder: _ZlibDecoder | _ZstdDecoder = _ZstdDecoder() if self._codec == CODEC_ZSTD else _ZlibDecoder()
+        self._offset = 0
+        self._pending = bytearray()
+        self._position = 0
+        self._flushed = False
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def _fill(self, wanted: int) -> None:
+        while len(self._pending) < wanted and not self._flushed:
+            if self._decoder.needs_input:
+                chunk = bytes(self._stored[self._offset : self._offset + STREAM_CHUNK_SIZE])
+                self._offset += len(chunk)
+                if not chunk:
+                    self._pending += self._decoder.flush()
+                    self._flushed = True
+                    break
+            else:
+                chunk = b""
+            self._pending += self._decoder.feed(chunk)
+
+    def readinto(self, buffer: Any) -> int:
+        wanted = len(buffer)
+        self._fill(wanted)
+        count = min(wanted, len(self._pending))
+        buffer[:count] = self._pending[:count]
+        del self._pending[:count]
+        self._position += count
+        return count
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._size
+        target = max(0, offset)
+        if target < self._position:
+            self._reset()
+        while self._position < target:
+            skipped = self.read(min(STREAM_CHUNK_SIZE, target - self._position))
+            if not skipped:
+                break
+        return self._position
+
+
+def open_decoded(stored: bytes, codec: str, size: int) -> io.BufferedReader | io.BytesIO:
+    if codec == CODEC_NONE:
+        return io.BytesIO(stored)
+    return io.BufferedReader(DecodingReader(stored, codec, size), buffer_size=STREAM_CHUNK_SIZE)
+
+
+def decode(stored: bytes, codec: str) -> bytes:
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(stored)
+    if codec == CODEC_ZSTD:
+        zstandard = _zstd_module()
+        if zstandard is None:
+            raise RuntimeError("zstandard is not installed; cannot read zstd-compressed media")
+        return bytes(zstandard.ZstdDecompressor().decompressobj().decompress(stored))
+    return bytes(stored)
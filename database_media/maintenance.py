@@ -0,0 +1,86 @@
+"""Garbage collection for content-addressed media blobs.
+
+``DatabaseMediaStorage.delete`` only drops the name row and decrements the
+blob's ``ref_count``; the bytes are removed here, after a grace period, so a
+concurrent upload of the same content can still take a reference.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, ProtectedError, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from database_media.models import DatabaseMediaBlob, DatabaseMediaFile
+
+DEFAULT_GC_GRACE = timedelta(hours=24)
+GC_BATCH_SIZE = 500
+
+
+@dataclass(frozen=True)
+class BlobGarbageReport:
+    repaired_ref_counts: int
+    deleted_blobs: int
+    freed_bytes: int
+
+
+def _reference_counts() -> Coalesce:
+    references = (
+        DatabaseMediaFile.objects.filter(blob=OuterRef("pk"))
+        .order_by()
+        .values("blob")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(references), 0)
+
+
+def reconcile_blob_ref_counts() -> int:
+    """Rewrite ``ref_count`` for blobs whose counter drifted from the name rows."""
+    drifted = (
+        DatabaseMediaBlob.objects.annotate(actual=_reference_counts())
+        .exclude(ref_count=F("actual"))
+        .values_list("pk", "actual")
+    )
+    repaired = 0
+    for blob_id, actual in drifted.iterator():
+        DatabaseMediaBlob.objects.filter(pk=blob_id).update(ref_count=actual)
+        repaired += 1
+    return repaired
+
+
+def collect_unreferenced_blobs(*, grace: timedelta = DEFAULT_GC_GRACE, dry_run: bool = False) -> BlobGarbageReport:
+    repaired = 0 if dry_run else reconcile_blob_ref_counts()
+    cutoff = timezone.now() - grace
+    candidates = DatabaseMediaBlob.objects.filter(files__isnull=True, updated_at__lt=cutoff).order_by("pk")
+    if dry_run:
+        totals = candidates.aggregate(count=Count("pk"), size=Sum("stored_size"))
+        return BlobGarbageReport(repaired, int(totals["count"] or 0), int(totals["size"] or 0))
+
+    deleted = freed = 0
+    last_pk = 0
+    while True:
+        batch = list(candidates.filter(pk__gt=last_pk).values_list("pk", "stored_size")[:GC_BATCH_SIZE])
+        if not batch:
+            break
+        last_pk = batch[-1][0]
+        ids = [blob_id for blob_id, _size in batch]
+        try:
+            with transaction.atomic():
+                # Re-check under row locks: an upload may have taken a
+                # reference (bumping ref_count and updated_at) before its name
+                # row exists, and must not lose the blob to this delete.
+                survivors = set(
+                    DatabaseMediaBlob.objects.select_for_update(of=("self",))
+                    .filter(pk__in=ids, files__isnull=True, ref_count=0, updated_at__lt=cutoff)
+                    .values_list("pk", flat=True)
+                )
+                DatabaseMediaBlob.objects.filter(pk__in=survivors).delete()
+        except (IntegrityError, ProtectedError):
+            continue
+        deleted += len(survivors)
+        freed += sum(size for blob_id, size in batch if blob_id in survivors)
+    return BlobGarbageReport(repaired, deleted, freed)
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from database_media.maintenance import DEFAULT_GC_GRACE, collect_unreferenced_blobs
+
+
+class Command(BaseCommand):
+    help = "Delete database media blobs that no stored name references any more."
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report unreferenced blobs without deleting them.",
+        )
+        parser.add_argument(
+            "--grace-hours",
+            type=int,
+            default=int(DEFAULT_GC_GRACE.total_seconds() // 3600),
+            help="Keep blobs released less than this many hours ago.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        dry_run = options["dry_run"]
+        report = collect_unreferenced_blobs(
+            grace=timedelta(hours=max(0, options["grace_hours"])),
+            dry_run=dry_run,
+        )
+        verb = "would delete" if dry_run else "deleted"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done: {verb}={report.deleted_blobs}, freed_bytes={report.freed_bytes}, "
+                f"repaired_ref_counts={report.repaired_ref_counts}."
+            )
+        )
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from database_media.codecs import CODEC_NONE, KNOWN_CODECS, configured_codec, decode, encode
+from database_media.models import DatabaseMediaBlob
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-encode stored database media blobs with the configured (or given) codec in batches. "
+        "Blobs whose content does not compress well are stored uncompressed."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--codec",
+            default=None,
+            help="Target codec: zlib, zstd or none. Defaults to DATABASE_MEDIA_COMPRESSION.",
+        )
+        parser.add_argument("--batch-size", type=int, default=100, help="Blobs loaded per batch.")
+        parser.add_argument("--limit", type=int, default=None, help="Stop after this many blobs.")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the size change without writing anything.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        codec = configured_codec() if options["codec"] is None else str(options["codec"]).lower()
+        codec = CODEC_NONE if codec in {"none", "off"} else codec
+        if codec not in KNOWN_CODECS:
+            raise CommandError(f"Unknown codec: {options['codec']}")
+        batch_size = max(1, int(options["batch_size"]))
+        limit = options["limit"]
+        dry_run = options["dry_run"]
+
+        candidates = DatabaseMediaBlob.objects.exclude(codec=codec).order_by("pk")
+        total = candidates.count() if limit is None else min(limit, candidates.count())
+        processed = changed = corrupt = 0
+        bytes_before = bytes_after = 0
+        last_pk = 0
+        while processed < total:
+            batch = list(
+                candidates.filter(pk__gt=last_pk).only("pk", "sha256", "content", "codec", "stored_size")[
+                    : min(batch_size, total - processed)
+                ]
+            )
+            if not batch:
+                break
+            for blob in batch:
+                last_pk = blob.pk
+                processed += 1
+                data = decode(bytes(blob.content), blob.codec)
+                if hashlib.sha256(data).hexdigest() != blob.sha256:
+                    corrupt += 1
+                    self.stdout.write(self.style.WARNING(f"digest mismatch, skipped: blob {blob.pk}"))
+                    continue
+                stored, new_codec = encode(data, codec=codec)
+                bytes_before += int(blob.stored_size)
+                bytes_after += len(stored)
+                if new_codec == blob.codec:
+                    continue
+                changed += 1
+                if not dry_run:
+                    DatabaseMediaBlob.objects.filter(pk=blob.pk, codec=blob.codec).update(
+                        content=stored,
+                        codec=new_codec,
+                        stored_size=len(stored),
+                    )
+            self.stdout.write(
+                f"progress: {processed}/{total} blobs, changed={changed}, "
+                f"bytes {bytes_before} -> {bytes_after}"
+            )
+
+        verb = "would re-encode" if dry_run else "re-encoded"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done: {verb}={changed}, scanned={processed}, digest_mismatch={corrupt}, "
+                f"bytes {bytes_before} -> {bytes_after}."
+            )
+        )
@@ -0,0 +1,60 @@
+# Generated by Django 6.0.7 on 2026-10-19 03:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("database_media", "0001_initial"),
+    ]
+
+    operations = [
+        # Keep the existing "content" column for legacy rows; only the model
+        # attribute is renamed so ``DatabaseMediaFile.content`` can resolve
+        # through the shared blob.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RenameField(
+                    model_name="databasemediafile",
+                    old_name="content",
+                    new_name="inline_content",
+                ),
+                migrations.AlterField(
+                    model_name="databasemediafile",
+                    name="inline_content",
+                    field=models.BinaryField(blank=True, db_column="content", default=b""),
+                ),
+            ],
+            database_operations=[],
+        ),
+        migrations.CreateModel(
+            name="DatabaseMediaBlob",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("sha256", models.CharField(max_length=64, unique=True)),
+                ("content", models.BinaryField()),
+                ("size", models.BigIntegerField(default=0)),
+                ("ref_count", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "database media blob",
+                "verbose_name_plural": "database media blobs",
+                "indexes": [models.Index(fields=["ref_count", "updated_at"], name="dbmedia_blob_gc_idx")],
+            },
+        ),
+        migrations.AddField(
+            model_name="databasemediafile",
+            name="blob",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="files",
+                to="database_media.databasemediablob",
+            ),
+        ),
+    ]
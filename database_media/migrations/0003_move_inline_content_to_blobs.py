@@ -0,0 +1,54 @@
+import hashlib
+
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 200
+
+
+def move_inline_content_to_blobs(apps, schema_editor):
+    DatabaseMediaFile = apps.get_model("database_media", "DatabaseMediaFile")
+    DatabaseMediaBlob = apps.get_model("database_media", "DatabaseMediaBlob")
+
+    pending = DatabaseMediaFile.objects.filter(blob__isnull=True).order_by("pk")
+    last_pk = 0
+    while True:
+        batch = list(pending.filter(pk__gt=last_pk)[:BATCH_SIZE])
+        if not batch:
+            break
+        for row in batch:
+            data = bytes(row.inline_content or b"")
+            digest = hashlib.sha256(data).hexdigest()
+            blob, _created = DatabaseMediaBlob.objects.only("pk").get_or_create(
+                sha256=digest,
+                defaults={"content": data, "size": len(data)},
+            )
+            row.blob_id = blob.pk
+            row.sha256 = digest
+            row.size = len(data)
+            row.inline_content = b""
+            row.save(update_fields=["blob", "sha256", "size", "inline_content"])
+        last_pk = batch[-1].pk
+
+    references = (
+        DatabaseMediaFile.objects.filter(blob=OuterRef("pk"))
+        .order_by()
+        .values("blob")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    DatabaseMediaBlob.objects.update(ref_count=Coalesce(Subquery(references), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("database_media", "0002_databasemediablob"),
+    ]
+
+    operations = [
+        # Irreversible: unapplying 0002 afterwards would drop the blob table
+        # that now holds the only copy of the bytes.
+        migrations.RunPython(move_inline_content_to_blobs),
+    ]
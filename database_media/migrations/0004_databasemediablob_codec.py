@@ -0,0 +1,29 @@
+# Generated by Django 6.0.7 on 2026-10-19 03:38
+
+from django.db import migrations, models
+
+
+def backfill_stored_size(apps, schema_editor):
+    DatabaseMediaBlob = apps.get_model("database_media", "DatabaseMediaBlob")
+    DatabaseMediaBlob.objects.update(stored_size=models.F("size"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("database_media", "0003_move_inline_content_to_blobs"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="databasemediablob",
+            name="codec",
+            field=models.CharField(blank=True, default="", max_length=16),
+        ),
+        migrations.AddField(
+            model_name="databasemediablob",
+            name="stored_size",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_stored_size, migrations.RunPython.noop),
+    ]
@@ -3,9 +3,39 @@ from __future__ import annotations
 from django.db import models
 
 
+class DatabaseMediaBlob(models.Model):
+    """Content-addressed bytes shared by every media name with the same digest."""
+
+    sha256: models.CharField = models.CharField(max_length=64, unique=True)
+    content: models.BinaryField = models.BinaryField()
+    # "" (stored as-is), "zlib" or "zstd"; see database_media.codecs.
+    codec: models.CharField = models.CharField(max_length=16, blank=True, default="")
+    size: models.BigIntegerField = models.BigIntegerField(default=0)
+    stored_size: models.BigIntegerField = models.BigIntegerField(default=0)
+    ref_count: models.PositiveIntegerField = models.PositiveIntegerField(default=0)
+    created_at: models.DateTimeField = models.DateTimeField(auto_now_add=True)
+    updated_at: models.DateTimeField = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "database media blob"
+        verbose_name_plural = "database media blobs"
+        indexes = [models.Index(fields=["ref_count", "updated_at"], name="dbmedia_blob_gc_idx")]
+
+    def __str__(self) -> str:
+        return self.sha256
+
+
 class DatabaseMediaFile(models.Model):
     name: models.CharField = models.CharField(max_length=512, unique=True, db_index=True)
-    content: models.BinaryField = models.BinaryField()
+    blob = models.ForeignKey(
+        DatabaseMediaBlob,
+        null=True,
+        blank=True,
+        on_delete=models.PROTECT,
+        related_name="files",
+    )
+    # Bytes of rows written before blobs existed; emptied by migration 0003.
+    inline_content: models.BinaryField = models.BinaryField(db_column="content", blank=True, default=b"")
     content_type: models.CharField = models.CharField(max_length=255, blank=True, default="")
     size: models.BigIntegerField = models.BigIntegerField(default=0)
     sha256: models.CharField = models.CharField(max_length=64, blank=True, db_index=True, default="")
@@ -19,3 +49,12 @@ class DatabaseMediaFile(models.Model):
 
     def __str__(self) -> str:
         return self.name
+
+    @property
+    def content(self) -> bytes:
+        blob = self.blob
+        if blob is not None:
+            from database_media.codecs import decode
+
+            return decode(bytes(blob.content), blob.codec)
+        return bytes(self.inline_content or b"")
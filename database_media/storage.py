@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import hashlib
+import os
 import posixpath
-from pathlib import Path
+import shutil
 from typing import TYPE_CHECKING, Any, cast
 from urllib.parse import urljoin
 
@@ -11,15 +12,25 @@ from django.core.exceptions import SuspiciousFileOperation
 from django.core.files.base import ContentFile, File
 from django.core.files.storage import FileSystemStorage, Storage
 from django.db import IntegrityError, transaction
-from django.utils._os import safe_join
+from django.db.models import F
+from django.utils import timezone
 from django.utils.encoding import filepath_to_uri
 
+from database_media.codecs import CODEC_NONE, STREAM_CHUNK_SIZE, decode, encode, open_decoded
+from database_media.temp_cache import TempFileCache
+from database_media.usage import adjust_storage_usage
+
 if TYPE_CHECKING:
-    from database_media.models import DatabaseMediaFile
+    from database_media.models import DatabaseMediaBlob, DatabaseMediaFile
 
 
 class DatabaseMediaStorage(Storage):
-    """Django storage backend that persists uploaded media bytes in PostgreSQL."""
+    """Django storage backend that persists uploaded media bytes in PostgreSQL.
+
+    Bytes live once per sha256 in ``DatabaseMediaBlob``; each stored name is a
+    ``DatabaseMediaFile`` row pointing at its blob, so identical uploads and
+    ``copy()`` calls only add metadata.
+    """
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
@@ -46,16 +57,67 @@ class DatabaseMediaStorage(Storage):
         data = b"".join(bytes(chunk) for chunk in chunks)
         return data, str(getattr(content, "content_type", "") or "")
 
-    def _create_blob(self, name: str, data: bytes, content_type: str) -> DatabaseMediaFile:
-        model = self._model()
+    def _blob_model(self) -> type[DatabaseMediaBlob]:
+        from database_media.models import DatabaseMediaBlob
+
+        return DatabaseMediaBlob
+
+    def _acquire_blob(self, data: bytes, content_type: str = "") -> tuple[int, str]:
+        """Take a reference on the blob for *data*, creating it if needed.
+
+        Returns ``(blob_id, sha256)``. New blobs are compressed per
+        ``database_media.codecs``; existing ones are never re-encoded here.
+        """
+        blob_model = self._blob_model()
         digest = hashlib.sha256(data).hexdigest()
-        return cast("DatabaseMediaFile", model.objects.create(
+        existing = blob_model.objects.filter(sha256=digest)
+        if existing.update(ref_count=F("ref_count") + 1, updated_at=timezone.now()):
+            return int(existing.values_list("pk", flat=True).get()), digest
+        stored, codec = encode(data, content_type=content_type)
+        blob, created = blob_model.objects.only("pk").get_or_create(
+            sha256=digest,
+            defaults={
+                "content": stored,
+                "codec": codec,
+                "size": len(data),
+                "stored_size": len(stored),
+                "ref_count": 1,
+            },
+        )
+        if not created:
+            blob_model.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") + 1, updated_at=timezone.now())
+        return int(blob.pk), digest
+
+    def _release_blob(self, blob_id: int | None) -> None:
+        if blob_id is None:
+            return
+        self._blob_model().objects.filter(pk=blob_id, ref_count__gt=0).update(
+            ref_count=F("ref_count") - 1,
+            updated_at=timezone.now(),
+        )
+
+    def _create_blob(self, name: str, data: bytes, content_type: str) -> DatabaseMediaFile:
+        blob_id, digest = self._acquire_blob(data, content_type)
+        row = cast("DatabaseMediaFile", self._model().objects.create(
             name=name,
-            content=data,
+            blob_id=blob_id,
             content_type=content_type,
             size=len(data),
             sha256=digest,
         ))
+        adjust_storage_usage(len(data))
+        return row
+
+    def _stored_blob(self, row: DatabaseMediaFile) -> tuple[bytes, str]:
+        if row.blob_id is None:
+            return bytes(row.inline_content or b""), CODEC_NONE
+        stored = self._blob_model().objects.filter(pk=row.blob_id).values_list("content", "codec").first()
+        if stored is None:
+            raise FileNotFoundError(row.name)
+        return bytes(stored[0]), str(stored[1])
+
+    def _read_blob(self, row: DatabaseMediaFile) -> bytes:
+        return decode(*self._stored_blob(row))
 
     def _import_from_fallback(self, name: str) -> DatabaseMediaFile | None:
         if not self.fallback_enabled or not self.auto_import_legacy_files:
@@ -65,14 +127,15 @@ class DatabaseMediaStorage(Storage):
         with self.fallback_storage.open(name, "rb") as legacy_file:
             data = legacy_file.read()
         try:
-            return self._create_blob(name, data, "")
+            with transaction.atomic():
+                return self._create_blob(name, data, "")
         except IntegrityError:
             return cast("DatabaseMediaFile | None", self._model().objects.filter(name=name).first())
 
     def _get_blob(self, name: str) -> DatabaseMediaFile | None:
         cleaned = self._clean_name(name)
         model = self._model()
-        blob = model.objects.filter(name=cleaned).first()
+        blob = model.objects.defer("inline_content").filter(name=cleaned).first()
         if blob is not None:
             return cast("DatabaseMediaFile", blob)
         return self._import_from_fallback(cleaned)
@@ -81,7 +144,12 @@ class DatabaseMediaStorage(Storage):
         blob = self._get_blob(name)
         if blob is None:
             raise FileNotFoundError(name)
-        return ContentFile(bytes(blob.content), name=blob.name)
+        stored, codec = self._stored_blob(blob)
+        if codec == CODEC_NONE:
+            return ContentFile(stored, name=blob.name)
+        opened = File(open_decoded(stored, codec, int(blob.size)), name=blob.name)
+        opened.size = int(blob.size)
+        return opened
 
     def _save(self, name: str, content: Any) -> str:
         cleaned = self._clean_name(name)
@@ -95,9 +163,44 @@ class DatabaseMediaStorage(Storage):
                 self._create_blob(cleaned, data, content_type)
         return cleaned
 
+    def copy(self, source_name: str, target_name: str) -> str:
+        """Point *target_name* at the bytes of *source_name* without copying them.
+
+        Returns the name actually used (like ``save``). Legacy rows and
+        fallback-only files are read once and stored through the normal path.
+        """
+        source = self._get_blob(source_name)
+        if source is None:
+            raise FileNotFoundError(source_name)
+        if source.blob_id is None:
+            return self.save(target_name, ContentFile(self._read_blob(source)))
+        cleaned = self.get_available_name(self._clean_name(target_name))
+        with transaction.atomic():
+            self._blob_model().objects.filter(pk=source.blob_id).update(
+                ref_count=F("ref_count") + 1,
+                updated_at=timezone.now(),
+            )
+            self._model().objects.create(
+                name=cleaned,
+                blob_id=source.blob_id,
+                content_type=source.content_type,
+                size=source.size,
+                sha256=source.sha256,
+            )
+        adjust_storage_usage(int(source.size))
+        return cleaned
+
     def delete(self, name: str) -> None:
         cleaned = self._clean_name(name)
-        self._model().objects.filter(name=cleaned).delete()
+        with transaction.atomic():
+            rows = list(
+                self._model().objects.select_for_update().filter(name=cleaned).values_list("blob_id", "size")
+            )
+            self._model().objects.filter(name=cleaned).delete()
+            for blob_id, _size in rows:
+                # Unreferenced blobs are removed later by collect_database_media_garbage.
+                self._release_blob(blob_id)
+        adjust_storage_usage(-sum(int(size) for _blob_id, size in rows))
         if self.fallback_enabled and self.fallback_storage.exists(cleaned):
             self.fallback_storage.delete(cleaned)
 
@@ -128,11 +231,14 @@ class DatabaseMediaStorage(Storage):
                 return self.fallback_storage.path(cleaned)
             raise FileNotFoundError(name)
 
-        temp_root = Path(str(getattr(settings, "DATABASE_MEDIA_TEMP_ROOT")))
-        target = Path(safe_join(str(temp_root), cleaned))
-        target.parent.mkdir(parents=True, exist_ok=True)
-        if not target.exists() or target.stat().st_size != blob.size:
-            target.write_bytes(bytes(blob.content))
+        # Bytes are only loaded from the database on a cache miss.
+        digest = blob.sha256 or hashlib.sha256(self._read_blob(blob)).hexdigest()
+
+        def write(handle: Any) -> None:
+            stored, codec = self._stored_blob(blob)
+            shutil.copyfileobj(open_decoded(stored, codec, int(blob.size)), handle, STREAM_CHUNK_SIZE)
+
+        target = TempFileCache.from_settings().materialize(digest, cleaned, int(blob.size), write)
         return str(target)
 
     def get_created_time(self, name: str) -> Any:
@@ -146,3 +252,23 @@ class DatabaseMediaStorage(Storage):
         if blob is None:
             raise FileNotFoundError(name)
         return blob.updated_at
+
+
+class UsageTrackingFileSystemStorage(FileSystemStorage):
+    """``FileSystemStorage`` that keeps the media usage counter up to date."""
+
+    def _save(self, name: str, content: Any) -> str:
+        name = super()._save(name, content)  # type: ignore[misc]
+        try:
+            adjust_storage_usage(os.path.getsize(self.path(name)))
+        except OSError:
+            pass
+        return name
+
+    def delete(self, name: str) -> None:
+        try:
+            size = os.path.getsize(self.path(name)) if name else 0
+        except OSError:
+            size = 0
+        super().delete(name)
+        adjust_storage_usage(-size)
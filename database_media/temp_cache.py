@@ -0,0 +1,187 @@
+"""Bounded on-disk cache behind ``DatabaseMediaStorage.path()``.
+
+Libraries such as tesseract and pdftoppm need a real file, so ``path()``
+materializes blobs under ``DATABASE_MEDIA_TEMP_ROOT``. Entries are keyed by
+content digest (``<root>/<sha[:2]>/<sha>/<basename>``), so a file that exists
+with the expected size is by construction the right content; a changed blob
+simply gets a new directory. Files are written to a hidden temp file, checked
+against the digest and renamed into place, so concurrent workers never see a
+partial file. Each process keeps a running estimate of the cache size; the
+directory is only walked when a miss would push the estimate past
+``DATABASE_MEDIA_TEMP_CACHE_MAX_MB`` or every ``RESCAN_EVERY_WRITES`` misses
+(other workers write to the same directory). The walk trims the cache by
+evicting least-recently-used entries (hits refresh the mtime). Entries used in the last
+``DATABASE_MEDIA_TEMP_CACHE_MIN_AGE_SECONDS`` are never evicted, so a path just
+handed to a caller stays valid while it is opened.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from django.conf import settings
+from django.utils._os import safe_join
+
+from legalize_site.metrics import TEMP_CACHE_EVENTS, increment
+
+logger = logging.getLogger(__name__)
+
+DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+TEMP_SUFFIX = ".tmp"
+STALE_TEMP_SECONDS = 3600
+
+RESCAN_EVERY_WRITES = 50
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "evicted_bytes": 0}
+# Per cache root: [estimated bytes on disk, misses since the last walk].
+_usage: dict[Path, list[int]] = {}
+
+
+def _bump(**counts: int) -> None:
+    with _stats_lock:
+        for key, value in counts.items():
+            _stats[key] += value
+    for key, value in counts.items():
+        increment(TEMP_CACHE_EVENTS, value, event=key)
+
+
+def temp_cache_stats() -> dict[str, int]:
+    """Per-process hit/miss/eviction counters since start (or the last reset)."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_temp_cache_stats() -> None:
+    with _stats_lock:
+        for key in _stats:
+            _stats[key] = 0
+        _usage.clear()
+
+
+class _DigestWriter:
+    """File-like sink that hashes everything written through it."""
+
+    def __init__(self, handle: BinaryIO) -> None:
+        self._handle = handle
+        self.digest = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self.digest.update(data)
+        return self._handle.write(data)
+
+
+@dataclass(frozen=True)
+class TempFileCache:
+    root: Path
+    max_bytes: int
+    min_age_seconds: int
+
+    @classmethod
+    def from_settings(cls) -> TempFileCache:
+        return cls(
+            root=Path(str(getattr(settings, "DATABASE_MEDIA_TEMP_ROOT"))),
+            max_bytes=int(getattr(settings, "DATABASE_MEDIA_TEMP_CACHE_MAX_MB", 512)) * 1024 * 1024,
+            min_age_seconds=int(getattr(settings, "DATABASE_MEDIA_TEMP_CACHE_MIN_AGE_SECONDS", 60)),
+        )
+
+    def entry_path(self, digest: str, filename: str) -> Path:
+        if not DIGEST_RE.match(digest):
+            raise ValueError("Temp cache entries must be keyed by a sha256 hex digest.")
+        return Path(safe_join(str(self.root), digest[:2], digest, Path(filename).name or "file"))
+
+    def materialize(self, digest: str, filename: str, size: int, write: Callable[[BinaryIO], None]) -> Path:
+        """Return a local path holding the content for *digest*, writing it on a miss."""
+        target = self.entry_path(digest, filename)
+        try:
+            if target.stat().st_size == size:
+                os.utime(target)
+                _bump(hits=1)
+                return target
+        except FileNotFoundError:
+            pass
+
+        _bump(misses=1)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=target.parent, prefix=".", suffix=TEMP_SUFFIX)
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                sink = _DigestWriter(handle)
+                write(sink)  # type: ignore[arg-type]
+            if sink.digest.hexdigest() != digest:
+                raise ValueError(f"Stored media does not match its digest: {digest}")
+            os.replace(temp_name, target)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        if self._needs_scan(size):
+            self.enforce_budget(keep=target)
+        return target
+
+    def _needs_scan(self, written: int) -> bool:
+        with _stats_lock:
+            usage = _usage.get(self.root)
+            if usage is None:
+                return True
+            usage[0] += written
+            usage[1] += 1
+            return usage[0] > self.max_bytes or usage[1] >= RESCAN_EVERY_WRITES
+
+    def enforce_budget(self, *, keep: Path | None = None) -> int:
+        """Evict least-recently-used entries until the cache fits its byte budget."""
+        now = time.time()
+        entries: list[tuple[float, int, Path]] = []
+        total = 0
+        for directory, _dirs, files in os.walk(self.root):
+            for filename in files:
+                path = Path(directory) / filename
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                if filename.startswith(".") and filename.endswith(TEMP_SUFFIX):
+                    # In-flight write from another worker, or a leftover from a crash.
+                    if stat.st_mtime < now - STALE_TEMP_SECONDS:
+                        path.unlink(missing_ok=True)
+                    continue
+                total += stat.st_size
+                entries.append((stat.st_mtime, stat.st_size, path))
+        if total <= self.max_bytes:
+            self._record_scan(total)
+            return 0
+
+        evicted = evicted_bytes = 0
+        for mtime, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            if path == keep or mtime > now - self.min_age_seconds:
+                continue
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            total -= size
+            evicted += 1
+            evicted_bytes += size
+            try:
+                path.parent.rmdir()
+            except OSError:
+                pass
+        self._record_scan(total)
+        if evicted:
+            _bump(evictions=evicted, evicted_bytes=evicted_bytes)
+            logger.info("Database media temp cache evicted %s files (%s bytes)", evicted, evicted_bytes)
+        return evicted
+
+    def _record_scan(self, total: int) -> None:
+        with _stats_lock:
+            _usage[self.root] = [total, 0]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from io import StringIO
 from pathlib import Path
 
 from django.core.files.base import ContentFile
@@ -9,7 +10,7 @@ from django.test import TestCase, override_settings
 
 from clients.models import Client
 from clients.models import Document as ClientDocument
-from database_media.models import DatabaseMediaFile
+from database_media.models import DatabaseMediaBlob, DatabaseMediaFile
 from database_media.storage import DatabaseMediaStorage
 
 
@@ -109,3 +110,21 @@ class DatabaseMediaCommandsTests(TestCase):
         call_command("export_database_media", overwrite=True)
         with self.file_system.open(file_name, "rb") as f:
             self.assertEqual(f.read(), b"%PDF-cmd-data")
+
+    def test_recompress_command_reencodes_raw_blobs_in_batches(self) -> None:
+        text = b"Umowa najmu lokalu mieszkalnego. " * 500
+        with override_settings(DATABASE_MEDIA_COMPRESSION="none"):
+            names = [
+                self.db_storage.save(f"documents/lease-{index}.txt", ContentFile(text + bytes([index])))
+                for index in range(3)
+            ]
+        self.assertEqual(set(DatabaseMediaBlob.objects.values_list("codec", flat=True)), {""})
+
+        out = StringIO()
+        call_command("recompress_database_media", "--codec", "zlib", "--batch-size", "2", stdout=out)
+
+        self.assertIn("progress: 2/3", out.getvalue())
+        self.assertIn("re-encoded=3", out.getvalue())
+        self.assertEqual(set(DatabaseMediaBlob.objects.values_list("codec", flat=True)), {"zlib"})
+        with self.db_storage.open(names[1], "rb") as stored_file:
+            self.assertEqual(stored_file.read(), text + b"\x01")
@@ -1,12 +1,23 @@
 from __future__ import annotations
 
+import os
+import tempfile
+from datetime import timedelta
 from pathlib import Path
+from unittest.mock import patch
 
 from django.core.files.base import ContentFile
+from django.db import transaction
 from django.test import TestCase, override_settings
+from django.utils import timezone
 
-from database_media.models import DatabaseMediaFile
-from database_media.storage import DatabaseMediaStorage
+from clients.models import Case, Client
+from clients.models import Document as ClientDocument
+from clients.services.document_helpers import copy_document_to_case
+from database_media.maintenance import collect_unreferenced_blobs
+from database_media.models import DatabaseMediaBlob, DatabaseMediaFile
+from database_media.storage import DatabaseMediaStorage, UsageTrackingFileSystemStorage
+from database_media.usage import reset_storage_usage, storage_usage_bytes
 
 
 class DatabaseMediaStorageTests(TestCase):
@@ -50,3 +61,162 @@ class DatabaseMediaStorageTests(TestCase):
 
         self.assertFalse(DatabaseMediaFile.objects.filter(name=name).exists())
         self.assertFalse(storage.fallback_storage.exists(name))
+
+    @override_settings(DATABASE_MEDIA_FALLBACK_TO_FILE_SYSTEM=False)
+    def test_identical_content_is_stored_once_and_copies_share_the_blob(self):
+        storage = DatabaseMediaStorage()
+        first = storage.save("documents/scan-a.pdf", ContentFile(b"%PDF-shared"))
+        second = storage.save("documents/scan-b.pdf", ContentFile(b"%PDF-shared"))
+        copied = storage.copy(first, "documents/scan-copy.pdf")
+
+        self.assertEqual(DatabaseMediaBlob.objects.count(), 1)
+        blob = DatabaseMediaBlob.objects.get()
+        self.assertEqual(blob.ref_count, 3)
+        self.assertEqual(
+            set(DatabaseMediaFile.objects.values_list("blob_id", flat=True)),
+            {blob.pk},
+        )
+        with storage.open(copied, "rb") as stored_file:
+            self.assertEqual(stored_file.read(), b"%PDF-shared")
+
+        storage.delete(first)
+        storage.delete(second)
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 1)
+        self.assertTrue(storage.exists(copied))
+
+    @override_settings(DATABASE_MEDIA_FALLBACK_TO_FILE_SYSTEM=False)
+    def test_garbage_collection_removes_only_unreferenced_blobs_after_grace(self):
+        storage = DatabaseMediaStorage()
+        kept = storage.save("documents/kept.pdf", ContentFile(b"%PDF-kept"))
+        dropped = storage.save("documents/dropped.pdf", ContentFile(b"%PDF-dropped"))
+        storage.delete(dropped)
+
+        self.assertEqual(collect_unreferenced_blobs().deleted_blobs, 0)
+
+        DatabaseMediaBlob.objects.update(updated_at=timezone.now() - timedelta(days=2))
+        DatabaseMediaBlob.objects.filter(sha256=DatabaseMediaFile.objects.get(name=kept).sha256).update(ref_count=7)
+        report = collect_unreferenced_blobs()
+
+        self.assertEqual(report.deleted_blobs, 1)
+        self.assertEqual(report.freed_bytes, len(b"%PDF-dropped"))
+        self.assertEqual(report.repaired_ref_counts, 1)
+        self.assertEqual(DatabaseMediaBlob.objects.get().ref_count, 1)
+        with storage.open(kept, "rb") as stored_file:
+            self.assertEqual(stored_file.read(), b"%PDF-kept")
+
+    @override_settings(DATABASE_MEDIA_FALLBACK_TO_FILE_SYSTEM=False)
+    def test_garbage_collection_spares_a_blob_taken_again_after_listing(self):
+        storage = DatabaseMediaStorage()
+        storage.delete(storage.save("documents/stale.pdf", ContentFile(b"%PDF-stale")))
+        DatabaseMediaBlob.objects.update(updated_at=timezone.now() - timedelta(days=2))
+        atomic = transaction.atomic
+        uploads: list[int] = []
+
+        def upload_then_atomic(*args, **kwargs):
+            # An upload of the same bytes takes its reference before the
+            # name row is written.
+            if not uploads:
+                uploads.append(storage._acquire_blob(b"%PDF-stale")[0])
+            return atomic(*args, **kwargs)
+
+        with patch("database_media.maintenance.transaction.atomic", upload_then_atomic):
+            report = collect_unreferenced_blobs()
+
+        self.assertEqual(report.deleted_blobs, 0)
+        self.assertEqual(DatabaseMediaBlob.objects.get().ref_count, 1)
+
+    @override_settings(
+        DATABASE_MEDIA_FALLBACK_TO_FILE_SYSTEM=False,
+        STORAGES={
+            "default": {"BACKEND": "database_media.storage.DatabaseMediaStorage"},
+            "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+        },
+    )
+    def test_copying_a_document_into_another_case_adds_only_metadata(self):
+        client = Client.objects.create(
+            first_name="Copy",
+            last_name="Case",
+            citizenship="UA",
+            phone="+48999000111",
+            email="copy-case@example.com",
+        )
+        source_case = Case.objects.create(client=client, application_purpose="work")
+        target_case = Case.objects.create(client=client, application_purpose="work")
+        document = ClientDocument.objects.create(
+            client=client,
+            case=source_case,
+            document_type="passport",
+            file=ContentFile(b"%PDF-passport", name="passport.pdf"),
+        )
+
+        copy = copy_document_to_case(document, target_case)
+
+        self.assertNotEqual(copy.file.name, document.file.name)
+        self.assertEqual(DatabaseMediaBlob.objects.count(), 1)
+        self.assertEqual(DatabaseMediaBlob.objects.get().ref_count, 2)
+        with copy.file.open("rb") as stored_file:
+            self.assertEqual(stored_file.read(), b"%PDF-passport")
+
+    @override_settings(DATABASE_MEDIA_FALLBACK_TO_FILE_SYSTEM=False, DATABASE_MEDIA_COMPRESSION="zlib")
+    def test_compressible_content_is_stored_compressed_and_streams_back(self):
+        storage = DatabaseMediaStorage()
+        text = b"%PDF-1.7\n" + b"BT /F1 12 Tf (Zaswiadczenie o zatrudnieniu) Tj ET\n" * 4000
+        name = storage.save("documents/text-layer.pdf", ContentFile(text))
+
+        blob = DatabaseMediaBlob.objects.get()
+        self.assertEqual(blob.codec, "zlib")
+        self.assertEqual(blob.size, len(text))
+        self.assertLess(blob.stored_size, len(text) // 2)
+
+        with storage.open(name, "rb") as stored_file:
+            self.assertEqual(stored_file.size, len(text))
+            self.assertEqual(stored_file.read(100), text[:100])
+            stored_file.seek(len(text) - 10)
+            self.assertEqual(stored_file.read(), text[-10:])
+            stored_file.seek(0)
+            self.assertEqual(b"".join(stored_file.chunks()), text)
+        self.assertEqual(DatabaseMediaFile.objects.get(name=name).content, text)
+
+    @override_settings(DATABASE_MEDIA_FALLBACK_TO_FILE_SYSTEM=False, DATABASE_MEDIA_COMPRESSION="zlib")
+    def test_already_compressed_and_incompressible_content_is_stored_raw(self):
+        storage = DatabaseMediaStorage()
+        storage.save("documents/photo.jpg", ContentFile(b"\xff\xd8\xff\xe0" + b"\x00" * 8192))
+        storage.save("documents/noise.pdf", ContentFile(b"%PDF-" + os.urandom(8192)))
+
+        self.assertEqual(set(DatabaseMediaBlob.objects.values_list("codec", flat=True)), {""})
+
+
+class StorageUsageCounterTests(TestCase):
+    def setUp(self):
+        reset_storage_usage()
+        self.addCleanup(reset_storage_usage)
+
+    @override_settings(DATABASE_MEDIA_FALLBACK_TO_FILE_SYSTEM=False)
+    def test_database_storage_keeps_the_counter_in_step_with_sum_of_sizes(self):
+        storage = DatabaseMediaStorage()
+        first = storage.save("documents/usage-a.pdf", ContentFile(b"%PDF-usage"))
+        self.assertEqual(storage_usage_bytes(), 10)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(storage_usage_bytes(), 10)
+
+        storage.save("documents/usage-b.pdf", ContentFile(b"%PDF-more-bytes"))
+        storage.copy(first, "documents/usage-copy.pdf")
+        storage.delete(first)
+
+        self.assertEqual(storage_usage_bytes(), 15 + 10)
+        reset_storage_usage()
+        self.assertEqual(storage_usage_bytes(), 15 + 10)
+
+    def test_file_system_storage_adjusts_the_counter_on_save_and_delete(self):
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            storage = UsageTrackingFileSystemStorage(location=media_root)
+            storage.save("existing.txt", ContentFile(b"abc"))
+            self.assertEqual(storage_usage_bytes(), 3)
+
+            name = storage.save("documents/new.txt", ContentFile(b"12345"))
+            self.assertEqual(storage_usage_bytes(), 8)
+
+            storage.delete(name)
+            self.assertEqual(storage_usage_bytes(), 3)
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+
+from database_media.storage import DatabaseMediaStorage
+from database_media.temp_cache import TempFileCache, reset_temp_cache_stats, temp_cache_stats
+
+TEMP_ROOT = "tmp/test_database_media_cache"
+
+
+@override_settings(
+    DATABASE_MEDIA_TEMP_ROOT=TEMP_ROOT,
+    DATABASE_MEDIA_FALLBACK_TO_FILE_SYSTEM=False,
+    DATABASE_MEDIA_TEMP_CACHE_MIN_AGE_SECONDS=0,
+)
+class DatabaseMediaTempCacheTests(TestCase):
+    def setUp(self) -> None:
+        shutil.rmtree(TEMP_ROOT, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, TEMP_ROOT, True)
+        reset_temp_cache_stats()
+        self.storage = DatabaseMediaStorage()
+
+    def test_second_path_call_is_a_hit_and_same_content_shares_an_entry(self):
+        first = self.storage.save("documents/a.pdf", ContentFile(b"%PDF-cached"))
+
+        path = Path(self.storage.path(first))
+        self.assertEqual(path.read_bytes(), b"%PDF-cached")
+        self.assertEqual(path.parent.name, hashlib.sha256(b"%PDF-cached").hexdigest())
+        self.assertEqual(Path(self.storage.path(first)), path)
+
+        stats = temp_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual([entry.name for entry in path.parent.iterdir()], ["a.pdf"])
+
+    def test_truncated_entry_is_rewritten(self):
+        name = self.storage.save("documents/b.pdf", ContentFile(b"%PDF-truncated-on-disk"))
+        path = Path(self.storage.path(name))
+        path.write_bytes(b"%PDF")
+
+        self.assertEqual(Path(self.storage.path(name)).read_bytes(), b"%PDF-truncated-on-disk")
+        self.assertEqual(temp_cache_stats()["misses"], 2)
+
+    @override_settings(DATABASE_MEDIA_TEMP_CACHE_MAX_MB=1)
+    def test_least_recently_used_entries_are_evicted_over_budget(self):
+        names = [
+            self.storage.save(f"documents/big-{index}.bin", ContentFile(bytes([index]) * 400_000))
+            for index in range(3)
+        ]
+        oldest = Path(self.storage.path(names[0]))
+        middle = Path(self.storage.path(names[1]))
+        stale = time.time() - 600
+        os.utime(oldest, (stale, stale))
+        os.utime(middle, (stale + 1, stale + 1))
+        self.storage.path(names[0])  # hit refreshes the oldest entry
+
+        newest = Path(self.storage.path(names[2]))
+
+        self.assertTrue(oldest.exists())
+        self.assertFalse(middle.exists())
+        self.assertTrue(newest.exists())
+        self.assertEqual(temp_cache_stats()["evictions"], 1)
+
+    def test_misses_under_budget_do_not_walk_the_cache_directory(self):
+        names = [self.storage.save(f"documents/w-{index}.pdf", ContentFile(b"%PDF-" + bytes([index]))) for index in range(3)]
+        self.storage.path(names[0])  # first miss in this process counts the directory
+
+        with patch("database_media.temp_cache.os.walk", wraps=os.walk) as walk:
+            self.storage.path(names[1])
+            self.storage.path(names[2])
+
+        walk.assert_not_called()
+        self.assertEqual(temp_cache_stats()["misses"], 3)
+
+    def test_digest_mismatch_leaves_no_file_behind(self):
+        cache = TempFileCache.from_settings()
+        digest = hashlib.sha256(b"expected").hexdigest()
+
+        with self.assertRaises(ValueError):
+            cache.materialize(digest, "x.pdf", 8, lambda handle: handle.write(b"tampered"))
+
+        self.assertEqual(list(cache.entry_path(digest, "x.pdf").parent.iterdir()), [])
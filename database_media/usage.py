@@ -0,0 +1,75 @@
+"""Running total of bytes in media storage, for the admin dashboard.
+
+Summing it on demand means ``SUM(size)`` over every ``DatabaseMediaFile`` or
+a walk of ``MEDIA_ROOT``. Instead the total is counted once and kept in the
+default cache; ``DatabaseMediaStorage`` and ``UsageTrackingFileSystemStorage``
+add and subtract the size of every file they save or delete. Writes that
+bypass those backends (rolled-back uploads, files copied in by hand) are
+corrected by the full recount every ``STORAGE_USAGE_RECOUNT_SECONDS``.
+"""
+from __future__ import annotations
+
+import logging
+import os
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Sum
+
+logger = logging.getLogger(__name__)
+
+STORAGE_USAGE_CACHE_KEY = "storage_usage:bytes"
+STORAGE_USAGE_RECOUNT_SECONDS = 24 * 60 * 60
+
+
+def adjust_storage_usage(delta: int) -> None:
+    """Add *delta* bytes to the running total, if one has been counted yet."""
+    if not delta:
+        return
+    try:
+        cache.incr(STORAGE_USAGE_CACHE_KEY, delta)
+    except ValueError:
+        # Not counted yet (or expired): the next read recounts from scratch.
+        pass
+    except Exception:
+        logger.warning("Failed to update the storage usage counter.", exc_info=True)
+
+
+def count_storage_usage() -> int | None:
+    """Total stored bytes, counted the slow way; ``None`` when unknown (S3)."""
+    from database_media.models import DatabaseMediaFile
+
+    if DatabaseMediaFile.objects.exists():
+        return int(DatabaseMediaFile.objects.aggregate(total=Sum("size"))["total"] or 0)
+    media_root = str(getattr(settings, "MEDIA_ROOT", "") or "")
+    if not media_root or not os.path.isdir(media_root) or getattr(settings, "USE_S3_MEDIA_STORAGE", False):
+        return None
+    total = 0
+    for dirpath, _dirnames, filenames in os.walk(media_root):
+        for filename in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, filename))
+            except OSError:
+                continue
+    return total
+
+
+def storage_usage_bytes() -> int | None:
+    try:
+        total = cache.get(STORAGE_USAGE_CACHE_KEY)
+    except Exception:
+        logger.warning("Failed to read the storage usage counter.", exc_info=True)
+        return count_storage_usage()
+    if total is not None:
+        return int(total)
+    total = count_storage_usage()
+    if total is not None:
+        try:
+            cache.add(STORAGE_USAGE_CACHE_KEY, total, timeout=STORAGE_USAGE_RECOUNT_SECONDS)
+        except Exception:
+            logger.warning("Failed to store the storage usage counter.", exc_info=True)
+    return total
+
+
+def reset_storage_usage() -> None:
+    cache.delete(STORAGE_USAGE_CACHE_KEY)
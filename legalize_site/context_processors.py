@@ -96,7 +96,12 @@ def onboarding_notifications(request: HttpRequest) -> dict[str, Any]:
 
     from clients.models import Client, StaffTask
     from clients.services.access import accessible_clients_queryset, accessible_tasks_queryset
-    from clients.services.attention import apply_client_attention_filter, count_client_attention_filters
+    from clients.services.attention import (
+        ATTENTION_FILTERS,
+        DOCUMENT_FILTERS,
+        apply_client_attention_filter,
+        count_client_attention_filters,
+    )
     from clients.services.onboarding_purposes import (
         onboarding_notifications_cache_key,
         onboarding_purpose_mismatch_q,
@@ -117,24 +122,13 @@ def onboarding_notifications(request: HttpRequest) -> dict[str, Any]:
         purpose_change_count = qs.filter(onboarding_purpose_mismatch_q()).count()
         staff_review_count = qs.filter(mos_applications__status="staff_review").count()
         submitted_in_mos_count = qs.filter(mos_applications__status="submitted_in_mos").count()
-        ocr_review_count = qs.filter(
-            documents__awaiting_confirmation=True,
-            documents__archived_at__isnull=True,
-        ).distinct().count()
-        ocr_warning_count = qs.filter(
-            documents__ocr_name_mismatch=True,
-            documents__archived_at__isnull=True,
-        ).distinct().count()
-        ocr_pending_count = qs.filter(
-            documents__ocr_status="pending",
-            documents__archived_at__isnull=True,
-        ).distinct().count()
-
-        ocr_failed_count = qs.filter(
-            documents__ocr_status="failed",
-            documents__archived_at__isnull=True,
-        ).distinct().count()
-        attention_counts = count_client_attention_filters(qs)
+        # Attention and OCR badge counts come from ClientAttentionState in a
+        # single aggregate query.
+        attention_counts = count_client_attention_filters(qs, filters=(*ATTENTION_FILTERS, *DOCUMENT_FILTERS))
+        ocr_review_count = attention_counts["ocr_review"]
+        ocr_warning_count = attention_counts["ocr_warning"]
+        ocr_pending_count = attention_counts["ocr_pending"]
+        ocr_failed_count = attention_counts["ocr_failed"]
         pending_question_tasks = accessible_tasks_queryset(
             request.user,
             StaffTask.objects.filter(
@@ -317,7 +311,7 @@ def onboarding_notifications(request: HttpRequest) -> dict[str, Any]:
                 "label": _("OCR требует подтверждения"),
                 "count": ocr_review_count,
                 "url": _attention_item_url(
-                    qs.filter(documents__awaiting_confirmation=True, documents__archived_at__isnull=True).distinct(),
+                    apply_client_attention_filter(qs, "ocr_review"),
                     f"{client_list_url}?document=ocr_review",
                     ocr_review_count,
                     "#documentAccordion",
@@ -330,7 +324,7 @@ def onboarding_notifications(request: HttpRequest) -> dict[str, Any]:
                 "label": _("OCR предупреждения"),
                 "count": ocr_warning_count,
                 "url": _attention_item_url(
-                    qs.filter(documents__ocr_name_mismatch=True, documents__archived_at__isnull=True).distinct(),
+                    apply_client_attention_filter(qs, "ocr_warning"),
                     f"{client_list_url}?document=ocr_warning",
                     ocr_warning_count,
                     "#documentAccordion",
@@ -344,7 +338,7 @@ def onboarding_notifications(request: HttpRequest) -> dict[str, Any]:
                 "label": _("OCR обрабатывается"),
                 "count": ocr_pending_count,
                 "url": _attention_item_url(
-                    qs.filter(documents__ocr_status="pending", documents__archived_at__isnull=True).distinct(),
+                    apply_client_attention_filter(qs, "ocr_pending"),
                     f"{client_list_url}?document=ocr_pending",
                     ocr_pending_count,
                     "#documentAccordion",
@@ -358,7 +352,7 @@ def onboarding_notifications(request: HttpRequest) -> dict[str, Any]:
                 "label": _("OCR с ошибкой"),
                 "count": ocr_failed_count,
                 "url": _attention_item_url(
-                    qs.filter(documents__ocr_status="failed", documents__archived_at__isnull=True).distinct(),
+                    apply_client_attention_filter(qs, "ocr_failed"),
                     f"{client_list_url}?document=ocr_failed",
                     ocr_failed_count,
                     "#documentAccordion",
@@ -98,8 +98,9 @@ def _authorize_cron_request(
     *,
     action_name: str,
     allow_backup_trigger_secret: bool = False,
+    token_env: str = "CRON_TOKEN",
 ) -> JsonResponse | None:
-    cron_token = os.environ.get("CRON_TOKEN")
+    cron_token = os.environ.get(token_env)
     expected_tokens = [cron_token] if cron_token else []
     if allow_backup_trigger_secret:
         backup_trigger_secret = os.environ.get("BACKUP_TRIGGER_SECRET")
@@ -116,7 +117,7 @@ def _authorize_cron_request(
         or not supplied_token
         or not any(secrets.compare_digest(supplied_token, expected_token) for expected_token in expected_tokens)
     ):
-        logger.warning("Invalid CRON_TOKEN for %s from ip=%s", action_name, request_ip)
+        logger.warning("Invalid %s for %s from ip=%s", token_env, action_name, request_ip)
         return JsonResponse({"error": "forbidden"}, status=403)
 
     if not _request_ip_allowed(request):
@@ -0,0 +1,322 @@
+"""Prometheus metrics shared across gunicorn workers.
+
+Each process adds counter increments and histogram observations to an
+in-memory buffer; a daemon thread folds the buffer into the default cache
+(Redis in production) every ``METRICS_FLUSH_SECONDS`` with one ``incr`` per
+touched value, so every worker adds to the same totals without a cache round
+trip per observation. ``/metrics`` flushes its own process, reads the totals
+back with one ``get_many`` and renders the Prometheus text format. The only
+database read is the queue gauge: one grouped COUNT per queue over the
+pending and in-flight rows only, cached for ``METRICS_QUEUE_DEPTH_TTL_SECONDS``.
+
+Totals live in the cache like ``clients.services.job_metrics``: they reset
+when the cache is flushed, which Prometheus treats as a counter reset.
+"""
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.db.models import Count
+from django.http import HttpRequest, HttpResponse
+
+logger = logging.getLogger(__name__)
+
+METRICS_CACHE_PREFIX = "metrics:"
+METRICS_INDEX_KEY = f"{METRICS_CACHE_PREFIX}series"
+METRICS_QUEUE_DEPTH_KEY = f"{METRICS_CACHE_PREFIX}queue_depth"
+METRICS_TIMEOUT = 30 * 24 * 60 * 60
+# Histogram sums are stored as integers (cache.incr) in millionths.
+_SUM_SCALE = 1_000_000
+_HTTP_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+
+@dataclass(frozen=True)
+class Metric:
+    name: str
+    kind: str  # "counter" or "histogram"
+    help: str
+    labels: tuple[str, ...] = ()
+    buckets: tuple[float, ...] = ()
+
+
+HTTP_REQUEST_DURATION = Metric(
+    "legalize_http_request_duration_seconds",
+    "histogram",
+    "Time to produce a response, by URL name.",
+    labels=("view", "method"),
+    buckets=(0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+DOCUMENT_JOB_DURATION = Metric(
+    "legalize_document_job_duration_seconds",
+    "histogram",
+    "Run time of one OCR job attempt, by job type and outcome.",
+    labels=("job_type", "outcome"),
+    buckets=(1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 900.0),
+)
+DOCUMENT_JOB_WAIT = Metric(
+    "legalize_document_job_wait_seconds",
+    "histogram",
+    "Time from enqueueing an OCR job to the start of an attempt, by job type.",
+    labels=("job_type",),
+    buckets=(1.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0, 4 * 3600.0, 24 * 3600.0),
+)
+DOCUMENT_JOB_ATTEMPTS = Metric(
+    "legalize_document_job_attempts",
+    "histogram",
+    "Attempts an OCR job took to complete or fail for good, by job type.",
+    labels=("job_type",),
+    buckets=(1.0, 2.0, 3.0, 5.0, 10.0),
+)
+EMAILS_SENT = Metric(
+    "legalize_emails_total",
+    "counter",
+    "Emails logged by template and delivery status; template=mass_email is campaign throughput.",
+    labels=("template", "status"),
+)
+REMINDER_RUN_DURATION = Metric(
+    "legalize_reminder_run_duration_seconds",
+    "histogram",
+    "Duration of update_reminders runs, by outcome.",
+    labels=("outcome",),
+    buckets=(1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0),
+)
+TEMP_CACHE_EVENTS = Metric(
+    "legalize_media_temp_cache_events_total",
+    "counter",
+    "DatabaseMediaStorage.path() temp cache hits, misses, evictions and evicted bytes.",
+    labels=("event",),
+)
+METRICS: dict[str, Metric] = {
+    metric.name: metric
+    for metric in (
+        HTTP_REQUEST_DURATION,
+        DOCUMENT_JOB_DURATION,
+        DOCUMENT_JOB_WAIT,
+        DOCUMENT_JOB_ATTEMPTS,
+        EMAILS_SENT,
+        REMINDER_RUN_DURATION,
+        TEMP_CACHE_EVENTS,
+    )
+}
+
+
+def _series_id(metric: Metric, labels: tuple[str, ...]) -> str:
+    digest = hashlib.sha1(json.dumps([metric.name, labels]).encode(), usedforsecurity=False).hexdigest()[:16]
+    return f"{metric.name}:{digest}"
+
+
+class _MetricsBuffer:
+    """Per-process deltas waiting to be added to the shared totals."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._deltas: defaultdict[str, int] = defaultdict(int)
+        # Series this process has seen, as they go into the shared index.
+        self._series: dict[str, list[Any]] = {}
+        self._thread: threading.Thread | None = None
+
+    def add(self, metric: Metric, labels: tuple[str, ...], fields: dict[str, int]) -> None:
+        series = _series_id(metric, labels)
+        with self._lock:
+            self._series.setdefault(series, [metric.name, list(labels)])
+            for field, amount in fields.items():
+                self._deltas[f"{METRICS_CACHE_PREFIX}{series}:{field}"] += amount
+        interval = float(getattr(settings, "METRICS_FLUSH_SECONDS", 15) or 0)
+        if interval <= 0:
+            self.flush()
+        elif self._thread is None:
+            self._start(interval)
+
+    def _start(self, interval: float) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, args=(interval,), name="metrics-flusher", daemon=True
+            )
+            self._thread.start()
+        atexit.register(self.flush)
+
+    def _run(self, interval: float) -> None:
+        while True:
+            time.sleep(interval)
+            self.flush()
+            close_old_connections()
+
+    def flush(self) -> None:
+        with self._lock:
+            deltas, self._deltas = self._deltas, defaultdict(int)
+            series = dict(self._series)
+        if not deltas:
+            return
+        try:
+            # Checked on every flush rather than once: two workers adding
+            # series at the same time can overwrite each other's index entry.
+            index = cache.get(METRICS_INDEX_KEY) or {}
+            if not series.keys() <= index.keys():
+                cache.set(METRICS_INDEX_KEY, {**index, **series}, timeout=METRICS_TIMEOUT)
+            for key, amount in deltas.items():
+                try:
+                    cache.incr(key, amount)
+                except ValueError:
+                    if not cache.add(key, amount, timeout=METRICS_TIMEOUT):
+                        cache.incr(key, amount)
+        except Exception:
+            logger.warning("Failed to flush metrics: dropped=%s", len(deltas), exc_info=True)
+
+
+_buffer = _MetricsBuffer()
+
+
+def _label_values(metric: Metric, labels: dict[str, Any]) -> tuple[str, ...]:
+    return tuple(str(labels.get(name, "")) for name in metric.labels)
+
+
+def increment(metric: Metric, amount: int = 1, **labels: Any) -> None:
+    _buffer.add(metric, _label_values(metric, labels), {"value": amount})
+
+
+def observe(metric: Metric, value: float, **labels: Any) -> None:
+    bucket = next((index for index, bound in enumerate(metric.buckets) if value <= bound), len(metric.buckets))
+    _buffer.add(
+        metric,
+        _label_values(metric, labels),
+        {"count": 1, "sum": round(value * _SUM_SCALE), f"bucket{bucket}": 1},
+    )
+
+
+def flush_metrics() -> None:
+    _buffer.flush()
+
+
+def _queue_depths() -> dict[str, list[tuple[dict[str, str], int]]]:
+    depths = cache.get(METRICS_QUEUE_DEPTH_KEY)
+    if depths is not None:
+        return depths
+    from clients.models import DocumentProcessingJob, EmailCampaign
+
+    # Failed jobs are history, not queue; counting them would scan the whole
+    # table on every scrape.
+    document_jobs = (
+        DocumentProcessingJob.objects.filter(
+            status__in=[DocumentProcessingJob.STATUS_PENDING, DocumentProcessingJob.STATUS_PROCESSING]
+        )
+        .values("status", "job_type")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    campaigns = (
+        EmailCampaign.objects.filter(status__in=[EmailCampaign.STATUS_PENDING, EmailCampaign.STATUS_RUNNING])
+        .values("status")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    depths = {
+        "legalize_document_jobs": [
+            ({"status": row["status"], "job_type": row["job_type"]}, row["total"]) for row in document_jobs
+        ],
+        "legalize_email_campaigns": [({"status": row["status"]}, row["total"]) for row in campaigns],
+    }
+    cache.set(METRICS_QUEUE_DEPTH_KEY, depths, timeout=getattr(settings, "METRICS_QUEUE_DEPTH_TTL_SECONDS", 30))
+    return depths
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_metrics() -> str:
+    """Every metric in the Prometheus text exposition format."""
+    from clients.services.job_metrics import JOB_METRIC_NAMES, job_metrics_snapshot
+
+    flush_metrics()
+    index: dict[str, list[Any]] = cache.get(METRICS_INDEX_KEY) or {}
+    keys = [
+        f"{METRICS_CACHE_PREFIX}{series}:{field}"
+        for series, (name, _labels) in index.items()
+        if name in METRICS
+        for field in (
+            ["value"]
+            if METRICS[name].kind == "counter"
+            else ["count", "sum", *(f"bucket{i}" for i in range(len(METRICS[name].buckets) + 1))]
+        )
+    ]
+    values = cache.get_many(keys) if keys else {}
+
+    def stored(series: str, field: str) -> int:
+        return int(values.get(f"{METRICS_CACHE_PREFIX}{series}:{field}") or 0)
+
+    series_by_metric: defaultdict[str, list[tuple[str, dict[str, str]]]] = defaultdict(list)
+    for series, (name, label_values) in sorted(index.items(), key=lambda item: (item[1][0], item[1][1])):
+        if name in METRICS:
+            series_by_metric[name].append((series, dict(zip(METRICS[name].labels, label_values))))
+
+    lines: list[str] = []
+    for name, metric in METRICS.items():
+        lines += [f"# HELP {name} {metric.help}", f"# TYPE {name} {metric.kind}"]
+        for series, labels in series_by_metric.get(name, []):
+            if metric.kind == "counter":
+                lines.append(f"{name}{_format_labels(labels)} {stored(series, 'value')}")
+                continue
+            cumulative = 0
+            for index_, bound in enumerate([*metric.buckets, float("inf")]):
+                cumulative += stored(series, f"bucket{index_}")
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                lines.append(f"{name}_bucket{_format_labels({**labels, 'le': le})} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(stored(series, 'sum') / _SUM_SCALE)}")
+            lines.append(f"{name}_count{_format_labels(labels)} {stored(series, 'count')}")
+
+    job_events = job_metrics_snapshot()
+    lines += [
+        "# HELP legalize_job_events_total OCR lease events (clients.services.job_metrics).",
+        "# TYPE legalize_job_events_total counter",
+        *(f'legalize_job_events_total{{event="{name}"}} {job_events[name]}' for name in JOB_METRIC_NAMES),
+    ]
+    gauges = {
+        "legalize_document_jobs": "OCR jobs pending or processing, by status and job type.",
+        "legalize_email_campaigns": "Email campaigns waiting or running, by status.",
+    }
+    depths = _queue_depths()
+    for name, help_text in gauges.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        lines += [f"{name}{_format_labels(labels)} {total}" for labels, total in depths.get(name, [])]
+    return "\n".join(lines) + "\n"
+
+
+class HttpMetricsMiddleware:
+    """Observe response time per URL name into ``legalize_http_request_duration_seconds``."""
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        started = time.perf_counter()
+        response = self.get_response(request)
+        match = getattr(request, "resolver_match", None)
+        # Unresolved paths and unusual methods share one label each, so
+        # scanners cannot blow up the number of series.
+        view = match.view_name if match is not None else "unmatched"
+        method = request.method if request.method in _HTTP_METHODS else "other"
+        observe(HTTP_REQUEST_DURATION, time.perf_counter() - started, view=view, method=method)
+        return response
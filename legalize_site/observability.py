@@ -1,8 +1,21 @@
 from __future__ import annotations
 
+import functools
+import json
+import logging
+import re
+import time
 import uuid
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from typing import Any, Callable
 
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
 from django.http import HttpRequest, HttpResponse
 
 from legalize_site.utils.logging import clear_log_context, set_log_context
@@ -16,6 +29,8 @@ else:
 
 sentry_sdk = _sentry_sdk
 
+logger = logging.getLogger(__name__)
+
 
 class RequestIDMiddleware:
     REQUEST_ID_HEADER = "HTTP_X_REQUEST_ID"
@@ -43,3 +58,168 @@ class RequestIDMiddleware:
 
         response[self.RESPONSE_HEADER] = request_id
         return response
+
+
+_SQL_IN_LIST_RE = re.compile(r"\bIN \((?:%s, )*%s\)")
+_SQL_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+_CACHE_OPERATIONS = (
+    "add",
+    "get",
+    "set",
+    "touch",
+    "delete",
+    "get_many",
+    "has_key",
+    "incr",
+    "decr",
+    "set_many",
+    "delete_many",
+    "get_or_set",
+    "clear",
+)
+
+
+def sql_shape(sql: str) -> str:
+    """*sql* with literals and ``IN`` lists collapsed, so N+1 loops group together."""
+    shape = _SQL_IN_LIST_RE.sub("IN (...)", sql)
+    shape = _SQL_LITERAL_RE.sub("?", shape)
+    return " ".join(shape.split())
+
+
+@dataclass
+class RequestMetrics:
+    queries: int = 0
+    db_seconds: float = 0.0
+    cache_ops: int = 0
+    cache_seconds: float = 0.0
+    sql_shapes: Counter[str] = field(default_factory=Counter)
+    # Set while a cache call runs, so calls it makes internally (get_or_set
+    # calling get and add) are not counted twice.
+    in_cache_call: bool = False
+
+    def duplicate_sql(self, limit: int = 5) -> list[tuple[str, int]]:
+        return [(shape, count) for shape, count in self.sql_shapes.most_common(limit) if count > 1]
+
+    def server_timing(self, total_seconds: float, view_name: str) -> str:
+        metrics = [
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries"',
+            f'cache;dur={self.cache_seconds * 1000:.1f};desc="{self.cache_ops} ops"',
+            f"total;dur={total_seconds * 1000:.1f}",
+        ]
+        if view_name:
+            metrics[-1] += f';desc="{view_name}"'
+        return ", ".join(metrics)
+
+
+_request_metrics: ContextVar[RequestMetrics | None] = ContextVar("request_metrics", default=None)
+
+
+def _record_query(execute: Callable[..., Any], sql: str, params: Any, many: bool, context: dict[str, Any]) -> Any:
+    metrics = _request_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_seconds += time.perf_counter() - started
+        metrics.sql_shapes[sql_shape(sql)] += 1
+
+
+def _counted_cache_operation(operation: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(operation)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        metrics = _request_metrics.get()
+        if metrics is None or metrics.in_cache_call:
+            return operation(*args, **kwargs)
+        metrics.in_cache_call = True
+        started = time.perf_counter()
+        try:
+            return operation(*args, **kwargs)
+        finally:
+            metrics.in_cache_call = False
+            metrics.cache_ops += 1
+            metrics.cache_seconds += time.perf_counter() - started
+
+    return wrapper
+
+
+@contextmanager
+def _counting_cache_calls() -> Iterator[None]:
+    """Count calls on the cache backends serving this request.
+
+    Django has no hook for cache calls, so the public methods are shadowed on
+    the backend instances (``caches`` keeps one per thread) while the request
+    runs, then removed again. The backend classes are left untouched.
+    """
+    wrapped = []
+    for alias in settings.CACHES:
+        backend = caches[alias]
+        if "get" in vars(backend):
+            continue
+        for name in _CACHE_OPERATIONS:
+            setattr(backend, name, _counted_cache_operation(getattr(backend, name)))
+        wrapped.append(backend)
+    try:
+        yield
+    finally:
+        for backend in wrapped:
+            for name in _CACHE_OPERATIONS:
+                vars(backend).pop(name, None)
+
+
+class RequestInstrumentationMiddleware:
+    """Count SQL queries and cache calls per request.
+
+    Enabled with ``REQUEST_INSTRUMENTATION_ENABLED``. Staff responses get a
+    ``Server-Timing`` header; requests slower than
+    ``SLOW_REQUEST_THRESHOLD_MS`` or running more than
+    ``SLOW_REQUEST_QUERY_THRESHOLD`` queries are logged with their most
+    repeated SQL shapes. Sits after ``RequestIDMiddleware`` so the log line
+    carries the request's ``request_id``.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+        self.slow_seconds: float = float(getattr(settings, "SLOW_REQUEST_THRESHOLD_MS", 1000)) / 1000
+        self.slow_queries: int = int(getattr(settings, "SLOW_REQUEST_QUERY_THRESHOLD", 100))
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        metrics = RequestMetrics()
+        token = _request_metrics.set(metrics)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(_record_query))
+                stack.enter_context(_counting_cache_calls())
+                response = self.get_response(request)
+        finally:
+            _request_metrics.reset(token)
+        elapsed = time.perf_counter() - started
+
+        match = getattr(request, "resolver_match", None)
+        view_name = match.view_name if match is not None else ""
+        # The URL pattern rather than the path: paths carry onboarding and
+        # upload tokens.
+        route = match.route if match is not None else ""
+        user = getattr(request, "user", None)
+        if getattr(user, "is_staff", False):
+            response["Server-Timing"] = metrics.server_timing(elapsed, view_name)
+        if elapsed >= self.slow_seconds or metrics.queries > self.slow_queries:
+            logger.warning(
+                "Slow request method=%s route=%s view=%s status=%s duration_ms=%.1f queries=%d db_ms=%.1f "
+                "cache_ops=%d cache_ms=%.1f duplicate_sql=%s",
+                request.method,
+                route or "-",
+                view_name or "-",
+                response.status_code,
+                elapsed * 1000,
+                metrics.queries,
+                metrics.db_seconds * 1000,
+                metrics.cache_ops,
+                metrics.cache_seconds * 1000,
+                json.dumps([{"count": count, "sql": shape[:300]} for shape, count in metrics.duplicate_sql()]),
+            )
+        return response
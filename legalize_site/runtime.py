@@ -1,13 +1,23 @@
 from __future__ import annotations
 
+import copy
 import importlib.util
 import shutil
+import threading
+import time
 from pathlib import Path
 from typing import Any
 
 from django.conf import settings
 
 WINDOWS_TESSERACT_PATH = Path(r"C:\Program Files\Tesseract-OCR\tesseract.exe")
+# Installed packages and binaries do not change while a worker runs, but an
+# operator fixing a missing binary should not need a restart to see it.
+RUNTIME_DEPENDENCY_CACHE_TTL_SECONDS = 300
+
+_summary_lock = threading.Lock()
+# (expires_at, translation tooling enabled, summary)
+_summary: tuple[float, bool, dict[str, Any]] | None = None
 
 
 def _binary_available(key: str) -> bool:
@@ -115,12 +125,35 @@ def collect_runtime_dependency_statuses() -> list[dict[str, Any]]:
 
 
 def runtime_dependency_summary() -> dict[str, Any]:
+    """Dependency summary for dashboards and probes, cached per process.
+
+    Every probe walks ``PATH`` once per binary, so the result is kept for
+    ``RUNTIME_DEPENDENCY_CACHE_TTL_SECONDS``. System checks call
+    ``collect_runtime_dependency_statuses()`` directly and always probe.
+    """
+    global _summary
+    tooling = bool(getattr(settings, "ENABLE_TRANSLATION_TOOLING", False))
+    now = time.monotonic()
+    with _summary_lock:
+        cached = _summary
+    if cached is not None and cached[0] > now and cached[1] == tooling:
+        return copy.deepcopy(cached[2])
+
     statuses = collect_runtime_dependency_statuses()
     missing = [item for item in statuses if not item["available"]]
-    return {
+    summary = {
         "status": "degraded" if missing else "ok",
         "total": len(statuses),
         "missing_count": len(missing),
         "missing_keys": [item["key"] for item in missing],
         "dependencies": statuses,
     }
+    with _summary_lock:
+        _summary = (now + RUNTIME_DEPENDENCY_CACHE_TTL_SECONDS, tooling, summary)
+    return copy.deepcopy(summary)
+
+
+def reset_runtime_dependency_summary() -> None:
+    global _summary
+    with _summary_lock:
+        _summary = None
@@ -1,16 +1,19 @@
 from __future__ import annotations
 
 import logging
+import math
 import secrets
+import threading
+import time
 from dataclasses import dataclass
 from ipaddress import ip_address
 from typing import Any, Callable
 
 from django.conf import settings
-from django.core.cache import cache
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache
 from django.http import HttpRequest, HttpResponse
-from django.urls import Resolver404, resolve
 from django.utils import timezone
+from django.utils.module_loading import import_string
 from django.utils.translation import gettext as _
 
 logger = logging.getLogger(__name__)
@@ -68,19 +71,151 @@ def _build_rate_limit_key(request: HttpRequest, url_name: str, rule: RateLimitRu
     return "|".join(parts)
 
 
-def is_rate_limited(request: HttpRequest, url_name: str, rule: RateLimitRule) -> bool:
+@dataclass(frozen=True)
+class RateLimitDecision:
+    limited: bool
+    # Seconds until the next request would be admitted; 0 when not limited.
+    retry_after: int = 0
+
+
+# Sliding log in a sorted set: one member per admitted request, scored by its
+# arrival time in milliseconds. Trimming, counting, recording and the expiry
+# refresh run as one script, so a request costs one round trip and concurrent
+# workers cannot both take the last slot. Rejected requests are not recorded,
+# so a client hammering a limited endpoint is let back in once its oldest
+# admitted request leaves the window.
+_SLIDING_WINDOW_LUA = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+if redis.call('ZCARD', key) < limit then
+    redis.call('ZADD', key, now, ARGV[4])
+    redis.call('PEXPIRE', key, window)
+    return 0
+end
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+return math.max(tonumber(oldest[2]) + window - now, 1)
+"""
+_sliding_window_script: Any = None
+_redis_clients_lock = threading.Lock()
+_redis_clients: dict[str, Any] = {}
+
+
+def _rate_limit_redis_client() -> Any | None:
+    """Redis client behind the default cache, or ``None`` when it is not Redis."""
+    config: dict[str, Any] = settings.CACHES.get(DEFAULT_CACHE_ALIAS, {})
+    backend = config.get("BACKEND", "")
+    if backend.startswith("django_redis."):
+        from django_redis import get_redis_connection
+
+        return get_redis_connection(DEFAULT_CACHE_ALIAS)
+    if backend != "django.core.cache.backends.redis.RedisCache":
+        return None
+    location = config.get("LOCATION") or ""
+    servers = location.split(",") if isinstance(location, str) else list(location)
+    if not servers:
+        return None
+    # Django's RedisCache writes to the first server; so does the script.
+    url = str(servers[0]).strip()
+    options: dict[str, Any] = dict(config.get("OPTIONS") or {})
+    key = f"{url}|{sorted(options.items(), key=lambda item: item[0])!r}"
+    with _redis_clients_lock:
+        client = _redis_clients.get(key)
+        if client is None:
+            client = _redis_clients[key] = _redis_client_like_cache(url, options)
+    return client
+
+
+def _redis_client_like_cache(url: str, options: dict[str, Any]) -> Any:
+    """A client built the way ``RedisCache`` builds its pools from ``OPTIONS``.
+
+    Password, TLS and pool settings live in ``OPTIONS`` (or the URL), so the
+    limiter reaches the same server with the same credentials as the cache.
+    """
+    import redis
+
+    options.pop("serializer", None)
+    pool_class = options.pop("pool_class", None) or redis.ConnectionPool
+    if isinstance(pool_class, str):
+        pool_class = import_string(pool_class)
+    parser_class = options.pop("parser_class", None)
+    if isinstance(parser_class, str):
+        parser_class = import_string(parser_class)
+    if parser_class is not None:
+        options["parser_class"] = parser_class
+    return redis.Redis(connection_pool=pool_class.from_url(url, **options))
+
+
+def _redis_sliding_window(client: Any, cache_key: str, rule: RateLimitRule) -> RateLimitDecision:
+    global _sliding_window_script
+
+    key = cache.make_and_validate_key(f"{cache_key}|sw")
+    if _sliding_window_script is None:
+        _sliding_window_script = client.register_script(_SLIDING_WINDOW_LUA)
+    now_ms = int(time.time() * 1000)
+    retry_ms = int(
+        _sliding_window_script(
+            keys=[key],
+            args=[now_ms, rule.window_seconds * 1000, rule.limit, f"{now_ms}-{secrets.token_hex(4)}"],
+            client=client,
+        )
+    )
+    if not retry_ms:
+        return RateLimitDecision(limited=False)
+    return RateLimitDecision(limited=True, retry_after=math.ceil(retry_ms / 1000))
+
+
+def _cache_sliding_window(cache_key: str, rule: RateLimitRule) -> RateLimitDecision:
+    """Sliding-window counter on top of the plain cache API.
+
+    Used when the cache is not Redis (the database cache locally, LocMem in
+    tests). The previous fixed window's count is weighted by how much of it
+    still overlaps the sliding window, which removes the 2x burst a bare
+    fixed window allows at its boundary. Read and increment are separate
+    calls, so concurrent requests can overshoot the limit by a few.
+    """
+    window = rule.window_seconds
+    now = time.time()
+    current_start = int(now // window) * window
+    current_key = f"{cache_key}|{current_start}"
+    previous_key = f"{cache_key}|{current_start - window}"
+
+    counts = cache.get_many([previous_key, current_key])
+    previous = int(counts.get(previous_key) or 0)
+    current = int(counts.get(current_key) or 0)
+    overlap = (current_start + window - now) / window
+    if previous * overlap + current >= rule.limit:
+        if current >= rule.limit or not previous:
+            wait = current_start + window - now
+        else:
+            # The weighted previous count keeps shrinking; wait until it
+            # leaves room for one more request.
+            wait = window * (1 - (rule.limit - current) / previous) - (now - current_start)
+        return RateLimitDecision(limited=True, retry_after=max(1, math.floor(wait) + 1))
+
+    if current_key in counts:
+        try:
+            cache.incr(current_key)
+            return RateLimitDecision(limited=False)
+        except ValueError:
+            pass
+    if not cache.add(current_key, 1, timeout=window * 2):
+        cache.incr(current_key)
+    return RateLimitDecision(limited=False)
+
+
+def check_rate_limit(request: HttpRequest, url_name: str, rule: RateLimitRule) -> RateLimitDecision:
     if str(request.method).upper() not in rule.methods:
-        return False
+        return RateLimitDecision(limited=False)
 
     cache_key = _build_rate_limit_key(request, url_name, rule)
     try:
-        created = cache.add(cache_key, 1, timeout=rule.window_seconds)
-        if created:
-            return False
-        current = int(cache.incr(cache_key))
-    except ValueError:
-        cache.set(cache_key, 1, timeout=rule.window_seconds)
-        return False
+        client = _rate_limit_redis_client()
+        if client is not None:
+            return _redis_sliding_window(client, cache_key, rule)
+        return _cache_sliding_window(cache_key, rule)
     except Exception:
         failure_mode = "closed" if rule.fail_closed else getattr(settings, "RATE_LIMIT_CACHE_FAILURE_MODE", "closed")
         logger.exception(
@@ -88,8 +223,13 @@ def is_rate_limited(request: HttpRequest, url_name: str, rule: RateLimitRule) ->
             url_name,
             failure_mode,
         )
-        return str(failure_mode).lower() == "closed"
-    return current > rule.limit
+        if str(failure_mode).lower() == "closed":
+            return RateLimitDecision(limited=True, retry_after=rule.window_seconds)
+        return RateLimitDecision(limited=False)
+
+
+def is_rate_limited(request: HttpRequest, url_name: str, rule: RateLimitRule) -> bool:
+    return check_rate_limit(request, url_name, rule).limited
 
 
 def build_rate_limited_response(request: HttpRequest, message: str) -> HttpResponse:
@@ -101,33 +241,73 @@ def build_rate_limited_response(request: HttpRequest, message: str) -> HttpRespo
     return HttpResponse(message, status=429)
 
 
+@dataclass(frozen=True)
+class _RateLimitTable:
+    source: Any
+    rules: dict[str, RateLimitRule]
+    # Union of the rules' methods: anything else skips the limiter outright.
+    methods: frozenset[str]
+
+
+_rate_limit_table: _RateLimitTable | None = None
+
+
+def _rate_limit_rules() -> _RateLimitTable:
+    """``settings.RATE_LIMITS`` compiled into rules, rebuilt when the setting is replaced."""
+    global _rate_limit_table
+
+    configured: dict[str, Any] = getattr(settings, "RATE_LIMITS", {})
+    table = _rate_limit_table
+    if table is None or table.source is not configured:
+        rules = {name: RateLimitRule(**config) for name, config in configured.items() if config}
+        table = _RateLimitTable(
+            source=configured,
+            rules=rules,
+            methods=frozenset(method.upper() for rule in rules.values() for method in rule.methods),
+        )
+        _rate_limit_table = table
+    return table
+
+
 class RateLimitMiddleware:
-    """Apply path-name based rate limits to sensitive endpoints."""
+    """Apply path-name based rate limits to sensitive endpoints.
+
+    Runs in ``process_view`` so it reuses the resolver match Django already
+    computed for the request instead of resolving the path a second time.
+    """
 
     def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
         self.get_response = get_response
 
     def __call__(self, request: HttpRequest) -> HttpResponse:
-        try:
-            match = resolve(request.path_info)
-        except Resolver404:
-            return self.get_response(request)
+        return self.get_response(request)
+
+    def process_view(
+        self,
+        request: HttpRequest,
+        view_func: Callable[..., Any],
+        view_args: tuple[Any, ...],
+        view_kwargs: dict[str, Any],
+    ) -> HttpResponse | None:
+        table = _rate_limit_rules()
+        match = request.resolver_match
+        if match is None or str(request.method).upper() not in table.methods:
+            return None
 
         url_name = match.url_name
         full_name = match.view_name
-        configured_rules: dict[str, Any] = getattr(settings, "RATE_LIMITS", {})
-        rule_config = configured_rules.get(str(full_name)) or configured_rules.get(str(url_name))
-        if rule_config:
-            rule = RateLimitRule(**rule_config)
-            if is_rate_limited(request, str(full_name or url_name or "unknown"), rule):
-                response = build_rate_limited_response(request, rule.message)
-                retry_after = str(rule.window_seconds)
-                response["Retry-After"] = retry_after
-                response["X-RateLimit-Limit"] = str(rule.limit)
-                response["X-RateLimit-Reset"] = str(int(timezone.now().timestamp()) + rule.window_seconds)
-                return response
-
-        return self.get_response(request)
+        rule = table.rules.get(str(full_name)) or table.rules.get(str(url_name))
+        if rule is None:
+            return None
+        decision = check_rate_limit(request, str(full_name or url_name or "unknown"), rule)
+        if not decision.limited:
+            return None
+
+        response = build_rate_limited_response(request, rule.message)
+        response["Retry-After"] = str(decision.retry_after)
+        response["X-RateLimit-Limit"] = str(rule.limit)
+        response["X-RateLimit-Reset"] = str(int(timezone.now().timestamp()) + decision.retry_after)
+        return response
 
 
 class PermissionsPolicyMiddleware:
@@ -67,6 +67,43 @@ ASYNC_OCR_PROCESSING = env_flag("ASYNC_OCR_PROCESSING", "False")
 # drained by the in-process automation loop or the /cron/process-document-jobs/
 # webhook. The interactive staff wezwanie parse stays inline regardless.
 ASYNC_AUTO_OCR_PROCESSING = env_flag("ASYNC_AUTO_OCR_PROCESSING", "True")
+# Upload image compression (resize + WEBP) runs as an "image_compression"
+# document job instead of inside the upload request. The job waits for OCR on
+# the original to finish before swapping the stored file.
+DEFER_UPLOAD_IMAGE_COMPRESSION = env_flag("DEFER_UPLOAD_IMAGE_COMPRESSION", "True")
+DEFERRED_IMAGE_COMPRESSION_DELAY_SECONDS = int(os.environ.get("DEFERRED_IMAGE_COMPRESSION_DELAY_SECONDS", "30"))
+# Wall-clock budget for one OCR job run. The job lease is extended between PDF
+# pages while the job runs; past the budget the worker aborts the job.
+DOCUMENT_JOB_TIME_BUDGET_SECONDS = int(os.environ.get("DOCUMENT_JOB_TIME_BUDGET_SECONDS", "900"))
+# Per-type limits on OCR jobs processing at once across all workers, on top of
+# the defaults in clients.services.document_job_scheduling, e.g.
+# DOCUMENT_JOB_TYPE_CONCURRENCY="zus_ocr=2,passport_ocr=4".
+DOCUMENT_JOB_TYPE_CONCURRENCY = {
+    job_type.strip(): int(cap)
+    for job_type, _sep, cap in (
+        item.partition("=") for item in os.environ.get("DOCUMENT_JOB_TYPE_CONCURRENCY", "").split(",") if item.strip()
+    )
+}
+# Opt-in per-request SQL/cache accounting: a Server-Timing header for staff and
+# a "Slow request" log line (with the most repeated SQL shapes) for requests
+# over either threshold.
+REQUEST_INSTRUMENTATION_ENABLED = env_flag("REQUEST_INSTRUMENTATION_ENABLED", "False")
+SLOW_REQUEST_THRESHOLD_MS = env_float("SLOW_REQUEST_THRESHOLD_MS", "1000")
+SLOW_REQUEST_QUERY_THRESHOLD = int(os.environ.get("SLOW_REQUEST_QUERY_THRESHOLD", "100"))
+# Prometheus metrics (/metrics, token in METRICS_TOKEN): each worker folds its
+# counters into the shared cache every METRICS_FLUSH_SECONDS (0 = on every
+# observation); the queue gauges are recounted at most every
+# METRICS_QUEUE_DEPTH_TTL_SECONDS.
+METRICS_FLUSH_SECONDS = env_float("METRICS_FLUSH_SECONDS", "15")
+METRICS_QUEUE_DEPTH_TTL_SECONDS = int(os.environ.get("METRICS_QUEUE_DEPTH_TTL_SECONDS", "30"))
+# The admin dashboard snapshot is reused for this many seconds; its Refresh
+# button recomputes it immediately.
+ADMIN_DASHBOARD_CACHE_SECONDS = int(os.environ.get("ADMIN_DASHBOARD_CACHE_SECONDS", "60"))
+# ClientActivity rows logged inside a transaction are written with one
+# bulk_create on commit. Optionally, high-volume events logged outside a
+# transaction (client views) are flushed by a per-process thread every N seconds.
+CLIENT_ACTIVITY_BUFFERED_WRITES = env_flag("CLIENT_ACTIVITY_BUFFERED_WRITES", "True")
+CLIENT_ACTIVITY_BACKGROUND_FLUSH_SECONDS = float(os.environ.get("CLIENT_ACTIVITY_BACKGROUND_FLUSH_SECONDS", "0"))
 # ClamAV scanning of uploads (fail-closed when enabled). Point CLAMD_TCP_ADDR at
 # a clamd instance and flip MALWARE_SCAN_ENABLED=True; production check W014
 # warns while scanning stays off.
@@ -281,6 +318,7 @@ if WHITENOISE_AVAILABLE:
     MIDDLEWARE.append("whitenoise.middleware.WhiteNoiseMiddleware")
 MIDDLEWARE += [
     "legalize_site.observability.RequestIDMiddleware",
+    "legalize_site.metrics.HttpMetricsMiddleware",
     "clients.middleware.OnboardingLinkExpiredMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
@@ -294,6 +332,11 @@ MIDDLEWARE += [
     "legalize_site.security.ContentSecurityPolicyMiddleware",
     "allauth.account.middleware.AccountMiddleware",
 ]
+if REQUEST_INSTRUMENTATION_ENABLED:
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("legalize_site.observability.RequestIDMiddleware") + 1,
+        "legalize_site.observability.RequestInstrumentationMiddleware",
+    )
 if ENABLE_TRANSLATION_TOOLING:
     MIDDLEWARE.insert(
         MIDDLEWARE.index("allauth.account.middleware.AccountMiddleware"),
@@ -400,7 +443,7 @@ USE_TZ = True
 STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
 if WHITENOISE_AVAILABLE:
     STORAGES: dict[str, dict[str, Any]] = {
-        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "default": {"BACKEND": "database_media.storage.UsageTrackingFileSystemStorage"},
         "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
     }
 
@@ -411,6 +454,14 @@ USE_DATABASE_MEDIA_STORAGE = env_flag("USE_DATABASE_MEDIA_STORAGE", "False")
 DATABASE_MEDIA_FALLBACK_TO_FILE_SYSTEM = env_flag("DATABASE_MEDIA_FALLBACK_TO_FILE_SYSTEM", "True")
 DATABASE_MEDIA_AUTO_IMPORT_LEGACY_FILES = env_flag("DATABASE_MEDIA_AUTO_IMPORT_LEGACY_FILES", "True")
 DATABASE_MEDIA_TEMP_MAX_AGE_HOURS = int(os.environ.get("DATABASE_MEDIA_TEMP_MAX_AGE_HOURS", "24"))
+# Byte budget for the LRU file cache behind DatabaseMediaStorage.path().
+DATABASE_MEDIA_TEMP_CACHE_MAX_MB = int(os.environ.get("DATABASE_MEDIA_TEMP_CACHE_MAX_MB", "512"))
+DATABASE_MEDIA_TEMP_CACHE_MIN_AGE_SECONDS = int(os.environ.get("DATABASE_MEDIA_TEMP_CACHE_MIN_AGE_SECONDS", "60"))
+# At-rest codec for new database media blobs: "zlib", "zstd" (needs the
+# zstandard package) or "none". Already-compressed formats are stored as-is;
+# other content keeps its compressed form only if it saves MIN_SAVING.
+DATABASE_MEDIA_COMPRESSION = os.environ.get("DATABASE_MEDIA_COMPRESSION", "zlib")
+DATABASE_MEDIA_COMPRESSION_MIN_SAVING = float(os.environ.get("DATABASE_MEDIA_COMPRESSION_MIN_SAVING", "0.1"))
 USE_S3_MEDIA_STORAGE = env_flag("USE_S3_MEDIA_STORAGE", "False")
 PRIVATE_MEDIA_LOCATION = os.environ.get("PRIVATE_MEDIA_LOCATION", "private")
 BACKUP_STORAGE_ALIAS = os.environ.get("BACKUP_STORAGE_ALIAS", "backups")
@@ -488,6 +539,11 @@ FILE_UPLOAD_MAX_MEMORY_SIZE = DATA_UPLOAD_MAX_MEMORY_SIZE
 MAX_IMAGE_PIXELS = int(os.environ.get("MAX_IMAGE_PIXELS", "300000000"))
 MAX_UPLOAD_FILENAME_LENGTH = int(os.environ.get("MAX_UPLOAD_FILENAME_LENGTH", "180"))
 MAX_TOTAL_CLIENT_EXPORT_MB = int(os.environ.get("MAX_TOTAL_CLIENT_EXPORT_MB", "200"))
+# Background export jobs (company / multi-client archives) build the ZIP in the
+# automation loop and serve it from storage through a signed, expiring link.
+MAX_TOTAL_EXPORT_JOB_MB = int(os.environ.get("MAX_TOTAL_EXPORT_JOB_MB", "2000"))
+EXPORT_JOB_MAX_CLIENTS = int(os.environ.get("EXPORT_JOB_MAX_CLIENTS", "500"))
+EXPORT_JOB_LINK_TTL_HOURS = int(os.environ.get("EXPORT_JOB_LINK_TTL_HOURS", "24"))
 
 # --- ПОЧТА (SendGrid или Brevo через API или SMTP) ---
 SENDGRID_API_KEY = os.getenv("SENDGRID_API_KEY")
@@ -686,6 +742,14 @@ RATE_LIMIT_CACHE_FAILURE_MODE = os.environ.get(
     "open",
 ).lower()
 CRON_FAILURE_EMAIL_ALERTS = env_flag("CRON_FAILURE_EMAIL_ALERTS", "True" if IS_PRODUCTION else "False")
+# Per-task cadence overrides for `run_background_automation_loop --loop`, e.g.
+# BACKGROUND_AUTOMATION_SCHEDULES="retention-maintenance=at 02:00;export-jobs=every 2m".
+BACKGROUND_AUTOMATION_SCHEDULES = {
+    name.strip(): spec.strip()
+    for name, _sep, spec in (
+        item.partition("=") for item in os.environ.get("BACKGROUND_AUTOMATION_SCHEDULES", "").split(";") if item.strip()
+    )
+}
 ADMINS = [
     (email, email) for email in (item.strip() for item in os.environ.get("DJANGO_ADMIN_EMAILS", "").split(",")) if email
 ]
@@ -12,6 +12,7 @@ ENABLE_TRANSLATION_TOOLING = env_flag("ENABLE_TRANSLATION_TOOLING", "True")
 ASYNC_OCR_PROCESSING = False
 # Local dev has no separate job runner; keep auto-OCR inline for instant feedback.
 ASYNC_AUTO_OCR_PROCESSING = False
+DEFER_UPLOAD_IMAGE_COMPRESSION = False
 
 ALLOWED_HOSTS = [host for host in os.environ.get("ALLOWED_HOSTS", "").split(",") if host]
 ALLOWED_HOSTS.extend(["127.0.0.1", "localhost"])
@@ -19,6 +19,11 @@ ALLOWED_HOSTS = [host for host in os.environ.get("ALLOWED_HOSTS", "").split(",")
 # Tests exercise the synchronous OCR path by default (like CELERY_TASK_ALWAYS_EAGER);
 # async-pipeline tests opt in with override_settings.
 ASYNC_AUTO_OCR_PROCESSING = False
+DEFER_UPLOAD_IMAGE_COMPRESSION = False
+CLIENT_ACTIVITY_BUFFERED_WRITES = False
+# Tests change counts between dashboard requests; opt into the cached snapshot
+# with override_settings.
+ADMIN_DASHBOARD_CACHE_SECONDS = 0
 
 if "translations" not in INSTALLED_APPS:  # noqa: F405
     INSTALLED_APPS.append("translations")  # noqa: F405
@@ -55,7 +60,7 @@ STATIC_URL = "/static/"
 if "STORAGES" not in locals():
     STORAGES = {}
 STORAGES["staticfiles"] = {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"}
-STORAGES["default"] = {"BACKEND": "django.core.files.storage.FileSystemStorage"}
+STORAGES["default"] = {"BACKEND": "database_media.storage.UsageTrackingFileSystemStorage"}
 
 # Keep test-generated files in writable, disposable directories.
 TEST_ARTIFACTS_DIR = BASE_DIR / "tmp" / "test-artifacts"  # noqa: F405
@@ -8,6 +8,7 @@ from django.urls import reverse
 
 from clients.management.commands.run_background_automation_loop import HEARTBEAT_CACHE_KEY
 from clients.models import Client, Document, DocumentProcessingJob, EmailCampaign
+from legalize_site.runtime import reset_runtime_dependency_summary, runtime_dependency_summary
 
 
 class HealthcheckViewTests(TestCase):
@@ -151,3 +152,21 @@ class HealthcheckViewTests(TestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json()["components"]["background_automation"]["status"], "ok")
+
+
+class RuntimeDependencySummaryTests(TestCase):
+    def setUp(self):
+        reset_runtime_dependency_summary()
+        self.addCleanup(reset_runtime_dependency_summary)
+
+    def test_probe_runs_once_per_process_until_reset(self):
+        statuses = [{"key": "tesseract", "available": False}]
+        with patch("legalize_site.runtime.collect_runtime_dependency_statuses", return_value=statuses) as collect:
+            first = runtime_dependency_summary()
+            first["missing_keys"].append("mutated")
+            second = runtime_dependency_summary()
+            reset_runtime_dependency_summary()
+            runtime_dependency_summary()
+
+        self.assertEqual(collect.call_count, 2)
+        self.assertEqual(second["missing_keys"], ["tesseract"])
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+from datetime import date
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from clients.constants import DocumentType
+from clients.models import DocumentProcessingJob
+from clients.services.document_jobs import enqueue_document_processing_job, process_pending_document_jobs
+from clients.services.job_metrics import OCR_LEASE_RENEWED, increment_job_metric
+from clients.services.notifications import _log_email
+from clients.services.wezwanie_parser import WezwanieData
+from clients.testing.factories import create_test_client, create_test_document
+from legalize_site.metrics import EMAILS_SENT, HTTP_REQUEST_DURATION, _buffer, increment, observe
+
+AUTH = {"HTTP_AUTHORIZATION": "Bearer scrape-secret"}
+
+
+@patch.dict(os.environ, {"METRICS_TOKEN": "scrape-secret"}, clear=False)
+class MetricsEndpointTests(TestCase):
+    def setUp(self):
+        # Drop what earlier tests in this process observed.
+        _buffer.flush()
+        cache.clear()
+
+    def _scrape(self) -> str:
+        response = self.client.get(reverse("metrics"), **AUTH)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        return response.content.decode()
+
+    def test_requires_the_metrics_token(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+        self.assertEqual(
+            self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer wrong").status_code,
+            403,
+        )
+
+    @patch.dict(os.environ, {"METRICS_TOKEN": ""}, clear=False)
+    def test_is_closed_without_a_configured_token(self):
+        self.assertEqual(self.client.get(reverse("metrics"), **AUTH).status_code, 403)
+
+    def test_histograms_are_cumulative_and_counters_add_up(self):
+        observe(HTTP_REQUEST_DURATION, 0.04, view="clients:client_list", method="GET")
+        observe(HTTP_REQUEST_DURATION, 0.3, view="clients:client_list", method="GET")
+        increment(EMAILS_SENT, template="mass_email", status="sent")
+        increment(EMAILS_SENT, 2, template="mass_email", status="sent")
+
+        body = self._scrape()
+
+        series = 'view="clients:client_list",method="GET"'
+        self.assertIn(f'legalize_http_request_duration_seconds_bucket{{{series},le="0.025"}} 0', body)
+        self.assertIn(f'legalize_http_request_duration_seconds_bucket{{{series},le="0.05"}} 1', body)
+        self.assertIn(f'legalize_http_request_duration_seconds_bucket{{{series},le="0.5"}} 2', body)
+        self.assertIn(f'legalize_http_request_duration_seconds_bucket{{{series},le="+Inf"}} 2', body)
+        self.assertIn(f"legalize_http_request_duration_seconds_count{{{series}}} 2", body)
+        self.assertIn(f"legalize_http_request_duration_seconds_sum{{{series}}} 0.34", body)
+        self.assertIn('legalize_emails_total{template="mass_email",status="sent"} 3', body)
+
+    def test_totals_survive_another_process_flushing(self):
+        increment(EMAILS_SENT, template="custom", status="failed")
+        _buffer.flush()
+        # What a second worker would see: its own buffer is empty, the totals
+        # come from the shared cache.
+        with patch.object(_buffer, "_deltas", {}), patch.object(_buffer, "_series", {}):
+            body = self._scrape()
+
+        self.assertIn('legalize_emails_total{template="custom",status="failed"} 1', body)
+
+    def test_http_requests_are_observed_by_url_name(self):
+        self.client.get(reverse("healthcheck"))
+        self.client.get("/no-such-page/")
+
+        body = self._scrape()
+
+        self.assertIn('legalize_http_request_duration_seconds_count{view="healthcheck",method="GET"} 1', body)
+        self.assertIn('legalize_http_request_duration_seconds_count{view="unmatched",method="GET"} 1', body)
+
+    def test_email_log_and_job_counters_are_exposed(self):
+        _log_email("Subject", "Body", ["a@example.com"], template_type="custom", delivery_status="failed")
+        increment_job_metric(OCR_LEASE_RENEWED)
+
+        body = self._scrape()
+
+        self.assertIn('legalize_emails_total{template="custom",status="failed"} 1', body)
+        self.assertIn('legalize_job_events_total{event="ocr_lease_renewed"} 1', body)
+
+    def test_queue_gauge_is_cached_between_scrapes(self):
+        client = create_test_client()
+        for _ in range(2):
+            enqueue_document_processing_job(
+                document=create_test_document(client, doc_type=DocumentType.WEZWANIE.value)
+            )
+
+        failed = enqueue_document_processing_job(
+            document=create_test_document(client, doc_type=DocumentType.WEZWANIE.value)
+        )
+        DocumentProcessingJob.objects.filter(pk=failed.pk).update(status=DocumentProcessingJob.STATUS_FAILED)
+
+        body = self._scrape()
+        self.assertIn('legalize_document_jobs{status="pending",job_type="wezwanie_ocr"} 2', body)
+        self.assertNotIn('status="failed",job_type=', body)
+
+        with self.assertNumQueries(0):
+            self._scrape()
+
+    @override_settings(METRICS_FLUSH_SECONDS=0)
+    def test_document_job_runs_are_observed(self):
+        client = create_test_client()
+        enqueue_document_processing_job(document=create_test_document(client, doc_type=DocumentType.WEZWANIE.value))
+
+        process_pending_document_jobs(
+            parser=lambda _path: WezwanieData(
+                text="parsed", case_number="WSC-II-S.1.2026", fingerprints_date=date(2030, 1, 5)
+            )
+        )
+
+        body = self._scrape()
+        job_type = DocumentProcessingJob.JOB_TYPE_WEZWANIE_OCR
+        self.assertIn(
+            f'legalize_document_job_duration_seconds_count{{job_type="{job_type}",outcome="completed"}} 1', body
+        )
+        self.assertIn(f'legalize_document_job_wait_seconds_count{{job_type="{job_type}"}} 1', body)
+        self.assertIn(f'legalize_document_job_attempts_bucket{{job_type="{job_type}",le="1"}} 1', body)
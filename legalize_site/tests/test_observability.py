@@ -1,11 +1,24 @@
 from __future__ import annotations
 
 import logging
+import re
 
-from django.test import TestCase
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import caches
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
-from legalize_site.utils.logging import clear_log_context, set_log_context
+from clients.services.roles import ensure_predefined_roles
+from legalize_site.observability import sql_shape
+from legalize_site.utils.logging import RequestContextFilter, clear_log_context, set_log_context
+
+_INSTRUMENTED_MIDDLEWARE = [
+    *settings.MIDDLEWARE[: settings.MIDDLEWARE.index("legalize_site.observability.RequestIDMiddleware") + 1],
+    "legalize_site.observability.RequestInstrumentationMiddleware",
+    *settings.MIDDLEWARE[settings.MIDDLEWARE.index("legalize_site.observability.RequestIDMiddleware") + 1 :],
+]
 
 
 class ObservabilityTests(TestCase):
@@ -35,3 +48,71 @@ class ObservabilityTests(TestCase):
         RequestContextFilter().filter(record)
         self.assertEqual(record.request_id, "req-123")
         self.assertEqual(record.correlation_id, "corr-456")
+
+
+@override_settings(
+    MIDDLEWARE=_INSTRUMENTED_MIDDLEWARE,
+    SLOW_REQUEST_THRESHOLD_MS=60_000,
+    SLOW_REQUEST_QUERY_THRESHOLD=1_000,
+)
+class RequestInstrumentationTests(TestCase):
+    def setUp(self):
+        ensure_predefined_roles()
+        self.staff = get_user_model().objects.create_user(
+            email="timing-staff@example.com", password="pass", is_staff=True
+        )
+        self.staff.groups.add(Group.objects.get(name="Admin"))
+
+    def test_staff_responses_carry_server_timing(self):
+        self.client.force_login(self.staff)
+
+        response = self.client.get(reverse("clients:client_list"))
+
+        self.assertEqual(response.status_code, 200)
+        timing = response["Server-Timing"]
+        queries = int(re.search(r'db;dur=[\d.]+;desc="(\d+) queries"', timing).group(1))
+        self.assertGreater(queries, 0)
+        self.assertRegex(timing, r'cache;dur=[\d.]+;desc="[1-9]\d* ops"')
+        self.assertIn('desc="clients:client_list"', timing)
+
+    def test_cache_backends_are_only_wrapped_during_the_request(self):
+        backend = caches["default"]
+        get = type(backend).get
+        self.client.force_login(self.staff)
+
+        self.client.get(reverse("clients:client_list"))
+
+        self.assertIs(type(backend).get, get)
+        self.assertNotIn("get", vars(backend))
+
+    def test_anonymous_responses_have_no_server_timing(self):
+        response = self.client.get(reverse("account_login"))
+
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(SLOW_REQUEST_QUERY_THRESHOLD=0)
+    def test_slow_request_log_carries_request_id_and_duplicate_sql(self):
+        self.client.force_login(self.staff)
+        logger = logging.getLogger("legalize_site.observability")
+        context_filter = RequestContextFilter()
+        logger.addFilter(context_filter)
+        self.addCleanup(logger.removeFilter, context_filter)
+
+        with self.assertLogs("legalize_site.observability", level="WARNING") as captured:
+            self.client.get(reverse("clients:client_list"), HTTP_X_REQUEST_ID="slow-req-1")
+
+        record = captured.records[-1]
+        self.assertEqual(record.request_id, "slow-req-1")
+        message = record.getMessage()
+        self.assertIn("view=clients:client_list", message)
+        self.assertIn("route=", message)
+        self.assertNotIn("path=", message)
+        self.assertIn("status=200", message)
+        self.assertIn("duplicate_sql=[", message)
+
+    def test_sql_shape_groups_repeated_lookups(self):
+        self.assertEqual(
+            sql_shape("SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x'"),
+            sql_shape("SELECT *  FROM t WHERE id IN (%s) AND name = 'yy'"),
+        )
+        self.assertEqual(sql_shape("SELECT 1 FROM t LIMIT 21"), "SELECT ? FROM t LIMIT ?")
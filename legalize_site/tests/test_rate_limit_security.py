@@ -2,9 +2,18 @@ from __future__ import annotations
 
 from unittest.mock import patch
 
-from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
 
-from legalize_site.security import RateLimitRule, _client_ip, is_rate_limited
+from legalize_site.security import (
+    RateLimitRule,
+    _client_ip,
+    _rate_limit_redis_client,
+    _rate_limit_rules,
+    check_rate_limit,
+    is_rate_limited,
+)
 
 
 class ClientIpTests(SimpleTestCase):
@@ -81,3 +90,105 @@ class RateLimitCacheFailureTests(SimpleTestCase):
         request = self.factory.post("/login", REMOTE_ADDR="127.0.0.1")
 
         self.assertTrue(is_rate_limited(request, "account_login", auth_rule))
+
+
+class SlidingWindowTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.rule = RateLimitRule(limit=2, window_seconds=60, by_user=False, by_ip=True)
+
+    def _check(self, at: float):
+        request = self.factory.post("/login", REMOTE_ADDR="127.0.0.1")
+        with patch("legalize_site.security.time.time", return_value=at):
+            return check_rate_limit(request, "account_login", self.rule)
+
+    def test_window_boundary_does_not_double_the_burst(self):
+        self.assertFalse(self._check(6050).limited)
+        self.assertFalse(self._check(6055).limited)
+        self.assertTrue(self._check(6059).limited)
+
+        # A fixed window would reset at 6060 and admit two more requests
+        # straight away; the sliding window still counts most of the
+        # previous minute.
+        self.assertFalse(self._check(6061).limited)
+        decision = self._check(6062)
+        self.assertTrue(decision.limited)
+        self.assertEqual(decision.retry_after, 29)
+
+        self.assertFalse(self._check(6091).limited)
+        self.assertTrue(self._check(6092).limited)
+        self.assertFalse(self._check(6200).limited)
+
+    def test_other_methods_are_not_counted(self):
+        request = self.factory.get("/login", REMOTE_ADDR="127.0.0.1")
+
+        for _ in range(5):
+            self.assertFalse(is_rate_limited(request, "account_login", self.rule))
+
+    def test_redis_client_comes_from_the_configured_cache(self):
+        self.assertIsNone(_rate_limit_redis_client())
+
+        redis_cache = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": "redis://127.0.0.1:6399/3,redis://127.0.0.1:6400/3",
+            }
+        }
+        with override_settings(CACHES=redis_cache):
+            client = _rate_limit_redis_client()
+
+        self.assertIsNotNone(client)
+        kwargs = client.connection_pool.connection_kwargs
+        self.assertEqual((kwargs["port"], kwargs["db"]), (6399, 3))
+
+    def test_redis_client_uses_the_cache_connection_options(self):
+        redis_cache = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": "rediss://127.0.0.1:6401/0",
+                "OPTIONS": {"password": "s3cret", "max_connections": 7, "ssl_cert_reqs": None},
+            }
+        }
+        with override_settings(CACHES=redis_cache):
+            client = _rate_limit_redis_client()
+
+        pool = client.connection_pool
+        self.assertEqual(pool.connection_kwargs["password"], "s3cret")
+        self.assertIsNone(pool.connection_kwargs["ssl_cert_reqs"])
+        self.assertEqual(pool.connection_class.__name__, "SSLConnection")
+        self.assertEqual(pool.max_connections, 7)
+
+
+@override_settings(
+    RATE_LIMITS={"account_login": {"limit": 1, "window_seconds": 60, "by_user": False, "by_ip": True}},
+)
+class RateLimitMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_limited_view_gets_retry_after_without_a_second_resolve(self):
+        url = reverse("account_login")
+        # A fixed clock keeps both posts in one window; across a minute
+        # boundary the second one could be admitted.
+        with patch("legalize_site.security.time.time", return_value=6030):
+            self.client.post(url, {"login": "a@example.com", "password": "x"})
+
+        with (
+            patch("legalize_site.security.time.time", return_value=6035),
+            patch("legalize_site.security.check_rate_limit", wraps=check_rate_limit) as checked,
+        ):
+            response = self.client.post(url, {"login": "a@example.com", "password": "x"})
+
+        self.assertEqual(response.status_code, 429)
+        self.assertTrue(checked.call_args.args[0].resolver_match.view_name.endswith("account_login"))
+        self.assertTrue(1 <= int(response["Retry-After"]) <= 60)
+        self.assertEqual(response["X-RateLimit-Limit"], "1")
+
+    def test_rule_table_is_rebuilt_when_the_setting_changes(self):
+        self.assertIn("account_login", _rate_limit_rules().rules)
+
+        with override_settings(RATE_LIMITS={}):
+            self.assertEqual(_rate_limit_rules().rules, {})
+            response = self.client.post(reverse("account_login"), {"login": "a@example.com", "password": "x"})
+        self.assertNotEqual(response.status_code, 429)
@@ -8,7 +8,7 @@ from django.urls import include, path
 
 from clients import views
 from clients.views.admin_views import update_translations_view
-from legalize_site.views import healthcheck, readiness
+from legalize_site.views import healthcheck, metrics, readiness
 from users.security_views import SignupDisabledView
 from users.views import ResendVerificationEmailView
 
@@ -23,6 +23,7 @@ from .cron_views import (
 urlpatterns = [
     path('healthz/', healthcheck, name='healthcheck'),
     path('readyz/', readiness, name='readiness'),
+    path('metrics', metrics, name='metrics'),
     path('admin/update-translations/', update_translations_view, name='update_translations'),
     path('admin/', admin.site.urls),
     path('i18n/', include('django.conf.urls.i18n')),
@@ -11,9 +11,13 @@ from django.db import connection
 from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import render
 from django.utils.translation import gettext as _
+from django.views.decorators.http import require_GET
 
-from clients.management.commands.run_background_automation_loop import HEARTBEAT_CACHE_KEY
+from clients.management.commands.run_background_automation_loop import HEARTBEAT_CACHE_KEY, TASK_SCHEDULE_CACHE_KEY
 from clients.models import DocumentProcessingJob, EmailCampaign
+from clients.services.job_metrics import job_metrics_snapshot
+from legalize_site.cron_views import _authorize_cron_request
+from legalize_site.metrics import render_metrics
 from legalize_site.runtime import runtime_dependency_summary
 from legalize_site.utils.http import request_is_ajax
 
@@ -50,11 +54,21 @@ def healthcheck(request: HttpRequest) -> HttpResponse:
             "running_email_campaigns": EmailCampaign.objects.filter(status=EmailCampaign.STATUS_RUNNING).count(),
             "failed_email_campaigns": EmailCampaign.objects.filter(status=EmailCampaign.STATUS_FAILED).count(),
         }
+        payload["job_metrics"] = job_metrics_snapshot()
         payload["runtime"] = runtime_dependency_summary()
 
     return JsonResponse(payload, status=200 if db_status == "ok" else 503)
 
 
+@require_GET
+def metrics(request: HttpRequest) -> HttpResponse:
+    """Prometheus scrape endpoint; needs ``Authorization: Bearer <METRICS_TOKEN>``."""
+    forbidden_response = _authorize_cron_request(request, action_name="metrics scrape", token_env="METRICS_TOKEN")
+    if forbidden_response is not None:
+        return forbidden_response
+    return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 def readiness(request: HttpRequest) -> HttpResponse:
     components: dict[str, Any] = {}
     overall_ok = True
@@ -115,6 +129,8 @@ def readiness(request: HttpRequest) -> HttpResponse:
             "status": heartbeat_status,
             "required": automation_required,
             "failed_tasks": heartbeat.get("failed_tasks", []) if isinstance(heartbeat, dict) else [],
+            # Per-task last duration / next run, published by the --loop scheduler.
+            "tasks": cache.get(TASK_SCHEDULE_CACHE_KEY) or {},
         }
         if automation_required and heartbeat_status != "ok":
             overall_ok = False
@@ -0,0 +1,125 @@
+"""Benchmark encrypted client-name search latency as the client table grows.
+
+Fills a throw-away test database with clients in steps, builds their search
+tokens in bulk and times the client-list search query
+(``build_search_filter`` + ``with_search_rank``, first page) for prefix,
+substring, transliterated and misspelled queries at each size.
+
+Uses ``legalize_site.settings.test``: in-memory SQLite by default, or the
+database in ``TEST_DATABASE_URL`` (recommended for the 100k step).
+
+Usage (from the repository root):
+    python scripts/bench_client_search.py [--sizes 1000 10000 100000] [--runs 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# A fixed set of named clients is planted once; everyone else gets a
+# generated name, so the share of clients matching a query shrinks as the
+# table grows, as it does for a real office.
+PLANTED_NAMES = [
+    ("Łukasz", "Kowalczyk"), ("Jan", "Kowalski"), ("Anna", "Kowalska"), ("Сергій", "Бойко"),
+    ("Olena", "Shevchenko"), ("Иван", "Петров"), ("Andrii", "Bondarenko"), ("Zofia", "Wiśniewska"),
+]
+PLANTED_COPIES = 10
+SYLLABLES = [
+    "ko", "wa", "ni", "sz", "ek", "ro", "ma", "li", "chu", "dy", "ber", "tan", "vel", "or", "ga", "mir",
+    "sta", "pol", "ren", "zu", "ol", "ha", "bre", "tek", "nus", "di", "fa", "gor", "hil", "jak",
+]
+QUERIES = ["kowal", "walcz", "lukasz kowalczyk", "сергии", "shevchnko", "bond"]
+
+
+def _generated_name(rng: random.Random, syllables: int) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(syllables)).capitalize()
+
+
+def _fill(target: int, rng: random.Random, batch_size: int = 2000) -> None:
+    from clients.models import Client
+
+    current = Client._base_manager.count()
+    planted = [] if current else [name for name in PLANTED_NAMES for _ in range(PLANTED_COPIES)]
+    while current < target:
+        size = min(batch_size, target - current)
+        names = [planted.pop() if planted else (_generated_name(rng, 2), _generated_name(rng, 3)) for _ in range(size)]
+        batch = [
+            Client(
+                first_name=first_name,
+                last_name=last_name,
+                email=f"bench-{current + index}@example.test",
+                phone="+48000000000",
+                application_purpose="work",
+                is_test_data=True,
+            )
+            for index, (first_name, last_name) in enumerate(names)
+        ]
+        created = Client.objects.bulk_create(batch)
+        Client.rebuild_search_tokens_bulk(created)
+        current += size
+
+
+def _time_query(query: str, runs: int) -> tuple[float, float, int]:
+    from clients.models import Client
+
+    def run() -> int:
+        page = (
+            Client.objects.filter(Client.build_search_filter(query))
+            .with_search_rank(query)
+            .distinct()
+            .order_by("-search_rank", "-created_at")
+            .values_list("pk", flat=True)[:15]
+        )
+        return len(list(page))
+
+    run()
+    timings = []
+    found = 0
+    for _ in range(runs):
+        started = time.perf_counter()
+        found = run()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), max(timings), found
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(REPO_ROOT))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "legalize_site.settings.test")
+    import django
+
+    django.setup()
+    from django.test.utils import setup_databases, setup_test_environment, teardown_databases
+
+    from clients.models import ClientSearchToken
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        rng = random.Random(40)
+        print(f"{'clients':>8} {'tokens':>9} {'query':<18} {'median ms':>10} {'max ms':>9} {'rows':>5}")
+        for size in sorted(args.sizes):
+            _fill(size, rng)
+            tokens = ClientSearchToken.objects.count()
+            for query in QUERIES:
+                median_ms, max_ms, found = _time_query(query, args.runs)
+                print(f"{size:>8} {tokens:>9} {query:<18} {median_ms:>10.1f} {max_ms:>9.1f} {found:>5}")
+    finally:
+        teardown_databases(old_config, verbosity=0)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,74 @@
+"""Benchmark the email-copy PDF renderers: render time and output size.
+
+Compares the reportlab vector renderer used for confirmation attachments with
+the legacy PIL raster renderer it replaced. No database is needed.
+
+Usage (from the repository root):
+    python scripts/bench_email_pdf.py [--runs 20] [--paragraphs 40]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+SAMPLE_PARAGRAPH = (
+    "Szanowni Państwo, przypominamy o brakujących dokumentach do wniosku o kartę pobytu. "
+    "Уважаемый клиент, пожалуйста, загрузите недостающие документы до указанного срока. "
+    "Dear client, please upload the missing documents before the deadline stated below."
+)
+
+
+def _measure(render: Callable[[str], bytes], text: str, runs: int) -> tuple[float, float, int]:
+    render(text)  # warm-up: font discovery and registration happen once per process
+    timings = []
+    size = 0
+    for _ in range(runs):
+        started = time.perf_counter()
+        size = len(render(text))
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), max(timings), size
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--paragraphs", type=int, default=40)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(REPO_ROOT))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "legalize_site.settings.test")
+    import django
+
+    django.setup()
+    from clients.services.notifications_pdf import (
+        _get_pdf_font_path,
+        _render_email_pdf_raster,
+        _render_email_pdf_vector,
+    )
+
+    started = time.perf_counter()
+    _get_pdf_font_path()
+    first_lookup_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    _get_pdf_font_path()
+    cached_lookup_ms = (time.perf_counter() - started) * 1000
+    print(f"font lookup: first={first_lookup_ms:.2f} ms cached={cached_lookup_ms:.4f} ms")
+
+    text = "\n\n".join(SAMPLE_PARAGRAPH for _ in range(args.paragraphs))
+    print(f"{'renderer':<8} {'median ms':>10} {'max ms':>10} {'bytes':>10}")
+    for label, render in (("vector", _render_email_pdf_vector), ("raster", _render_email_pdf_raster)):
+        median_ms, max_ms, size = _measure(render, text, args.runs)
+        print(f"{label:<8} {median_ms:>10.1f} {max_ms:>10.1f} {size:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
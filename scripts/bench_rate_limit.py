@@ -0,0 +1,110 @@
+"""Benchmark the per-request overhead of ``RateLimitMiddleware``.
+
+Times ``RateLimitMiddleware.process_view`` for a GET to a page without a rule
+(the common case), a GET to a rate-limited view (skipped by method) and a POST
+to a rate-limited view that stays under its limit (one limiter check against
+the cache). ``resolve()`` of the same paths is timed alongside it: that is
+what the middleware used to pay on every request before it switched to the
+resolver match Django already computes.
+
+Uses ``legalize_site.settings.test``. ``--cache`` picks the backend the
+limiter talks to: LocMem (default), the database cache, or Redis at
+``--redis-url``.
+
+Usage (from the repository root):
+    python scripts/bench_rate_limit.py [--cache locmem|db|redis] [--redis-url redis://...] [--runs 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+LIMITED_VIEW = "account_login"
+UNLIMITED_VIEW = "account_logout"
+
+
+def _cache_settings(kind: str, redis_url: str) -> dict:
+    if kind == "db":
+        return {"default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "bench_cache"}}
+    if kind == "redis":
+        return {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": redis_url}}
+    return {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "bench"}}
+
+
+def _time_us(func: Callable[[], object], runs: int) -> tuple[float, float]:
+    func()
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1_000_000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.99) - 1]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cache", choices=["locmem", "db", "redis"], default="locmem")
+    parser.add_argument("--redis-url", default=os.environ.get("REDIS_URL", "redis://127.0.0.1:6379/15"))
+    parser.add_argument("--runs", type=int, default=5000)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(REPO_ROOT))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "legalize_site.settings.test")
+    import django
+
+    django.setup()
+    from django.contrib.auth.models import AnonymousUser
+    from django.core.management import call_command
+    from django.http import HttpRequest, HttpResponse
+    from django.test import RequestFactory
+    from django.test.utils import override_settings, setup_databases, setup_test_environment, teardown_databases
+    from django.urls import resolve, reverse
+
+    from legalize_site.security import RateLimitMiddleware
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    rules = {LIMITED_VIEW: {"limit": 10**9, "window_seconds": 3600, "by_user": False, "by_ip": True}}
+    try:
+        with override_settings(CACHES=_cache_settings(args.cache, args.redis_url), RATE_LIMITS=rules):
+            if args.cache == "db":
+                call_command("createcachetable", verbosity=0)
+            middleware = RateLimitMiddleware(lambda request: HttpResponse())
+            factory = RequestFactory()
+
+            def request_for(method: str, view_name: str) -> HttpRequest:
+                path = reverse(view_name)
+                request = getattr(factory, method)(path, REMOTE_ADDR="198.51.100.7")
+                request.user = AnonymousUser()
+                request.resolver_match = resolve(path)
+                return request
+
+            cases = [
+                ("GET, no rule", request_for("get", UNLIMITED_VIEW)),
+                ("GET, limited view", request_for("get", LIMITED_VIEW)),
+                (f"POST, limited view ({args.cache})", request_for("post", LIMITED_VIEW)),
+            ]
+            print(f"{'case':<32} {'middleware us':>14} {'p99 us':>8} {'resolve() us':>13}")
+            for label, request in cases:
+                match = resolve(request.path_info)
+                median_us, p99_us = _time_us(
+                    lambda: middleware.process_view(request, match.func, match.args, match.kwargs), args.runs
+                )
+                resolve_us, _ = _time_us(lambda: resolve(request.path_info), args.runs)
+                print(f"{label:<32} {median_us:>14.1f} {p99_us:>8.1f} {resolve_us:>13.1f}")
+    finally:
+        teardown_databases(old_config, verbosity=0)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,70 @@
+// Lazily loaded client detail sections (activity, emails, tasks, versions).
+// Each [data-client-fragment] container is fetched once it scrolls into view
+// (hidden tabs and collapsed panels load when they are opened); the
+// "show more" control appends the next cursor page to the same list.
+function initLazyFragments() {
+  const containers = document.querySelectorAll('[data-client-fragment]');
+  if (!containers.length) {
+    return;
+  }
+
+  async function load(container) {
+    if (container.dataset.loaded) {
+      return;
+    }
+    container.dataset.loaded = 'true';
+    try {
+      const { html } = await fetchHtml(container.dataset.url, { cache: 'no-store' });
+      replaceNodeContents(container, html);
+    } catch (error) {
+      container.textContent = container.dataset.errorText || '';
+      logAjaxError('load fragment', error, { url: container.dataset.url });
+    }
+  }
+
+  if ('IntersectionObserver' in window) {
+    const observer = new IntersectionObserver((entries) => {
+      entries.forEach((entry) => {
+        if (entry.isIntersecting) {
+          observer.unobserve(entry.target);
+          load(entry.target);
+        }
+      });
+    }, { rootMargin: '200px' });
+    containers.forEach((container) => observer.observe(container));
+  } else {
+    containers.forEach(load);
+  }
+
+  document.addEventListener('click', async (event) => {
+    const more = event.target.closest('[data-fragment-more]');
+    const container = more?.closest('[data-client-fragment]');
+    if (!more || !container) {
+      return;
+    }
+    const button = more.querySelector('button');
+    if (button) {
+      button.disabled = true;
+    }
+    try {
+      const { html } = await fetchHtml(more.dataset.url, { cache: 'no-store' });
+      const page = createTemplateFragment(html);
+      const items = container.querySelector('[data-fragment-items]');
+      const nextItems = page.querySelector('[data-fragment-items]');
+      if (items && nextItems) {
+        items.append(...nextItems.childNodes);
+      }
+      const nextMore = page.querySelector('[data-fragment-more]');
+      if (nextMore) {
+        more.replaceWith(nextMore);
+      } else {
+        more.remove();
+      }
+    } catch (error) {
+      if (button) {
+        button.disabled = false;
+      }
+      logAjaxError('load more', error, { url: more.dataset.url });
+    }
+  });
+}
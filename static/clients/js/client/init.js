@@ -12,7 +12,7 @@ document.addEventListener('DOMContentLoaded', () => {
   initHoverDropdowns();
   initSendEmailModal();
   initMessageTemplatesModal();
-  initEmailHistoryToggle();
+  initLazyFragments();
   initTabAnchorLinks();
   initOnboardingPanelLinkGenerator();
 });
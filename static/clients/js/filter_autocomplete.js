@@ -0,0 +1,94 @@
+// Autocomplete for list filters that used to render every client/company as
+// a <select> option. Markup:
+//   <div data-filter-autocomplete>
+//     <input type="hidden" name="..." data-filter-value>
+//     <input type="text" data-autocomplete-url="...">
+//     <div class="dropdown-menu" data-filter-suggestions></div>
+//   </div>
+// The endpoint answers {"results": [{"id": ..., "label": ...}]}.
+(function () {
+  function initFilterAutocomplete(container) {
+    const hidden = container.querySelector('[data-filter-value]');
+    const input = container.querySelector('input[data-autocomplete-url]');
+    const suggestions = container.querySelector('[data-filter-suggestions]');
+    if (!hidden || !input || !suggestions) return;
+
+    let debounceTimer;
+    let selectedLabel = input.value;
+
+    function hideSuggestions() {
+      suggestions.style.display = 'none';
+      suggestions.innerHTML = '';
+    }
+
+    function select(id, label) {
+      hidden.value = id;
+      input.value = label;
+      selectedLabel = label;
+      hideSuggestions();
+    }
+
+    function renderSuggestions(results) {
+      suggestions.innerHTML = '';
+      if (!results || results.length === 0) {
+        suggestions.style.display = 'none';
+        return;
+      }
+      results.forEach((result) => {
+        const item = document.createElement('button');
+        item.type = 'button';
+        item.className = 'dropdown-item';
+        item.textContent = result.label;
+        item.addEventListener('click', () => select(String(result.id), result.label));
+        suggestions.appendChild(item);
+      });
+      suggestions.style.display = 'block';
+    }
+
+    input.addEventListener('input', () => {
+      clearTimeout(debounceTimer);
+      const query = input.value.trim();
+      if (query !== selectedLabel) {
+        // Typing invalidates the previous choice; an empty input means "all".
+        hidden.value = '';
+        selectedLabel = '';
+      }
+      if (query.length < 2) {
+        hideSuggestions();
+        return;
+      }
+
+      debounceTimer = setTimeout(async () => {
+        try {
+          const response = await fetch(`${input.dataset.autocompleteUrl}?q=${encodeURIComponent(query)}`, {
+            headers: {
+              'X-Requested-With': 'XMLHttpRequest',
+              'Accept': 'application/json'
+            }
+          });
+          if (!response.ok) throw new Error('Network error');
+          const data = await response.json();
+          renderSuggestions(data.results);
+        } catch (err) {
+          console.error('Filter autocomplete error:', err);
+        }
+      }, 250);
+    });
+
+    input.addEventListener('keydown', (event) => {
+      if (event.key === 'Escape') {
+        hideSuggestions();
+      }
+    });
+
+    document.addEventListener('click', (event) => {
+      if (!container.contains(event.target)) {
+        suggestions.style.display = 'none';
+      }
+    });
+  }
+
+  document.addEventListener('DOMContentLoaded', () => {
+    document.querySelectorAll('[data-filter-autocomplete]').forEach(initFilterAutocomplete);
+  });
+})();
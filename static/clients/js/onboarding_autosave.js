@@ -54,19 +54,61 @@ document.addEventListener("DOMContentLoaded", function() {
         }
     }
 
-    function saveDraft(options = {}) {
+    // Only fields changed since the last successful save are posted, and a
+    // burst of edits is coalesced into one request: the server then decrypts
+    // and rewrites just the sections those fields belong to.
+    function snapshot() {
+        const values = new Map();
         const formData = new FormData(form);
+        for (const name of new Set(formData.keys())) {
+            values.set(name, JSON.stringify(formData.getAll(name)));
+        }
+        return values;
+    }
+
+    let savedValues = snapshot();
+    let inFlight = null;
+    let pendingSave = false;
+
+    function collectChanges() {
+        const current = snapshot();
+        const delta = new FormData();
+        const sent = new Map();
+        current.forEach((serialized, name) => {
+            if (savedValues.get(name) === serialized) return;
+            JSON.parse(serialized).forEach(value => delta.append(name, value));
+            sent.set(name, serialized);
+        });
+        if (!sent.size) return null;
+        const csrfInput = form.querySelector("[name=csrfmiddlewaretoken]");
+        if (csrfInput) {
+            delta.append("csrfmiddlewaretoken", csrfInput.value);
+        }
+        return { delta, sent };
+    }
+
+    function markSaved(sent) {
+        sent.forEach((serialized, name) => savedValues.set(name, serialized));
+    }
+
+    function saveDraft(options = {}) {
+        if (inFlight) {
+            pendingSave = true;
+            return inFlight;
+        }
+        const changes = collectChanges();
+        if (!changes) return Promise.resolve(null);
         if (!options.silent) {
             setStatus(textSaving, "saving");
         }
 
-        return fetch(window.ONBOARDING_AUTO_SAVE_URL, {
+        inFlight = fetch(window.ONBOARDING_AUTO_SAVE_URL, {
             method: "POST",
             headers: {
                 "X-CSRFToken": csrfToken,
                 "X-Requested-With": "XMLHttpRequest"
             },
-            body: formData,
+            body: changes.delta,
             keepalive: Boolean(options.keepalive)
         })
         .then(response => {
@@ -76,6 +118,7 @@ document.addEventListener("DOMContentLoaded", function() {
             return response.json();
         })
         .then(data => {
+            markSaved(changes.sent);
             if (!options.silent) {
                 const savedAt = new Date().toLocaleTimeString([], { hour: "2-digit", minute: "2-digit" });
                 setStatus(textSaved + " " + savedAt, "success");
@@ -87,7 +130,15 @@ document.addEventListener("DOMContentLoaded", function() {
                 setStatus(textFailed, "danger");
             }
             console.error("Error auto-saving draft:", error);
+        })
+        .finally(() => {
+            inFlight = null;
+            if (pendingSave) {
+                pendingSave = false;
+                debouncedSave();
+            }
         });
+        return inFlight;
     }
 
     let timeout = null;
@@ -98,9 +149,10 @@ document.addEventListener("DOMContentLoaded", function() {
 
     function flushDraft() {
         clearTimeout(timeout);
-        const formData = new FormData(form);
-        if (navigator.sendBeacon) {
-            navigator.sendBeacon(window.ONBOARDING_AUTO_SAVE_URL, formData);
+        const changes = collectChanges();
+        if (!changes) return;
+        if (navigator.sendBeacon && navigator.sendBeacon(window.ONBOARDING_AUTO_SAVE_URL, changes.delta)) {
+            markSaved(changes.sent);
             return;
         }
         saveDraft({ keepalive: true, silent: true });
@@ -110,7 +162,7 @@ document.addEventListener("DOMContentLoaded", function() {
         if (input.type === "text" || input.type === "date" || input.tagName === "TEXTAREA" || input.type === "password" || input.type === "email" || input.type === "tel") {
             input.addEventListener("input", debouncedSave);
         } else {
-            input.addEventListener("change", saveDraft);
+            input.addEventListener("change", debouncedSave);
         }
     });
 